@@ -4,6 +4,7 @@ Main anomaly detection system that orchestrates all components.
 
 import pandas as pd
 import numpy as np
+from dataclasses import replace
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 import time
@@ -18,7 +19,9 @@ from .anomaly_detectors import (
     ZScoreDetector, ModifiedZScoreDetector, IQRDetector,
     IsolationForestDetector, LocalOutlierFactorDetector, LSTMDetector
 )
+from .data_versions import DataVersionRegistry
 from .ensemble_detector import EnsembleDetector
+from .streaming_detectors import create_streaming_detectors
 from .notification_manager import NotificationManager
 from .feedback_processor import FeedbackProcessor
 
@@ -26,15 +29,24 @@ from .feedback_processor import FeedbackProcessor
 class AnomalyDetectionSystem:
     """Main anomaly detection system."""
     
-    def __init__(self, config: Optional[DetectionConfig] = None):
-        """Initialize the anomaly detection system."""
+    def __init__(self, config: Optional[DetectionConfig] = None,
+                 data_versions: Optional[DataVersionRegistry] = None):
+        """Initialize the anomaly detection system.
+        
+        Args:
+            config: Detection configuration
+            data_versions: Registry whose versions identify the data passed
+                to scan_history (None to fingerprint the data instead)
+        """
         self.config = config or DetectionConfig()
+        self.data_versions = data_versions
         
         # Initialize detectors
         self.detectors = self._initialize_detectors()
         
         # Initialize main components
         self.ensemble = EnsembleDetector(self.detectors, self.config)
+        self._initialize_streaming()
         self.notification_manager = NotificationManager()
         self.feedback_processor = FeedbackProcessor(self.config)
         
@@ -67,11 +79,13 @@ class AnomalyDetectionSystem:
         
         # Machine learning detectors
         detectors['isolation_forest'] = IsolationForestDetector(
-            contamination=self.config.isolation_forest_contamination
+            contamination=self.config.isolation_forest_contamination,
+            n_jobs=self.config.ml_n_jobs
         )
         detectors['lof'] = LocalOutlierFactorDetector(
             n_neighbors=self.config.lof_neighbors,
-            contamination=self.config.lof_contamination
+            contamination=self.config.lof_contamination,
+            n_jobs=self.config.ml_n_jobs
         )
         
         # LSTM detector (when available)
@@ -98,6 +112,23 @@ class AnomalyDetectionSystem:
         
         return detectors
     
+    def _initialize_streaming(self):
+        """Initialize online detectors used by real-time detection.
+        
+        Only the statistical methods have online variants, so the streaming
+        ensemble votes across all of them regardless of ``enabled_methods``.
+        """
+        self.streaming_detectors = create_streaming_detectors(
+            self.config, adaptive=self.config.real_time_adaptive
+        )
+        streaming_config = replace(
+            self.config,
+            enabled_methods=[detector.method for detector in self.streaming_detectors.values()]
+        )
+        # Online updates are microseconds per point; threads would only add overhead
+        self.streaming_ensemble = EnsembleDetector(self.streaming_detectors, streaming_config,
+                                                   max_workers=1)
+    
     def detect_anomalies(self, data: Union[pd.Series, pd.DataFrame], 
                         real_time: bool = False) -> List[Anomaly]:
         """Main entry point for anomaly detection."""
@@ -108,6 +139,38 @@ class AnomalyDetectionSystem:
         else:
             raise ValueError("Data must be pandas Series or DataFrame")
     
+    def scan_history(self, data: pd.DataFrame) -> List[Anomaly]:
+        """Sweep the full history of all metrics in one batch.
+        
+        Model-based detectors fit once per data version and reuse the cached
+        fit on later sweeps; statistical detectors score all metrics in a
+        single vectorized pass; ensemble members run concurrently.
+        
+        Args:
+            data: Frame with one row per date and one column per metric
+        """
+        start_time = time.time()
+        try:
+            if data.empty:
+                return []
+            anomalies = self.ensemble.detect_multivariate(
+                data, data_version=self._history_version(data))
+            return self._process_detected_anomalies(anomalies, data)
+        finally:
+            self._record_performance_metric('history_scan_time', time.time() - start_time)
+    
+    def _history_version(self, data: pd.DataFrame) -> Optional[str]:
+        """Registry version of the metrics and days ``data`` covers.
+        
+        Returns None, so detectors fingerprint the content instead, when no
+        registry is attached or the index holds no dates.
+        """
+        if self.data_versions is None or not isinstance(data.index, pd.DatetimeIndex):
+            return None
+        span = f"date_range:{data.index.min().date()}:{data.index.max().date()}"
+        dependencies = [f"metric:{column}" for column in data.columns] + [span]
+        return f"registry:{self.data_versions.version_for(dependencies)}"
+    
     def _detect_univariate(self, data: pd.Series, real_time: bool = False) -> List[Anomaly]:
         """Detect anomalies in univariate time series."""
         start_time = time.time()
@@ -159,7 +222,11 @@ class AnomalyDetectionSystem:
         """Run batch anomaly detection on univariate data."""
         # Use ensemble detector
         anomalies = self.ensemble.detect(data)
-        
+        return self._process_detected_anomalies(anomalies, data)
+    
+    def _process_detected_anomalies(self, anomalies: List[Anomaly],
+                                    data: Union[pd.Series, pd.DataFrame]) -> List[Anomaly]:
+        """Filter, explain, notify and record detections."""
         # Apply feedback-based filtering
         filtered_anomalies = self.feedback_processor.filter_anomalies(anomalies)
         
@@ -183,28 +250,15 @@ class AnomalyDetectionSystem:
         """Run batch anomaly detection on multivariate data."""
         # Use ensemble detector for multivariate data
         anomalies = self.ensemble.detect_multivariate(data)
-        
-        # Apply feedback-based filtering
-        filtered_anomalies = self.feedback_processor.filter_anomalies(anomalies)
-        
-        # Add explanations
-        for anomaly in filtered_anomalies:
-            self._enhance_anomaly_explanation(anomaly, data)
-        
-        # Create notifications
-        if self.config.notification_enabled:
-            for anomaly in filtered_anomalies:
-                notification = self.notification_manager.create_notification(anomaly)
-                if notification:
-                    print(f"Notification: {notification.title}")
-        
-        # Record detection result
-        self._record_detection_result(filtered_anomalies, len(data), DetectionMethod.ENSEMBLE)
-        
-        return filtered_anomalies
+        return self._process_detected_anomalies(anomalies, data)
     
     def _detect_real_time_univariate(self, data: pd.Series) -> List[Anomaly]:
         """Real-time anomaly detection for univariate data."""
+        if self.config.real_time_streaming:
+            # Online detectors only score points not seen on earlier ticks
+            anomalies = self.streaming_ensemble.detect(data)
+            return self._process_detected_anomalies(anomalies, data)
+        
         # For real-time, we typically process the latest point(s)
         # Use a sliding window approach
         window_size = min(100, len(data))  # Use last 100 points for context
@@ -399,6 +453,12 @@ class AnomalyDetectionSystem:
         if self.real_time_thread:
             self.real_time_thread.join()
     
+    def shutdown(self):
+        """Stop real-time detection and release the ensemble thread pools."""
+        self.stop_real_time_detection()
+        self.ensemble.shutdown()
+        self.streaming_ensemble.shutdown()
+    
     def _real_time_detection_loop(self, data_stream_callback: callable):
         """Real-time detection loop (runs in separate thread)."""
         while self.real_time_running:
@@ -520,8 +580,11 @@ class AnomalyDetectionSystem:
         self.config = new_config
         
         # Reinitialize detectors with new configuration
+        self.ensemble.shutdown()
+        self.streaming_ensemble.shutdown()
         self.detectors = self._initialize_detectors()
         self.ensemble = EnsembleDetector(self.detectors, self.config)
+        self._initialize_streaming()
         
         # Update feedback processor
         self.feedback_processor.config = new_config
\ No newline at end of file
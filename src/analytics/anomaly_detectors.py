@@ -2,9 +2,12 @@
 Anomaly detection algorithms implementation.
 """
 
+import threading
 import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from sklearn.ensemble import IsolationForest
@@ -15,6 +18,7 @@ from .anomaly_models import (
     Anomaly, DetectionMethod, Severity, DetectionResult,
     AnomalyDetectionError, InsufficientDataError
 )
+from ..utils.data_fingerprint import fingerprint_frame
 
 
 class BaseDetector(ABC):
@@ -40,6 +44,48 @@ class BaseDetector(ABC):
                 anomalies.extend(column_anomalies)
         return anomalies
     
+    def _numeric_columns(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Numeric columns with enough non-null points for detection."""
+        numeric = data.select_dtypes(include=[np.number])
+        return numeric.loc[:, numeric.count() >= 3]
+    
+    def _collect_frame_anomalies(self, values: pd.DataFrame, scores: pd.DataFrame,
+                                 mask: pd.DataFrame, severity_threshold: float,
+                                 threshold: float, context_fn) -> List[Anomaly]:
+        """Build anomalies for the flagged cells of a vectorized detection.
+        
+        Args:
+            values: Observed values (rows are timestamps, columns are metrics)
+            scores: Anomaly scores aligned with ``values``
+            mask: Boolean frame marking anomalous cells
+            severity_threshold: Threshold used to grade severity
+            threshold: Threshold recorded on each anomaly
+            context_fn: Called with the column name, returns the context dict
+        """
+        rows, cols = np.nonzero(mask.to_numpy(dtype=bool))
+        value_array = values.to_numpy()
+        score_array = scores.to_numpy()
+        contexts = {}
+        
+        anomalies = []
+        for row, col in zip(rows, cols):
+            idx = values.index[row]
+            column = values.columns[col]
+            if column not in contexts:
+                contexts[column] = context_fn(column)
+            score = float(score_array[row, col])
+            anomalies.append(Anomaly(
+                timestamp=idx if isinstance(idx, datetime) else datetime.now(),
+                metric=column,
+                value=value_array[row, col],
+                score=score,
+                method=self.method,
+                severity=self._calculate_severity(score, severity_threshold),
+                threshold=threshold,
+                context=dict(contexts[column])
+            ))
+        return anomalies
+    
     def _calculate_severity(self, score: float, threshold: float) -> Severity:
         """Calculate severity based on score and threshold."""
         abs_score = abs(score)
@@ -122,6 +168,22 @@ class ZScoreDetector(BaseDetector):
             )
         
         return anomalies
+    
+    def detect_batch(self, data: pd.DataFrame) -> List[Anomaly]:
+        """Detect anomalies in every numeric column in one vectorized pass."""
+        numeric = self._numeric_columns(data)
+        if numeric.empty:
+            return []
+        
+        mean = numeric.mean()
+        std = numeric.std()
+        z_scores = (numeric - mean) / std.where(std != 0)
+        mask = z_scores.abs() > self.threshold
+        
+        return self._collect_frame_anomalies(
+            numeric, z_scores, mask, self.threshold, self.threshold,
+            lambda column: {'mean': mean[column], 'std': std[column]}
+        )
 
 
 class ModifiedZScoreDetector(BaseDetector):
@@ -166,6 +228,22 @@ class ModifiedZScoreDetector(BaseDetector):
             ))
         
         return anomalies
+    
+    def detect_batch(self, data: pd.DataFrame) -> List[Anomaly]:
+        """Detect anomalies in every numeric column in one vectorized pass."""
+        numeric = self._numeric_columns(data)
+        if numeric.empty:
+            return []
+        
+        median = numeric.median()
+        mad = (numeric - median).abs().median()
+        modified_z_scores = 0.6745 * (numeric - median) / mad.where(mad != 0)
+        mask = modified_z_scores.abs() > self.threshold
+        
+        return self._collect_frame_anomalies(
+            numeric, modified_z_scores, mask, self.threshold, self.threshold,
+            lambda column: {'median': median[column], 'mad': mad[column]}
+        )
 
 
 class IQRDetector(BaseDetector):
@@ -234,74 +312,167 @@ class IQRDetector(BaseDetector):
             )
         
         return anomalies
+    
+    def detect_batch(self, data: pd.DataFrame) -> List[Anomaly]:
+        """Detect anomalies in every numeric column in one vectorized pass."""
+        numeric = self._numeric_columns(data)
+        if numeric.empty:
+            return []
+        
+        Q1 = numeric.quantile(0.25)
+        Q3 = numeric.quantile(0.75)
+        IQR = (Q3 - Q1).where(Q3 > Q1)
+        lower_bound = Q1 - self.multiplier * IQR
+        upper_bound = Q3 + self.multiplier * IQR
+        
+        below = (lower_bound - numeric) / IQR
+        above = (numeric - upper_bound) / IQR
+        mask = (below > 0) | (above > 0)
+        scores = below.where(below > 0, above)
+        
+        return self._collect_frame_anomalies(
+            numeric, scores, mask, 1.0, self.multiplier,
+            lambda column: {
+                'Q1': Q1[column],
+                'Q3': Q3[column],
+                'IQR': IQR[column],
+                'lower_bound': lower_bound[column],
+                'upper_bound': upper_bound[column]
+            }
+        )
+
+
+@dataclass
+class FittedModel:
+    """A fitted multivariate model and its scores for one data version."""
+    model: Any
+    scaler: StandardScaler
+    feature_names: List[str]
+    index: pd.Index
+    features: np.ndarray
+    predictions: np.ndarray
+    scores: np.ndarray
+
+
+class _ModelCacheMixin:
+    """Per-detector LRU cache of fitted models keyed by data version."""
+    
+    MODEL_CACHE_SIZE = 8
+    
+    def _init_model_cache(self):
+        self._model_cache: "OrderedDict[Tuple, FittedModel]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.model_cache_hits = 0
+        self.model_cache_misses = 0
+    
+    def _prepare_features(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Select numeric columns and drop incomplete rows."""
+        if data.empty:
+            raise InsufficientDataError("Input data is empty")
+        
+        numeric_columns = data.select_dtypes(include=[np.number]).columns
+        if len(numeric_columns) == 0:
+            return None
+        return data[numeric_columns].dropna()
+    
+    def _get_fitted(self, features: pd.DataFrame, data_version: Optional[str],
+                    params: Tuple) -> FittedModel:
+        """Return the cached fit for this data version, fitting on a miss."""
+        if data_version is None:
+            version = fingerprint_frame(features)
+        else:
+            # A caller's token only identifies data of the same size and span
+            version = (data_version, len(features), features.index[0], features.index[-1])
+        key = (version, tuple(features.columns), params)
+        
+        with self._cache_lock:
+            fitted = self._model_cache.get(key)
+            if fitted is not None:
+                self._model_cache.move_to_end(key)
+                self.model_cache_hits += 1
+                return fitted
+            self.model_cache_misses += 1
+        
+        fitted = self._fit(features)
+        
+        with self._cache_lock:
+            self._model_cache[key] = fitted
+            while len(self._model_cache) > self.MODEL_CACHE_SIZE:
+                self._model_cache.popitem(last=False)
+        return fitted
+    
+    def clear_model_cache(self):
+        """Drop all cached fitted models."""
+        with self._cache_lock:
+            self._model_cache.clear()
 
 
-class IsolationForestDetector(BaseDetector):
-    """Isolation Forest based anomaly detection for multivariate data."""
+class IsolationForestDetector(_ModelCacheMixin, BaseDetector):
+    """Isolation Forest based anomaly detection for multivariate data.
     
-    def __init__(self, contamination: float = 0.01, n_estimators: int = 100):
+    Fitted models are cached per data version, so repeated sweeps over
+    unchanged data reuse the fit and its scores.
+    """
+    
+    def __init__(self, contamination: float = 0.01, n_estimators: int = 100,
+                 n_jobs: Optional[int] = None):
         super().__init__("Isolation Forest Detector", DetectionMethod.ISOLATION_FOREST)
         self.contamination = contamination
         self.n_estimators = n_estimators
+        self.n_jobs = n_jobs
         self.model = None
         self.scaler = StandardScaler()
         self.feature_names = []
+        self._init_model_cache()
     
     def detect(self, data: pd.Series) -> List[Anomaly]:
         """For single series, convert to DataFrame and detect."""
         df = pd.DataFrame({data.name or 'value': data})
         return self.detect_multivariate(df)
     
-    def detect_multivariate(self, data: pd.DataFrame) -> List[Anomaly]:
-        """Detect multivariate anomalies using Isolation Forest."""
-        if data.empty:
-            raise InsufficientDataError("Input data is empty")
-        
-        # Prepare features
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) == 0:
+    def detect_multivariate(self, data: pd.DataFrame,
+                            data_version: Optional[str] = None) -> List[Anomaly]:
+        """Detect multivariate anomalies using Isolation Forest.
+        
+        Args:
+            data: Feature frame, one row per timestamp
+            data_version: Version token for ``data``; computed from its
+                content when not given
+        """
+        features = self._prepare_features(data)
+        if features is None:
             return []
-        
-        features = data[numeric_columns].dropna()
         if len(features) < 5:
             raise InsufficientDataError("Insufficient data for Isolation Forest")
         
-        self.feature_names = list(features.columns)
-        
-        # Scale features
-        scaled_features = self.scaler.fit_transform(features)
-        
-        # Fit and predict
-        self.model = IsolationForest(
-            contamination=self.contamination,
-            random_state=42,
-            n_estimators=self.n_estimators
+        fitted = self._get_fitted(
+            features, data_version, (self.contamination, self.n_estimators)
         )
-        
-        predictions = self.model.fit_predict(scaled_features)
-        scores = self.model.score_samples(scaled_features)
+        self.model = fitted.model
+        self.scaler = fitted.scaler
+        self.feature_names = fitted.feature_names
         
         # Extract anomalies
         anomalies = []
-        anomaly_indices = np.where(predictions == -1)[0]
+        anomaly_indices = np.where(fitted.predictions == -1)[0]
+        contributions = self._explain_isolation_batch(fitted, anomaly_indices)
         
-        for idx in anomaly_indices:
-            original_idx = features.index[idx]
-            
-            # Calculate feature contributions
-            feature_contributions = self._explain_isolation(features.iloc[idx])
+        for position, idx in enumerate(anomaly_indices):
+            original_idx = fitted.index[idx]
+            score = fitted.scores[idx]
             
             anomalies.append(Anomaly(
                 timestamp=original_idx if isinstance(original_idx, datetime) else datetime.now(),
                 metric='multivariate',
-                value=features.iloc[idx].to_dict(),
-                score=float(scores[idx]),
+                value=dict(zip(fitted.feature_names, fitted.features[idx].tolist())),
+                score=float(score),
                 method=self.method,
-                severity=self._score_to_severity(scores[idx]),
+                severity=self._score_to_severity(score),
                 threshold=self.contamination,
-                contributing_features=feature_contributions,
+                contributing_features=dict(zip(fitted.feature_names,
+                                               contributions[position].tolist())),
                 context={
-                    'n_features': len(self.feature_names),
+                    'n_features': len(fitted.feature_names),
                     'contamination': self.contamination
                 }
             ))
@@ -311,22 +482,35 @@ class IsolationForestDetector(BaseDetector):
         
         return anomalies
     
-    def _explain_isolation(self, sample: pd.Series) -> Dict[str, float]:
-        """Explain which features contributed to isolation."""
-        contributions = {}
+    def _fit(self, features: pd.DataFrame) -> FittedModel:
+        """Fit the forest and score every sample in one vectorized pass."""
+        scaler = StandardScaler()
+        scaled_features = scaler.fit_transform(features)
         
-        # Calculate simple feature deviations
-        for feature in sample.index:
-            if feature in self.feature_names:
-                # Get feature statistics from training data
-                feature_mean = self.scaler.mean_[self.feature_names.index(feature)]
-                feature_std = self.scaler.scale_[self.feature_names.index(feature)]
-                
-                # Calculate normalized deviation
-                deviation = abs(sample[feature] - feature_mean) / feature_std
-                contributions[feature] = float(deviation)
-        
-        return contributions
+        model = IsolationForest(
+            contamination=self.contamination,
+            random_state=42,
+            n_estimators=self.n_estimators,
+            n_jobs=self.n_jobs
+        )
+        predictions = model.fit_predict(scaled_features)
+        scores = model.score_samples(scaled_features)
+        
+        return FittedModel(
+            model=model,
+            scaler=scaler,
+            feature_names=list(features.columns),
+            index=features.index,
+            features=features.to_numpy(dtype=float),
+            predictions=predictions,
+            scores=scores
+        )
+    
+    def _explain_isolation_batch(self, fitted: FittedModel,
+                                 indices: np.ndarray) -> np.ndarray:
+        """Normalized feature deviations for many samples at once."""
+        samples = fitted.features[indices]
+        return np.abs(samples - fitted.scaler.mean_) / fitted.scaler.scale_
     
     def _score_to_severity(self, score: float) -> Severity:
         """Convert isolation score to severity."""
@@ -344,58 +528,61 @@ class IsolationForestDetector(BaseDetector):
             return Severity.LOW
 
 
-class LocalOutlierFactorDetector(BaseDetector):
-    """Local Outlier Factor based anomaly detection."""
+class LocalOutlierFactorDetector(_ModelCacheMixin, BaseDetector):
+    """Local Outlier Factor based anomaly detection.
+    
+    Fitted models are cached per data version, so repeated sweeps over
+    unchanged data reuse the fit and its outlier factors.
+    """
     
-    def __init__(self, n_neighbors: int = 20, contamination: float = 0.01):
+    def __init__(self, n_neighbors: int = 20, contamination: float = 0.01,
+                 n_jobs: Optional[int] = None):
         super().__init__("Local Outlier Factor Detector", DetectionMethod.LOF)
         self.n_neighbors = n_neighbors
         self.contamination = contamination
+        self.n_jobs = n_jobs
         self.model = None
         self.scaler = StandardScaler()
+        self._init_model_cache()
     
     def detect(self, data: pd.Series) -> List[Anomaly]:
         """For single series, convert to DataFrame and detect."""
         df = pd.DataFrame({data.name or 'value': data})
         return self.detect_multivariate(df)
     
-    def detect_multivariate(self, data: pd.DataFrame) -> List[Anomaly]:
-        """Detect anomalies using Local Outlier Factor."""
-        if data.empty:
-            raise InsufficientDataError("Input data is empty")
-        
-        # Prepare features
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) == 0:
+    def detect_multivariate(self, data: pd.DataFrame,
+                            data_version: Optional[str] = None) -> List[Anomaly]:
+        """Detect anomalies using Local Outlier Factor.
+        
+        Args:
+            data: Feature frame, one row per timestamp
+            data_version: Version token for ``data``; computed from its
+                content when not given
+        """
+        features = self._prepare_features(data)
+        if features is None:
             return []
-        
-        features = data[numeric_columns].dropna()
         if len(features) < max(5, self.n_neighbors + 1):
             raise InsufficientDataError(f"Insufficient data for LOF (need at least {self.n_neighbors + 1} points)")
         
-        # Scale features
-        scaled_features = self.scaler.fit_transform(features)
-        
-        # Fit and predict
-        self.model = LocalOutlierFactor(
-            n_neighbors=min(self.n_neighbors, len(features) - 1),
-            contamination=self.contamination
+        fitted = self._get_fitted(
+            features, data_version, (self.n_neighbors, self.contamination)
         )
-        
-        predictions = self.model.fit_predict(scaled_features)
-        scores = self.model.negative_outlier_factor_
+        self.model = fitted.model
+        self.scaler = fitted.scaler
+        scores = fitted.scores
         
         # Extract anomalies
         anomalies = []
-        anomaly_indices = np.where(predictions == -1)[0]
+        anomaly_indices = np.where(fitted.predictions == -1)[0]
         
         for idx in anomaly_indices:
-            original_idx = features.index[idx]
+            original_idx = fitted.index[idx]
             
             anomalies.append(Anomaly(
                 timestamp=original_idx if isinstance(original_idx, datetime) else datetime.now(),
                 metric='local_density',
-                value=features.iloc[idx].to_dict(),
+                value=dict(zip(fitted.feature_names, fitted.features[idx].tolist())),
                 score=float(abs(scores[idx])),
                 method=self.method,
                 severity=self._lof_score_to_severity(scores[idx]),
@@ -412,6 +599,28 @@ class LocalOutlierFactorDetector(BaseDetector):
         
         return anomalies
     
+    def _fit(self, features: pd.DataFrame) -> FittedModel:
+        """Fit LOF and keep the outlier factors of every sample."""
+        scaler = StandardScaler()
+        scaled_features = scaler.fit_transform(features)
+        
+        model = LocalOutlierFactor(
+            n_neighbors=min(self.n_neighbors, len(features) - 1),
+            contamination=self.contamination,
+            n_jobs=self.n_jobs
+        )
+        predictions = model.fit_predict(scaled_features)
+        
+        return FittedModel(
+            model=model,
+            scaler=scaler,
+            feature_names=list(features.columns),
+            index=features.index,
+            features=features.to_numpy(dtype=float),
+            predictions=predictions,
+            scores=model.negative_outlier_factor_
+        )
+    
     def _lof_score_to_severity(self, score: float) -> Severity:
         """Convert LOF score to severity."""
         # LOF scores are negative, with more negative indicating stronger outliers
@@ -138,6 +138,9 @@ class DetectionConfig:
     isolation_forest_contamination: float = 0.01
     lof_neighbors: int = 20
     lof_contamination: float = 0.01
+    # scikit-learn parallelism for IsolationForest/LOF; they already run
+    # concurrently in the ensemble's thread pool, so more jobs oversubscribe
+    ml_n_jobs: Optional[int] = 1
     
     # LSTM parameters (when available)
     lstm_sequence_length: int = 24
@@ -150,6 +153,8 @@ class DetectionConfig:
     # Real-time parameters
     real_time_enabled: bool = False
     real_time_latency_ms: int = 100
+    real_time_streaming: bool = False  # Opt in to O(1) online detectors in real-time mode
+    real_time_adaptive: bool = False  # Exponentially weighted z-score statistics
     
     # Notification parameters
     notification_enabled: bool = True
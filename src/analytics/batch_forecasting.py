@@ -0,0 +1,321 @@
+"""
+Batch multi-metric forecasting pipeline.
+
+Schedules CPU-heavy forecast fits (ARIMA weekly trends, Prophet seasonal
+forecasts) for many metrics across a process pool, streams results back as
+each metric finishes and records per-metric fit times so the slowest models
+can be identified.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_METHODS = ('weekly', 'arima', 'prophet')
+
+
+@dataclass
+class ForecastJob:
+    """A single metric forecast request."""
+    metric: str
+    data: pd.Series
+    horizon: int = 7
+    method: str = 'weekly'
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.method not in SUPPORTED_METHODS:
+            raise ValueError(
+                f"Unsupported forecast method '{self.method}', "
+                f"expected one of {SUPPORTED_METHODS}"
+            )
+        if self.horizon < 1:
+            raise ValueError("Forecast horizon must be at least one day")
+
+
+@dataclass
+class ForecastResult:
+    """Outcome of a single forecast job."""
+    metric: str
+    method: str
+    horizon: int
+    forecast: Any = None
+    fit_time_seconds: float = 0.0
+    error: Optional[str] = None
+    worker_pid: Optional[int] = None
+    completed_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the forecast completed without error."""
+        return self.error is None
+
+
+def _init_forecast_worker(memory_limit_mb: Optional[int]):
+    """Process pool initializer applying the per-worker memory limit.
+
+    Uses ``RLIMIT_AS`` where the platform supports it so a runaway fit raises
+    ``MemoryError`` inside the worker instead of exhausting the machine.
+    """
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+        limit = int(memory_limit_mb) * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ImportError, ValueError, OSError) as e:
+        logger.debug(f"Worker memory limit not applied: {e}")
+
+
+def _run_forecast_job(metric: str, data: pd.Series, horizon: int,
+                      method: str, options: Dict[str, Any]) -> ForecastResult:
+    """Fit and forecast a single metric. Runs inside a pool worker."""
+    start = time.perf_counter()
+    try:
+        if method == 'prophet':
+            from .seasonal_pattern_analyzer import ProphetForecaster
+            forecaster = ProphetForecaster(
+                yearly_seasonality=options.get('yearly_seasonality', True),
+                weekly_seasonality=options.get('weekly_seasonality', True)
+            )
+            forecast = forecaster.forecast(data, periods=horizon)
+        else:
+            from ..predictive_analytics import PredictiveAnalytics
+            analytics = PredictiveAnalytics()
+            if method == 'weekly':
+                # Report failed fits on the result instead of a flat fallback
+                forecast = analytics.forecast_weekly_trend(metric, data, periods=horizon,
+                                                           fallback=False)
+            else:
+                forecast = analytics.models['arima'].forecast(data, periods=horizon)
+        error = None
+    except MemoryError:
+        forecast = None
+        error = "Memory limit exceeded during fit"
+    except Exception as e:
+        forecast = None
+        error = str(e)
+
+    return ForecastResult(
+        metric=metric,
+        method=method,
+        horizon=horizon,
+        forecast=forecast,
+        fit_time_seconds=time.perf_counter() - start,
+        error=error,
+        worker_pid=os.getpid()
+    )
+
+
+class BatchForecastPipeline:
+    """
+    Runs forecasts for many metrics in parallel.
+
+    Features:
+    - Process pool execution so fits do not contend for the GIL
+    - Optional per-worker memory limit and bounded number of in-flight jobs
+    - Recovery from dead workers, failing only the job that killed its worker
+    - Worker recycling to release memory held by fitted models
+    - Streaming results in completion order
+    - Per-metric fit time tracking for identifying slow models
+
+    Setting ``max_workers=0`` runs every job in the calling process, which is
+    useful for frozen builds where spawning workers is not possible.
+    """
+
+    DEFAULT_TASKS_PER_CHILD = 8
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 memory_limit_mb: Optional[int] = None,
+                 max_in_flight: Optional[int] = None,
+                 tasks_per_child: Optional[int] = DEFAULT_TASKS_PER_CHILD):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_workers: Worker processes (None for cpu_count - 1, 0 for in-process)
+            memory_limit_mb: Address space limit per worker, or None for no
+                limit. This caps virtual memory rather than RSS, and numpy's
+                thread arenas alone can reserve gigabytes, so size it well
+                above the memory a fit actually uses
+            max_in_flight: Jobs submitted ahead of completion (None for 2x workers)
+            tasks_per_child: Jobs a worker runs before being replaced
+        """
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)
+        self.max_workers = max_workers
+        self.memory_limit_mb = memory_limit_mb
+        self.max_in_flight = max_in_flight or max(1, max_workers * 2)
+        self.tasks_per_child = tasks_per_child
+
+        self._fit_times: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def forecast_iter(self, jobs: Iterable[ForecastJob]) -> Iterator[ForecastResult]:
+        """
+        Run forecast jobs and yield results as each metric finishes.
+
+        Args:
+            jobs: Forecast jobs to run
+
+        Yields:
+            ForecastResult in completion order
+        """
+        if self.max_workers == 0:
+            for job in jobs:
+                result = _run_forecast_job(job.metric, job.data, job.horizon,
+                                           job.method, job.options)
+                self._record(result)
+                yield result
+            return
+
+        pending_jobs = deque(jobs)
+        # Jobs in flight when a worker died; rerun one at a time to find the culprit
+        suspects: deque = deque()
+        in_flight: Dict[Future, ForecastJob] = {}
+        executor = self._create_executor()
+        try:
+            while pending_jobs or suspects or in_flight:
+                pool_broken = False
+                queue = suspects or pending_jobs
+                limit = 1 if suspects else self.max_in_flight
+                while queue and len(in_flight) < limit:
+                    job = queue.popleft()
+                    try:
+                        in_flight[self._submit(executor, job)] = job
+                    except BrokenProcessPool:
+                        queue.appendleft(job)
+                        pool_broken = True
+                        break
+
+                done = wait(in_flight, return_when=FIRST_COMPLETED)[0] if in_flight else set()
+                broken = []
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken.append(job)
+                        continue
+                    except Exception as e:
+                        logger.error(f"Forecast worker failed for {job.metric}: {e}")
+                        result = self._failed(job, str(e) or type(e).__name__)
+                    self._record(result)
+                    yield result
+
+                if broken or pool_broken:
+                    # The pool cannot run further jobs once a worker has died
+                    broken.extend(in_flight.values())
+                    in_flight.clear()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = self._create_executor()
+                    if len(broken) == 1:
+                        job = broken[0]
+                        logger.error(f"Forecast worker died running {job.metric}")
+                        result = self._failed(job, "Worker process died during fit "
+                                                   "(e.g. killed for exceeding its memory limit)")
+                        self._record(result)
+                        yield result
+                    else:
+                        suspects.extend(broken)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def forecast_all(self, jobs: Iterable[ForecastJob],
+                     callback: Optional[Callable[[ForecastResult], None]] = None
+                     ) -> Dict[str, ForecastResult]:
+        """
+        Run forecast jobs to completion.
+
+        Args:
+            jobs: Forecast jobs to run
+            callback: Called with each result as soon as it is available
+
+        Returns:
+            Results keyed by metric; later jobs for a metric replace earlier ones
+        """
+        results: Dict[str, ForecastResult] = {}
+        for result in self.forecast_iter(jobs):
+            results[result.metric] = result
+            if callback:
+                try:
+                    callback(result)
+                except Exception as e:
+                    logger.error(f"Forecast callback failed for {result.metric}: {e}")
+        return results
+
+    def get_fit_times(self) -> Dict[str, Dict[str, float]]:
+        """Get fit time statistics per metric."""
+        with self._lock:
+            return {
+                metric: {
+                    'count': len(times),
+                    'last_seconds': times[-1],
+                    'mean_seconds': sum(times) / len(times),
+                    'max_seconds': max(times)
+                }
+                for metric, times in self._fit_times.items()
+            }
+
+    def get_slowest_metrics(self, n: int = 5) -> List[tuple]:
+        """Get the ``n`` metrics with the highest mean fit time.
+
+        Returns:
+            List of (metric, mean_seconds) tuples, slowest first
+        """
+        stats = self.get_fit_times()
+        ranked = sorted(stats.items(), key=lambda item: item[1]['mean_seconds'],
+                        reverse=True)
+        return [(metric, s['mean_seconds']) for metric, s in ranked[:n]]
+
+    def _record(self, result: ForecastResult):
+        """Record fit time for a finished job."""
+        with self._lock:
+            self._fit_times.setdefault(result.metric, []).append(result.fit_time_seconds)
+        if result.error:
+            logger.warning(f"Forecast for {result.metric} ({result.method}) failed: "
+                           f"{result.error}")
+        else:
+            logger.debug(f"Forecast for {result.metric} ({result.method}) took "
+                         f"{result.fit_time_seconds:.2f}s")
+
+    @staticmethod
+    def _submit(executor: ProcessPoolExecutor, job: ForecastJob) -> Future:
+        return executor.submit(_run_forecast_job, job.metric, job.data,
+                               job.horizon, job.method, job.options)
+
+    @staticmethod
+    def _failed(job: ForecastJob, error: str) -> ForecastResult:
+        return ForecastResult(metric=job.metric, method=job.method,
+                              horizon=job.horizon, error=error)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool, recycling workers when supported."""
+        kwargs = {
+            'max_workers': self.max_workers,
+            'initializer': _init_forecast_worker,
+            'initargs': (self.memory_limit_mb,)
+        }
+        if self.tasks_per_child:
+            try:
+                return ProcessPoolExecutor(max_tasks_per_child=self.tasks_per_child,
+                                           **kwargs)
+            except TypeError:
+                # Python < 3.11
+                pass
+        return ProcessPoolExecutor(**kwargs)
@@ -242,6 +242,9 @@ def cached_analytics_call(key: str, compute_fn: Callable[[], Any],
     
     cache_manager = get_cache_manager()
     
+    # Key results by the version of the data they depend on
+    key = cache_manager.versioned_key(key, dependencies)
+    
     # Record access for refresh monitoring
     if enable_refresh:
         refresh_monitor = get_refresh_monitor()
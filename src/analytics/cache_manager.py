@@ -16,9 +16,11 @@ Key Features:
 - TTL-based expiration with configurable timeouts
 - Memory usage monitoring and automatic eviction
 - Dependency-based cache invalidation
+- Data-version keys with indexed (metric, day range) invalidation
 - Thread-safe operations with proper locking
 - Comprehensive performance metrics and monitoring
 - Compressed storage for efficient disk usage
+- Columnar serialization of DataFrames and arrays (see cache_serialization)
 
 Example:
     Basic caching usage:
@@ -66,22 +68,61 @@ Note:
 
 import hashlib
 import json
-import pickle
+import os
 import sqlite3
 import threading
 import time
+import weakref
+from concurrent.futures import Future
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union, Tuple
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import tempfile
 import gzip
+import mmap
+
+import pandas as pd
+
+from .cache_serialization import SerializerRegistry, default_registry
+from .cache_sizing import estimate_size
+from .data_versions import (
+    DataVersionRegistry, DependencyIndex, normalize_day, parse_dependencies
+)
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# L3 compression codecs: name -> (compress, decompress)
+COMPRESSION_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'gzip': (lambda data: gzip.compress(data, compresslevel=3), gzip.decompress),
+    # Uncompressed entries can be memory-mapped (see DiskCache.mmap_min_mb)
+    'none': (bytes, bytes),
+}
+if ZSTD_AVAILABLE:
+    COMPRESSION_CODECS['zstd'] = (
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data)
+    )
+if LZ4_AVAILABLE:
+    COMPRESSION_CODECS['lz4'] = (lz4.frame.compress, lz4.frame.decompress)
+
+DEFAULT_COMPRESSION_CODEC = 'zstd' if ZSTD_AVAILABLE else 'lz4' if LZ4_AVAILABLE else 'gzip'
+
 
 @dataclass
 class CacheMetrics:
@@ -96,6 +137,13 @@ class CacheMetrics:
     cache_sets: int = 0
     invalidations: int = 0
     memory_usage_mb: float = 0.0
+    # Contention: computations run, misses that joined an in-flight
+    # computation instead of starting their own, and time they waited
+    computations: int = 0
+    coalesced_requests: int = 0
+    coalesced_wait_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    max_in_flight: int = 0
     
     @property
     def l1_hit_rate(self) -> float:
@@ -120,6 +168,12 @@ class CacheMetrics:
         """Calculate overall cache hit rate."""
         total_hits = self.l1_hits + self.l2_hits + self.l3_hits
         return total_hits / self.total_requests if self.total_requests > 0 else 0.0
+    
+    @property
+    def coalesce_rate(self) -> float:
+        """Fraction of computing misses served by another request's computation."""
+        total = self.computations + self.coalesced_requests
+        return self.coalesced_requests / total if total > 0 else 0.0
 
 
 @dataclass
@@ -151,56 +205,173 @@ class CacheEntry:
         return (datetime.now() - self.created_at).total_seconds()
 
 
+class FrequencySketch:
+    """Count-min sketch of recent key access frequencies for TinyLFU admission.
+    
+    Counters saturate at 15 and are halved every ``sample_size`` increments,
+    so estimates reflect recent popularity rather than all-time counts.
+    """
+    
+    MAX_COUNT = 15
+    
+    def __init__(self, width: int = 4096, depth: int = 4, sample_size: Optional[int] = None):
+        self.width = width
+        self.depth = depth
+        self.sample_size = sample_size or 10 * width
+        self._rows = [bytearray(width) for _ in range(depth)]
+        self._additions = 0
+    
+    def _slots(self, key: str):
+        for seed, row in enumerate(self._rows):
+            yield row, hash((seed, key)) % self.width
+    
+    def increment(self, key: str) -> None:
+        """Record one access to ``key``."""
+        for row, slot in self._slots(key):
+            if row[slot] < self.MAX_COUNT:
+                row[slot] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+    
+    def estimate(self, key: str) -> int:
+        """Estimated recent access count of ``key``."""
+        return min(row[slot] for row, slot in self._slots(key))
+    
+    def _age(self) -> None:
+        """Halve all counters."""
+        for i, row in enumerate(self._rows):
+            self._rows[i] = bytearray(count >> 1 for count in row)
+        self._additions //= 2
+
+
 class LRUCache:
-    """Thread-safe LRU cache with size and TTL limits."""
+    """Thread-safe in-memory cache with size and TTL limits.
+    
+    Values are sized structurally (see ``cache_sizing``) instead of being
+    pickled. Eviction policies:
     
-    def __init__(self, maxsize: int = 1000, max_memory_mb: float = 500.0, default_ttl: int = 900):
+    - ``'lru'``: plain least-recently-used
+    - ``'slru'``: segmented LRU; new entries enter a probationary segment and
+      move to a protected segment on their second hit, so one-off scans
+      cannot flush the working set (default)
+    - ``'tinylfu'``: segmented LRU that also refuses a new entry when it is
+      accessed less often than the entry it would evict
+    
+    Values of at least ``large_object_mb`` are kept in a separate LRU segment
+    with its own ``large_memory_mb`` budget (a quarter of the total by
+    default), so large DataFrames can be cached without pushing out many
+    small results.
+    """
+    
+    EVICTION_POLICIES = ('lru', 'slru', 'tinylfu')
+    
+    def __init__(self, maxsize: int = 1000, max_memory_mb: float = 500.0, default_ttl: int = 900,
+                 eviction_policy: str = 'slru', protected_ratio: float = 0.8,
+                 large_object_mb: Optional[float] = 1.0,
+                 large_memory_mb: Optional[float] = None,
+                 deep_sizing: bool = True):
+        if eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"eviction_policy must be one of {self.EVICTION_POLICIES}")
+        if not 0 < protected_ratio < 1:
+            raise ValueError("protected_ratio must be between 0 and 1")
+        
         self.maxsize = maxsize
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.default_ttl = default_ttl  # 15 minutes
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.eviction_policy = eviction_policy
+        self.protected_ratio = protected_ratio
+        self.deep_sizing = deep_sizing
+        
+        if large_object_mb is None:
+            self.large_object_bytes = None
+            self.large_memory_bytes = 0
+        else:
+            self.large_object_bytes = large_object_mb * 1024 * 1024
+            self.large_memory_bytes = (large_memory_mb * 1024 * 1024 if large_memory_mb is not None
+                                       else self.max_memory_bytes / 4)
+        
+        self._cache: Dict[str, CacheEntry] = {}
+        self._probation: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._protected: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._large: OrderedDict[str, CacheEntry] = OrderedDict()
         self._lock = threading.RLock()
         self._current_memory = 0
+        self._protected_memory = 0
+        self._large_memory = 0
+        self._dependency_index = DependencyIndex()
+        self._sketch = FrequencySketch(width=max(64, 1 << (4 * maxsize - 1).bit_length())) \
+            if eviction_policy == 'tinylfu' else None
+        self.evictions = 0
+        self.rejections = 0
+    
+    @property
+    def _small_memory_budget(self) -> float:
+        return self.max_memory_bytes - self.large_memory_bytes
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         with self._lock:
-            if key not in self._cache:
-                return None
+            if self._sketch is not None:
+                self._sketch.increment(key)
             
-            entry = self._cache[key]
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
             
             # Check expiration
             if entry.is_expired:
-                del self._cache[key]
-                self._current_memory -= entry.size_bytes
+                self._remove(key)
                 return None
             
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
+            self._touch(key, entry)
             entry.last_accessed = datetime.now()
             entry.access_count += 1
             
             return entry.value
     
+    def _touch(self, key: str, entry: CacheEntry) -> None:
+        """Mark ``key`` as recently used, promoting probationary entries."""
+        if key in self._large:
+            self._large.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif self.eviction_policy == 'lru':
+            self._probation.move_to_end(key)
+        else:
+            del self._probation[key]
+            self._protected[key] = entry
+            self._protected_memory += entry.size_bytes
+            
+            # Demote the coldest protected entries back to probation
+            max_entries = int(self.maxsize * self.protected_ratio)
+            max_bytes = self._small_memory_budget * self.protected_ratio
+            while len(self._protected) > 1 and (len(self._protected) > max_entries or
+                                                self._protected_memory > max_bytes):
+                demoted_key, demoted = self._protected.popitem(last=False)
+                self._protected_memory -= demoted.size_bytes
+                self._probation[demoted_key] = demoted
+    
     def set(self, key: str, value: Any, ttl: Optional[int] = None, dependencies: List[str] = None) -> None:
         """Set value in cache."""
         with self._lock:
             # Calculate size
             try:
-                size_bytes = len(pickle.dumps(value))
-                if size_bytes > 1024 * 1024:  # Skip objects > 1MB
-                    logger.warning(f"Skipping cache entry {key}: too large ({size_bytes} bytes)")
-                    return
+                size_bytes = estimate_size(value, deep=self.deep_sizing)
             except Exception as e:
                 logger.warning(f"Could not calculate size for cache entry {key}: {e}")
                 return
             
             # Remove existing entry if present
             if key in self._cache:
-                old_entry = self._cache[key]
-                self._current_memory -= old_entry.size_bytes
-                del self._cache[key]
+                self._remove(key)
+            
+            large = self.large_object_bytes is not None and size_bytes >= self.large_object_bytes
+            budget = self.large_memory_bytes if large else self._small_memory_budget
+            if size_bytes > budget:
+                logger.warning(f"Skipping cache entry {key}: too large ({size_bytes} bytes)")
+                self.rejections += 1
+                return
             
             # Create new entry
             entry = CacheEntry(
@@ -214,37 +385,79 @@ class LRUCache:
                 ttl_seconds=ttl or self.default_ttl
             )
             
-            # Check memory limits
-            while (self._current_memory + entry.size_bytes > self.max_memory_bytes and 
-                   len(self._cache) > 0):
-                self._evict_lru()
-            
-            # Check size limits
-            while len(self._cache) >= self.maxsize:
-                self._evict_lru()
+            if large:
+                while self._large and self._large_memory + size_bytes > budget:
+                    self._remove(next(iter(self._large)))
+                    self.evictions += 1
+                while len(self._cache) >= self.maxsize and self._evict():
+                    pass
+                self._large[key] = entry
+                self._large_memory += size_bytes
+            else:
+                def over_capacity():
+                    small_memory = self._current_memory - self._large_memory
+                    return (small_memory + size_bytes > budget or
+                            len(self._cache) >= self.maxsize)
+                
+                if self._sketch is not None and over_capacity() and not self._admit(key):
+                    self.rejections += 1
+                    return
+                
+                # Check memory and size limits
+                while over_capacity() and self._evict():
+                    pass
+                self._probation[key] = entry
             
             # Add new entry
             self._cache[key] = entry
             self._current_memory += entry.size_bytes
+            self._dependency_index.add(key, entry.dependencies)
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entry."""
-        if not self._cache:
-            return
-        
-        # Remove oldest (least recently used)
-        key, entry = self._cache.popitem(last=False)
+    def _admit(self, key: str) -> bool:
+        """TinyLFU admission: admit only if more popular than the next victim."""
+        segment = self._probation or self._protected
+        if not segment:
+            return True
+        victim = next(iter(segment))
+        return self._sketch.estimate(key) > self._sketch.estimate(victim)
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its dependency index records."""
+        entry = self._cache.pop(key)
         self._current_memory -= entry.size_bytes
-        logger.debug(f"Evicted LRU cache entry: {key}")
+        if self._probation.pop(key, None) is None:
+            if self._protected.pop(key, None) is not None:
+                self._protected_memory -= entry.size_bytes
+            elif self._large.pop(key, None) is not None:
+                self._large_memory -= entry.size_bytes
+        self._dependency_index.remove(key)
+    
+    def _evict(self) -> bool:
+        """Evict one entry, probationary first; returns False when empty."""
+        for segment in (self._probation, self._protected, self._large):
+            if segment:
+                key = next(iter(segment))
+                self._remove(key)
+                self.evictions += 1
+                logger.debug(f"Evicted cache entry: {key}")
+                return True
+        return False
     
     def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate entries matching pattern."""
         with self._lock:
             keys_to_remove = [key for key in self._cache.keys() if pattern in key]
             for key in keys_to_remove:
-                entry = self._cache[key]
-                self._current_memory -= entry.size_bytes
-                del self._cache[key]
+                self._remove(key)
+            return len(keys_to_remove)
+    
+    def invalidate_range(self, metric: Optional[str], start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> int:
+        """Invalidate entries depending on ``metric`` data between two days."""
+        with self._lock:
+            keys_to_remove = self._dependency_index.matching(metric, start_date, end_date)
+            for key in keys_to_remove:
+                self._remove(key)
             return len(keys_to_remove)
     
     def invalidate_dependencies(self, dependency: str) -> int:
@@ -256,9 +469,7 @@ class LRUCache:
                     keys_to_remove.append(key)
             
             for key in keys_to_remove:
-                entry = self._cache[key]
-                self._current_memory -= entry.size_bytes
-                del self._cache[key]
+                self._remove(key)
             
             return len(keys_to_remove)
     
@@ -266,7 +477,13 @@ class LRUCache:
         """Clear all entries."""
         with self._lock:
             self._cache.clear()
+            self._probation.clear()
+            self._protected.clear()
+            self._large.clear()
+            self._dependency_index.clear()
             self._current_memory = 0
+            self._protected_memory = 0
+            self._large_memory = 0
     
     @property
     def memory_usage_mb(self) -> float:
@@ -279,15 +496,132 @@ class LRUCache:
         return len(self._cache)
 
 
+class OperationLatency:
+    """Rolling latency statistics for one cache operation."""
+    
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._recent = deque(maxlen=window)
+    
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._recent.append(seconds)
+    
+    def summary(self) -> Dict[str, float]:
+        """Mean, recent p50/p95 and max latency in milliseconds."""
+        recent = sorted(self._recent)
+        
+        def percentile(q):
+            return recent[min(len(recent) - 1, int(q * len(recent)))] * 1000 if recent else 0.0
+        
+        return {
+            'count': self.count,
+            'mean_ms': self.total_seconds / self.count * 1000 if self.count else 0.0,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'max_ms': self.max_seconds * 1000
+        }
+
+
+class _ThreadConnection:
+    """Thread-local handle whose collection at thread exit closes the connection."""
+    
+    __slots__ = ('conn', 'generation', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.generation = generation
+
+
+def _release_connection(connections: Dict[int, sqlite3.Connection],
+                        lock: threading.Lock, conn: sqlite3.Connection) -> None:
+    """Forget and close a connection whose thread has exited."""
+    with lock:
+        connections.pop(id(conn), None)
+    try:
+        conn.close()
+    except Exception as e:
+        logger.debug(f"Error closing cache connection: {e}")
+
+
 class SQLiteCache:
-    """SQLite-based cache for computed aggregates."""
+    """SQLite-based cache for computed aggregates.
+    
+    Each thread keeps one long-lived WAL connection instead of connecting
+    per operation; it is closed when the thread exits. Hits do not write:
+    access statistics are buffered and applied in batches of
+    ``access_flush_size`` (or every ``access_flush_seconds``), and bulk ``get_many``/``set_many`` run in a
+    single statement or transaction. Per-operation latency is available from
+    ``get_latency_stats``. Values are encoded by a ``SerializerRegistry``
+    (columnar for DataFrames and arrays, pickle otherwise).
+    """
     
-    def __init__(self, db_path: str = "analytics_cache_temp.db"):
+    # SQLite's default limit on host parameters is 999
+    MAX_BATCH_PARAMS = 900
+    
+    def __init__(self, db_path: str = "analytics_cache_temp.db",
+                 access_flush_size: int = 256,
+                 access_flush_seconds: float = 5.0,
+                 serializers: Optional[SerializerRegistry] = None):
         self.db_path = Path(db_path)
-        self._connection = None
+        self.serializers = serializers or default_registry
         self._corrupted = False
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._generation = 0
+        
+        self.access_flush_size = access_flush_size
+        self.access_flush_seconds = access_flush_seconds
+        self._pending_access: Dict[str, int] = {}
+        self._access_lock = threading.Lock()
+        self._last_access_flush = time.monotonic()
+        self._latency: Dict[str, OperationLatency] = {
+            op: OperationLatency() for op in ('get', 'get_many', 'set', 'set_many')
+        }
+        
         self._init_db_with_recovery()
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's persistent connection, opening it if needed."""
+        handle = getattr(self._local, 'handle', None)
+        if handle is None or handle.generation != self._generation:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            handle = _ThreadConnection(conn, self._generation)
+            # Thread-local values are released when their thread exits, so
+            # worker threads do not leave connections open behind them
+            weakref.finalize(handle, _release_connection, self._connections,
+                             self._connections_lock, conn)
+            self._local.handle = handle
+            with self._connections_lock:
+                self._connections[id(conn)] = conn
+        return handle.conn
+    
+    def _close_connections(self) -> None:
+        """Close every thread's connection; threads reconnect on next use."""
+        with self._connections_lock:
+            self._generation += 1
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing cache connection: {e}")
+    
+    def _record_latency(self, operation: str, start: float) -> None:
+        self._latency[operation].record(time.perf_counter() - start)
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary per operation (milliseconds)."""
+        return {op: stats.summary() for op, stats in self._latency.items()}
+    
     def _check_database_integrity(self) -> bool:
         """Check if the SQLite database is corrupted."""
         try:
@@ -311,6 +645,7 @@ class SQLiteCache:
     def _recover_corrupted_database(self) -> None:
         """Recover from a corrupted database by recreating it."""
         logger.warning(f"Attempting to recover corrupted cache database: {self.db_path}")
+        self._close_connections()
         
         # Backup the corrupted file
         if self.db_path.exists():
@@ -374,6 +709,32 @@ class SQLiteCache:
                     CREATE INDEX IF NOT EXISTS idx_created_at ON cache_entries(created_at)
                 """)
                 
+                # Dependency spans of each entry, so data changes can find the
+                # affected entries through an index instead of matching keys
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS cache_dependencies (
+                        key TEXT NOT NULL,
+                        metric TEXT,
+                        start_date TEXT,
+                        end_date TEXT
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cache_dependencies_metric
+                    ON cache_dependencies(metric, start_date)
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cache_dependencies_key
+                    ON cache_dependencies(key)
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_cache_entries_delete
+                    AFTER DELETE ON cache_entries
+                    BEGIN
+                        DELETE FROM cache_dependencies WHERE key = OLD.key;
+                    END
+                """)
+                
                 # Enable WAL mode for better concurrent performance
                 conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute("PRAGMA synchronous=NORMAL")
@@ -397,28 +758,21 @@ class SQLiteCache:
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from SQLite cache."""
+        start = time.perf_counter()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("""
-                    SELECT value, expires_at FROM cache_entries 
-                    WHERE key = ? AND (expires_at IS NULL OR expires_at > datetime('now'))
-                """, (key,))
-                
-                row = cursor.fetchone()
-                if row is None:
-                    return None
-                
-                # Update access statistics
-                conn.execute("""
-                    UPDATE cache_entries 
-                    SET last_accessed = datetime('now'), access_count = access_count + 1
-                    WHERE key = ?
-                """, (key,))
-                
-                # Deserialize value
-                value = pickle.loads(row['value'])
-                return value
+            row = self._get_connection().execute("""
+                SELECT value FROM cache_entries 
+                WHERE key = ? AND (expires_at IS NULL OR expires_at > datetime('now'))
+            """, (key,)).fetchone()
+            
+            if row is None:
+                return None
+            
+            # Access statistics are written in batches, keeping hits read-only
+            self._record_access([key])
+            
+            # Deserialize value
+            return self.serializers.loads(row[0])
                 
         except sqlite3.DatabaseError as e:
             if "malformed" in str(e).lower() or "corrupt" in str(e).lower():
@@ -432,32 +786,78 @@ class SQLiteCache:
         except Exception as e:
             logger.error(f"Error getting from SQLite cache: {e}")
             return None
+        finally:
+            self._record_latency('get', start)
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values with one query per batch of keys.
+        
+        Returns:
+            Mapping of the keys that were found (and not expired) to values
+        """
+        start = time.perf_counter()
+        results: Dict[str, Any] = {}
+        try:
+            conn = self._get_connection()
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), self.MAX_BATCH_PARAMS):
+                batch = unique_keys[i:i + self.MAX_BATCH_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"""
+                    SELECT key, value FROM cache_entries
+                    WHERE key IN ({placeholders})
+                      AND (expires_at IS NULL OR expires_at > datetime('now'))
+                """, batch).fetchall()
+                for key, blob in rows:
+                    try:
+                        results[key] = self.serializers.loads(blob)
+                    except Exception as e:
+                        logger.warning(f"Could not deserialize cache entry {key}: {e}")
+            if results:
+                self._record_access(results.keys())
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Database error in SQLite get_many: {e}")
+        finally:
+            self._record_latency('get_many', start)
+        return results
+    
+    def _record_access(self, keys) -> None:
+        """Buffer access statistics, flushing when the batch is full or stale."""
+        with self._access_lock:
+            for key in keys:
+                self._pending_access[key] = self._pending_access.get(key, 0) + 1
+            due = (len(self._pending_access) >= self.access_flush_size or
+                   time.monotonic() - self._last_access_flush >= self.access_flush_seconds)
+        if due:
+            self.flush_access_stats()
+    
+    def flush_access_stats(self) -> int:
+        """Write buffered access statistics; returns the number of keys updated."""
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_access_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            with self._get_connection() as conn:
+                conn.executemany("""
+                    UPDATE cache_entries 
+                    SET last_accessed = datetime('now'), access_count = access_count + ?
+                    WHERE key = ?
+                """, [(count, key) for key, count in pending.items()])
+        except sqlite3.Error as e:
+            logger.debug(f"Could not flush cache access statistics: {e}")
+        return len(pending)
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None, dependencies: List[str] = None) -> None:
         """Set value in SQLite cache."""
+        start = time.perf_counter()
         try:
             # Serialize value
-            value_blob = pickle.dumps(value)
-            size_bytes = len(value_blob)
+            value_blob = self.serializers.dumps(value)
             
-            # Calculate expiration using SQLite datetime functions for consistency
-            dependencies_json = json.dumps(dependencies or [])
-            
-            with sqlite3.connect(self.db_path) as conn:
-                if ttl:
-                    # Use SQLite datetime arithmetic for consistent timing
-                    conn.execute("""
-                        INSERT OR REPLACE INTO cache_entries 
-                        (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
-                        VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, datetime('now', '+' || ? || ' seconds'), NULL)
-                    """, (key, value_blob, size_bytes, dependencies_json, ttl, ttl))
-                else:
-                    # No expiration
-                    conn.execute("""
-                        INSERT OR REPLACE INTO cache_entries 
-                        (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
-                        VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, NULL, NULL)
-                    """, (key, value_blob, size_bytes, dependencies_json, ttl))
+            with self._get_connection() as conn:
+                self._write_entry(conn, key, value_blob, ttl, dependencies)
                 
         except sqlite3.DatabaseError as e:
             if "malformed" in str(e).lower() or "corrupt" in str(e).lower():
@@ -467,19 +867,8 @@ class SQLiteCache:
                 self._init_db()
                 try:
                     # Retry the operation once after recovery
-                    with sqlite3.connect(self.db_path) as conn:
-                        if ttl:
-                            conn.execute("""
-                                INSERT OR REPLACE INTO cache_entries 
-                                (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
-                                VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, datetime('now', '+' || ? || ' seconds'), NULL)
-                            """, (key, value_blob, size_bytes, dependencies_json, ttl, ttl))
-                        else:
-                            conn.execute("""
-                                INSERT OR REPLACE INTO cache_entries 
-                                (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
-                                VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, NULL, NULL)
-                            """, (key, value_blob, size_bytes, dependencies_json, ttl))
+                    with self._get_connection() as conn:
+                        self._write_entry(conn, key, value_blob, ttl, dependencies)
                     logger.info("Successfully wrote to cache after recovery")
                 except Exception as retry_error:
                     logger.error(f"Failed to write to cache even after recovery: {retry_error}")
@@ -487,11 +876,75 @@ class SQLiteCache:
                 logger.error(f"Database error setting SQLite cache: {e}")
         except Exception as e:
             logger.error(f"Error setting SQLite cache: {e}")
+        finally:
+            self._record_latency('set', start)
+    
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None,
+                 dependencies: Optional[Dict[str, List[str]]] = None) -> int:
+        """Store several values in one transaction.
+        
+        Args:
+            items: Mapping of key to value
+            ttl: Time to live in seconds for every entry
+            dependencies: Optional mapping of key to its dependency list
+        
+        Returns:
+            Number of entries written
+        """
+        start = time.perf_counter()
+        dependencies = dependencies or {}
+        written = 0
+        try:
+            with self._get_connection() as conn:
+                for key, value in items.items():
+                    try:
+                        value_blob = self.serializers.dumps(value)
+                    except Exception as e:
+                        logger.warning(f"Could not serialize cache entry {key}: {e}")
+                        continue
+                    self._write_entry(conn, key, value_blob, ttl, dependencies.get(key))
+                    written += 1
+        except sqlite3.Error as e:
+            logger.error(f"Database error in SQLite set_many: {e}")
+            written = 0
+        finally:
+            self._record_latency('set_many', start)
+        return written
+    
+    def _write_entry(self, conn: sqlite3.Connection, key: str, value_blob: bytes,
+                     ttl: Optional[int], dependencies: Optional[List[str]]) -> None:
+        """Insert or replace an entry together with its dependency spans."""
+        size_bytes = len(value_blob)
+        dependencies_json = json.dumps(dependencies or [])
+        
+        if ttl:
+            # Use SQLite datetime arithmetic for consistent timing
+            conn.execute("""
+                INSERT OR REPLACE INTO cache_entries 
+                (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
+                VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, datetime('now', '+' || ? || ' seconds'), NULL)
+            """, (key, value_blob, size_bytes, dependencies_json, ttl, ttl))
+        else:
+            # No expiration
+            conn.execute("""
+                INSERT OR REPLACE INTO cache_entries 
+                (key, value, created_at, last_accessed, access_count, size_bytes, dependencies, ttl_seconds, expires_at, import_id)
+                VALUES (?, ?, datetime('now'), datetime('now'), 1, ?, ?, ?, NULL, NULL)
+            """, (key, value_blob, size_bytes, dependencies_json, ttl))
+        
+        # REPLACE does not fire the delete trigger, so drop old spans here
+        conn.execute("DELETE FROM cache_dependencies WHERE key = ?", (key,))
+        spans = parse_dependencies(dependencies)
+        if spans:
+            conn.executemany("""
+                INSERT INTO cache_dependencies (key, metric, start_date, end_date)
+                VALUES (?, ?, ?, ?)
+            """, [(key, metric, start, end) for metric, start, end in spans])
     
     def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate entries matching pattern."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.execute("DELETE FROM cache_entries WHERE key LIKE ?", (f"%{pattern}%",))
                 return cursor.rowcount
         except sqlite3.DatabaseError as e:
@@ -506,10 +959,43 @@ class SQLiteCache:
             logger.error(f"Error invalidating SQLite cache pattern: {e}")
             return 0
     
+    def invalidate_range(self, metric: Optional[str], start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> int:
+        """Invalidate entries depending on ``metric`` data between two days."""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.execute("""
+                    DELETE FROM cache_entries WHERE key IN (
+                        SELECT key FROM cache_dependencies
+                        WHERE (? IS NULL OR metric = ? OR metric IS NULL)
+                          AND (? IS NULL OR start_date IS NULL OR start_date <= ?)
+                          AND (? IS NULL OR end_date IS NULL OR end_date >= ?)
+                    )
+                """, (metric, metric, end_date, end_date, start_date, start_date))
+                return cursor.rowcount
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Database error invalidating SQLite cache range: {e}")
+            return 0
+    
+    def invalidate_dependencies(self, dependency: str) -> int:
+        """Invalidate entries with specific dependency."""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.execute("""
+                    DELETE FROM cache_entries WHERE key IN (
+                        SELECT cache_entries.key FROM cache_entries, json_each(cache_entries.dependencies)
+                        WHERE json_each.value = ?
+                    )
+                """, (dependency,))
+                return cursor.rowcount
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Database error invalidating SQLite cache dependency: {e}")
+            return 0
+    
     def cleanup_expired(self) -> int:
         """Remove expired entries."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.execute("DELETE FROM cache_entries WHERE expires_at < datetime('now')")
                 return cursor.rowcount
         except sqlite3.DatabaseError as e:
@@ -526,8 +1012,8 @@ class SQLiteCache:
     
     def close(self) -> None:
         """Close any open database connections and prepare for cleanup."""
-        # Since we use context managers, connections are auto-closed
-        # But we should ensure no active connections remain
+        self.flush_access_stats()
+        self._close_connections()
         try:
             # Force close any lingering connections by clearing the connection pool
             import gc
@@ -573,7 +1059,7 @@ class SQLiteCache:
     def get_size(self) -> int:
         """Get the number of entries in the cache."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM cache_entries")
                 return cursor.fetchone()[0]
         except Exception as e:
@@ -583,7 +1069,7 @@ class SQLiteCache:
     def clear(self) -> None:
         """Clear all entries from the SQLite cache."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 conn.execute("DELETE FROM cache_entries")
                 conn.commit()
                 logger.info("Cleared all entries from SQLite cache")
@@ -592,158 +1078,343 @@ class SQLiteCache:
 
 
 class DiskCache:
-    """Disk-based cache for expensive calculations."""
+    """Disk-based cache for expensive calculations.
+    
+    Each entry is one compressed file in a sharded layout
+    (``<cache_dir>/<hash[:2]>/<hash>.cache``), written to a temporary file
+    and atomically renamed into place. Metadata changes are appended to
+    ``metadata.log`` and periodically compacted into the ``metadata.json``
+    snapshot, so neither reads nor writes rewrite the whole index; the last
+    access time of an entry is its file's mtime. Total size is bounded by
+    evicting least recently used entries.
+    
+    Values are encoded by a ``SerializerRegistry``. With ``mmap_min_mb``
+    set, columnar payloads at least that large are stored uncompressed and
+    read through a copy-on-write memory map, so a large frame is paged in
+    as it is used instead of being read and decoded up front. This is off
+    by default because a mapped file cannot be replaced or deleted on
+    Windows while a decoded frame still references it.
+    """
+    
+    LOG_FILE = "metadata.log"
+    SNAPSHOT_FILE = "metadata.json"
+    # Compact once the log holds this many records per live entry
+    COMPACTION_RATIO = 2
+    MIN_COMPACTION_RECORDS = 1000
     
-    def __init__(self, cache_dir: str = "./cache/"):
+    def __init__(self, cache_dir: str = "./cache/", max_size_mb: float = 1024.0,
+                 codec: Optional[str] = None, mmap_min_mb: Optional[float] = None,
+                 serializers: Optional[SerializerRegistry] = None):
+        if codec is not None and codec not in COMPRESSION_CODECS:
+            raise ValueError(f"codec must be one of {sorted(COMPRESSION_CODECS)}")
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
-        self.metadata_file = self.cache_dir / "metadata.json"
-        self._metadata: Dict[str, Dict] = self._load_metadata()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.metadata_file = self.cache_dir / self.SNAPSHOT_FILE
+        self.log_file = self.cache_dir / self.LOG_FILE
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.codec = codec or DEFAULT_COMPRESSION_CODEC
+        self.mmap_min_bytes = mmap_min_mb * 1024 * 1024 if mmap_min_mb is not None else None
+        self.serializers = serializers or default_registry
+        self._lock = threading.RLock()
+        self._metadata: OrderedDict[str, Dict] = OrderedDict()
+        self._dependency_index = DependencyIndex()
+        self._total_bytes = 0
+        self._log_records = 0
+        self._log = None
+        self._load_metadata()
     
-    def _load_metadata(self) -> Dict[str, Dict]:
-        """Load cache metadata."""
+    def _load_metadata(self) -> None:
+        """Load the snapshot, replay the log and order entries by last access."""
+        entries: Dict[str, Dict] = {}
         try:
             if self.metadata_file.exists():
                 with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                    entries = json.load(f)
         except Exception as e:
             logger.warning(f"Could not load cache metadata: {e}")
-        return {}
+        
+        # Entries written by the previous single-file layout
+        for key, metadata in entries.items():
+            metadata.setdefault('file', f"{self._key_hash(key)}.cache.gz")
+            metadata.setdefault('codec', 'gzip')
+        
+        if self.log_file.exists():
+            try:
+                with open(self.log_file, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Torn final record from an interrupted write
+                            break
+                        op, key = record.pop('op'), record.pop('key')
+                        if op == 'set':
+                            entries[key] = record
+                        else:
+                            entries.pop(key, None)
+                        self._log_records += 1
+            except OSError as e:
+                logger.warning(f"Could not read cache metadata log: {e}")
+        
+        live = []
+        for key, metadata in entries.items():
+            try:
+                accessed = (self.cache_dir / metadata['file']).stat().st_mtime
+            except OSError:
+                continue
+            live.append((accessed, key, metadata))
+        
+        for _, key, metadata in sorted(live, key=lambda item: item[0]):
+            self._metadata[key] = metadata
+            self._total_bytes += metadata.get('size_bytes', 0)
+            self._dependency_index.add(key, metadata.get('dependencies'))
     
-    def _save_metadata(self) -> None:
-        """Save cache metadata."""
+    def _append_log(self, record: Dict) -> None:
+        """Append one metadata record, compacting when the log grows large."""
         try:
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self._metadata, f, default=str)
-        except Exception as e:
-            logger.error(f"Could not save cache metadata: {e}")
+            if self._log is None or self._log.closed:
+                self._log = open(self.log_file, 'a')
+            self._log.write(json.dumps(record, default=str) + "\n")
+            self._log.flush()
+            self._log_records += 1
+        except OSError as e:
+            logger.error(f"Could not append cache metadata: {e}")
+            return
+        
+        if self._log_records > max(self.MIN_COMPACTION_RECORDS,
+                                   self.COMPACTION_RATIO * len(self._metadata)):
+            self.compact()
+    
+    def compact(self) -> None:
+        """Write the live metadata as a new snapshot and truncate the log."""
+        with self._lock:
+            try:
+                self._atomic_write(self.metadata_file,
+                                   json.dumps(self._metadata, default=str).encode())
+                if self._log is not None:
+                    self._log.close()
+                # Replaying an already-compacted log is harmless, so a crash
+                # between the snapshot rename and this truncation is safe
+                self._log = open(self.log_file, 'w')
+                self._log_records = 0
+            except OSError as e:
+                logger.error(f"Could not compact cache metadata: {e}")
+    
+    @staticmethod
+    def _key_hash(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
     
     def _get_file_path(self, key: str) -> Path:
         """Get file path for cache key."""
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.cache.gz"
+        key_hash = self._key_hash(key)
+        return self.cache_dir / key_hash[:2] / f"{key_hash}.cache"
+    
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        """Write ``data`` to a temporary file and rename it over ``path``."""
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    def _read(self, file_path: Path, codec: str) -> Any:
+        """Read and decode one entry file."""
+        if codec == 'none' and self.mmap_min_bytes is not None:
+            with open(file_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            # Decoded columnar values keep the mapping alive
+            return self.serializers.loads(mapped)
+        _, decompress = COMPRESSION_CODECS[codec]
+        return self.serializers.loads(decompress(file_path.read_bytes()))
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from disk cache."""
-        try:
-            file_path = self._get_file_path(key)
-            
-            if not file_path.exists():
+        with self._lock:
+            metadata = self._metadata.get(key)
+            if metadata is None:
                 return None
             
-            # Check metadata
-            if key in self._metadata:
-                metadata = self._metadata[key]
-                ttl = metadata.get('ttl_seconds')
-                created_at = datetime.fromisoformat(metadata['created_at'])
-                
-                if ttl and (datetime.now() - created_at).total_seconds() > ttl:
-                    # Expired
-                    file_path.unlink(missing_ok=True)
-                    del self._metadata[key]
-                    self._save_metadata()
-                    return None
-            
-            # Load compressed data
-            with gzip.open(file_path, 'rb') as f:
-                value = pickle.load(f)
-            
-            # Update access statistics
-            if key in self._metadata:
-                self._metadata[key]['last_accessed'] = datetime.now().isoformat()
-                self._metadata[key]['access_count'] = self._metadata[key].get('access_count', 0) + 1
-                self._save_metadata()
-            
-            return value
-            
+            ttl = metadata.get('ttl_seconds')
+            created_at = datetime.fromisoformat(metadata['created_at'])
+            if ttl and (datetime.now() - created_at).total_seconds() > ttl:
+                # Expired
+                self._remove(key)
+                return None
+            file_path = self.cache_dir / metadata['file']
+            codec = metadata['codec']
+        
+        # Read and decompress outside the lock; files are replaced atomically
+        try:
+            value = self._read(file_path, codec)
+        except FileNotFoundError:
+            with self._lock:
+                if self._metadata.get(key) is metadata:
+                    self._remove(key)
+            return None
         except Exception as e:
             logger.error(f"Error getting from disk cache: {e}")
             return None
+        
+        with self._lock:
+            if key in self._metadata:
+                self._metadata.move_to_end(key)
+                metadata['access_count'] = metadata.get('access_count', 0) + 1
+        try:
+            # The file's mtime records the last access
+            os.utime(file_path)
+        except OSError:
+            pass
+        return value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None, dependencies: List[str] = None) -> None:
         """Set value in disk cache."""
         try:
+            data = self.serializers.dumps(value)
+            codec = self.codec
+            payload_format = self.serializers.format_of(data)
+            if (self.mmap_min_bytes is None or len(data) < self.mmap_min_bytes
+                    or payload_format is None or not payload_format.columnar):
+                compress, _ = COMPRESSION_CODECS[codec]
+                data = compress(data)
+            else:
+                codec = 'none'
+            if len(data) > self.max_size_bytes:
+                logger.warning(f"Skipping disk cache entry {key}: too large ({len(data)} bytes)")
+                return
             file_path = self._get_file_path(key)
             
-            # Save compressed data
-            with gzip.open(file_path, 'wb') as f:
-                pickle.dump(value, f)
-            
-            # Update metadata
-            self._metadata[key] = {
-                'created_at': datetime.now().isoformat(),
-                'last_accessed': datetime.now().isoformat(),
-                'access_count': 1,
-                'size_bytes': file_path.stat().st_size,
-                'dependencies': dependencies or [],
-                'ttl_seconds': ttl
-            }
-            
-            self._save_metadata()
+            with self._lock:
+                self._atomic_write(file_path, data)
+                
+                old = self._metadata.pop(key, None)
+                if old is not None:
+                    self._total_bytes -= old.get('size_bytes', 0)
+                    if old['file'] != str(file_path.relative_to(self.cache_dir)):
+                        (self.cache_dir / old['file']).unlink(missing_ok=True)
+                
+                metadata = {
+                    'file': str(file_path.relative_to(self.cache_dir)),
+                    'codec': codec,
+                    'created_at': datetime.now().isoformat(),
+                    'access_count': 1,
+                    'size_bytes': len(data),
+                    'dependencies': dependencies or [],
+                    'ttl_seconds': ttl
+                }
+                self._metadata[key] = metadata
+                self._total_bytes += len(data)
+                self._dependency_index.add(key, dependencies)
+                self._append_log({'op': 'set', 'key': key, **metadata})
+                
+                # Evict least recently used entries beyond the size bound
+                while self._total_bytes > self.max_size_bytes and len(self._metadata) > 1:
+                    self._remove(next(iter(self._metadata)))
             
         except Exception as e:
             logger.error(f"Error setting disk cache: {e}")
     
+    def _remove(self, key: str) -> None:
+        """Delete an entry's file, metadata and dependency index records."""
+        metadata = self._metadata.pop(key, None)
+        if metadata is None:
+            return
+        (self.cache_dir / metadata['file']).unlink(missing_ok=True)
+        self._total_bytes -= metadata.get('size_bytes', 0)
+        self._dependency_index.remove(key)
+        self._append_log({'op': 'del', 'key': key})
+    
     def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate entries matching pattern."""
-        count = 0
-        keys_to_remove = []
-        
-        for key in self._metadata.keys():
-            if pattern in key:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            file_path = self._get_file_path(key)
-            file_path.unlink(missing_ok=True)
-            del self._metadata[key]
-            count += 1
-        
-        if count > 0:
-            self._save_metadata()
-        
-        return count
+        with self._lock:
+            keys_to_remove = [key for key in self._metadata if pattern in key]
+            for key in keys_to_remove:
+                self._remove(key)
+            return len(keys_to_remove)
+    
+    def invalidate_range(self, metric: Optional[str], start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> int:
+        """Invalidate entries depending on ``metric`` data between two days."""
+        with self._lock:
+            keys_to_remove = self._dependency_index.matching(metric, start_date, end_date)
+            for key in keys_to_remove:
+                self._remove(key)
+            return len(keys_to_remove)
+    
+    def invalidate_dependencies(self, dependency: str) -> int:
+        """Invalidate entries with specific dependency."""
+        with self._lock:
+            keys_to_remove = [key for key, metadata in self._metadata.items()
+                              if dependency in metadata.get('dependencies', [])]
+            for key in keys_to_remove:
+                self._remove(key)
+            return len(keys_to_remove)
+    
+    @property
+    def size_mb(self) -> float:
+        """Total size of stored entries in MB."""
+        return self._total_bytes / (1024 * 1024)
     
     def get_size(self) -> int:
         """Get the number of entries in the cache."""
-        try:
-            return len(self._metadata)
-        except Exception as e:
-            logger.error(f"Error getting disk cache size: {e}")
-            return 0
+        return len(self._metadata)
     
     def clear(self) -> None:
         """Clear all entries from the disk cache."""
-        try:
-            # Remove all cache files
-            for key in list(self._metadata.keys()):
-                cache_file = self.cache_dir / f"{key}.pkl"
-                if cache_file.exists():
-                    cache_file.unlink()
-            
-            # Clear metadata
-            self._metadata.clear()
-            self._save_metadata()
-            
-            logger.info("Cleared all entries from disk cache")
-        except Exception as e:
-            logger.error(f"Error clearing disk cache: {e}")
+        with self._lock:
+            try:
+                # Remove all cache files
+                for metadata in self._metadata.values():
+                    (self.cache_dir / metadata['file']).unlink(missing_ok=True)
+                
+                # Clear metadata
+                self._metadata.clear()
+                self._dependency_index.clear()
+                self._total_bytes = 0
+                self.compact()
+                
+                logger.info("Cleared all entries from disk cache")
+            except Exception as e:
+                logger.error(f"Error clearing disk cache: {e}")
+    
+    def close(self) -> None:
+        """Compact metadata and close the log."""
+        with self._lock:
+            if self._log_records:
+                self.compact()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
 
 
 class AnalyticsCacheManager:
     """Multi-tier cache manager for analytics calculations."""
     
+    # Summary statistics that are counts, returned as int by get_import_summary
+    INTEGER_SUMMARY_STATS = frozenset({'count', 'sources', 'days_with_data'})
+    
     def __init__(self, 
                  l1_maxsize: int = 1000,
                  l1_memory_mb: float = 500.0,
                  l2_db_path: str = "analytics_cache_temp.db",  # Keep analytics cache for now 
-                 l3_cache_dir: str = "./cache/"):
+                 l3_cache_dir: str = "./cache/",
+                 l1_eviction_policy: str = 'slru'):
         
-        self.l1_cache = LRUCache(maxsize=l1_maxsize, max_memory_mb=l1_memory_mb)
+        self.l1_cache = LRUCache(maxsize=l1_maxsize, max_memory_mb=l1_memory_mb,
+                                 eviction_policy=l1_eviction_policy)
         self.l2_cache = SQLiteCache(db_path=l2_db_path)
         self.l3_cache = DiskCache(cache_dir=l3_cache_dir)
+        self.data_versions = DataVersionRegistry(self.l2_cache.db_path)
         self.metrics = CacheMetrics()
+        # Guards metrics and the in-flight table only; never held during
+        # tier I/O or computation. Invalidations detach in-flight
+        # computations so their (possibly stale) results are not stored.
         self._lock = threading.RLock()
+        self._in_flight: Dict[str, Future] = {}
         
         # Default TTL by tier (seconds)
         self.l1_default_ttl = 900    # 15 minutes
@@ -754,65 +1425,120 @@ class AnalyticsCacheManager:
             cache_tiers: List[str] = None, 
             ttl: Optional[int] = None,
             dependencies: List[str] = None) -> Any:
-        """Get from cache or compute with tier fallback."""
+        """Get from cache or compute with tier fallback.
+        
+        Tier lookups rely on each tier's own locking, so in-memory hits never
+        wait behind SQLite/disk probes or computations. Concurrent misses for
+        the same key share a single computation; different keys compute in
+        parallel. A computation overtaken by an invalidation or a data version
+        bump is returned to its callers but not stored.
+        """
         
         if cache_tiers is None:
             cache_tiers = ['l1', 'l2', 'l3']
         
         with self._lock:
             self.metrics.total_requests += 1
-            
-            # Try L1 cache first
-            if 'l1' in cache_tiers:
-                result = self.l1_cache.get(key)
-                if result is not None:
-                    self.metrics.l1_hits += 1
-                    logger.debug(f"L1 cache hit: {key}")
-                    return result
-                else:
-                    self.metrics.l1_misses += 1
-                    logger.debug(f"L1 cache miss: {key}")
-            
-            # Try L2 cache
-            if 'l2' in cache_tiers:
-                result = self.l2_cache.get(key)
-                if result is not None:
-                    self.metrics.l2_hits += 1
-                    logger.debug(f"L2 cache hit: {key}")
-                    
-                    # Promote to L1
-                    if 'l1' in cache_tiers:
-                        self.l1_cache.set(key, result, ttl=self.l1_default_ttl, dependencies=dependencies)
-                    
-                    return result
-                else:
-                    self.metrics.l2_misses += 1
-            
-            # Try L3 cache
-            if 'l3' in cache_tiers:
-                result = self.l3_cache.get(key)
-                if result is not None:
-                    self.metrics.l3_hits += 1
-                    logger.debug(f"L3 cache hit: {key}")
-                    
-                    # Promote to L2 and L1
-                    if 'l2' in cache_tiers:
-                        self.l2_cache.set(key, result, ttl=self.l2_default_ttl, dependencies=dependencies)
-                    if 'l1' in cache_tiers:
-                        self.l1_cache.set(key, result, ttl=self.l1_default_ttl, dependencies=dependencies)
-                    
-                    return result
+        
+        result = self._lookup(key, cache_tiers, dependencies)
+        if result is not None:
+            return result
+        
+        # Cache miss - join an in-flight computation or start one
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.metrics.max_in_flight = max(self.metrics.max_in_flight,
+                                                 len(self._in_flight))
+        
+        if not leader:
+            wait_start = time.perf_counter()
+            try:
+                return future.result()
+            finally:
+                with self._lock:
+                    self.metrics.coalesced_requests += 1
+                    self.metrics.coalesced_wait_seconds += time.perf_counter() - wait_start
+        
+        try:
+            # Another leader may have stored the value between our lookup
+            # and registering this computation
+            result = self.l1_cache.get(key) if 'l1' in cache_tiers else None
+            if result is None:
+                logger.debug(f"Cache miss - computing: {key}")
+                version = self.data_versions.version_for(dependencies)
+                compute_start = time.perf_counter()
+                result = compute_fn()
+                with self._lock:
+                    self.metrics.computations += 1
+                    self.metrics.compute_seconds += time.perf_counter() - compute_start
+                    current = self._in_flight.get(key) is future
+                
+                if current and self.data_versions.version_for(dependencies) == version:
+                    # Store in all requested tiers
+                    self.set(key, result, cache_tiers=cache_tiers, ttl=ttl, dependencies=dependencies)
                 else:
-                    self.metrics.l3_misses += 1
-            
-            # Cache miss - compute result
-            logger.debug(f"Cache miss - computing: {key}")
-            result = compute_fn()
-            
-            # Store in all requested tiers
-            self.set(key, result, cache_tiers=cache_tiers, ttl=ttl, dependencies=dependencies)
-            
+                    logger.debug(f"Data changed while computing {key}; not caching result")
+            future.set_result(result)
             return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+    
+    def _lookup(self, key: str, cache_tiers: List[str],
+                dependencies: Optional[List[str]]) -> Optional[Any]:
+        """Probe the requested tiers in order, promoting hits to faster tiers."""
+        # Try L1 cache first
+        if 'l1' in cache_tiers:
+            result = self.l1_cache.get(key)
+            self._count_lookup('l1', result is not None)
+            if result is not None:
+                logger.debug(f"L1 cache hit: {key}")
+                return result
+            logger.debug(f"L1 cache miss: {key}")
+        
+        # Try L2 cache
+        if 'l2' in cache_tiers:
+            result = self.l2_cache.get(key)
+            self._count_lookup('l2', result is not None)
+            if result is not None:
+                logger.debug(f"L2 cache hit: {key}")
+                
+                # Promote to L1
+                if 'l1' in cache_tiers:
+                    self.l1_cache.set(key, result, ttl=self.l1_default_ttl, dependencies=dependencies)
+                
+                return result
+        
+        # Try L3 cache
+        if 'l3' in cache_tiers:
+            result = self.l3_cache.get(key)
+            self._count_lookup('l3', result is not None)
+            if result is not None:
+                logger.debug(f"L3 cache hit: {key}")
+                
+                # Promote to L2 and L1
+                if 'l2' in cache_tiers:
+                    self.l2_cache.set(key, result, ttl=self.l2_default_ttl, dependencies=dependencies)
+                if 'l1' in cache_tiers:
+                    self.l1_cache.set(key, result, ttl=self.l1_default_ttl, dependencies=dependencies)
+                
+                return result
+        
+        return None
+    
+    def _count_lookup(self, tier: str, hit: bool) -> None:
+        """Record a hit or miss for ``tier``."""
+        field = f"{tier}_hits" if hit else f"{tier}_misses"
+        with self._lock:
+            setattr(self.metrics, field, getattr(self.metrics, field) + 1)
     
     def set(self, key: str, value: Any, 
             cache_tiers: List[str] = None,
@@ -825,57 +1551,119 @@ class AnalyticsCacheManager:
         
         with self._lock:
             self.metrics.cache_sets += 1
-            
-            if 'l1' in cache_tiers:
-                self.l1_cache.set(key, value, ttl=ttl or self.l1_default_ttl, dependencies=dependencies)
-            
-            if 'l2' in cache_tiers:
-                self.l2_cache.set(key, value, ttl=ttl or self.l2_default_ttl, dependencies=dependencies)
-            
-            if 'l3' in cache_tiers:
-                self.l3_cache.set(key, value, ttl=ttl or self.l3_default_ttl, dependencies=dependencies)
+        
+        if 'l1' in cache_tiers:
+            self.l1_cache.set(key, value, ttl=ttl or self.l1_default_ttl, dependencies=dependencies)
+        
+        if 'l2' in cache_tiers:
+            self.l2_cache.set(key, value, ttl=ttl or self.l2_default_ttl, dependencies=dependencies)
+        
+        if 'l3' in cache_tiers:
+            self.l3_cache.set(key, value, ttl=ttl or self.l3_default_ttl, dependencies=dependencies)
+    
+    def _begin_invalidation(self, count: bool = True) -> None:
+        """Detach in-flight computations, counting an invalidation if ``count``.
+        
+        Leaders of detached computations still hand their result to waiting
+        callers but skip storing it; later callers start a fresh computation.
+        """
+        with self._lock:
+            if count:
+                self.metrics.invalidations += 1
+            self._in_flight.clear()
     
     def invalidate_pattern(self, pattern: str) -> Dict[str, int]:
         """Invalidate caches matching pattern across all tiers."""
-        with self._lock:
-            self.metrics.invalidations += 1
-            
-            results = {
-                'l1': self.l1_cache.invalidate_pattern(pattern),
-                'l2': self.l2_cache.invalidate_pattern(pattern), 
-                'l3': self.l3_cache.invalidate_pattern(pattern)
-            }
-            
-            logger.info(f"Invalidated pattern '{pattern}': {results}")
-            return results
+        self._begin_invalidation()
+        
+        results = {
+            'l1': self.l1_cache.invalidate_pattern(pattern),
+            'l2': self.l2_cache.invalidate_pattern(pattern), 
+            'l3': self.l3_cache.invalidate_pattern(pattern)
+        }
+        
+        logger.info(f"Invalidated pattern '{pattern}': {results}")
+        return results
     
     def invalidate_dependencies(self, dependency: str) -> Dict[str, int]:
         """Invalidate caches with specific dependency."""
-        with self._lock:
-            self.metrics.invalidations += 1
-            
-            results = {
-                'l1': self.l1_cache.invalidate_dependencies(dependency),
-                'l2': 0,  # TODO: implement for L2/L3
-                'l3': 0
-            }
-            
-            logger.info(f"Invalidated dependency '{dependency}': {results}")
-            return results
+        self._begin_invalidation()
+        
+        results = {
+            'l1': self.l1_cache.invalidate_dependencies(dependency),
+            'l2': self.l2_cache.invalidate_dependencies(dependency),
+            'l3': self.l3_cache.invalidate_dependencies(dependency)
+        }
+        
+        logger.info(f"Invalidated dependency '{dependency}': {results}")
+        return results
+    
+    def invalidate_range(self, metric: Optional[str], start_date=None,
+                         end_date=None) -> Dict[str, int]:
+        """Invalidate entries depending on ``metric`` data between two days.
+        
+        Uses the per-tier dependency indexes, so only entries whose metric and
+        day span overlap the change are removed.
+        
+        Args:
+            metric: Metric whose data changed (None for every metric)
+            start_date: First changed day (None for open start)
+            end_date: Last changed day (None for open end)
+        
+        Returns:
+            Number of entries removed per tier
+        """
+        start, end = normalize_day(start_date), normalize_day(end_date)
+        self._begin_invalidation()
+        
+        results = {
+            'l1': self.l1_cache.invalidate_range(metric, start, end),
+            'l2': self.l2_cache.invalidate_range(metric, start, end),
+            'l3': self.l3_cache.invalidate_range(metric, start, end)
+        }
+        
+        logger.info(f"Invalidated {metric or 'all metrics'} from {start} to {end}: {results}")
+        return results
+    
+    def record_data_change(self, metric: Optional[str], start_date=None,
+                           end_date=None) -> int:
+        """Bump the data version for a changed range and evict dependent entries.
+        
+        Args:
+            metric: Metric whose data changed (None for every metric)
+            start_date: First changed day (None for open start)
+            end_date: Last changed day (None for open end)
+        
+        Returns:
+            The new data version
+        """
+        version = self.data_versions.bump(metric, start_date, end_date)
+        self.invalidate_range(metric, start_date, end_date)
+        return version
+    
+    def versioned_key(self, key: str, dependencies: Optional[List[str]]) -> str:
+        """Embed the data version of ``dependencies`` in ``key``.
+        
+        Results cached before a change to their (metric, day range) are
+        keyed by the old version and can no longer be returned.
+        """
+        version = self.data_versions.version_for(dependencies)
+        return f"{key}|v={version}" if version else key
     
     def get_metrics(self) -> CacheMetrics:
         """Get current cache metrics."""
+        memory_usage_mb = self.l1_cache.memory_usage_mb
         with self._lock:
             # Update memory usage
-            self.metrics.memory_usage_mb = self.l1_cache.memory_usage_mb
+            self.metrics.memory_usage_mb = memory_usage_mb
             return self.metrics
     
     def clear_all(self) -> None:
         """Clear all cache tiers."""
-        with self._lock:
-            self.l1_cache.clear()
-            # Note: L2 and L3 don't have clear methods - would need to implement
-            logger.info("Cleared L1 cache")
+        self._begin_invalidation(count=False)
+        self.l1_cache.clear()
+        # Note: L2 and L3 don't have clear methods - would need to implement
+        logger.info("Cleared L1 cache")
     
     def cleanup_expired(self) -> Dict[str, int]:
         """Cleanup expired entries across tiers."""
@@ -888,12 +1676,17 @@ class AnalyticsCacheManager:
         logger.info(f"Cleaned up expired entries: {results}")
         return results
     
+    SUMMARY_GRANULARITIES = ('daily', 'weekly', 'monthly')
+    
     def cache_import_summaries(self, summaries: Dict[str, Any], import_id: str) -> None:
         """Cache all summaries from import process using simplified SQLite-only storage.
         
         This method is optimized for bulk import of pre-computed summaries during
         the data import process. It bypasses the multi-tier cache and stores
-        directly in SQLite for persistence and simplicity.
+        directly in SQLite for persistence and simplicity. Each metric and
+        granularity is stored as one columnar table (one row per period)
+        under ``cache_key('<granularity>_summary', metric)``; read them with
+        ``get_import_summary`` or ``get_import_summary_table``.
         
         Args:
             summaries: Dictionary containing summaries organized by time period:
@@ -910,68 +1703,101 @@ class AnalyticsCacheManager:
         """
         logger.info(f"Caching import summaries for import_id: {import_id}")
         
-        with self._lock:
-            try:
-                # Clear previous import's summaries
-                self._clear_previous_import_summaries(import_id)
-                
-                # Prepare batch data for insertion
-                batch_data = []
-                
-                # Process daily summaries
-                for metric, daily_data in summaries.get('daily', {}).items():
-                    for date_str, stats in daily_data.items():
-                        key = cache_key('daily_summary', metric, date_str)
-                        batch_data.append((
-                            key,
-                            json.dumps(stats),
-                            None,  # No TTL for import summaries
-                            json.dumps([]),  # No dependencies
-                            import_id
-                        ))
-                
-                # Process weekly summaries
-                for metric, weekly_data in summaries.get('weekly', {}).items():
-                    for week_str, stats in weekly_data.items():
-                        key = cache_key('weekly_summary', metric, week_str)
-                        batch_data.append((
-                            key,
-                            json.dumps(stats),
-                            None,
-                            json.dumps([]),
-                            import_id
-                        ))
-                
-                # Process monthly summaries
-                for metric, monthly_data in summaries.get('monthly', {}).items():
-                    for month_str, stats in monthly_data.items():
-                        key = cache_key('monthly_summary', metric, month_str)
-                        batch_data.append((
-                            key,
-                            json.dumps(stats),
-                            None,
-                            json.dumps([]),
-                            import_id
-                        ))
-                
-                # Store metadata
-                metadata_key = cache_key('import_metadata', import_id)
-                batch_data.append((
-                    metadata_key,
-                    json.dumps(summaries.get('metadata', {})),
-                    None,
-                    json.dumps([]),
-                    import_id
-                ))
-                
-                # Bulk insert into SQLite cache
-                self._bulk_insert_summaries(batch_data)
-                
-                logger.info(f"Successfully cached {len(batch_data)} summary entries")
-                
-            except Exception as e:
-                logger.error(f"Error caching import summaries: {e}")
-                raise
+        self._begin_invalidation(count=False)
+        try:
+            # Clear previous import's summaries
+            self._clear_previous_import_summaries(import_id)
+            self.l1_cache.invalidate_pattern('_summary|')
+            
+            # Prepare batch data for insertion
+            batch_data = []
+            
+            for granularity in self.SUMMARY_GRANULARITIES:
+                for metric, period_data in summaries.get(granularity, {}).items():
+                    if not period_data:
+                        continue
+                    key = cache_key(f'{granularity}_summary', metric)
+                    batch_data.append((
+                        key,
+                        self.l2_cache.serializers.dumps(self._summary_table(period_data)),
+                        None,  # No TTL for import summaries
+                        json.dumps([]),  # No dependencies
+                        import_id
+                    ))
+            
+            # Store metadata
+            metadata_key = cache_key('import_metadata', import_id)
+            batch_data.append((
+                metadata_key,
+                json.dumps(summaries.get('metadata', {})),
+                None,
+                json.dumps([]),
+                import_id
+            ))
+            
+            # Bulk insert into SQLite cache
+            self._bulk_insert_summaries(batch_data)
+            
+            logger.info(f"Successfully cached {len(batch_data)} summary entries")
+            
+        except Exception as e:
+            logger.error(f"Error caching import summaries: {e}")
+            raise
+    
+    @staticmethod
+    def _summary_table(period_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """Build a table with one row per period and one column per statistic."""
+        table = pd.DataFrame.from_dict(period_data, orient='index').sort_index()
+        table.index.name = 'period'
+        return table.infer_objects()
+    
+    def get_import_summary_table(self, granularity: str, metric: str) -> Optional[pd.DataFrame]:
+        """Get the cached summary table of ``metric`` at one granularity.
+        
+        Args:
+            granularity: 'daily', 'weekly' or 'monthly'
+            metric: Metric type
+        
+        Returns:
+            DataFrame indexed by period string, or None if not cached
+        """
+        key = cache_key(f'{granularity}_summary', metric)
+        table = self.l1_cache.get(key)
+        if table is None:
+            table = self.l2_cache.get(key)
+            if not isinstance(table, pd.DataFrame):
+                return None
+            self.l1_cache.set(key, table)
+        return table
+    
+    def get_import_summary(self, granularity: str, metric: str,
+                           period: str) -> Optional[Dict[str, Any]]:
+        """Get the statistics of one period from a cached summary table.
+        
+        Args:
+            granularity: 'daily', 'weekly' or 'monthly'
+            metric: Metric type
+            period: Date ('2024-01-15'), week ('2024-W03') or month ('2024-01')
+        
+        Returns:
+            Dict of statistics as passed to ``cache_import_summaries``, or None
+        """
+        table = self.get_import_summary_table(granularity, metric)
+        if table is None or period not in table.index:
+            return None
+        # Read per column: a row Series would upcast integer counts to float
+        summary = {}
+        for stat in table.columns:
+            value = table.at[period, stat]
+            if pd.isna(value):
+                value = None
+            elif hasattr(value, 'item'):
+                value = value.item()
+            if stat in self.INTEGER_SUMMARY_STATS and isinstance(value, float):
+                # Columns with missing counts are stored as float
+                value = int(value)
+            summary[stat] = value
+        return summary
     
     def _clear_previous_import_summaries(self, current_import_id: str) -> None:
         """Clear summaries from previous imports.
@@ -981,15 +1807,13 @@ class AnalyticsCacheManager:
         """
         try:
             # Use a custom query to delete summary entries not from current import
-            with sqlite3.connect(self.l2_cache.db_path) as conn:
-                conn.execute("""
+            with self.l2_cache._get_connection() as conn:
+                deleted = conn.execute("""
                     DELETE FROM cache_entries 
                     WHERE key LIKE '%_summary|%' 
                     AND key NOT LIKE '%' || ? || '%'
-                """, (current_import_id,))
-                conn.commit()
+                """, (current_import_id,)).rowcount
                 
-                deleted = conn.total_changes
                 if deleted > 0:
                     logger.info(f"Cleared {deleted} summaries from previous imports")
                     
@@ -1003,7 +1827,7 @@ class AnalyticsCacheManager:
             batch_data: List of tuples (key, value, ttl, dependencies, import_id)
         """
         try:
-            with sqlite3.connect(self.l2_cache.db_path) as conn:
+            with self.l2_cache._get_connection() as conn:
                 # Use executemany for efficient bulk insert
                 # Note: We need to insert with all required columns
                 import time
@@ -1030,8 +1854,6 @@ class AnalyticsCacheManager:
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, full_batch_data)
                 
-                conn.commit()
-                
         except sqlite3.Error as e:
             logger.error(f"Error bulk inserting summaries: {e}")
             raise
@@ -1043,14 +1865,15 @@ class AnalyticsCacheManager:
             Dict containing cache health information including hit rates,
             memory usage, entry counts, and performance statistics.
         """
+        # Get current cache sizes
+        l1_size = len(self.l1_cache._cache)
+        l1_memory_mb = self.l1_cache._current_memory / (1024 * 1024)
+        
+        l2_size = self.l2_cache.get_size()
+        l3_size = self.l3_cache.get_size()
+        l2_latency = self.l2_cache.get_latency_stats()
+        
         with self._lock:
-            # Get current cache sizes
-            l1_size = len(self.l1_cache._cache)
-            l1_memory_mb = self.l1_cache._current_memory / (1024 * 1024)
-            
-            l2_size = self.l2_cache.get_size()
-            l3_size = self.l3_cache.get_size()
-            
             return {
                 'hit_rates': {
                     'l1': self.metrics.l1_hit_rate,
@@ -1074,6 +1897,16 @@ class AnalyticsCacheManager:
                     'l3_hits': self.metrics.l3_hits,
                     'l3_misses': self.metrics.l3_misses
                 },
+                'contention': {
+                    'computations': self.metrics.computations,
+                    'coalesced_requests': self.metrics.coalesced_requests,
+                    'coalesce_rate': self.metrics.coalesce_rate,
+                    'coalesced_wait_seconds': round(self.metrics.coalesced_wait_seconds, 3),
+                    'compute_seconds': round(self.metrics.compute_seconds, 3),
+                    'in_flight': len(self._in_flight),
+                    'max_in_flight': self.metrics.max_in_flight
+                },
+                'l2_latency': l2_latency,
                 'health_status': self._get_cache_health_status()
             }
     
@@ -1092,34 +1925,35 @@ class AnalyticsCacheManager:
     
     def invalidate_all_cache(self) -> None:
         """Clear all cache tiers completely."""
-        with self._lock:
-            logger.info("Invalidating all cache entries")
-            
-            # Clear L1 cache
-            self.l1_cache.clear()
-            
-            # Clear L2 cache
-            self.l2_cache.clear()
-            
-            # Clear L3 cache 
-            self.l3_cache.clear()
-            
-            logger.info("All cache entries invalidated")
+        logger.info("Invalidating all cache entries")
+        self._begin_invalidation(count=False)
+        
+        # Clear L1 cache
+        self.l1_cache.clear()
+        
+        # Clear L2 cache
+        self.l2_cache.clear()
+        
+        # Clear L3 cache 
+        self.l3_cache.clear()
+        
+        logger.info("All cache entries invalidated")
     
     def shutdown(self) -> None:
         """Shutdown the cache manager and close all connections."""
-        with self._lock:
-            logger.info("Shutting down cache manager")
-            
-            # Clear L1 cache
-            self.l1_cache.clear()
-            
-            # Close L2 cache database connection
-            self.l2_cache.close()
-            
-            # L3 cache doesn't need closing (file-based)
-            
-            logger.info("Cache manager shutdown complete")
+        logger.info("Shutting down cache manager")
+        self._begin_invalidation(count=False)
+        
+        # Clear L1 cache
+        self.l1_cache.clear()
+        
+        # Close L2 cache database connection
+        self.l2_cache.close()
+        
+        # Compact L3 metadata and close its log
+        self.l3_cache.close()
+        
+        logger.info("Cache manager shutdown complete")
 
 
 # Global cache manager instance
@@ -0,0 +1,380 @@
+"""
+Pluggable serialization for cached analytics values.
+
+Cache tiers persist values through a :class:`SerializerRegistry` instead of
+calling ``pickle`` directly. DataFrames and NumPy arrays are written in
+columnar form - Arrow IPC when ``pyarrow`` is installed, otherwise raw
+``.npy`` buffers with a small JSON header - so decoding is a buffer view
+rather than object reconstruction, and payloads read from a memory-mapped
+file stay zero-copy. Everything else falls back to pickle.
+
+Columnar values decoded from immutable buffers (``bytes`` from SQLite) are
+read-only views, like the shared objects returned by the in-memory tier;
+callers that modify a cached frame work on ``frame.copy()``.
+
+Every encoded payload starts with a four byte magic and a one byte format
+code. Payloads without the magic are treated as legacy pickles (and ``str``
+values as legacy JSON rows), so entries written before the registry existed
+stay readable.
+
+Example:
+    >>> blob = dumps(pd.DataFrame({'value': [1.0, 2.0]}))
+    >>> loads(blob)['value'].sum()
+    3.0
+"""
+
+import io
+import json
+import logging
+import pickle
+import struct
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+MAGIC = b'IQC1'
+HEADER_SIZE = len(MAGIC) + 1
+# Buffers inside a columnar frame start on this boundary so views are aligned
+ALIGNMENT = 64
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Serializer:
+    """Base class for one payload format.
+
+    Attributes:
+        name: Human readable format name
+        code: Format byte written after the magic; unique per registry
+        columnar: Whether decoded values are views over the payload buffer
+    """
+
+    name = 'base'
+    code = 0
+    columnar = False
+
+    def can_encode(self, value: Any) -> bool:
+        """Return True if this serializer handles ``value``."""
+        raise NotImplementedError
+
+    def encode(self, value: Any) -> bytes:
+        """Encode ``value`` to bytes (without the registry header)."""
+        raise NotImplementedError
+
+    def decode(self, payload: memoryview) -> Any:
+        """Decode a payload produced by :meth:`encode`."""
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    """Fallback for any picklable value."""
+
+    name = 'pickle'
+    code = 1
+
+    def can_encode(self, value: Any) -> bool:
+        return True
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload: memoryview) -> Any:
+        return pickle.loads(payload)
+
+
+def _npy_bytes(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _npy_view(payload: memoryview) -> np.ndarray:
+    """Return the array stored in a ``.npy`` buffer without copying it."""
+    stream = io.BytesIO(payload[:256].tobytes())
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    count = int(np.prod(shape)) if shape else 1
+    array = np.frombuffer(payload, dtype=dtype, count=count, offset=stream.tell())
+    return array.reshape(shape, order='F' if fortran_order else 'C')
+
+
+class NumpySerializer(Serializer):
+    """Raw ``.npy`` buffers for arrays of fixed-width dtypes."""
+
+    name = 'npy'
+    code = 2
+    columnar = True
+
+    def can_encode(self, value: Any) -> bool:
+        return isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+    def encode(self, value: np.ndarray) -> bytes:
+        return _npy_bytes(value)
+
+    def decode(self, payload: memoryview) -> np.ndarray:
+        return _npy_view(payload)
+
+
+class NpyFrameSerializer(Serializer):
+    """DataFrames as a JSON column directory followed by aligned ``.npy`` buffers.
+
+    Numeric, boolean and datetime columns are stored as their values;
+    string and categorical columns as integer codes plus a category list.
+    The index is stored like a column. Frames with MultiIndexes,
+    non-scalar column labels or mixed-type object columns are left to the
+    pickle fallback.
+    """
+
+    name = 'npy-frame'
+    code = 3
+    columnar = True
+
+    def can_encode(self, value: Any) -> bool:
+        if not isinstance(value, pd.DataFrame):
+            return False
+        if isinstance(value.columns, pd.MultiIndex) or isinstance(value.index, pd.MultiIndex):
+            return False
+        if not value.columns.is_unique:
+            return False
+        return all(isinstance(label, (str, int)) and not isinstance(label, bool)
+                   for label in value.columns)
+
+    def encode(self, frame: pd.DataFrame) -> bytes:
+        columns = [self._encode_column(frame.index, frame.index.name)]
+        columns += [self._encode_column(frame[label], label) for label in frame.columns]
+
+        directory: List[Dict[str, Any]] = []
+        buffers: List[bytes] = []
+        offset = 0
+        for spec, arrays in columns:
+            spec['buffers'] = []
+            for array in arrays:
+                data = _npy_bytes(array)
+                padding = -offset % ALIGNMENT
+                buffers.append(b'\0' * padding + data)
+                offset += padding
+                spec['buffers'].append([offset, len(data)])
+                offset += len(data)
+            directory.append(spec)
+
+        header = json.dumps({'columns': directory, 'rows': len(frame)}).encode()
+        prefix_length = 4 + len(header)
+        padding = -prefix_length % ALIGNMENT
+        return b''.join([struct.pack('<I', len(header) + padding), header,
+                         b' ' * padding] + buffers)
+
+    @staticmethod
+    def _encode_column(values: Union[pd.Series, pd.Index], label: Any):
+        dtype = values.dtype
+        spec: Dict[str, Any] = {'label': label, 'label_type': type(label).__name__}
+        if isinstance(dtype, pd.CategoricalDtype):
+            spec['kind'] = 'category'
+            spec['ordered'] = bool(dtype.ordered)
+            categories = values.cat.categories if isinstance(values, pd.Series) else values.categories
+            codes = values.cat.codes if isinstance(values, pd.Series) else values.codes
+            return NpyFrameSerializer._encode_categories(spec, categories, np.asarray(codes))
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            spec.update(kind='datetime', tz=str(dtype.tz), unit=dtype.unit)
+            return spec, [values.array.asi8]
+        if dtype == object or pd.api.types.is_string_dtype(dtype):
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            if not all(isinstance(item, str) for item in uniques):
+                raise TypeError(f"Column {label!r} holds non-string objects")
+            spec['kind'] = 'string'
+            missing = codes == -1
+            if missing.any():
+                # Keep None (SQL-backed frames) apart from NaN (parsed files)
+                gaps = np.asarray(values, dtype=object)[missing]
+                spec['na'] = 'none' if all(gap is None for gap in gaps) else 'nan'
+            return NpyFrameSerializer._encode_categories(spec, pd.Index(uniques), codes)
+        if isinstance(values, pd.RangeIndex):
+            spec.update(kind='range', start=values.start, stop=values.stop, step=values.step)
+            return spec, []
+        array = np.asarray(values)
+        if array.dtype.hasobject:
+            raise TypeError(f"Column {label!r} has unsupported dtype {dtype}")
+        spec['kind'] = 'values'
+        return spec, [array]
+
+    @staticmethod
+    def _encode_categories(spec, categories: pd.Index, codes: np.ndarray):
+        if categories.dtype == object and not all(isinstance(c, str) for c in categories):
+            raise TypeError("Categories must be strings")
+        # Smallest signed type that holds every code and the -1 NA sentinel
+        code_type = next(t for t in (np.int8, np.int16, np.int32, np.int64)
+                         if len(categories) <= np.iinfo(t).max)
+        codes = codes.astype(code_type, copy=False)
+        if categories.dtype == object:
+            spec['categories'] = [str(c) for c in categories]
+            return spec, [codes]
+        spec['categories'] = None
+        return spec, [codes, np.asarray(categories)]
+
+    def decode(self, payload: memoryview) -> pd.DataFrame:
+        (header_length,) = struct.unpack_from('<I', payload, 0)
+        header = json.loads(bytes(payload[4:4 + header_length]))
+        base = 4 + header_length
+
+        decoded = []
+        for spec in header['columns']:
+            arrays = [_npy_view(payload[base + start:base + start + length])
+                      for start, length in spec['buffers']]
+            decoded.append((spec, self._decode_column(spec, arrays, header['rows'])))
+
+        (index_spec, index_values), columns = decoded[0], decoded[1:]
+        index = pd.Index(index_values, copy=False)
+        index.name = self._label(index_spec)
+        data = {self._label(spec): values for spec, values in columns}
+        # copy=False keeps one block per column instead of consolidating,
+        # so numeric columns remain views over the payload
+        return pd.DataFrame(data, index=index, copy=False)
+
+    @staticmethod
+    def _label(spec):
+        label = spec['label']
+        return int(label) if spec['label_type'] == 'int' and label is not None else label
+
+    @staticmethod
+    def _decode_column(spec, arrays, rows: int):
+        kind = spec['kind']
+        if kind == 'range':
+            return pd.RangeIndex(spec['start'], spec['stop'], spec['step'])
+        if kind == 'values':
+            return arrays[0]
+        if kind == 'datetime':
+            return pd.DatetimeIndex(arrays[0].view(f"datetime64[{spec['unit']}]")) \
+                .tz_localize('UTC').tz_convert(spec['tz'])
+        categories = spec['categories'] if spec['categories'] is not None else arrays[1]
+        if kind == 'category':
+            return pd.Categorical.from_codes(arrays[0], categories=categories,
+                                             ordered=spec.get('ordered', False))
+        # The -1 sentinel selects the trailing missing value
+        missing = np.nan if spec.get('na') == 'nan' else None
+        lookup = np.array(list(categories) + [missing], dtype=object)
+        return lookup[arrays[0]]
+
+
+class ArrowSerializer(Serializer):
+    """Arrow IPC streams for DataFrames (requires ``pyarrow``)."""
+
+    name = 'arrow'
+    code = 4
+    columnar = True
+
+    def can_encode(self, value: Any) -> bool:
+        return PYARROW_AVAILABLE and isinstance(value, pd.DataFrame)
+
+    def encode(self, frame: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, payload: memoryview) -> pd.DataFrame:
+        reader = pa.ipc.open_stream(pa.py_buffer(payload))
+        return reader.read_all().to_pandas()
+
+
+class SerializerRegistry:
+    """Ordered set of serializers; the first one that accepts a value wins."""
+
+    def __init__(self, serializers: Optional[List[Serializer]] = None):
+        self._serializers: List[Serializer] = []
+        self._by_code: Dict[int, Serializer] = {}
+        self.fallback = PickleSerializer()
+        self._by_code[self.fallback.code] = self.fallback
+        for serializer in serializers or []:
+            self.register(serializer)
+
+    def register(self, serializer: Serializer, first: bool = False) -> None:
+        """Add ``serializer``; ``first`` gives it priority over existing ones."""
+        existing = self._by_code.get(serializer.code)
+        if existing is not None and existing.name != serializer.name:
+            raise ValueError(f"Format code {serializer.code} already used by {existing.name}")
+        self._serializers = [s for s in self._serializers if s.code != serializer.code]
+        if first:
+            self._serializers.insert(0, serializer)
+        else:
+            self._serializers.append(serializer)
+        self._by_code[serializer.code] = serializer
+
+    def serializer_for(self, value: Any) -> Serializer:
+        for serializer in self._serializers:
+            if serializer.can_encode(value):
+                return serializer
+        return self.fallback
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode ``value`` with its preferred serializer, falling back to pickle."""
+        serializer = self.serializer_for(value)
+        if serializer is not self.fallback:
+            try:
+                return MAGIC + bytes([serializer.code]) + serializer.encode(value)
+            except Exception as e:
+                logger.debug(f"{serializer.name} could not encode value, using pickle: {e}")
+        return MAGIC + bytes([self.fallback.code]) + self.fallback.encode(value)
+
+    def format_of(self, data: Buffer) -> Optional[Serializer]:
+        """Return the serializer that wrote ``data``, or None for legacy payloads."""
+        if len(data) < HEADER_SIZE or bytes(data[:len(MAGIC)]) != MAGIC:
+            return None
+        return self._by_code.get(data[len(MAGIC)])
+
+    def loads(self, data: Union[Buffer, str], writable: bool = False) -> Any:
+        """Decode a payload from :meth:`dumps` or a legacy pickle/JSON value.
+
+        Args:
+            data: Encoded payload. Columnar payloads decode to views over
+                this buffer: read-only for ``bytes``, while a copy-on-write
+                memory map (``ACCESS_COPY``) yields writable frames that copy
+                only the pages that are modified.
+            writable: Copy read-only buffers once so decoded arrays can be
+                modified like unpickled ones
+
+        Raises:
+            ValueError: If the payload has an unknown format code
+        """
+        if isinstance(data, str):
+            return json.loads(data)
+        view = memoryview(data)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            return pickle.loads(view)
+        serializer = self._by_code.get(view[len(MAGIC)])
+        if serializer is None:
+            raise ValueError(f"Unknown cache payload format {view[len(MAGIC)]}")
+        if serializer.columnar and writable and view.readonly:
+            view = memoryview(bytearray(view))
+        return serializer.decode(view[HEADER_SIZE:])
+
+
+def _default_registry() -> SerializerRegistry:
+    registry = SerializerRegistry([NpyFrameSerializer(), NumpySerializer()])
+    if PYARROW_AVAILABLE:
+        registry.register(ArrowSerializer(), first=True)
+    return registry
+
+
+default_registry = _default_registry()
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` with the default registry."""
+    return default_registry.dumps(value)
+
+
+def loads(data: Union[Buffer, str], writable: bool = False) -> Any:
+    """Decode a payload with the default registry."""
+    return default_registry.loads(data, writable)
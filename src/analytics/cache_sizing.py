@@ -0,0 +1,106 @@
+"""
+Structural size estimates for cached analytics values.
+
+The in-memory cache tier needs an approximate byte size for every value to
+enforce its memory budget. Serializing values just to measure them doubles
+the cost of caching a DataFrame, so sizes are estimated from the objects'
+own buffers instead: ``DataFrame.memory_usage``, ``ndarray.nbytes`` and a
+recursive walk over containers and dataclasses such as ``MetricStatistics``.
+Object columns and large containers are sized from a sample of their items
+rather than walked in full.
+"""
+
+import dataclasses
+import sys
+from typing import Any, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+# Containers longer than this are sized from a sample of their items
+SAMPLE_SIZE = 64
+
+
+def estimate_size(value: Any, deep: bool = True, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the memory footprint of ``value`` in bytes.
+
+    Args:
+        value: Object to size
+        deep: Include the contents of object-dtype pandas columns (string
+            columns are otherwise counted as pointers only)
+
+    Returns:
+        Approximate size in bytes; shared objects are counted once
+    """
+    if _seen is None:
+        _seen = set()
+    obj_id = id(value)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes,
+                                           bytearray, np.generic)):
+        return sys.getsizeof(value)
+
+    if isinstance(value, pd.DataFrame):
+        # Shallow usage counts object columns as pointers; add their sampled
+        # payload instead of pandas' deep walk over every element
+        size = int(value.memory_usage(index=False, deep=False).sum())
+        size += estimate_size(value.index, deep, _seen)
+        if deep:
+            for position in np.flatnonzero((value.dtypes == object).values):
+                size += _sampled(value.iloc[:, position].values, deep, _seen)
+        return size
+
+    if isinstance(value, (pd.Series, pd.Index)):
+        size = int(value.memory_usage(index=False, deep=False) if isinstance(value, pd.Series)
+                   else value.memory_usage(deep=False))
+        if isinstance(value, pd.Series):
+            size += estimate_size(value.index, deep, _seen)
+        if deep and value.dtype == object:
+            size += _sampled(value.values, deep, _seen)
+        return size
+
+    if isinstance(value, np.ndarray):
+        size = sys.getsizeof(value) if value.base is None else value.nbytes + 112
+        if value.dtype == object and value.size:
+            size += _sampled(value.ravel(), deep, _seen)
+        return size
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        size = sys.getsizeof(value)
+        for field in dataclasses.fields(value):
+            size += estimate_size(getattr(value, field.name, None), deep, _seen)
+        return size
+
+    if isinstance(value, dict):
+        size = sys.getsizeof(value)
+        if value:
+            size += _sampled(list(value.keys()), deep, _seen)
+            size += _sampled(list(value.values()), deep, _seen)
+        return size
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size = sys.getsizeof(value)
+        if value:
+            items = value if isinstance(value, (list, tuple)) else list(value)
+            size += _sampled(items, deep, _seen)
+        return size
+
+    size = sys.getsizeof(value)
+    attributes = getattr(value, '__dict__', None)
+    if attributes:
+        size += estimate_size(attributes, deep, _seen)
+    return size
+
+
+def _sampled(items, deep: bool, seen: Set[int]) -> int:
+    """Size a sequence, extrapolating from evenly spaced items when long."""
+    n = len(items)
+    if n <= SAMPLE_SIZE:
+        return sum(estimate_size(item, deep, seen) for item in items)
+    step = n / SAMPLE_SIZE
+    sample = sum(estimate_size(items[int(i * step)], deep, seen) for i in range(SAMPLE_SIZE))
+    return int(sample * n / SAMPLE_SIZE)
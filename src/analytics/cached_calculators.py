@@ -511,22 +511,14 @@ class CacheInvalidationManager:
         self.cache_manager = get_cache_manager()
     
     def invalidate_metric_data(self, metric: str, start_date: date = None, end_date: date = None) -> Dict[str, int]:
-        """Invalidate all cache entries for a specific metric and date range."""
+        """Invalidate cache entries for a specific metric and date range.
         
-        patterns = [f"metric:{metric}"]
-        
-        if start_date and end_date:
-            patterns.append(f"date_range:{start_date}:{end_date}")
-        elif start_date:
-            patterns.append(f"date_range:{start_date}")
-        elif end_date:
-            patterns.append(f"date_range.*:{end_date}")
-        
-        results = {}
-        for pattern in patterns:
-            result = self.cache_manager.invalidate_pattern(pattern)
-            for tier, count in result.items():
-                results[f"{tier}_{pattern}"] = count
+        Bumps the metric's data version for the range and evicts only the
+        entries whose dependencies overlap it; open bounds extend the range
+        to the start or end of the data.
+        """
+        self.cache_manager.data_versions.bump(metric, start_date, end_date)
+        results = self.cache_manager.invalidate_range(metric, start_date, end_date)
         
         logger.info(f"Invalidated cache for metric {metric}: {results}")
         return results
@@ -534,8 +526,8 @@ class CacheInvalidationManager:
     def invalidate_date_range(self, start_date: date, end_date: date) -> Dict[str, int]:
         """Invalidate all cache entries for a date range."""
         
-        pattern = f"date_range:{start_date}:{end_date}"
-        results = self.cache_manager.invalidate_pattern(pattern)
+        self.cache_manager.data_versions.bump(None, start_date, end_date)
+        results = self.cache_manager.invalidate_range(None, start_date, end_date)
         
         logger.info(f"Invalidated cache for date range {start_date} to {end_date}: {results}")
         return results
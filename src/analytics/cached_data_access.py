@@ -19,7 +19,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from datetime import date, datetime
 
-from src.analytics.cache_manager import get_cache_manager, cache_key
+from src.analytics.cache_manager import get_cache_manager
 from src.analytics.daily_metrics_calculator import MetricStatistics
 
 logger = logging.getLogger(__name__)
@@ -59,11 +59,8 @@ class CachedDataAccess:
             cached_metrics = CachedMetricsAccess()
             return cached_metrics.get_daily_summary(metric, target_date, source_name)
         
-        # Otherwise use the original cache manager approach for backward compatibility
-        key = cache_key('daily_summary', metric, target_date.isoformat())
-        
-        # Get from L2 cache (SQLite) directly since import stores there
-        result = self.cache_manager.l2_cache.get(key)
+        # Otherwise read the columnar summary table cached during import
+        result = self.cache_manager.get_import_summary('daily', metric, target_date.isoformat())
         
         if result is None:
             # Try CachedMetricsAccess as fallback
@@ -71,12 +68,7 @@ class CachedDataAccess:
             cached_metrics = CachedMetricsAccess()
             return cached_metrics.get_daily_summary(metric, target_date)
             
-        # Parse JSON result from cache
-        try:
-            return json.loads(result) if isinstance(result, str) else result
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing cached daily summary: {e}")
-            return None
+        return result
             
     def get_weekly_summary(self, metric: str, week: str) -> Optional[Dict[str, Any]]:
         """Get weekly summary statistics from cache.
@@ -88,9 +80,7 @@ class CachedDataAccess:
         Returns:
             Dict with summary statistics or None if not cached
         """
-        key = cache_key('weekly_summary', metric, week)
-        
-        result = self.cache_manager.l2_cache.get(key)
+        result = self.cache_manager.get_import_summary('weekly', metric, week)
         
         if result is None:
             self._cache_misses += 1
@@ -98,13 +88,8 @@ class CachedDataAccess:
                 f"Cache miss for weekly summary: {metric} for {week}. "
                 f"Total misses: {self._cache_misses}"
             )
-            return None
             
-        try:
-            return json.loads(result) if isinstance(result, str) else result
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing cached weekly summary: {e}")
-            return None
+        return result
             
     def get_monthly_summary(self, metric: str, month: str) -> Optional[Dict[str, Any]]:
         """Get monthly summary statistics from cache.
@@ -116,9 +101,7 @@ class CachedDataAccess:
         Returns:
             Dict with summary statistics or None if not cached
         """
-        key = cache_key('monthly_summary', metric, month)
-        
-        result = self.cache_manager.l2_cache.get(key)
+        result = self.cache_manager.get_import_summary('monthly', metric, month)
         
         if result is None:
             self._cache_misses += 1
@@ -126,13 +109,8 @@ class CachedDataAccess:
                 f"Cache miss for monthly summary: {metric} for {month}. "
                 f"Total misses: {self._cache_misses}"
             )
-            return None
             
-        try:
-            return json.loads(result) if isinstance(result, str) else result
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing cached monthly summary: {e}")
-            return None
+        return result
             
     def get_available_sources(self) -> List[str]:
         """Get list of available data sources from cache.
@@ -187,10 +165,9 @@ class CachedDataAccess:
             metrics = set()
             import sqlite3
             with sqlite3.connect(self.cache_manager.l2_cache.db_path) as conn:
+                # Summary tables are keyed '<granularity>_summary|<metric>'
                 cursor = conn.execute("""
-                    SELECT DISTINCT 
-                        SUBSTR(key, INSTR(key, '|') + 1, 
-                               INSTR(SUBSTR(key, INSTR(key, '|') + 1), '|') - 1) as metric
+                    SELECT DISTINCT SUBSTR(key, INSTR(key, '|') + 1) as metric
                     FROM cache_entries
                     WHERE key LIKE '%_summary|%'
                 """)
@@ -215,23 +192,13 @@ class CachedDataAccess:
             Dict with 'start' and 'end' dates, or None if no data
         """
         try:
-            # Query daily summaries to find date range
-            import sqlite3
-            with sqlite3.connect(self.cache_manager.l2_cache.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT 
-                        MIN(SUBSTR(key, -10)) as start_date,
-                        MAX(SUBSTR(key, -10)) as end_date
-                    FROM cache_entries
-                    WHERE key LIKE 'daily_summary|' || ? || '|%'
-                """, (metric,))
-                
-                row = cursor.fetchone()
-                if row and row[0] and row[1]:
-                    return {
-                        'start': date.fromisoformat(row[0]),
-                        'end': date.fromisoformat(row[1])
-                    }
+            # The daily summary table is indexed by sorted ISO dates
+            table = self.cache_manager.get_import_summary_table('daily', metric)
+            if table is not None and len(table):
+                return {
+                    'start': date.fromisoformat(table.index[0]),
+                    'end': date.fromisoformat(table.index[-1])
+                }
                     
         except Exception as e:
             logger.error(f"Error getting date range for {metric}: {e}")
@@ -248,8 +215,8 @@ class CachedDataAccess:
         Returns:
             True if cached data exists
         """
-        key = cache_key('daily_summary', metric, target_date.isoformat())
-        return self.cache_manager.l2_cache.get(key) is not None
+        return self.cache_manager.get_import_summary(
+            'daily', metric, target_date.isoformat()) is not None
         
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Get statistics about cache usage and performance.
@@ -0,0 +1,228 @@
+"""
+Registry of metric calculators keyed by a content fingerprint of their data.
+
+Building ``DailyMetricsCalculator`` re-prepares every record (timestamp
+parsing, timezone conversion, sorting), and the weekly, monthly and cached
+calculators wrap it, so a dashboard refresh should reuse an existing set
+whenever the data is identical and build a new one only when it is not.
+The registry keys calculator sets by ``fingerprint_frame`` of the data plus
+the timezone, and keeps the few most recent sets so switching back to a
+previous filter is free. When the data changes but every row is already in a
+kept set, as after narrowing the date window or dropping a metric, an
+optional ``derive`` callback builds the new set from that set's prepared rows
+instead of preparing the records again.
+
+Example:
+    >>> registry = CalculatorRegistry(build_calculators, derive=derive_calculators)
+    >>> calculators = registry.get(filtered_data, timezone='US/Eastern')
+    >>> calculators['daily'].calculate_statistics('HKQuantityTypeIdentifierStepCount')
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.data_fingerprint import fingerprint_frame
+
+logger = logging.getLogger(__name__)
+
+CalculatorSet = Dict[str, Any]
+
+
+class CalculatorRegistry:
+    """LRU registry of calculator sets keyed by (data fingerprint, timezone).
+
+    Fingerprints are memoized per DataFrame object, so the several tabs
+    refreshed from one filtered frame hash it once. Frames handed to the
+    registry are treated as immutable; a frame modified in place after its
+    first lookup must be passed as a new object (for example via ``copy()``).
+
+    The lock only guards bookkeeping: a set is built outside it, and
+    concurrent lookups of the same key wait for that one build while lookups
+    of other keys proceed.
+
+    Attributes:
+        hits: Lookups answered by an existing calculator set
+        builds: Calculator sets built by ``factory``
+        derived: Calculator sets built by ``derive`` from a kept set's rows
+    """
+
+    def __init__(self, factory: Callable[[pd.DataFrame, str], CalculatorSet],
+                 max_entries: int = 3,
+                 derive: Optional[Callable[[CalculatorSet, np.ndarray, str],
+                                           CalculatorSet]] = None):
+        """
+        Args:
+            factory: Builds a calculator set from ``(data, timezone)``
+            max_entries: Number of calculator sets kept alive
+            derive: Builds a calculator set from ``(calculators, rows, timezone)``,
+                where ``rows`` holds, for each row of the new data, its
+                position in the data ``calculators`` were built from. None
+                to always use ``factory``.
+        """
+        self.factory = factory
+        self.derive = derive
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], CalculatorSet] = OrderedDict()
+        # Row hash -> first position in the entry's data, for derive
+        self._row_positions: Dict[Tuple[str, str], pd.Series] = {}
+        self._fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._building: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.builds = 0
+        self.derived = 0
+        self.fingerprint_seconds = 0.0
+        self.build_seconds = 0.0
+
+    def fingerprint(self, data: pd.DataFrame) -> str:
+        """Return the content fingerprint of ``data``, memoized per object."""
+        key = id(data)
+        with self._lock:
+            memo = self._fingerprints.get(key)
+            if memo is not None and memo[0]() is data:
+                return memo[1]
+
+        start = time.perf_counter()
+        fingerprint = fingerprint_frame(data, include_index=False)
+        self.fingerprint_seconds += time.perf_counter() - start
+
+        with self._lock:
+            try:
+                ref = weakref.ref(data, lambda _, key=key: self._fingerprints.pop(key, None))
+            except TypeError:
+                return fingerprint
+            self._fingerprints[key] = (ref, fingerprint)
+        return fingerprint
+
+    def get(self, data: Optional[pd.DataFrame], timezone: str = 'UTC') -> Optional[CalculatorSet]:
+        """Return the calculator set for ``data``, building it if needed.
+
+        Args:
+            data: Health records the calculators operate on
+            timezone: Timezone passed to the factory; part of the key
+
+        Returns:
+            Calculator set from the factory, or None when ``data`` is None
+        """
+        if data is None:
+            return None
+
+        key = (self.fingerprint(data), timezone)
+        with self._lock:
+            calculators = self._entries.get(key)
+            if calculators is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.debug("Using cached calculators")
+                return calculators
+            future = self._building.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._building[key] = future
+                kept = self._kept_for(timezone) if self.derive is not None else []
+
+        if not leader:
+            calculators = future.result()
+            with self._lock:
+                self.hits += 1
+            return calculators
+
+        try:
+            start = time.perf_counter()
+            row_hashes = self._row_hashes(data) if self.derive is not None else None
+            calculators = None
+            if row_hashes is not None:
+                calculators = self._derive_from_kept(kept, row_hashes, timezone)
+            if calculators is None:
+                logger.debug("Creating new calculators due to data change")
+                calculators = self.factory(data, timezone)
+                built = True
+            else:
+                built = False
+            elapsed = time.perf_counter() - start
+        except BaseException as e:
+            with self._lock:
+                if self._building.get(key) is future:
+                    del self._building[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if built:
+                self.builds += 1
+            else:
+                self.derived += 1
+            self.build_seconds += elapsed
+            # A clear() during the build detaches it; the result is still
+            # returned but not kept
+            if self._building.get(key) is future:
+                del self._building[key]
+                self._entries[key] = calculators
+                if row_hashes is not None:
+                    positions = pd.Series(np.arange(len(row_hashes)), index=row_hashes)
+                    self._row_positions[key] = positions[~positions.index.duplicated()]
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._row_positions.pop(evicted, None)
+        future.set_result(calculators)
+        return calculators
+
+    def _kept_for(self, timezone: str) -> List[Tuple[CalculatorSet, pd.Series]]:
+        """Kept sets for ``timezone`` with their row positions, newest first."""
+        return [(self._entries[key], self._row_positions[key])
+                for key in reversed(self._entries)
+                if key[1] == timezone and key in self._row_positions]
+
+    @staticmethod
+    def _row_hashes(data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Hash each row's content, or None if a column cannot be hashed."""
+        try:
+            return pd.util.hash_pandas_object(data, index=False).to_numpy()
+        except TypeError as e:
+            logger.debug(f"Rows cannot be hashed, calculators will be rebuilt: {e}")
+            return None
+
+    def _derive_from_kept(self, kept: List[Tuple[CalculatorSet, pd.Series]],
+                          row_hashes: np.ndarray,
+                          timezone: str) -> Optional[CalculatorSet]:
+        """Derive a set from the most recent kept set holding every row."""
+        for source, positions in kept:
+            found = positions.index.get_indexer(row_hashes)
+            if (found < 0).any():
+                continue
+            logger.debug("Deriving calculators from the rows of a kept set")
+            try:
+                return self.derive(source, positions.to_numpy()[found], timezone)
+            except Exception as e:
+                logger.warning(f"Could not derive calculators, rebuilding: {e}")
+                return None
+        return None
+
+    def clear(self) -> None:
+        """Drop all calculator sets, e.g. after the database is replaced."""
+        with self._lock:
+            self._entries.clear()
+            self._row_positions.clear()
+            self._fingerprints.clear()
+            self._building.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return reuse counters and time spent fingerprinting and building."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'builds': self.builds,
+                'derived': self.derived,
+                'fingerprint_seconds': self.fingerprint_seconds,
+                'build_seconds': self.build_seconds,
+            }
@@ -0,0 +1,401 @@
+"""
+Parallel chart rendering for reports and chart exports.
+
+Rasterizing a matplotlib figure is CPU bound and holds the GIL, so a
+report with twenty metric charts spends most of its time rendering them
+one after another. The render farm describes each chart as a picklable
+``ChartSpec`` (plain arrays, labels and a style dictionary) and renders
+the specs in a pool of worker processes on the Agg backend. Workers use
+the object-oriented ``Figure`` API and never touch pyplot or Qt.
+
+Rendered PNG/SVG/PDF bytes are cached by (kind, metric, date range, style,
+DPI, format, size, data version), so exporting the same charts again, or
+the same metric into a report and a chart export, renders them once.
+Callers consume results as they complete and can assemble documents
+meanwhile.
+
+Example:
+    >>> farm = ChartRenderFarm(max_workers=4)
+    >>> specs = [metric_chart_spec(m, frames[m], date_range, style) for m in metrics]
+    >>> for spec, image in farm.render_as_completed(specs):
+    ...     charts[spec.metric] = image
+"""
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.data_fingerprint import fingerprint_frame
+
+logger = logging.getLogger(__name__)
+
+# Style values taken from WSJStyleManager so workers need not import Qt
+DEFAULT_STYLE = {
+    'name': 'wsj_publication',
+    'primary': '#FF8C42',
+    'palette': ['#FF8C42', '#FFD166', '#95C17B', '#E76F51', '#A8A8A8'],
+    'surface': '#FAF8F5',
+    'grid': '#E8DCC8',
+    'text_primary': '#2C2C2C',
+    'text_secondary': '#666666',
+    'title_size': 18,
+    'label_size': 12,
+    'tick_size': 10,
+}
+
+
+@dataclass
+class ChartSeries:
+    """One line of a chart."""
+
+    name: str
+    x: np.ndarray
+    y: np.ndarray
+
+
+@dataclass
+class ChartSpec:
+    """Everything a worker needs to render one chart.
+
+    Attributes:
+        kind: 'line' (line with a light fill) or 'overview' (several lines
+            with a legend)
+        metric: Metric name, or a label such as 'overview' for combined charts
+        data_version: Content fingerprint of the plotted data
+    """
+
+    kind: str
+    metric: str
+    title: str
+    series: List[ChartSeries]
+    date_range: Tuple[str, str] = ('', '')
+    x_label: str = 'Date'
+    y_label: str = 'Value'
+    size: Tuple[float, float] = (10, 6)
+    dpi: int = 300
+    format: str = 'png'
+    style: Dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_STYLE))
+    data_version: str = ''
+    description: str = ''
+
+    @property
+    def cache_key(self) -> Tuple:
+        """Key covering everything that changes the rendered image."""
+        return (self.kind, self.metric, self.date_range, self.title, self.x_label,
+                self.y_label, self.style_digest, self.dpi, self.format, tuple(self.size),
+                self.data_version)
+
+    @property
+    def style_digest(self) -> str:
+        """Stable digest of the whole style dictionary."""
+        encoded = json.dumps(self.style, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def style_from_manager(style_manager: Any) -> Dict[str, Any]:
+    """Return the render style dictionary for a ``WSJStyleManager``."""
+    style = dict(DEFAULT_STYLE)
+    palette = getattr(style_manager, 'WARM_PALETTE', None)
+    if palette:
+        for key in ('primary', 'surface', 'grid', 'text_primary', 'text_secondary'):
+            style[key] = palette.get(key, style[key])
+        style['palette'] = [palette.get(key, style['primary']) for key in
+                            ('primary', 'secondary', 'positive', 'negative', 'neutral')]
+    typography = getattr(style_manager, 'TYPOGRAPHY', None)
+    if typography:
+        style['title_size'] = typography['title']['size']
+        style['label_size'] = typography['axis_label']['size']
+        style['tick_size'] = typography['tick_label']['size']
+    return style
+
+
+def _date_range_key(date_range) -> Tuple[str, str]:
+    return tuple(str(bound) for bound in date_range) if date_range else ('', '')
+
+
+def metric_chart_spec(metric: str, data: pd.DataFrame, date_range=None,
+                      style: Optional[Dict[str, Any]] = None, **options) -> ChartSpec:
+    """Build the spec of a single-metric chart from its records.
+
+    Args:
+        metric: Metric name
+        data: Records indexed by time with a ``value`` column
+        date_range: Exported (start, end); part of the cache key
+        style: Style dictionary; ``DEFAULT_STYLE`` when None
+        **options: Other ``ChartSpec`` fields (title, size, dpi, format, ...)
+    """
+    unit = data['unit'].iloc[0] if 'unit' in data.columns and len(data) else 'Value'
+    options.setdefault('title', metric.replace('_', ' ').title())
+    options.setdefault('y_label', unit)
+    return ChartSpec(
+        kind=options.pop('kind', 'line'),
+        metric=metric,
+        series=[ChartSeries(metric, data.index.to_numpy(),
+                            data['value'].to_numpy(dtype=np.float64, na_value=np.nan))],
+        date_range=_date_range_key(date_range),
+        style=dict(style or DEFAULT_STYLE),
+        data_version=fingerprint_frame(data[['value']]),
+        **options)
+
+
+def overview_chart_spec(frames: Dict[str, pd.DataFrame], date_range=None,
+                        style: Optional[Dict[str, Any]] = None, max_series: int = 4,
+                        **options) -> Optional[ChartSpec]:
+    """Build the spec of the normalized multi-metric overview chart.
+
+    Each metric is z-scored and averaged per day, as the report overview
+    has always shown it. Returns None when no metric has values.
+    """
+    series, versions = [], []
+    for metric, data in frames.items():
+        if data is None or data.empty or 'value' not in data.columns:
+            continue
+        values = data['value']
+        daily = ((values - values.mean()) / values.std()).resample('D').mean()
+        series.append(ChartSeries(metric.replace('_', ' ').title(),
+                                  daily.index.to_numpy(), daily.to_numpy(dtype=np.float64)))
+        versions.append(fingerprint_frame(data[['value']]))
+        if len(series) == max_series:
+            break
+    if not series:
+        return None
+    options.setdefault('title', 'Health Metrics Overview')
+    options.setdefault('y_label', 'Normalized Value')
+    options.setdefault('description', 'Normalized comparison of health metrics over time')
+    return ChartSpec(kind='overview', metric='overview', series=series,
+                     date_range=_date_range_key(date_range), style=dict(style or DEFAULT_STYLE),
+                     data_version='/'.join(versions), **options)
+
+
+def render_chart(spec: ChartSpec) -> bytes:
+    """Render ``spec`` to image bytes on the Agg backend.
+
+    Module level so it can run in worker processes.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    style = spec.style
+    figure = Figure(figsize=spec.size, facecolor=style['surface'])
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_facecolor(style['surface'])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.grid(True, linestyle='--', color=style['grid'], alpha=0.5, linewidth=0.5)
+    ax.set_axisbelow(True)
+    ax.tick_params(colors=style['text_secondary'], labelsize=style['tick_size'], length=0)
+
+    palette = style['palette']
+    for i, series in enumerate(spec.series):
+        color = palette[i % len(palette)]
+        ax.plot(series.x, series.y, linewidth=2, color=color, label=series.name)
+        if spec.kind == 'line':
+            ax.fill_between(series.x, series.y, alpha=0.1, color=color)
+
+    ax.set_title(spec.title, fontsize=style['title_size'], color=style['text_primary'])
+    ax.set_xlabel(spec.x_label, fontsize=style['label_size'], color=style['text_secondary'])
+    ax.set_ylabel(spec.y_label, fontsize=style['label_size'], color=style['text_secondary'])
+    if spec.kind == 'overview':
+        ax.legend(loc='best', frameon=False)
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=spec.format, dpi=spec.dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+class ChartRenderFarm:
+    """Renders chart specs in worker processes with a byte-budgeted cache.
+
+    The process pool is created on first use and reused across exports.
+    With ``max_workers=0``, or when the pool cannot be started or breaks,
+    charts are rendered on the calling thread.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_mb: float = 64.0):
+        """
+        Args:
+            max_workers: Worker processes; defaults to the available CPUs
+                (at most 4), or 0 on a single CPU; 0 renders on the
+                calling thread
+            cache_mb: Memory budget of rendered images kept for reuse
+        """
+        if max_workers is None:
+            cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') \
+                else (os.cpu_count() or 1)
+            max_workers = min(4, cpus) if cpus > 1 else 0
+        self.max_workers = max_workers
+        self.cache_bytes = int(cache_mb * 1024 * 1024)
+        self._cache: OrderedDict[Tuple, bytes] = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self.hits = 0
+        self.renders = 0
+
+    # Cache
+
+    def get_cached(self, spec: ChartSpec) -> Optional[bytes]:
+        with self._lock:
+            image = self._cache.get(spec.cache_key)
+            if image is not None:
+                self._cache.move_to_end(spec.cache_key)
+                self.hits += 1
+            return image
+
+    def _store(self, spec: ChartSpec, image: bytes) -> None:
+        if len(image) > self.cache_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(spec.cache_key, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous)
+            self._cache[spec.cache_key] = image
+            self._cached_bytes += len(image)
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    # Rendering
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.max_workers == 0:
+            return None
+        if self._executor is None:
+            try:
+                # Spawned workers do not inherit Qt state or threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Chart render pool unavailable, rendering inline: {e}")
+                self.max_workers = 0
+                return None
+        return self._executor
+
+    def _render_inline(self, spec: ChartSpec) -> Optional[bytes]:
+        try:
+            return render_chart(spec)
+        except Exception as e:
+            logger.error(f"Error rendering chart for {spec.metric}: {e}")
+            return None
+
+    def submit(self, specs: Iterable[ChartSpec]) -> 'RenderBatch':
+        """Start rendering ``specs`` in the background and return a handle."""
+        return RenderBatch(self, list(specs))
+
+    def render_as_completed(self, specs: Iterable[ChartSpec]
+                            ) -> Iterator[Tuple[ChartSpec, Optional[bytes]]]:
+        """Yield (spec, image bytes) as charts finish; cached charts come first."""
+        return self.submit(specs).as_completed()
+
+    def render_all(self, specs: Sequence[ChartSpec]) -> List[Optional[bytes]]:
+        """Render ``specs`` in parallel and return images in spec order."""
+        return self.submit(specs).results()
+
+    def _finish(self, spec: ChartSpec, image: Optional[bytes]) -> None:
+        if image is not None:
+            self.renders += 1
+            self._store(spec, image)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'workers': self.max_workers, 'cached_charts': len(self._cache),
+                    'cached_bytes': self._cached_bytes, 'hits': self.hits,
+                    'renders': self.renders}
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class RenderBatch:
+    """Charts submitted together to a ``ChartRenderFarm``.
+
+    Uncached charts are submitted to the pool when the batch is created,
+    so the caller can do other work (gathering insights, laying out a
+    document) while they render. A chart that fails to render yields None
+    instead of raising.
+    """
+
+    def __init__(self, farm: ChartRenderFarm, specs: List[ChartSpec]):
+        self.farm = farm
+        self.specs = specs
+        self._ready: List[Tuple[int, Optional[bytes]]] = []
+        self._inline: List[int] = []
+        self._futures: Dict[Future, int] = {}
+
+        pending = []
+        for position, spec in enumerate(specs):
+            image = farm.get_cached(spec)
+            if image is not None:
+                self._ready.append((position, image))
+            else:
+                pending.append(position)
+
+        executor = farm._get_executor() if len(pending) > 1 else None
+        if executor is None:
+            self._inline = pending
+        else:
+            self._futures = {executor.submit(render_chart, specs[position]): position
+                             for position in pending}
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def as_completed(self) -> Iterator[Tuple[ChartSpec, Optional[bytes]]]:
+        """Yield (spec, image bytes) in completion order."""
+        for position, image in self._ready:
+            yield self.specs[position], image
+        for position in self._inline:
+            spec = self.specs[position]
+            image = self.farm._render_inline(spec)
+            self.farm._finish(spec, image)
+            yield spec, image
+        for future in as_completed(self._futures):
+            spec = self.specs[self._futures[future]]
+            try:
+                image = future.result()
+            except BrokenProcessPool as e:
+                logger.warning(f"Chart render pool failed, rendering inline: {e}")
+                self.farm.shutdown()
+                self.farm.max_workers = 0
+                image = self.farm._render_inline(spec)
+            except Exception as e:
+                logger.error(f"Error rendering chart for {spec.metric}: {e}")
+                image = None
+            self.farm._finish(spec, image)
+            yield spec, image
+
+    def results(self) -> List[Optional[bytes]]:
+        """Wait for every chart and return images in submission order."""
+        images: List[Optional[bytes]] = [None] * len(self.specs)
+        positions = {id(spec): i for i, spec in enumerate(self.specs)}
+        for spec, image in self.as_completed():
+            images[positions[id(spec)]] = image
+        return images
@@ -336,6 +336,22 @@ class DailyMetricsCalculator:
             )
         
         self._prepare_data()
+    
+    @classmethod
+    def from_prepared(cls, data: pd.DataFrame, timezone: str = 'UTC') -> 'DailyMetricsCalculator':
+        """Create a calculator over rows another calculator already prepared.
+        
+        Skips timestamp parsing and type conversion, so selecting a subset of
+        an existing calculator's ``data`` costs only the selection.
+        
+        Args:
+            data: Rows of a calculator's ``data`` prepared for ``timezone``
+            timezone: Timezone the rows were prepared for
+        """
+        calculator = cls.__new__(cls)
+        calculator.data = data
+        calculator.timezone = normalize_timezone(timezone)
+        return calculator
         
     def _prepare_data(self):
         """Prepare data for analysis by ensuring proper types and indexing.
@@ -0,0 +1,452 @@
+"""
+Data version tracking for dependency-aware cache invalidation.
+
+Every import bumps a version counter for each (metric, day range) it touched.
+Cached analytics results embed the version of the data they were computed
+from in their cache key, so a result computed before an import can never be
+returned after it, and the cache tiers index each entry's (metric, day range)
+dependencies so only entries overlapping the changed days are evicted.
+Importing one new day of step counts therefore leaves cached results for
+earlier months untouched.
+
+Dependencies use the string format produced by ``cached_calculators``:
+
+- ``metric:<name>``
+- ``date:<YYYY-MM-DD>``
+- ``date_range:<start>:<end>`` (either bound may be ``None``)
+- ``week:<year>:<iso week>``
+- ``month:<year>:<month>``
+- ``period_end:<year>:<month>`` (open start)
+
+Example:
+    >>> registry = DataVersionRegistry("analytics_cache.db")
+    >>> version = registry.bump("HKQuantityTypeIdentifierStepCount", "2024-06-01", "2024-06-01")
+    >>> registry.version_for(["metric:HKQuantityTypeIdentifierStepCount",
+    ...                       "month:2024:5"])
+    0
+"""
+
+import calendar
+import logging
+import re
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[date, datetime, str, None]
+# (metric, first day, last day); None metric matches every metric and None
+# bounds are open-ended
+DependencySpan = Tuple[Optional[str], Optional[str], Optional[str]]
+
+_ISO_DAY = re.compile(r"\d{4}-\d{2}-\d{2}|None")
+
+
+def normalize_day(value: DateLike) -> Optional[str]:
+    """Return ``value`` as an ISO day string (None stays None)."""
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    value = str(value)
+    return None if value in ('', 'None') else value[:10]
+
+
+def _parse_span(dependency: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """Parse a date-like dependency into a (first day, last day) span."""
+    kind, _, rest = dependency.partition(':')
+    try:
+        if kind == 'date':
+            day = normalize_day(rest)
+            return day, day
+        if kind == 'date_range':
+            bounds = _ISO_DAY.findall(rest)
+            if len(bounds) != 2:
+                return None, None
+            return normalize_day(bounds[0]), normalize_day(bounds[1])
+        if kind in ('month', 'period_end'):
+            year, month = (int(part) for part in rest.split(':'))
+            last = date(year, month, calendar.monthrange(year, month)[1]).isoformat()
+            if kind == 'period_end':
+                return None, last
+            return date(year, month, 1).isoformat(), last
+        if kind == 'week':
+            year, week = (int(part) for part in rest.split(':'))
+            monday = date.fromisocalendar(year, week, 1)
+            return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+    except (TypeError, ValueError):
+        # Unparseable bounds; treat as depending on all days
+        return None, None
+    return None
+
+
+def parse_dependencies(dependencies: Optional[Iterable[str]]) -> List[DependencySpan]:
+    """
+    Convert dependency strings into (metric, first day, last day) spans.
+
+    Args:
+        dependencies: Dependency strings attached to a cache entry
+
+    Returns:
+        One span per metric dependency, or a single metric-agnostic span when
+        the entry only depends on a date range. Entries without metric or date
+        dependencies yield no spans.
+    """
+    metrics: List[str] = []
+    start: Optional[str] = None
+    end: Optional[str] = None
+    has_span = False
+
+    for dependency in dependencies or []:
+        if dependency.startswith('metric:'):
+            metrics.append(dependency[len('metric:'):])
+            continue
+        span = _parse_span(dependency)
+        if span is None:
+            continue
+        # Several date dependencies narrow the span to their intersection
+        if has_span:
+            start = max(filter(None, (start, span[0])), default=None)
+            end = min(filter(None, (end, span[1])), default=None)
+        else:
+            start, end = span
+            has_span = True
+
+    if metrics:
+        return [(metric, start, end) for metric in dict.fromkeys(metrics)]
+    if has_span:
+        return [(None, start, end)]
+    return []
+
+
+def spans_overlap(span_start: Optional[str], span_end: Optional[str],
+                  start: Optional[str], end: Optional[str]) -> bool:
+    """Return True if two day spans (with open None bounds) intersect."""
+    if start is not None and span_end is not None and span_end < start:
+        return False
+    if end is not None and span_start is not None and span_start > end:
+        return False
+    return True
+
+
+# Sentinels for open bounds; they sort before and after every ISO day
+_OPEN_START = ''
+_OPEN_END = '~'
+
+
+def _bound(day: Optional[str], sentinel: str) -> str:
+    """Return ``day`` if it is a valid ISO day, otherwise the open-bound sentinel."""
+    if day is None:
+        return sentinel
+    try:
+        date.fromisoformat(day)
+    except ValueError:
+        logger.debug(f"Treating unparseable day {day!r} as an open bound")
+        return sentinel
+    return day
+
+
+def _shift_day(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+class _VersionMap:
+    """
+    Latest version of every day of one metric, as sorted disjoint segments.
+
+    A bump overwrites the days it covers: older segments it overlaps are
+    trimmed or dropped, so overlapping bumps merge into one segment and the
+    map never holds more segments than there are bump boundaries. Adjacent
+    segments keep their own versions, so a new day does not change the
+    version of the days before it. Lookups bisect the segment bounds.
+    """
+
+    def __init__(self):
+        self.starts: List[str] = []
+        self.ends: List[str] = []
+        self.versions: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def latest(self, start: str, end: str) -> int:
+        """Highest version of any segment intersecting [start, end]."""
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        return max(self.versions[lo:hi], default=0)
+
+    def assign(self, start: str, end: str, version: int
+               ) -> Tuple[List[Tuple[str, str, int]], List[Tuple[str, str, int]]]:
+        """
+        Give the days in [start, end] ``version``.
+
+        Returns:
+            The segments the bump overlapped, and the trimmed pieces of them
+            that survive outside [start, end]
+        """
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        replaced = list(zip(self.starts[lo:hi], self.ends[lo:hi], self.versions[lo:hi]))
+        pieces: List[Tuple[str, str, int]] = []
+        if lo < hi:
+            if self.starts[lo] < start:
+                pieces.append((self.starts[lo], _shift_day(start, -1), self.versions[lo]))
+            if self.ends[hi - 1] > end:
+                pieces.append((_shift_day(end, 1), self.ends[hi - 1], self.versions[hi - 1]))
+
+        segments = sorted(pieces + [(start, end, version)])
+        self.starts[lo:hi] = [segment[0] for segment in segments]
+        self.ends[lo:hi] = [segment[1] for segment in segments]
+        self.versions[lo:hi] = [segment[2] for segment in segments]
+        return replaced, pieces
+
+
+class DataVersionRegistry:
+    """
+    Per-metric data versions over day ranges, persisted in SQLite.
+
+    Versions come from one monotonically increasing counter, so the version
+    of any (metric, day range) is the latest bump overlapping it and changes
+    whenever data inside the range changes.
+    """
+
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            db_path: SQLite database storing the version log (None keeps
+                versions in memory only)
+        """
+        self.db_path = Path(db_path) if db_path is not None else None
+        self._lock = threading.Lock()
+        self._maps: Dict[Optional[str], _VersionMap] = {}
+        self._current = 0
+        self._load()
+
+    @property
+    def current_version(self) -> int:
+        """Latest version issued by any bump."""
+        return self._current
+
+    def _load(self) -> None:
+        """Create the version table and load existing bumps."""
+        if self.db_path is None:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS data_versions (
+                        metric TEXT,
+                        start_date TEXT,
+                        end_date TEXT,
+                        version INTEGER NOT NULL,
+                        bumped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_data_versions_metric
+                    ON data_versions(metric, version)
+                """)
+                rows = conn.execute("""
+                    SELECT metric, start_date, end_date, version
+                    FROM data_versions ORDER BY version
+                """).fetchall()
+
+                for metric, start, end, version in rows:
+                    self._map(metric).assign(_bound(start, _OPEN_START),
+                                             _bound(end, _OPEN_END), version)
+                    self._current = max(self._current, version)
+
+                # Logs written before bumps were merged hold overlapping rows
+                if sum(len(versions) for versions in self._maps.values()) < len(rows):
+                    conn.execute("DELETE FROM data_versions")
+                    conn.executemany("""
+                        INSERT INTO data_versions (metric, start_date, end_date, version)
+                        VALUES (?, ?, ?, ?)
+                    """, [(metric, *self._stored(start, end), version)
+                          for metric, versions in self._maps.items()
+                          for start, end, version in zip(versions.starts, versions.ends,
+                                                         versions.versions)])
+        except sqlite3.Error as e:
+            logger.error(f"Could not load data versions: {e}")
+
+    def _map(self, metric: Optional[str]) -> _VersionMap:
+        versions = self._maps.get(metric)
+        if versions is None:
+            versions = self._maps[metric] = _VersionMap()
+        return versions
+
+    @staticmethod
+    def _stored(start: str, end: str) -> Tuple[Optional[str], Optional[str]]:
+        return (None if start == _OPEN_START else start,
+                None if end == _OPEN_END else end)
+
+    def bump(self, metric: Optional[str], start_date: DateLike = None,
+             end_date: DateLike = None) -> int:
+        """
+        Record that data for ``metric`` between two days changed.
+
+        Args:
+            metric: Metric whose data changed (None for every metric)
+            start_date: First changed day (None for open start)
+            end_date: Last changed day (None for open end)
+
+        Returns:
+            The new version number
+        """
+        start = _bound(normalize_day(start_date), _OPEN_START)
+        end = _bound(normalize_day(end_date), _OPEN_END)
+        if start > end:
+            start, end = end, start
+        with self._lock:
+            self._current += 1
+            version = self._current
+            replaced, pieces = self._map(metric).assign(start, end, version)
+
+            if self.db_path is not None:
+                self._persist(metric, [(start, end, version)] + pieces, replaced)
+        return version
+
+    def _persist(self, metric, segments, replaced) -> None:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if replaced:
+                    # A version split by earlier bumps has one row per piece
+                    conn.executemany(
+                        "DELETE FROM data_versions "
+                        "WHERE metric IS ? AND version = ? AND start_date IS ?",
+                        [(metric, version, self._stored(start, end)[0])
+                         for start, end, version in replaced]
+                    )
+                conn.executemany("""
+                    INSERT INTO data_versions (metric, start_date, end_date, version)
+                    VALUES (?, ?, ?, ?)
+                """, [(metric, *self._stored(start, end), version)
+                      for start, end, version in segments])
+        except sqlite3.Error as e:
+            logger.error(f"Could not persist data version: {e}")
+
+    def version(self, metric: Optional[str], start_date: DateLike = None,
+                end_date: DateLike = None) -> int:
+        """Return the data version of ``metric`` between two days (0 if never bumped)."""
+        start = _bound(normalize_day(start_date), _OPEN_START)
+        end = _bound(normalize_day(end_date), _OPEN_END)
+        with self._lock:
+            if metric is None:
+                # Metric-agnostic results depend on every metric
+                maps = list(self._maps.values())
+            else:
+                maps = [versions for versions in (self._maps.get(None), self._maps.get(metric))
+                        if versions is not None]
+            return max((versions.latest(start, end) for versions in maps), default=0)
+
+    def version_for(self, dependencies: Optional[Iterable[str]]) -> int:
+        """Return the combined data version of a cache entry's dependencies."""
+        spans = parse_dependencies(dependencies)
+        return max((self.version(*span) for span in spans), default=0)
+
+
+def _month_buckets(start: Optional[str], end: Optional[str], limit: int) -> Optional[List[str]]:
+    """Months ('YYYY-MM') a bounded day span touches, or None past ``limit`` months."""
+    if start is None or end is None:
+        return None
+    try:
+        year, month = int(start[:4]), int(start[5:7])
+        count = (int(end[:4]) - year) * 12 + int(end[5:7]) - month + 1
+    except ValueError:
+        return None
+    if count > limit or count < 1:
+        return None
+    months = []
+    for _ in range(count):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class DependencyIndex:
+    """
+    In-memory index from metric to the day spans of dependent cache keys.
+
+    Lets a cache tier find the entries affected by a (metric, day range)
+    change without scanning every key. Spans are bucketed by the months
+    they touch, so a change only visits the buckets of its own months.
+    Open-ended spans and spans longer than ``MAX_BUCKET_MONTHS`` share one
+    wide bucket per metric that every lookup checks. Not thread-safe;
+    owners hold their own lock around calls.
+    """
+
+    MAX_BUCKET_MONTHS = 3
+
+    def __init__(self):
+        # metric -> month bucket ('YYYY-MM', None for wide spans) -> key -> span
+        self._by_metric: Dict[Optional[str],
+                              Dict[Optional[str], Dict[str, Tuple[Optional[str], Optional[str]]]]] = {}
+        self._by_key: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def add(self, key: str, dependencies: Optional[Iterable[str]]) -> None:
+        """Index ``key`` under the spans of its dependencies."""
+        self.remove(key)
+        spans = parse_dependencies(dependencies)
+        if not spans:
+            return
+        locations = []
+        for metric, start, end in spans:
+            buckets = self._by_metric.setdefault(metric, {})
+            for month in _month_buckets(start, end, self.MAX_BUCKET_MONTHS) or [None]:
+                buckets.setdefault(month, {})[key] = (start, end)
+                locations.append((metric, month))
+        self._by_key[key] = locations
+
+    def remove(self, key: str) -> None:
+        """Drop ``key`` from the index."""
+        for metric, month in self._by_key.pop(key, ()):
+            buckets = self._by_metric.get(metric)
+            if buckets is None or month not in buckets:
+                continue
+            buckets[month].pop(key, None)
+            if not buckets[month]:
+                del buckets[month]
+                if not buckets:
+                    del self._by_metric[metric]
+
+    def matching(self, metric: Optional[str], start_date: DateLike = None,
+                 end_date: DateLike = None) -> List[str]:
+        """Return keys whose spans overlap a change to ``metric`` (None for all)."""
+        start, end = normalize_day(start_date), normalize_day(end_date)
+        if metric is None:
+            groups = list(self._by_metric.values())
+        else:
+            groups = [buckets for buckets in (self._by_metric.get(metric),
+                                              self._by_metric.get(None))
+                      if buckets is not None]
+
+        first = start[:7] if start is not None else _OPEN_START
+        last = end[:7] if end is not None else _OPEN_END
+        months = _month_buckets(start, end, 12)
+
+        matched = []
+        for buckets in groups:
+            if months is not None and len(months) < len(buckets):
+                candidates = [None, *months]
+            else:
+                candidates = [month for month in buckets
+                              if month is None or first <= month <= last]
+            for month in candidates:
+                for key, (span_start, span_end) in buckets.get(month, {}).items():
+                    if spans_overlap(span_start, span_end, start, end):
+                        matched.append(key)
+        return list(dict.fromkeys(matched))
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self._by_metric.clear()
+        self._by_key.clear()
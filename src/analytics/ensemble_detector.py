@@ -4,9 +4,11 @@ Ensemble anomaly detection that combines multiple detectors.
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import threading
 
 from .anomaly_models import (
     Anomaly, DetectionMethod, Severity, DetectionResult, DetectionConfig
@@ -15,12 +17,23 @@ from .anomaly_detectors import BaseDetector
 
 
 class EnsembleDetector:
-    """Combines multiple anomaly detectors for improved accuracy."""
+    """Combines multiple anomaly detectors for improved accuracy.
     
-    def __init__(self, detectors: Dict[str, BaseDetector], config: DetectionConfig):
+    Ensemble members run concurrently on a small thread pool; the heavy
+    members (scikit-learn models, NumPy reductions) release the GIL.
+    """
+    
+    MAX_PARALLEL_DETECTORS = 4
+    
+    def __init__(self, detectors: Dict[str, BaseDetector], config: DetectionConfig,
+                 max_workers: Optional[int] = None):
         self.detectors = detectors
         self.config = config
         self.detection_history = []
+        self.max_workers = (max_workers if max_workers is not None
+                            else min(self.MAX_PARALLEL_DETECTORS, len(detectors)))
+        self._executor = None
+        self._executor_lock = threading.Lock()
     
     def detect(self, data: pd.Series) -> List[Anomaly]:
         """Run ensemble detection on single series."""
@@ -28,19 +41,15 @@ class EnsembleDetector:
             return []
         
         start_time = datetime.now()
-        all_anomalies = []
-        detector_results = {}
         
         # Run each enabled detector
-        for name, detector in self.detectors.items():
-            if detector.method in self.config.enabled_methods:
-                try:
-                    anomalies = detector.detect(data)
-                    detector_results[name] = anomalies
-                    all_anomalies.extend(anomalies)
-                except Exception as e:
-                    print(f"Detector {name} failed: {e}")
-                    detector_results[name] = []
+        jobs = [
+            (name, lambda detector=detector: detector.detect(data))
+            for name, detector in self.detectors.items()
+            if detector.method in self.config.enabled_methods
+        ]
+        detector_results = self._run_detectors(jobs, "Detector")
+        all_anomalies = [a for anomalies in detector_results.values() for a in anomalies]
         
         # Combine results using ensemble logic
         combined_anomalies = self._combine_anomalies(all_anomalies, detector_results)
@@ -62,49 +71,46 @@ class EnsembleDetector:
         
         return combined_anomalies
     
-    def detect_multivariate(self, data: pd.DataFrame) -> List[Anomaly]:
-        """Run ensemble detection on multivariate data."""
+    def detect_multivariate(self, data: pd.DataFrame,
+                            data_version: Optional[str] = None) -> List[Anomaly]:
+        """Run ensemble detection on multivariate data.
+        
+        Args:
+            data: Frame with one row per timestamp and one column per metric
+            data_version: Version token for ``data``, letting model-based
+                detectors reuse fits cached for the same version
+        """
         if data.empty:
             return []
         
         start_time = datetime.now()
-        all_anomalies = []
-        detector_results = {}
+        jobs = []
         
-        # Run multivariate detectors
+        # Multivariate detectors fit once over all metrics
         multivariate_detectors = ['isolation_forest', 'lof']
         for name, detector in self.detectors.items():
             if (detector.method in self.config.enabled_methods and 
                 name in multivariate_detectors):
-                try:
-                    if hasattr(detector, 'detect_multivariate'):
-                        anomalies = detector.detect_multivariate(data)
-                    else:
-                        # Run on each column separately
-                        anomalies = detector.detect_batch(data)
-                    
-                    detector_results[name] = anomalies
-                    all_anomalies.extend(anomalies)
-                except Exception as e:
-                    print(f"Multivariate detector {name} failed: {e}")
-                    detector_results[name] = []
+                if hasattr(detector, 'detect_multivariate'):
+                    run = (lambda detector=detector:
+                           detector.detect_multivariate(data, data_version=data_version))
+                else:
+                    # Run on each column separately
+                    run = lambda detector=detector: detector.detect_batch(data)
+                jobs.append((name, run))
         
-        # Run univariate detectors on each column
+        # Univariate detectors score every column in one vectorized pass
         univariate_detectors = ['zscore', 'modified_zscore', 'iqr']
-        for column in data.select_dtypes(include=[np.number]).columns:
-            series = data[column].dropna()
-            if len(series) > 3:
-                for name, detector in self.detectors.items():
-                    if (detector.method in self.config.enabled_methods and 
-                        name in univariate_detectors):
-                        try:
-                            anomalies = detector.detect(series)
-                            if name not in detector_results:
-                                detector_results[name] = []
-                            detector_results[name].extend(anomalies)
-                            all_anomalies.extend(anomalies)
-                        except Exception as e:
-                            print(f"Univariate detector {name} failed on {column}: {e}")
+        numeric = data.select_dtypes(include=[np.number])
+        numeric = numeric.loc[:, numeric.count() > 3]
+        if not numeric.empty:
+            for name, detector in self.detectors.items():
+                if (detector.method in self.config.enabled_methods and 
+                    name in univariate_detectors):
+                    jobs.append((name, lambda detector=detector: detector.detect_batch(numeric)))
+        
+        detector_results = self._run_detectors(jobs, "Multivariate detector")
+        all_anomalies = [a for anomalies in detector_results.values() for a in anomalies]
         
         # Combine results
         combined_anomalies = self._combine_anomalies(all_anomalies, detector_results)
@@ -125,25 +131,80 @@ class EnsembleDetector:
         
         return combined_anomalies
     
+    def _run_detectors(self, jobs: List[Tuple[str, Callable[[], List[Anomaly]]]],
+                       label: str) -> Dict[str, List[Anomaly]]:
+        """Run detector jobs, concurrently when more than one is enabled."""
+        results: Dict[str, List[Anomaly]] = {}
+        
+        if self.max_workers <= 1 or len(jobs) <= 1:
+            for name, run in jobs:
+                try:
+                    results[name] = run()
+                except Exception as e:
+                    print(f"{label} {name} failed: {e}")
+                    results[name] = []
+            return results
+        
+        executor = self._get_executor()
+        futures = [(name, executor.submit(run)) for name, run in jobs]
+        for name, future in futures:
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"{label} {name} failed: {e}")
+                results[name] = []
+        return results
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the detector thread pool on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ensemble-detector"
+                )
+            return self._executor
+    
+    def __enter__(self) -> 'EnsembleDetector':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+    
+    def shutdown(self):
+        """Release the detector thread pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
     def _combine_anomalies(self, all_anomalies: List[Anomaly], 
                           detector_results: Dict[str, List[Anomaly]]) -> List[Anomaly]:
         """Combine anomalies from multiple detectors."""
         if not all_anomalies:
             return []
         
-        # Group anomalies by timestamp and metric
-        anomaly_groups = defaultdict(list)
-        for anomaly in all_anomalies:
-            key = (anomaly.timestamp, anomaly.metric)
-            anomaly_groups[key].append(anomaly)
+        # Assign a group code per (timestamp, metric) and count votes in bulk
+        group_codes = {}
+        codes = np.fromiter(
+            (group_codes.setdefault((a.timestamp, a.metric), len(group_codes))
+             for a in all_anomalies),
+            dtype=np.int64, count=len(all_anomalies)
+        )
+        votes = np.bincount(codes)
+        qualifying = np.nonzero(votes >= self.config.ensemble_min_votes)[0]
+        if len(qualifying) == 0:
+            return []
         
-        combined_anomalies = []
+        # Only materialize groups that reached the vote threshold
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.concatenate(([0], np.cumsum(votes)))
         
-        for (timestamp, metric), group in anomaly_groups.items():
-            if len(group) >= self.config.ensemble_min_votes:
-                # Create ensemble anomaly
-                ensemble_anomaly = self._create_ensemble_anomaly(group)
-                combined_anomalies.append(ensemble_anomaly)
+        combined_anomalies = []
+        for code in qualifying:
+            members = order[boundaries[code]:boundaries[code + 1]]
+            group = [all_anomalies[i] for i in members]
+            combined_anomalies.append(self._create_ensemble_anomaly(group))
         
         # Sort by severity and score
         combined_anomalies.sort(
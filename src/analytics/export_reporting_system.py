@@ -7,11 +7,9 @@ shareable insights for healthcare providers or personal tracking.
 """
 
 import io
-import json
-import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 import base64
 from enum import Enum
@@ -30,14 +28,14 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 import matplotlib.pyplot as plt
 import matplotlib.backends.backend_pdf as pdf_backend
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from openpyxl.drawing.image import Image as XLImage
 
 from ..ui.charts.wsj_style_manager import WSJStyleManager
 from ..ui.charts.matplotlib_chart_factory import MatplotlibChartFactory
+from .chart_render_farm import (ChartRenderFarm, RenderBatch, metric_chart_spec,
+                                overview_chart_spec, style_from_manager)
 from .health_insights_engine import HealthInsightsEngine
+from .streaming_export import ExportCancelledError, StreamingDataExporter
+from ..database_backup import BackupCancelledError, DatabaseBackupEngine
 from ..models import HealthData
 from ..config import Config
 
@@ -133,9 +131,24 @@ class WSJExportReportingSystem(QObject):
     """Professional export and reporting system following WSJ design principles."""
     
     def __init__(self, data_manager, viz_suite, insights_engine: HealthInsightsEngine, 
-                 style_manager: WSJStyleManager):
+                 style_manager: WSJStyleManager, record_source=None,
+                 backup_db_path: Optional[Path] = None):
+        """
+        Args:
+            data_manager: Provides ``get_metric_data(metric, start, end)``
+            viz_suite: Visualization suite for report charts
+            insights_engine: Generates report insights
+            style_manager: WSJ chart styling
+            record_source: Optional chunked record reader for data exports,
+                such as ``HealthRecordChunkSource``; exports slice
+                ``data_manager`` results when None
+            backup_db_path: Database backed up by ``create_backup``; the
+                application database when None
+        """
         super().__init__()
         self.data_manager = data_manager
+        self.record_source = record_source
+        self.backup_db_path = backup_db_path
         self.viz_suite = viz_suite
         self.insights_engine = insights_engine
         self.style_manager = style_manager
@@ -146,12 +159,24 @@ class WSJExportReportingSystem(QObject):
         
         # Export engines
         self.chart_factory = MatplotlibChartFactory(style_manager)
+        self.render_farm = ChartRenderFarm()
+        self.render_style = style_from_manager(style_manager)
         self.export_progress = ExportProgressManager()
         
         # Export cache for performance
         self._export_cache = {}
         self._cache_timeout = 300  # 5 minutes
         
+    def shutdown(self) -> None:
+        """Stop the chart render worker processes."""
+        self.render_farm.shutdown()
+    
+    def __enter__(self) -> 'WSJExportReportingSystem':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        
     def _setup_template_environment(self) -> Environment:
         """Set up Jinja2 template environment."""
         template_dir = Path(__file__).parent.parent / "templates" / "reports"
@@ -208,6 +233,9 @@ class WSJExportReportingSystem(QObject):
             progress_tracker.update(10, "Gathering health data...")
             report_data = self._gather_report_data(config)
             
+            # Start rendering charts in the background
+            chart_batch = self._submit_report_charts(report_data, config)
+            
             # Generate insights
             progress_tracker.update(30, "Analyzing patterns and trends...")
             insights = self.insights_engine.generate_prioritized_insights(
@@ -215,12 +243,8 @@ class WSJExportReportingSystem(QObject):
                 max_insights=10
             )
             
-            # Create charts
-            progress_tracker.update(50, "Creating visualizations...")
-            charts = self._generate_report_charts(report_data, config)
-            
             # Create PDF
-            progress_tracker.update(70, "Generating PDF document...")
+            progress_tracker.update(50, "Generating PDF document...")
             pdf_buffer = io.BytesIO()
             
             # Create document
@@ -287,18 +311,25 @@ class WSJExportReportingSystem(QObject):
                 story.append(table)
                 story.append(Spacer(1, 0.5*inch))
             
-            # Add charts
-            for chart in charts:
-                if chart['image']:
-                    img = Image(io.BytesIO(chart['image']), width=6*inch, height=4*inch)
-                    story.append(KeepTogether([
+            # Add charts as they finish rendering, keeping report order
+            chart_slots = [[] for _ in chart_batch.specs]
+            positions = {id(spec): i for i, spec in enumerate(chart_batch.specs)}
+            for done, (spec, image) in enumerate(chart_batch.as_completed(), 1):
+                progress_tracker.update(50 + 40 * done // len(chart_batch),
+                                        f"Rendered chart {done} of {len(chart_batch)}...")
+                if image:
+                    chart = self._report_chart_entry(spec, image)
+                    img = Image(io.BytesIO(image), width=6*inch, height=4*inch)
+                    chart_slots[positions[id(spec)]] = [KeepTogether([
                         Paragraph(chart['title'], styles['Heading2']),
                         Spacer(1, 0.1*inch),
                         img,
                         Spacer(1, 0.1*inch),
                         Paragraph(chart['description'], styles['Caption']),
                         Spacer(1, 0.3*inch)
-                    ]))
+                    ])]
+            for slot in chart_slots:
+                story.extend(slot)
             
             story.append(PageBreak())
             
@@ -341,282 +372,84 @@ class WSJExportReportingSystem(QObject):
             progress_tracker.error(f"Report generation failed: {str(e)}")
             raise
             
-    def export_data_csv(self, config: ExportConfiguration) -> bytes:
-        """Export data as CSV with proper formatting."""
-        progress_tracker = self.export_progress.start_export('CSV export')
-        
+    def export_data_csv(self, config: ExportConfiguration) -> Union[bytes, Path]:
+        """Export data as CSV with proper formatting.
+
+        Records are streamed in chunks; see ``_stream_export``.
+        """
+        return self._stream_export(config, 'CSV', 'export.csv',
+                                   lambda exporter, target: exporter.write_csv(target, config))
+
+    def export_data_excel(self, config: ExportConfiguration) -> Union[bytes, Path]:
+        """Export data as Excel with formatting and multiple sheets.
+
+        Records are streamed in chunks; see ``_stream_export``.
+        """
+        insights = self._export_insights if config.include_insights else None
+        return self._stream_export(config, 'Excel', 'export.xlsx',
+                                   lambda exporter, target: exporter.write_excel(
+                                       target, config, insights_factory=insights))
+
+    def export_data_json(self, config: ExportConfiguration) -> Union[bytes, Path]:
+        """Export data as JSON with metadata.
+
+        Records are streamed in chunks; see ``_stream_export``.
+        """
+        insights = self._export_insights if config.include_insights else None
+        return self._stream_export(config, 'JSON', 'export.json',
+                                   lambda exporter, target: exporter.write_json(
+                                       target, config, insights_factory=insights))
+
+    def _stream_export(self, config: ExportConfiguration, label: str, default_name: str,
+                       write: Callable[[StreamingDataExporter, Any], Any]) -> Union[bytes, Path]:
+        """Run a streaming data export.
+
+        With ``config.output_path`` set, the file is written there in
+        chunks and its path returned, so memory use stays bounded by the
+        chunk size. Otherwise the export is built in memory and returned
+        as bytes.
+        """
+        progress_tracker = self.export_progress.start_export(f'{label} export')
+        exporter = StreamingDataExporter(
+            self.record_source or self.data_manager,
+            progress=progress_tracker.update,
+            is_cancelled=lambda: progress_tracker.is_cancelled)
+
         try:
-            progress_tracker.update(20, "Gathering data...")
-            report_data = self._gather_report_data(config)
-            
-            progress_tracker.update(50, "Formatting CSV data...")
-            output = io.StringIO()
-            
-            # Write metadata
-            writer = csv.writer(output)
-            writer.writerow(['Apple Health Monitor Export'])
-            writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-            writer.writerow(['Date Range:', f"{config.date_range[0]} to {config.date_range[1]}"])
-            writer.writerow([])  # Empty row
-            
-            # Write data for each metric
-            for metric in config.metrics:
-                writer.writerow([f'Metric: {metric.replace("_", " ").title()}'])
-                
-                # Get data for metric
-                df = report_data['raw_data'].get(metric, pd.DataFrame())
-                if not df.empty:
-                    # Write headers
-                    writer.writerow(['Date', 'Value', 'Unit'])
-                    
-                    # Write data
-                    for idx, row in df.iterrows():
-                        writer.writerow([
-                            idx.strftime('%Y-%m-%d %H:%M:%S'),
-                            row.get('value', ''),
-                            row.get('unit', '')
-                        ])
-                else:
-                    writer.writerow(['No data available'])
-                
-                writer.writerow([])  # Empty row between metrics
-            
-            # Add summary statistics
-            if config.include_insights and report_data['summary_stats']:
-                writer.writerow(['Summary Statistics'])
-                writer.writerow(['Metric', 'Count', 'Mean', 'Min', 'Max', 'Std Dev'])
-                
-                for metric, stats in report_data['summary_stats'].items():
-                    writer.writerow([
-                        metric.replace('_', ' ').title(),
-                        stats.get('count', 0),
-                        f"{stats.get('mean', 0):.2f}",
-                        f"{stats.get('min', 0):.2f}",
-                        f"{stats.get('max', 0):.2f}",
-                        f"{stats.get('std', 0):.2f}"
-                    ])
-            
-            progress_tracker.update(100, "CSV export completed")
-            csv_bytes = output.getvalue().encode('utf-8')
-            progress_tracker.complete("export.csv")
-            
-            return csv_bytes
-            
-        except Exception as e:
-            progress_tracker.error(f"CSV export failed: {str(e)}")
+            if config.output_path:
+                output_path = Path(config.output_path)
+                write(exporter, output_path)
+                progress_tracker.complete(str(output_path))
+                return output_path
+
+            buffer = io.BytesIO()
+            write(exporter, buffer)
+            progress_tracker.complete(default_name)
+            return buffer.getvalue()
+
+        except ExportCancelledError:
+            if not progress_tracker.is_cancelled:
+                progress_tracker.cancel()
             raise
-            
-    def export_data_excel(self, config: ExportConfiguration) -> bytes:
-        """Export data as Excel with formatting and multiple sheets."""
-        progress_tracker = self.export_progress.start_export('Excel export')
-        
-        try:
-            progress_tracker.update(10, "Creating workbook...")
-            wb = Workbook()
-            
-            # Remove default sheet
-            wb.remove(wb.active)
-            
-            # Define styles
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="FF8C42", end_color="FF8C42", fill_type="solid")
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            
-            date_font = Font(italic=True)
-            number_alignment = Alignment(horizontal="right")
-            
-            # Summary sheet
-            progress_tracker.update(20, "Creating summary sheet...")
-            summary_sheet = wb.create_sheet("Summary")
-            
-            # Title
-            summary_sheet['A1'] = "Apple Health Monitor Export"
-            summary_sheet['A1'].font = Font(bold=True, size=16)
-            summary_sheet['A2'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            summary_sheet['A3'] = f"Date Range: {config.date_range[0]} to {config.date_range[1]}"
-            
-            # Gather report data
-            progress_tracker.update(30, "Gathering data...")
-            report_data = self._gather_report_data(config)
-            
-            # Summary statistics
-            if report_data['summary_stats']:
-                row = 6
-                summary_sheet[f'A{row}'] = "Summary Statistics"
-                summary_sheet[f'A{row}'].font = Font(bold=True, size=12)
-                
-                row += 2
-                headers = ['Metric', 'Count', 'Average', 'Min', 'Max', 'Std Dev']
-                for col, header in enumerate(headers, 1):
-                    cell = summary_sheet.cell(row=row, column=col, value=header)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = header_alignment
-                
-                row += 1
-                for metric, stats in report_data['summary_stats'].items():
-                    summary_sheet.cell(row=row, column=1, value=metric.replace('_', ' ').title())
-                    summary_sheet.cell(row=row, column=2, value=stats.get('count', 0))
-                    summary_sheet.cell(row=row, column=3, value=round(stats.get('mean', 0), 2))
-                    summary_sheet.cell(row=row, column=4, value=round(stats.get('min', 0), 2))
-                    summary_sheet.cell(row=row, column=5, value=round(stats.get('max', 0), 2))
-                    summary_sheet.cell(row=row, column=6, value=round(stats.get('std', 0), 2))
-                    row += 1
-                
-                # Adjust column widths
-                for col in range(1, 7):
-                    summary_sheet.column_dimensions[get_column_letter(col)].width = 15
-            
-            # Create sheets for each metric
-            progress_tracker.update(50, "Creating metric sheets...")
-            for i, metric in enumerate(config.metrics):
-                sheet_name = metric.replace('_', ' ').title()[:31]  # Excel limit
-                ws = wb.create_sheet(sheet_name)
-                
-                # Headers
-                headers = ['Date', 'Time', 'Value', 'Unit']
-                for col, header in enumerate(headers, 1):
-                    cell = ws.cell(row=1, column=col, value=header)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = header_alignment
-                
-                # Data
-                df = report_data['raw_data'].get(metric, pd.DataFrame())
-                if not df.empty:
-                    row = 2
-                    for idx, data_row in df.iterrows():
-                        ws.cell(row=row, column=1, value=idx.date())
-                        ws.cell(row=row, column=2, value=idx.time())
-                        ws.cell(row=row, column=3, value=data_row.get('value', 0))
-                        ws.cell(row=row, column=4, value=data_row.get('unit', ''))
-                        row += 1
-                    
-                    # Format columns
-                    ws.column_dimensions['A'].width = 12
-                    ws.column_dimensions['B'].width = 10
-                    ws.column_dimensions['C'].width = 10
-                    ws.column_dimensions['D'].width = 10
-                
-                progress_tracker.update(50 + (40 * (i + 1) // len(config.metrics)), 
-                                      f"Processing {sheet_name}...")
-            
-            # Insights sheet
-            if config.include_insights:
-                progress_tracker.update(90, "Adding insights...")
-                insights_sheet = wb.create_sheet("Insights")
-                
-                insights = self.insights_engine.generate_prioritized_insights(
-                    report_data['metrics'], 
-                    max_insights=10
-                )
-                
-                row = 1
-                insights_sheet['A1'] = "Health Insights & Recommendations"
-                insights_sheet['A1'].font = Font(bold=True, size=14)
-                
-                row = 3
-                for i, insight in enumerate(insights, 1):
-                    insights_sheet[f'A{row}'] = f"{i}. {insight.title}"
-                    insights_sheet[f'A{row}'].font = Font(bold=True)
-                    row += 1
-                    
-                    insights_sheet[f'A{row}'] = f"Summary: {insight.summary}"
-                    row += 1
-                    
-                    insights_sheet[f'A{row}'] = f"Recommendation: {insight.recommendation}"
-                    row += 1
-                    
-                    insights_sheet[f'A{row}'] = f"Evidence Level: {insight.evidence_level}"
-                    insights_sheet[f'A{row}'].font = Font(italic=True)
-                    row += 2
-                
-                # Adjust column width
-                insights_sheet.column_dimensions['A'].width = 100
-            
-            # Save to bytes
-            progress_tracker.update(95, "Finalizing workbook...")
-            excel_buffer = io.BytesIO()
-            wb.save(excel_buffer)
-            excel_bytes = excel_buffer.getvalue()
-            
-            progress_tracker.update(100, "Excel export completed")
-            progress_tracker.complete("export.xlsx")
-            
-            return excel_bytes
-            
         except Exception as e:
-            progress_tracker.error(f"Excel export failed: {str(e)}")
+            progress_tracker.error(f"{label} export failed: {str(e)}")
             raise
-            
-    def export_data_json(self, config: ExportConfiguration) -> bytes:
-        """Export data as JSON with metadata."""
-        progress_tracker = self.export_progress.start_export('JSON export')
-        
-        try:
-            progress_tracker.update(20, "Gathering data...")
-            report_data = self._gather_report_data(config)
-            
-            progress_tracker.update(50, "Formatting JSON data...")
-            
-            # Build JSON structure
-            export_data = {
-                'metadata': {
-                    'export_date': datetime.now().isoformat(),
-                    'date_range': {
-                        'start': config.date_range[0].isoformat(),
-                        'end': config.date_range[1].isoformat()
-                    },
-                    'version': '1.0',
-                    'metrics': config.metrics
-                },
-                'summary_statistics': report_data['summary_stats'],
-                'data': {}
+
+    def _export_insights(self, metrics: Dict[str, pd.DataFrame]) -> List[Dict[str, Any]]:
+        """Prioritized insights for data exports, as plain dictionaries."""
+        insights = self.insights_engine.generate_prioritized_insights(metrics, max_insights=10)
+        return [
+            {
+                'title': insight.title,
+                'summary': insight.summary,
+                'recommendation': insight.recommendation,
+                'evidence_level': insight.evidence_level,
+                'confidence_score': insight.confidence_score,
+                'impact_score': insight.impact_score
             }
-            
-            # Add raw data for each metric
-            for metric in config.metrics:
-                df = report_data['raw_data'].get(metric, pd.DataFrame())
-                if not df.empty:
-                    metric_data = []
-                    for idx, row in df.iterrows():
-                        metric_data.append({
-                            'timestamp': idx.isoformat(),
-                            'value': float(row.get('value', 0)),
-                            'unit': row.get('unit', '')
-                        })
-                    export_data['data'][metric] = metric_data
-            
-            # Add insights if requested
-            if config.include_insights:
-                insights = self.insights_engine.generate_prioritized_insights(
-                    report_data['metrics'],
-                    max_insights=10
-                )
-                export_data['insights'] = [
-                    {
-                        'title': insight.title,
-                        'summary': insight.summary,
-                        'recommendation': insight.recommendation,
-                        'evidence_level': insight.evidence_level,
-                        'confidence_score': insight.confidence_score,
-                        'impact_score': insight.impact_score
-                    }
-                    for insight in insights
-                ]
-            
-            progress_tracker.update(90, "Encoding JSON...")
-            json_bytes = json.dumps(export_data, indent=2).encode('utf-8')
-            
-            progress_tracker.update(100, "JSON export completed")
-            progress_tracker.complete("export.json")
-            
-            return json_bytes
-            
-        except Exception as e:
-            progress_tracker.error(f"JSON export failed: {str(e)}")
-            raise
-            
+            for insight in insights
+        ]
+
     def generate_html_summary(self, config: ExportConfiguration) -> str:
         """Generate email-friendly HTML summary."""
         progress_tracker = self.export_progress.start_export('HTML summary')
@@ -665,32 +498,37 @@ class WSJExportReportingSystem(QObject):
             raise
             
     def export_charts(self, config: ExportConfiguration) -> Dict[str, bytes]:
-        """Export charts as high-resolution images."""
+        """Export charts as high-resolution images.
+
+        Charts are rendered in parallel by the render farm; unchanged
+        charts exported before are served from its cache.
+        """
         progress_tracker = self.export_progress.start_export('Chart export')
         
         try:
             progress_tracker.update(10, "Gathering data...")
             report_data = self._gather_report_data(config)
             
-            charts = {}
-            total_metrics = len(config.metrics)
+            specs = [
+                metric_chart_spec(metric, report_data['raw_data'][metric], config.date_range,
+                                  self.render_style, dpi=config.get_dpi(),
+                                  format=config.format.value)
+                for metric in config.metrics
+                if metric in report_data['raw_data'] and
+                'value' in report_data['raw_data'][metric].columns
+            ]
             
-            for i, metric in enumerate(config.metrics):
+            charts = {}
+            for done, (spec, chart_bytes) in enumerate(self.render_farm.render_as_completed(specs), 1):
                 progress_tracker.update(
-                    10 + (80 * i // total_metrics),
-                    f"Generating chart for {metric}..."
+                    10 + (80 * done // len(specs)),
+                    f"Rendered chart for {spec.metric}..."
                 )
-                
-                # Generate chart using matplotlib factory
-                chart_bytes = self._generate_metric_chart(
-                    metric, 
-                    report_data,
-                    format=config.format.value,
-                    dpi=config.get_dpi()
-                )
-                
                 if chart_bytes:
-                    charts[metric] = chart_bytes
+                    charts[spec.metric] = chart_bytes
+            
+            # Keep the requested metric order
+            charts = {metric: charts[metric] for metric in config.metrics if metric in charts}
             
             progress_tracker.update(100, "Chart export completed")
             progress_tracker.complete(f"charts.{config.format.value}")
@@ -701,80 +539,47 @@ class WSJExportReportingSystem(QObject):
             progress_tracker.error(f"Chart export failed: {str(e)}")
             raise
             
-    def create_backup(self, include_settings: bool = True) -> bytes:
-        """Create complete data backup with integrity verification."""
+    def create_backup(self, include_settings: bool = True,
+                      output_path: Optional[Path] = None,
+                      base_backup: Optional[Path] = None) -> Union[bytes, Path]:
+        """Create a page-level database backup with per-chunk checksums.
+
+        The live database is copied with the SQLite backup API and streamed
+        into a compressed archive; see ``DatabaseBackupEngine``.
+
+        Args:
+            include_settings: Store application settings in the archive
+            output_path: Write the archive there and return the path;
+                otherwise the archive is returned as bytes
+            base_backup: Previous backup to take an incremental backup
+                against, storing only the chunks changed since then
+        """
         progress_tracker = self.export_progress.start_export('Backup')
         
         try:
-            import zipfile
-            import hashlib
+            progress_tracker.update(1, "Preparing backup...")
+            engine = DatabaseBackupEngine(
+                db_path=self.backup_db_path,
+                progress=progress_tracker.update,
+                is_cancelled=lambda: progress_tracker.is_cancelled
+            )
+            settings_data = self._export_settings() if include_settings else None
             
-            progress_tracker.update(10, "Preparing backup...")
+            if output_path:
+                output_path = Path(output_path)
+                engine.create_backup(output_path, base=base_backup, settings=settings_data,
+                                     temp_dir=output_path.parent)
+                progress_tracker.complete(str(output_path))
+                return output_path
             
             backup_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(backup_buffer, 'w', zipfile.ZIP_DEFLATED) as backup_zip:
-                # Export all data as JSON
-                progress_tracker.update(30, "Exporting health data...")
-                
-                # Get all available metrics
-                all_metrics = self.data_manager.get_available_metrics()
-                
-                # Export configuration for full backup
-                backup_config = ExportConfiguration(
-                    format=ExportFormat.JSON,
-                    date_range=(
-                        datetime(2000, 1, 1),  # Far past
-                        datetime.now()
-                    ),
-                    metrics=all_metrics,
-                    include_charts=False,
-                    include_insights=True,
-                    include_raw_data=True
-                )
-                
-                # Generate JSON data
-                json_data = self.export_data_json(backup_config)
-                backup_zip.writestr('health_data.json', json_data)
-                
-                # Add metadata
-                metadata = {
-                    'backup_date': datetime.now().isoformat(),
-                    'version': '1.0',
-                    'metrics_count': len(all_metrics),
-                    'data_hash': hashlib.sha256(json_data).hexdigest()
-                }
-                backup_zip.writestr('metadata.json', json.dumps(metadata, indent=2))
-                
-                # Include settings if requested
-                if include_settings:
-                    progress_tracker.update(60, "Including settings...")
-                    settings_data = self._export_settings()
-                    backup_zip.writestr('settings.json', json.dumps(settings_data, indent=2))
-                
-                # Add verification file
-                progress_tracker.update(80, "Creating verification data...")
-                verification_data = {
-                    'files': ['health_data.json', 'metadata.json'],
-                    'checksums': {
-                        'health_data.json': hashlib.sha256(json_data).hexdigest()
-                    }
-                }
-                
-                if include_settings:
-                    verification_data['files'].append('settings.json')
-                    verification_data['checksums']['settings.json'] = hashlib.sha256(
-                        json.dumps(settings_data).encode()
-                    ).hexdigest()
-                
-                backup_zip.writestr('verification.json', json.dumps(verification_data, indent=2))
-            
-            progress_tracker.update(100, "Backup completed")
-            backup_bytes = backup_buffer.getvalue()
+            engine.create_backup(backup_buffer, base=base_backup, settings=settings_data)
             progress_tracker.complete("backup.zip")
             
-            return backup_bytes
+            return backup_buffer.getvalue()
             
+        except BackupCancelledError:
+            raise
         except Exception as e:
             progress_tracker.error(f"Backup failed: {str(e)}")
             raise
@@ -876,152 +681,44 @@ class WSJExportReportingSystem(QObject):
         
         return report_data
         
-    def _generate_report_charts(self, report_data: Dict, config: ExportConfiguration) -> List[Dict]:
-        """Generate charts for the report."""
-        charts = []
+    def _submit_report_charts(self, report_data: Dict, config: ExportConfiguration) -> RenderBatch:
+        """Start rendering the report charts: an overview and up to 5 metric charts."""
+        specs = []
         
         # Overview chart - combined metrics
         if len(config.metrics) > 1:
-            overview_chart = self._generate_overview_chart(report_data, config)
-            if overview_chart:
-                charts.append(overview_chart)
+            overview = overview_chart_spec(report_data['raw_data'], config.date_range,
+                                           self.render_style, dpi=config.get_dpi())
+            if overview:
+                specs.append(overview)
         
         # Individual metric charts
         for metric in config.metrics[:5]:  # Limit to 5 charts
-            metric_chart = self._generate_metric_detail_chart(metric, report_data, config)
-            if metric_chart:
-                charts.append(metric_chart)
+            df = report_data['raw_data'].get(metric)
+            if df is None or df.empty or 'value' not in df.columns:
+                continue
+            specs.append(metric_chart_spec(
+                metric, df, config.date_range, self.render_style,
+                title=f"{metric.replace('_', ' ').title()} Over Time",
+                size=(8, 5),
+                dpi=config.get_dpi(),
+                description=f"Daily {metric.replace('_', ' ')} measurements over the selected period"
+            ))
         
-        return charts
+        return self.render_farm.submit(specs)
+        
+    def _report_chart_entry(self, spec, image: bytes) -> Dict:
+        """Title, description and image of a rendered report chart."""
+        title = spec.title if spec.kind == 'overview' else \
+            f"{spec.metric.replace('_', ' ').title()} Trends"
+        return {'title': title, 'description': spec.description, 'image': image}
+        
+    def _generate_report_charts(self, report_data: Dict, config: ExportConfiguration) -> List[Dict]:
+        """Generate charts for the report."""
+        batch = self._submit_report_charts(report_data, config)
+        return [self._report_chart_entry(spec, image)
+                for spec, image in zip(batch.specs, batch.results()) if image]
         
-    def _generate_overview_chart(self, report_data: Dict, config: ExportConfiguration) -> Optional[Dict]:
-        """Generate overview chart combining multiple metrics."""
-        try:
-            # Use matplotlib factory to create multi-metric chart
-            chart_config = {
-                'title': 'Health Metrics Overview',
-                'style': 'wsj_publication',
-                'size': (10, 6),
-                'dpi': config.get_dpi()
-            }
-            
-            # Prepare data for visualization
-            metrics_data = []
-            for metric, df in report_data['raw_data'].items():
-                if not df.empty and 'value' in df.columns:
-                    # Normalize values for comparison
-                    normalized = (df['value'] - df['value'].mean()) / df['value'].std()
-                    metrics_data.append({
-                        'name': metric.replace('_', ' ').title(),
-                        'data': normalized.resample('D').mean()  # Daily averages
-                    })
-            
-            if not metrics_data:
-                return None
-            
-            # Create chart
-            fig, ax = plt.subplots(figsize=chart_config['size'])
-            
-            # Apply WSJ styling
-            self.style_manager.apply_wsj_style(fig, ax)
-            
-            # Plot each metric
-            for metric_info in metrics_data[:4]:  # Limit to 4 metrics
-                ax.plot(metric_info['data'].index, metric_info['data'].values,
-                       label=metric_info['name'], linewidth=2)
-            
-            ax.set_title(chart_config['title'])
-            ax.set_xlabel('Date')
-            ax.set_ylabel('Normalized Value')
-            ax.legend(loc='best')
-            
-            # Convert to bytes
-            buffer = io.BytesIO()
-            fig.savefig(buffer, format='png', dpi=chart_config['dpi'], bbox_inches='tight')
-            plt.close(fig)
-            
-            return {
-                'title': chart_config['title'],
-                'description': 'Normalized comparison of health metrics over time',
-                'image': buffer.getvalue()
-            }
-            
-        except Exception as e:
-            print(f"Error generating overview chart: {e}")
-            return None
-            
-    def _generate_metric_detail_chart(self, metric: str, report_data: Dict, 
-                                    config: ExportConfiguration) -> Optional[Dict]:
-        """Generate detailed chart for a single metric."""
-        try:
-            df = report_data['raw_data'].get(metric)
-            if df is None or df.empty:
-                return None
-            
-            # Create chart using matplotlib factory
-            chart = self.chart_factory.create_chart(
-                chart_type='line',
-                data=df,
-                config={
-                    'title': f"{metric.replace('_', ' ').title()} Over Time",
-                    'x_label': 'Date',
-                    'y_label': df.get('unit', ['Value'])[0] if 'unit' in df else 'Value',
-                    'style': 'wsj_publication',
-                    'size': (8, 5),
-                    'dpi': config.get_dpi()
-                }
-            )
-            
-            # Convert to bytes
-            buffer = io.BytesIO()
-            chart.figure.savefig(buffer, format='png', dpi=config.get_dpi(), bbox_inches='tight')
-            plt.close(chart.figure)
-            
-            return {
-                'title': f"{metric.replace('_', ' ').title()} Trends",
-                'description': f"Daily {metric.replace('_', ' ')} measurements over the selected period",
-                'image': buffer.getvalue()
-            }
-            
-        except Exception as e:
-            print(f"Error generating chart for {metric}: {e}")
-            return None
-            
-    def _generate_metric_chart(self, metric: str, report_data: Dict, 
-                             format: str = "png", dpi: int = 300) -> Optional[bytes]:
-        """Generate a single metric chart for export."""
-        try:
-            df = report_data['raw_data'].get(metric)
-            if df is None or df.empty:
-                return None
-            
-            # Create figure
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Apply WSJ styling
-            self.style_manager.apply_wsj_style(fig, ax)
-            
-            # Plot data
-            if 'value' in df.columns:
-                ax.plot(df.index, df['value'], linewidth=2, color=self.style_manager.colors['primary'])
-                ax.fill_between(df.index, df['value'], alpha=0.1, color=self.style_manager.colors['primary'])
-            
-            # Labels
-            ax.set_title(f"{metric.replace('_', ' ').title()}")
-            ax.set_xlabel('Date')
-            ax.set_ylabel(df.get('unit', ['Value'])[0] if 'unit' in df else 'Value')
-            
-            # Format
-            buffer = io.BytesIO()
-            fig.savefig(buffer, format=format, dpi=dpi, bbox_inches='tight')
-            plt.close(fig)
-            
-            return buffer.getvalue()
-            
-        except Exception as e:
-            print(f"Error generating chart for {metric}: {e}")
-            return None
-            
     def _generate_email_chart(self, metric: str, report_data: Dict) -> Optional[Dict]:
         """Generate small chart suitable for email embedding."""
         try:
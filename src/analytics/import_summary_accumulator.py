@@ -0,0 +1,400 @@
+"""Metric summaries accumulated while health records are imported.
+
+After an import, SummaryCalculator used to re-read ``health_records`` several
+times: once per metric for each of the daily, per-source, weekly and monthly
+aggregations. Instead, the importers feed every record they insert to an
+ImportSummaryAccumulator, which keeps running totals per (metric, source, day).
+
+Whenever the import commits, those totals are merged into the
+``import_daily_totals`` table in the same transaction. A later import therefore extends the totals
+instead of scanning the records it did not add. Weekly and monthly rollups
+are derived from the daily totals.
+
+The highest ``health_records`` rowid the totals cover is kept alongside them.
+When records were inserted without an accumulator in between, the stored rowid
+no longer matches and the next import derives the totals again. Deleted or
+re-valued records are caught by comparing the record count and value total
+with the sums of the daily totals.
+
+Example:
+    >>> summary = ImportSummaryAccumulator()
+    >>> convert_xml_to_sqlite("export.xml", "health.db", summary=summary)
+    >>> cache_manager.cache_import_summaries(summary.summaries(), import_id)
+"""
+
+import logging
+import sqlite3
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DAILY_TOTALS_TABLE = 'import_daily_totals'
+DAILY_TOTALS_WATERMARK_TABLE = 'import_daily_totals_watermark'
+
+# Metrics whose sources record the same activity; "All Sources" takes the
+# largest source total instead of averaging
+CUMULATIVE_METRICS = frozenset({
+    'StepCount', 'DistanceWalkingRunning', 'FlightsClimbed', 'ActiveEnergyBurned'
+})
+
+# total, count, minimum, maximum
+_Totals = List[float]
+
+# Records the daily totals summarize, as add() filters them
+_SUMMARIZED_RECORDS = "value IS NOT NULL AND type IS NOT NULL AND length(startDate) >= 10"
+
+
+class ImportSummaryAccumulator:
+    """Running per-day totals of the records an import inserts.
+
+    Call begin() on the import connection before the first insert, add() or
+    add_frame() for each inserted record, checkpoint() before each
+    intermediate commit and finish() before the import's final commit. summaries() and summaries_by_source() then return the cached
+    summary structures without reading ``health_records``.
+
+    Attributes:
+        months_back: Months of history the summaries cover.
+        today: Last day the summaries cover.
+    """
+
+    def __init__(self, months_back: int = 12, today: Optional[date] = None):
+        """Initialize an empty accumulator.
+
+        Args:
+            months_back: Months of history to summarize, as 30-day months.
+            today: Last day to summarize; defaults to the current date.
+        """
+        self.months_back = months_back
+        self.today = today or date.today()
+        self._totals: Dict[Tuple[str, str, str], _Totals] = {}
+        self._merged: Set[Tuple[str, str, str]] = set()
+        self._window: Optional[Dict[Tuple[str, str, str], _Totals]] = None
+        self._watermark = 0
+        self._replace = False
+        self._has_table = False
+        self._stale = False
+        self._table_ready = False
+
+    @property
+    def start_date(self) -> date:
+        """First day the summaries cover."""
+        return self.today - timedelta(days=self.months_back * 30)
+
+    def __len__(self) -> int:
+        return len(self._merged.union(self._totals))
+
+    def begin(self, conn: sqlite3.Connection, replace: bool = False):
+        """Note which records existed before the import.
+
+        Args:
+            conn: The import connection.
+            replace: Whether the import replaces every record, as CSV
+                migration does.
+        """
+        self._replace = replace
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?, ?)",
+            (DAILY_TOTALS_TABLE, DAILY_TOTALS_WATERMARK_TABLE, 'health_records')
+        )}
+        self._has_table = DAILY_TOTALS_TABLE in tables
+        self._table_ready = False
+        self._watermark = 0
+        if 'health_records' in tables and not replace:
+            self._watermark = conn.execute(
+                "SELECT COALESCE(MAX(rowid), 0) FROM health_records"
+            ).fetchone()[0]
+
+        # Totals are stale when records were written without an accumulator
+        covered = None
+        if DAILY_TOTALS_WATERMARK_TABLE in tables:
+            row = conn.execute(
+                f"SELECT last_rowid FROM {DAILY_TOTALS_WATERMARK_TABLE}").fetchone()
+            covered = row[0] if row else None
+        self._stale = self._has_table and not replace and (
+            covered != self._watermark or not self._totals_match(conn))
+
+    @staticmethod
+    def _totals_match(conn: sqlite3.Connection) -> bool:
+        """Whether the daily totals still add up to the summarized records.
+
+        Inserts above the watermark are caught by the rowid; this catches
+        records deleted or updated below it.
+        """
+        records = conn.execute(f"""
+            SELECT COUNT(value), TOTAL(value) FROM health_records
+            WHERE {_SUMMARIZED_RECORDS}
+        """).fetchone()
+        totals = conn.execute(
+            f"SELECT COALESCE(SUM(count), 0), TOTAL(total) FROM {DAILY_TOTALS_TABLE}"
+        ).fetchone()
+        # Totals are summed in a different order, so allow rounding error
+        return records[0] == totals[0] and \
+            abs(records[1] - totals[1]) <= 1e-9 * max(1.0, abs(records[1]))
+
+    def add(self, metric: str, source: Optional[str], start_date: Any,
+            value: Optional[float]):
+        """Accumulate one inserted record.
+
+        Args:
+            metric: Record type as stored.
+            source: Source name.
+            start_date: Start timestamp; its first ten characters are the day.
+            value: Numeric value. Records without one are skipped, as the
+                summary queries skipped NULL values.
+        """
+        if value is None or value != value:
+            return
+        day = str(start_date)[:10]
+        if len(day) != 10:
+            return
+        key = (metric, source or '', day)
+        totals = self._totals.get(key)
+        if totals is None:
+            self._totals[key] = [value, 1, value, value]
+        else:
+            totals[0] += value
+            totals[1] += 1
+            if value < totals[2]:
+                totals[2] = value
+            if value > totals[3]:
+                totals[3] = value
+
+    def add_frame(self, frame: pd.DataFrame):
+        """Accumulate records from a DataFrame in one grouped pass.
+
+        Args:
+            frame: Records with type, sourceName, startDate and value columns.
+        """
+        if frame.empty:
+            return
+        start = frame['startDate']
+        if pd.api.types.is_datetime64_any_dtype(start):
+            days = start.dt.strftime('%Y-%m-%d')
+        else:
+            days = start.astype(str).str[:10]
+        records = pd.DataFrame({
+            'metric': frame['type'].astype(str),
+            'source': (frame['sourceName'].astype(object).fillna('').astype(str)
+                       if 'sourceName' in frame else ''),
+            'day': days,
+            'value': pd.to_numeric(frame['value'], errors='coerce'),
+        }).dropna(subset=['day', 'value'])
+        grouped = records.groupby(['metric', 'source', 'day'], sort=False)['value'].agg(
+            ['sum', 'count', 'min', 'max'])
+
+        for key, total, count, minimum, maximum in zip(
+                grouped.index, grouped['sum'], grouped['count'], grouped['min'], grouped['max']):
+            totals = self._totals.get(key)
+            if totals is None:
+                self._totals[key] = [float(total), int(count), float(minimum), float(maximum)]
+            else:
+                totals[0] += float(total)
+                totals[1] += int(count)
+                totals[2] = min(totals[2], float(minimum))
+                totals[3] = max(totals[3], float(maximum))
+
+    def checkpoint(self, conn: sqlite3.Connection):
+        """Merge the totals accumulated so far into the daily totals table.
+
+        Runs inside the import transaction, so a rolled back batch leaves the
+        table untouched and an import that stops after a commit leaves it
+        consistent with the committed records.
+
+        Args:
+            conn: The import connection.
+        """
+        if not self._table_ready:
+            self._prepare_table(conn)
+            self._table_ready = True
+
+        conn.executemany(f"""
+            INSERT INTO {DAILY_TOTALS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (type, sourceName, day) DO UPDATE SET
+                total = total + excluded.total,
+                count = count + excluded.count,
+                minimum = MIN(minimum, excluded.minimum),
+                maximum = MAX(maximum, excluded.maximum)
+        """, [(*key, *totals) for key, totals in self._totals.items()])
+        self._merged.update(self._totals)
+        self._totals.clear()
+
+        conn.execute(f"DELETE FROM {DAILY_TOTALS_WATERMARK_TABLE}")
+        conn.execute(f"""
+            INSERT INTO {DAILY_TOTALS_WATERMARK_TABLE}
+            SELECT COALESCE(MAX(rowid), 0) FROM health_records
+        """)
+
+    def finish(self, conn: sqlite3.Connection):
+        """Merge the remaining totals and load the summary window.
+
+        Args:
+            conn: The import connection.
+        """
+        self.checkpoint(conn)
+
+        # Earlier imports' totals in the summary window complete the picture
+        rows = conn.execute(f"""
+            SELECT type, sourceName, day, total, count, minimum, maximum
+            FROM {DAILY_TOTALS_TABLE}
+            WHERE day BETWEEN ? AND ?
+        """, (self.start_date.isoformat(), self.today.isoformat())).fetchall()
+        self._window = {(row[0], row[1], row[2]): list(row[3:]) for row in rows}
+        logger.info(f"Merged {len(self)} daily totals; {len(rows)} in summary window")
+
+    def _prepare_table(self, conn: sqlite3.Connection):
+        """Create the daily totals table on first use.
+
+        The first import after the table is introduced, or after records were
+        written without an accumulator, derives totals for the existing
+        records once.
+        """
+        if self._stale:
+            logger.info("Daily totals do not cover every record; deriving them again")
+        if self._replace or self._stale:
+            conn.execute(f"DROP TABLE IF EXISTS {DAILY_TOTALS_TABLE}")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DAILY_TOTALS_TABLE} (
+                type TEXT NOT NULL,
+                sourceName TEXT NOT NULL,
+                day TEXT NOT NULL,
+                total REAL NOT NULL,
+                count INTEGER NOT NULL,
+                minimum REAL NOT NULL,
+                maximum REAL NOT NULL,
+                PRIMARY KEY (type, sourceName, day)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DAILY_TOTALS_WATERMARK_TABLE} (
+                last_rowid INTEGER NOT NULL
+            )
+        """)
+        if not self._replace and (self._stale or not self._has_table) and self._watermark:
+            logger.info("Deriving daily totals for records imported before totals were kept")
+            conn.execute(f"""
+                INSERT INTO {DAILY_TOTALS_TABLE}
+                SELECT type, COALESCE(sourceName, ''), substr(startDate, 1, 10),
+                       SUM(value), COUNT(value), MIN(value), MAX(value)
+                FROM health_records
+                WHERE rowid <= ? AND {_SUMMARIZED_RECORDS}
+                GROUP BY 1, 2, 3
+            """, (self._watermark,))
+
+    def _window_totals(self) -> Dict[str, Dict[str, Dict[str, _Totals]]]:
+        """Totals in the summary window as metric -> day -> source -> totals."""
+        if self._window is not None:
+            items = self._window.items()
+        else:
+            first, last = self.start_date.isoformat(), self.today.isoformat()
+            items = ((key, totals) for key, totals in self._totals.items()
+                     if first <= key[2] <= last)
+
+        by_metric = defaultdict(lambda: defaultdict(dict))
+        for (metric, source, day), totals in items:
+            by_metric[metric][day][source] = totals
+        return by_metric
+
+    def summaries(self) -> Dict[str, Any]:
+        """Daily, weekly and monthly summaries in the ``cache_import_summaries`` format.
+
+        Returns:
+            Dict with 'daily', 'weekly' and 'monthly' mappings of metric to
+            period to statistics, and 'metadata', as produced by
+            SummaryCalculator.calculate_all_summaries.
+        """
+        started = datetime.now()
+        result = {'daily': {}, 'weekly': {}, 'monthly': {}}
+
+        for metric, days in sorted(self._window_totals().items()):
+            daily, weeks, months = {}, defaultdict(list), defaultdict(list)
+            for day in sorted(days):
+                source_sums = [totals[0] for totals in days[day].values()]
+                day_sum = sum(source_sums)
+                daily[day] = {
+                    'sum': day_sum,
+                    'avg': day_sum / len(source_sums),
+                    'max': max(source_sums),
+                    'min': min(source_sums),
+                    'count': sum(totals[1] for totals in days[day].values()),
+                    'sources': len(source_sums)
+                }
+                weeks[date.fromisoformat(day).strftime('%Y-W%W')].append(day_sum)
+                months[day[:7]].append(day_sum)
+
+            result['daily'][metric] = daily
+            result['weekly'][metric] = {
+                week: {
+                    'sum': sum(sums),
+                    'daily_avg': sum(sums) / len(sums),
+                    'daily_max': max(sums),
+                    'daily_min': min(sums),
+                    'days_with_data': len(sums)
+                }
+                for week, sums in weeks.items()
+            }
+            result['monthly'][metric] = {
+                month: self._monthly_stats(sums) for month, sums in months.items()
+            }
+
+        result['metadata'] = {
+            'import_timestamp': started.isoformat(),
+            'metrics_processed': len(result['daily']),
+            'date_range': {'start': self.start_date.isoformat(),
+                           'end': self.today.isoformat()},
+            'processing_time': (datetime.now() - started).total_seconds()
+        }
+        return result
+
+    @staticmethod
+    def _monthly_stats(sums: List[float]) -> Dict[str, Any]:
+        mean = sum(sums) / len(sums)
+        variance = sum(value * value for value in sums) / len(sums) - mean * mean
+        return {
+            'sum': sum(sums),
+            'daily_avg': mean,
+            'daily_max': max(sums),
+            'daily_min': min(sums),
+            'days_with_data': len(sums),
+            'std_dev': variance ** 0.5 if variance > 0 else 0
+        }
+
+    def summaries_by_source(self) -> Dict[str, Any]:
+        """Daily summaries per source, as SummaryCalculator.calculate_summaries_by_source.
+
+        Returns:
+            Dict with 'daily' mapping metric to source to day to statistics,
+            where the None source holds the "All Sources" aggregate.
+        """
+        daily = {}
+        for metric, days in sorted(self._window_totals().items()):
+            by_source = defaultdict(dict)
+            aggregated = {}
+            cumulative = metric.replace('HKQuantityTypeIdentifier', '') in CUMULATIVE_METRICS
+            for day in sorted(days):
+                stats = []
+                for source, (total, count, minimum, maximum) in days[day].items():
+                    by_source[source][day] = {
+                        'sum': total,
+                        'avg': total / count,
+                        'max': maximum,
+                        'min': minimum,
+                        'count': count
+                    }
+                    stats.append(by_source[source][day])
+                sums = [s['sum'] for s in stats]
+                aggregated[day] = {
+                    'sum': max(sums) if cumulative else sum(sums) / len(sums),
+                    'avg': sum(s['avg'] for s in stats) / len(stats),
+                    'max': max(s['max'] for s in stats),
+                    'min': min(s['min'] for s in stats),
+                    'count': sum(s['count'] for s in stats),
+                    'sources': len(stats)
+                }
+            daily[metric] = dict(by_source)
+            daily[metric][None] = aggregated  # None represents "All Sources"
+
+        return {'daily': daily, 'weekly': {}, 'monthly': {}}
@@ -0,0 +1,423 @@
+"""
+Incremental STL decomposition and online CUSUM change-point detection.
+
+Daily refreshes usually add a single new observation to years of history.
+Instead of re-decomposing and re-scanning the full series, these helpers keep
+the last decomposition state, re-fit STL only on a trailing window (with an
+overlap that absorbs window edge effects) and update CUSUM statistics one
+point at a time, so refresh cost depends on the window size rather than the
+history length.
+
+Only the trailing points a refresh depends on are compared with the stored
+state. Edits to older history are detected through an optional ``version``
+token, such as ``DataVersionRegistry.version(metric)``, which callers pass
+with the data; a changed token forces a full re-fit or re-scan.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .advanced_trend_models import ChangePoint
+
+logger = logging.getLogger(__name__)
+
+try:
+    from statsmodels.tsa.seasonal import STL
+    STL_AVAILABLE = True
+except (ImportError, Exception) as e:
+    STL_AVAILABLE = False
+    STL = None
+    logger.debug(f"STL not available: {e}. Incremental decomposition disabled.")
+
+
+class DecompositionState:
+    """Decomposition of the full history, kept between refreshes.
+
+    Components are views of buffers with spare capacity, so a refresh writes
+    the re-fitted tail in place instead of copying the whole history.
+    """
+
+    COMPONENTS = ('observed', 'trend', 'seasonal', 'resid')
+
+    def __init__(self, index: pd.Index, observed: np.ndarray, trend: np.ndarray,
+                 seasonal: np.ndarray, resid: np.ndarray, refreshed_from: int = 0,
+                 version: Optional[Hashable] = None):
+        self.index = index
+        self.refreshed_from = refreshed_from  # First position re-decomposed by the last update
+        self.version = version
+        self._length = len(observed)
+        capacity = max(16, 2 * self._length)
+        self._buffers = {}
+        for name, values in zip(self.COMPONENTS, (observed, trend, seasonal, resid)):
+            buffer = np.empty(capacity, dtype=float)
+            buffer[:self._length] = values
+            self._buffers[name] = buffer
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def observed(self) -> np.ndarray:
+        return self._buffers['observed'][:self._length]
+
+    @property
+    def trend(self) -> np.ndarray:
+        return self._buffers['trend'][:self._length]
+
+    @property
+    def seasonal(self) -> np.ndarray:
+        return self._buffers['seasonal'][:self._length]
+
+    @property
+    def resid(self) -> np.ndarray:
+        return self._buffers['resid'][:self._length]
+
+    def extend(self, index: pd.Index, new_observed: np.ndarray, start: int,
+               components: '_Components'):
+        """Append new observations and replace the components from ``start`` on.
+
+        Args:
+            index: Index of the whole extended series
+            new_observed: Observations appended after the current ones
+            start: First position whose components are replaced
+            components: Trend, seasonal and residual for positions ``start`` onwards
+        """
+        old_n, n = self._length, len(index)
+        if n > len(self._buffers['observed']):
+            # Doubling keeps appends amortized O(1) per point
+            for name, buffer in self._buffers.items():
+                grown = np.empty(2 * n, dtype=float)
+                grown[:old_n] = buffer[:old_n]
+                self._buffers[name] = grown
+
+        self._buffers['observed'][old_n:n] = new_observed
+        self._buffers['trend'][start:n] = components.trend
+        self._buffers['seasonal'][start:n] = components.seasonal
+        self._buffers['resid'][start:n] = components.resid
+        self._length = n
+        self.index = index
+        self.refreshed_from = start
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the components as a DataFrame indexed like the input."""
+        return pd.DataFrame({
+            'observed': self.observed,
+            'trend': self.trend,
+            'seasonal': self.seasonal,
+            'resid': self.resid
+        }, index=self.index)
+
+
+class IncrementalSTL:
+    """
+    STL decomposition that only re-fits the trailing window on refresh.
+
+    The first call (or any call where earlier history changed) performs a full
+    fit. Later calls that only append points re-fit the last ``window`` points
+    and replace components from ``window - overlap`` points back, keeping the
+    earlier components untouched.
+
+    The window must hold at least two seasonal periods and the ``seasonal``
+    smoother's span of cycles; shorter histories, or windows shorter than two
+    periods, are always fitted in full like the batch decomposition.
+    """
+
+    def __init__(self,
+                 seasonal: int = 7,
+                 trend: Optional[int] = None,
+                 period: Optional[int] = None,
+                 window: Optional[int] = None,
+                 overlap: Optional[int] = None,
+                 robust: bool = False):
+        """
+        Initialize incremental decomposition.
+
+        Args:
+            seasonal: STL seasonal smoother length
+            trend: STL trend smoother length (None for STL default)
+            period: Seasonal period (None to infer from the index frequency)
+            window: Trailing points re-fitted per refresh (None for auto, at
+                least ``seasonal`` periods)
+            overlap: Leading window points used only as context (None for auto)
+            robust: Use robust STL fitting
+        """
+        if not STL_AVAILABLE:
+            raise ImportError("statsmodels is required for incremental STL")
+
+        self.seasonal = seasonal
+        self.trend = trend
+        self.period = period
+        span = period or 7
+        self.overlap = overlap if overlap is not None else 2 * span
+        self.window = window if window is not None else max(8 * span, 90, seasonal * span)
+        if self.window <= self.overlap:
+            raise ValueError("window must be larger than overlap")
+        # A window shorter than two periods cannot estimate the seasonal component
+        self.windowed = self.window >= 2 * span
+        self.robust = robust
+
+        self.state: Optional[DecompositionState] = None
+        self.full_fits = 0
+        self.incremental_fits = 0
+
+    def reset(self):
+        """Discard the stored decomposition."""
+        self.state = None
+
+    def update(self, data: pd.Series, version: Optional[Hashable] = None) -> DecompositionState:
+        """
+        Bring the decomposition up to date with ``data``.
+
+        Args:
+            data: Full time series, typically the previous history plus new points
+            version: Token that changes whenever earlier history is edited
+                (None when the caller does not track one)
+
+        Returns:
+            Decomposition covering all of ``data``
+        """
+        new_points = self._appended_points(data, version)
+
+        if new_points is None or new_points > self.window - self.overlap:
+            return self._full_fit(data, version)
+        if new_points == 0:
+            self.state.refreshed_from = len(self.state)
+            return self.state
+
+        n = len(data)
+        result = self._fit(data.iloc[n - self.window:])
+        keep = n - self.window + self.overlap
+        self.state.extend(
+            data.index,
+            np.asarray(data.values[len(self.state):], dtype=float),
+            keep,
+            _Components(result.trend[self.overlap:], result.seasonal[self.overlap:],
+                        result.resid[self.overlap:])
+        )
+        self.incremental_fits += 1
+        return self.state
+
+    def _appended_points(self, data: pd.Series, version: Optional[Hashable]) -> Optional[int]:
+        """Count points appended since the last update.
+
+        Returns None when the stored state cannot be extended: there is no
+        state yet, the history is too short for windowed fitting, the version
+        changed, or one of the last ``window`` fitted points differs. Older
+        points are covered by the version, so the check costs O(window)
+        rather than O(history).
+        """
+        state = self.state
+        if (state is None or not self.windowed or len(state) < self.window
+                or len(data) < len(state) or version != state.version):
+            return None
+
+        old_n = len(state)
+        start = old_n - self.window
+        if data.index[0] != state.index[0]:
+            return None
+        if not data.index[start:old_n].equals(state.index[start:]):
+            return None
+        if not np.array_equal(np.asarray(data.values[start:old_n], dtype=float),
+                              state.observed[start:], equal_nan=True):
+            return None
+        return len(data) - old_n
+
+    def _full_fit(self, data: pd.Series, version: Optional[Hashable] = None) -> DecompositionState:
+        """Decompose the whole series."""
+        result = self._fit(data)
+        self.state = DecompositionState(
+            index=data.index,
+            observed=np.asarray(data.values, dtype=float),
+            trend=result.trend,
+            seasonal=result.seasonal,
+            resid=result.resid,
+            refreshed_from=0,
+            version=version
+        )
+        self.full_fits += 1
+        return self.state
+
+    def _fit(self, data: pd.Series):
+        """Run STL and return components as NumPy arrays."""
+        stl = STL(data, seasonal=self.seasonal, trend=self.trend,
+                  period=self.period, robust=self.robust)
+        result = stl.fit()
+        return _Components(np.asarray(result.trend, dtype=float),
+                           np.asarray(result.seasonal, dtype=float),
+                           np.asarray(result.resid, dtype=float))
+
+
+@dataclass
+class _Components:
+    trend: np.ndarray
+    seasonal: np.ndarray
+    resid: np.ndarray
+
+
+class OnlineCUSUM:
+    """
+    Two-sided tabular CUSUM updated one observation at a time.
+
+    Deviations are standardized against running (Welford) statistics of the
+    current regime. When either cumulative sum exceeds ``threshold`` a change
+    point is recorded at the start of the excursion and a new regime is
+    estimated from the following ``warmup`` points.
+    """
+
+    def __init__(self, drift: float = 0.5, threshold: float = 8.0,
+                 warmup: int = 30):
+        """
+        Initialize online CUSUM.
+
+        Args:
+            drift: Allowed slack per point in standard deviations (k)
+            threshold: Decision threshold in standard deviations (h)
+            warmup: Points used to establish the initial regime
+        """
+        self.drift = drift
+        self.threshold = threshold
+        self.warmup = warmup
+        self.change_points: List[ChangePoint] = []
+        self.reset()
+
+    def reset(self):
+        """Forget all statistics and detected change points."""
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_value = None
+        self.version = None
+        self.points_seen = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._s_pos = 0.0
+        self._s_neg = 0.0
+        self._pos_run = [None, 0.0, 0]  # start timestamp, sum, count
+        self._neg_run = [None, 0.0, 0]
+        self.change_points = []
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of the current regime."""
+        if self._count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self._count - 1))
+
+    def update(self, timestamp, value: float) -> Optional[ChangePoint]:
+        """
+        Process one observation.
+
+        Returns:
+            ChangePoint if this observation triggered a change, otherwise None
+        """
+        if self.points_seen == 0:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.last_value = value
+        self.points_seen += 1
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+
+        if self._count < self.warmup:
+            self._add(value)
+            return None
+
+        std = self.std or 1e-9
+        z = (value - self._mean) / std
+
+        self._s_pos = self._step(self._s_pos, z - self.drift, self._pos_run, timestamp, value)
+        self._s_neg = self._step(self._s_neg, -z - self.drift, self._neg_run, timestamp, value)
+
+        for s, run in ((self._s_pos, self._pos_run), (self._s_neg, self._neg_run)):
+            if s > self.threshold:
+                return self._signal(run, std)
+
+        self._add(value)
+        return None
+
+    def update_series(self, data: pd.Series, version: Optional[Hashable] = None) -> List[ChangePoint]:
+        """
+        Process the points of ``data`` newer than the last processed timestamp.
+
+        When the history already processed no longer matches ``data`` (the
+        version changed, points were inserted or removed before the last
+        processed timestamp, or the first or last processed point changed),
+        the detector resets and rescans all of ``data``.
+
+        Args:
+            data: Full time series, typically the previous history plus new points
+            version: Token that changes whenever earlier history is edited
+                (None when the caller does not track one)
+
+        Returns:
+            Change points detected among the processed points
+        """
+        if self.last_timestamp is not None and len(data):
+            start = data.index.searchsorted(self.last_timestamp, side='right')
+            if not self._continues(data, start, version):
+                self.reset()
+                start = 0
+            data = data.iloc[start:]
+        self.version = version
+
+        detected = []
+        for timestamp, value in zip(data.index, data.values):
+            change = self.update(timestamp, float(value))
+            if change is not None:
+                detected.append(change)
+        return detected
+
+    def _continues(self, data: pd.Series, consumed: int, version: Optional[Hashable]) -> bool:
+        """Whether the first ``consumed`` points of ``data`` are the ones already processed."""
+        if version != self.version or consumed != self.points_seen or consumed == 0:
+            return False
+        if data.index[0] != self.first_timestamp or data.index[consumed - 1] != self.last_timestamp:
+            return False
+        value, last = float(data.iloc[consumed - 1]), self.last_value
+        return value == last or (math.isnan(value) and (last is None or math.isnan(last)))
+
+    def _step(self, s: float, increment: float, run: list, timestamp, value: float) -> float:
+        """Advance one side of the CUSUM and track its current excursion."""
+        s_new = max(0.0, s + increment)
+        if s_new == 0.0:
+            run[0], run[1], run[2] = None, 0.0, 0
+        else:
+            if run[0] is None:
+                run[0] = timestamp
+            run[1] += value
+            run[2] += 1
+        return s_new
+
+    def _signal(self, run: list, std: float) -> ChangePoint:
+        """Record a change point for ``run`` and re-base the regime on it."""
+        run_mean = run[1] / run[2]
+        magnitude = run_mean - self._mean
+        change = ChangePoint(
+            timestamp=run[0],
+            confidence=min(100.0, 100.0 * abs(magnitude) / (2 * std + 1)),
+            magnitude=magnitude,
+            direction="increase" if magnitude > 0 else "decrease",
+            method="CUSUM"
+        )
+        self.change_points.append(change)
+
+        # Start a fresh regime; it is re-estimated over the next warmup points
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._s_pos = self._s_neg = 0.0
+        self._pos_run = [None, 0.0, 0]
+        self._neg_run = [None, 0.0, 0]
+        return change
+
+    def _add(self, value: float):
+        """Welford update of regime statistics."""
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
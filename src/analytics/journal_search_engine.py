@@ -35,6 +35,9 @@ Examples:
 import sqlite3
 import logging
 import re
+import threading
+import unicodedata
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -43,10 +46,26 @@ import hashlib
 import json
 
 from ..database import DatabaseManager
+from ..data_access import JournalDAO
 from ..models import JournalEntry
 
 logger = logging.getLogger(__name__)
 
+# Sorts after any text starting with a given prefix
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+# Number of distinct query/filter combinations kept in the result cache
+RESULT_CACHE_SIZE = 128
+
+# Ranked matches fetched per query; later pages are sliced from this window
+RANKING_WINDOW = 500
+
+
+def _vocabulary_form(word: str) -> str:
+    """Fold a word the way the unicode61 tokenizer stores vocabulary terms."""
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
 
 @dataclass
 class SearchResult:
@@ -70,6 +89,29 @@ class SearchResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class _RankedResults:
+    """Ranked matches for one query and filter set, shared by all its pages.
+
+    Attributes:
+        fts_query: FTS5 expression the matches were ranked for.
+        results: Matches in rank order. Snippets are filled in when a page
+            containing them is first served.
+        complete: Whether ``results`` holds every match rather than a window.
+        snippet_ids: Entry IDs whose snippet has been generated.
+        logged: Whether the query has been recorded in search history.
+    """
+    fts_query: str
+    results: List[SearchResult]
+    complete: bool
+    snippet_ids: set
+    logged: bool = False
+
+    def covers(self, end: int) -> bool:
+        """Return whether results up to index ``end`` are available."""
+        return self.complete or len(self.results) >= end
+
+
 @dataclass
 class ParsedQuery:
     """Represents a parsed search query with extracted components.
@@ -201,20 +243,32 @@ class JournalSearchEngine:
     Attributes:
         db (DatabaseManager): Database connection manager.
         parser (QueryParser): Query parser instance.
-        _cache (dict): LRU cache for search results.
+        _cache (OrderedDict): LRU cache of ranked results keyed by query
+            and filters, valid for one journal data version.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None,
+                 read_connection: Optional[sqlite3.Connection] = None):
         """Initialize the search engine with database connection.
         
         Args:
             db_path: Optional path to database file. If not provided,
                 uses the default DatabaseManager instance.
+            read_connection: Optional connection that all search queries
+                run on instead of opening one per query. It must only be
+                used from the thread that owns it.
         """
         self.db = DatabaseManager() if not db_path else None
         self.db_path = db_path
+        self._read_connection = read_connection
         self.parser = QueryParser()
-        self._cache = {}
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self._cache_version = JournalDAO.get_data_version()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_invalidations = 0
         
     def _get_connection(self):
         """Get database connection based on initialization method."""
@@ -226,9 +280,14 @@ class JournalSearchEngine:
             return conn
             
     def search(self, query: str, filters: Optional[Dict[str, Any]] = None, 
-              limit: int = 50) -> List[SearchResult]:
+              limit: int = 50, offset: int = 0,
+              snippets: bool = True, log: bool = True) -> List[SearchResult]:
         """Search journal entries with optional filters.
         
+        Matches are ranked once per query and filter set and kept in an LRU
+        cache until a journal entry is saved or deleted, so requesting the
+        next page slices the cached ranking instead of searching again.
+        
         Args:
             query: The search query string.
             filters: Optional filters dict with keys:
@@ -237,6 +296,12 @@ class JournalSearchEngine:
                 - entry_types: List of entry types to include
                 - sort_by: Sort order ('relevance' or 'date')
             limit: Maximum number of results to return.
+            offset: Number of ranked results to skip, for pagination.
+            snippets: Whether to generate snippets for the page. When False
+                they are left empty for a later load_snippets call.
+            log: Whether to record the query in search history (once per
+                ranking). Search-as-you-type passes False so partial words
+                do not become suggestions.
             
         Returns:
             List of SearchResult objects sorted by relevance.
@@ -244,33 +309,110 @@ class JournalSearchEngine:
         Examples:
             >>> engine = JournalSearchEngine()
             >>> results = engine.search("exercise routine")
+            >>> next_page = engine.search("exercise routine", offset=50)
             >>> results = engine.search(
             ...     "workout",
             ...     filters={'entry_types': ['daily'], 'date_from': date(2024, 1, 1)}
             ... )
         """
-        # Check cache
-        cache_key = self._get_cache_key(query, filters, limit)
-        if cache_key in self._cache:
-            logger.debug(f"Cache hit for query: {query}")
-            return self._cache[cache_key]
-        
-        # Parse query
-        parsed_query = self.parser.parse(query)
-        
-        # Execute search
-        results = self._execute_search(parsed_query, filters, limit)
+        cache_key = self._get_cache_key(query, filters)
+        end = offset + limit
+        
+        with self._cache_lock:
+            version = self._sync_cache_version()
+            ranked = self._cache.get(cache_key)
+            hit = ranked is not None and ranked.covers(end)
+            if hit:
+                self._cache.move_to_end(cache_key)
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
         
-        # Cache results
-        self._cache[cache_key] = results
-        if len(self._cache) > 100:  # Simple cache eviction
-            self._cache.pop(next(iter(self._cache)))
+        if hit:
+            logger.debug(f"Cache hit for query: {query}")
+        else:
+            # Widen the window geometrically when paging past it
+            window = max(end, RANKING_WINDOW if ranked is None else 2 * len(ranked.results))
+            parsed_query = self.parser.parse(query)
+            results = self._execute_search(parsed_query, filters, window)
+            ranked = _RankedResults(parsed_query.fts_query, results,
+                                    len(results) < window, set(),
+                                    logged=ranked is not None and ranked.logged)
+            self._store_ranked(cache_key, ranked, version)
         
         # Log search for history
-        self._log_search(query, len(results))
+        if log and not ranked.logged:
+            ranked.logged = True
+            self._log_search(query, len(ranked.results))
+        
+        page = ranked.results[offset:end]
+        if snippets:
+            self._load_snippets(ranked, page)
+        return page
+    
+    def load_snippets(self, query: str, results: List[SearchResult],
+                      filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
+        """Generate snippets for results returned by ``search(snippets=False)``.
         
+        Args:
+            query: The query the results were found for.
+            results: Results to fill in, typically the ones on screen.
+            filters: The filters the results were found with.
+            
+        Returns:
+            The same results with snippet and highlights set.
+        """
+        with self._cache_lock:
+            ranked = self._cache.get(self._get_cache_key(query, filters))
+        if ranked is None:
+            ranked = _RankedResults(self.parser.parse(query).fts_query, [], True, set())
+        self._load_snippets(ranked, results)
         return results
     
+    def _sync_cache_version(self) -> int:
+        """Drop cached results if journal entries changed since they were cached.
+        
+        Returns:
+            The journal data version the cache is now valid for.
+        """
+        version = JournalDAO.get_data_version()
+        if version != self._cache_version:
+            if self._cache:
+                self._cache_invalidations += 1
+                self._cache.clear()
+            self._cache_version = version
+        return version
+    
+    def _store_ranked(self, cache_key: str, ranked: _RankedResults, version: int):
+        """Cache ranked results, evicting the least recently used entries.
+        
+        Args:
+            cache_key: Key from _get_cache_key.
+            ranked: Ranked results to cache.
+            version: Journal data version the search started under.
+        """
+        with self._cache_lock:
+            # A write landed while searching; the results may already be stale
+            if self._sync_cache_version() != version:
+                return
+            self._cache[cache_key] = ranked
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > RESULT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+    
+    def _with_connection(self, work, *args):
+        """Run ``work(conn, *args)`` on a connection to the journal database."""
+        if self._read_connection is not None:
+            return work(self._read_connection, *args)
+        if self.db:
+            with self.db.get_connection() as conn:
+                return work(conn, *args)
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return work(conn, *args)
+    
     def _execute_search(self, parsed_query: ParsedQuery, 
                        filters: Optional[Dict[str, Any]], 
                        limit: int) -> List[SearchResult]:
@@ -282,15 +424,10 @@ class JournalSearchEngine:
             limit: Result limit.
             
         Returns:
-            List of SearchResult objects.
+            List of ranked SearchResult objects without snippets.
         """
-        if self.db:
-            with self.db.get_connection() as conn:
-                return self._search_with_connection(conn, parsed_query, filters, limit)
-        else:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                return self._search_with_connection(conn, parsed_query, filters, limit)
+        return self._with_connection(self._search_with_connection,
+                                     parsed_query, filters, limit)
     
     def _search_with_connection(self, conn: sqlite3.Connection,
                                parsed_query: ParsedQuery,
@@ -299,15 +436,13 @@ class JournalSearchEngine:
         """Execute search with provided connection."""
         cursor = conn.cursor()
         
-        # Build SQL query
+        # Build SQL query; snippets are generated per page in _load_snippets
         sql_parts = ["""
             SELECT 
                 js.entry_id,
                 je.entry_date,
                 je.entry_type,
-                je.content,
                 bm25(journal_search) as text_score,
-                snippet(journal_search, 3, '<mark>', '</mark>', '...', 32) as snippet,
                 je.created_at,
                 je.updated_at
             FROM journal_search js
@@ -332,12 +467,12 @@ class JournalSearchEngine:
                 sql_parts.append(f"AND je.entry_type IN ({placeholders})")
                 params.extend(filters['entry_types'])
         
-        # Add ordering
+        # Add ordering; bm25 is negative with the best matches lowest
         sort_by = filters.get('sort_by', 'relevance') if filters else 'relevance'
         if sort_by == 'date':
             sql_parts.append("ORDER BY je.entry_date DESC")
         else:
-            sql_parts.append("ORDER BY text_score DESC")
+            sql_parts.append("ORDER BY text_score")
             
         sql_parts.append("LIMIT ?")
         params.append(limit)
@@ -355,16 +490,13 @@ class JournalSearchEngine:
             recency_score = self._calculate_recency_score(row['entry_date'])
             hybrid_score = self._calculate_hybrid_score(text_score, recency_score, row)
             
-            # Extract highlights from snippet
-            highlights = self._extract_highlights(row['snippet'])
-            
             results.append(SearchResult(
                 entry_id=row['entry_id'],
                 entry_date=date.fromisoformat(row['entry_date']),
                 entry_type=row['entry_type'],
                 score=hybrid_score,
-                snippet=row['snippet'],
-                highlights=highlights,
+                snippet='',
+                highlights=[],
                 metadata={
                     'text_score': text_score,
                     'recency_score': recency_score,
@@ -375,6 +507,36 @@ class JournalSearchEngine:
         
         return results
     
+    def _load_snippets(self, ranked: _RankedResults, page: List[SearchResult]):
+        """Generate highlighted snippets for the results on one page.
+        
+        Args:
+            ranked: Cached ranking the page was sliced from.
+            page: Results about to be returned.
+        """
+        pending = {result.entry_id: result for result in page
+                   if result.entry_id not in ranked.snippet_ids}
+        if not pending:
+            return
+        
+        def fetch(conn, entry_ids):
+            placeholders = ','.join('?' for _ in entry_ids)
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT entry_id,
+                       snippet(journal_search, 3, '<mark>', '</mark>', '...', 32) as snippet
+                FROM journal_search
+                WHERE journal_search MATCH ? AND entry_id IN ({placeholders})
+            """, [ranked.fts_query, *entry_ids])
+            return cursor.fetchall()
+        
+        for row in self._with_connection(fetch, list(pending)):
+            result = pending.get(row['entry_id'])
+            if result is not None:
+                result.snippet = row['snippet']
+                result.highlights = self._extract_highlights(row['snippet'])
+        ranked.snippet_ids.update(pending)
+    
     def _calculate_recency_score(self, entry_date_str: str) -> float:
         """Calculate recency score with exponential decay.
         
@@ -565,6 +727,13 @@ class JournalSearchEngine:
     def suggest_queries(self, partial_query: str, limit: int = 10) -> List[str]:
         """Generate query suggestions based on partial input and history.
         
+        Previous searches starting with the input come first, most frequent
+        first, followed by completions of its last word from the journal
+        vocabulary, most widely used first. Both come from indexes kept up
+        to date by triggers on writes (``search_query_stats`` and
+        ``journal_terms_vocab``), and are read with a range lookup on the
+        prefix, so suggesting costs the same however long the journal is.
+        
         Args:
             partial_query: Partial query string.
             limit: Maximum number of suggestions.
@@ -586,42 +755,35 @@ class JournalSearchEngine:
                 
                 # Get suggestions from search history
                 cursor.execute("""
-                    SELECT DISTINCT query, COUNT(*) as frequency
-                    FROM search_history
-                    WHERE query LIKE ? || '%'
-                    GROUP BY query
-                    ORDER BY frequency DESC, searched_at DESC
+                    SELECT query
+                    FROM search_query_stats
+                    WHERE query >= ? AND query <= ?
+                    ORDER BY frequency DESC, last_searched DESC
                     LIMIT ?
-                """, (partial_query, limit))
+                """, (partial_query, partial_query + PREFIX_UPPER_BOUND, limit))
                 
-                for row in cursor.fetchall():
-                    suggestions.append(row['query'])
+                suggestions = [row['query'] for row in cursor.fetchall()]
                 
-                # If not enough suggestions, add from content
-                if len(suggestions) < limit:
-                    remaining = limit - len(suggestions)
+                # If not enough suggestions, complete the last word from
+                # the journal vocabulary
+                words = partial_query.split()
+                if len(suggestions) < limit and words and not partial_query[-1].isspace():
+                    head = partial_query[:len(partial_query) - len(words[-1])]
+                    prefix = _vocabulary_form(words[-1])
                     cursor.execute("""
-                        SELECT DISTINCT content
-                        FROM journal_entries
-                        WHERE content LIKE '%' || ? || '%'
+                        SELECT term
+                        FROM journal_terms_vocab
+                        WHERE term >= ? AND term <= ?
+                        ORDER BY doc DESC, term
                         LIMIT ?
-                    """, (partial_query, remaining * 3))
+                    """, (prefix, prefix + PREFIX_UPPER_BOUND, limit * 2))
                     
-                    # Extract relevant terms from content
-                    pattern = re.compile(
-                        f'\\b{re.escape(partial_query)}\\w*\\b',
-                        re.IGNORECASE
-                    )
-                    
-                    terms_seen = set(suggestions)
+                    terms_seen = {suggestion.lower() for suggestion in suggestions}
                     for row in cursor.fetchall():
-                        matches = pattern.findall(row['content'])
-                        for match in matches:
-                            if match.lower() not in terms_seen:
-                                suggestions.append(match)
-                                terms_seen.add(match.lower())
-                                if len(suggestions) >= limit:
-                                    break
+                        suggestion = head + row['term']
+                        if suggestion.lower() not in terms_seen:
+                            suggestions.append(suggestion)
+                            terms_seen.add(suggestion.lower())
                         if len(suggestions) >= limit:
                             break
         
@@ -644,13 +806,13 @@ class JournalSearchEngine:
                 logger.error(f"Failed to log search history: {e}")
     
     def _get_cache_key(self, query: str, filters: Optional[Dict[str, Any]], 
-                      limit: int) -> str:
+                      limit: Optional[int] = None) -> str:
         """Generate cache key for search query.
         
         Args:
             query: Search query.
             filters: Search filters.
-            limit: Result limit.
+            limit: Result limit, or None for the ranking shared by all pages.
             
         Returns:
             Hash key for caching.
@@ -676,22 +838,34 @@ class JournalSearchEngine:
     
     def clear_cache(self):
         """Clear the search result cache."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
         logger.info("Search cache cleared")
     
     def get_search_stats(self) -> Dict[str, Any]:
         """Get search usage statistics.
         
         Returns:
-            Dictionary with search statistics including popular queries,
-            recent searches, and success rates.
+            Dictionary with search statistics including result cache hit
+            rate, popular queries, recent searches, and success rates.
         """
-        stats = {
-            'cache_size': len(self._cache),
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            stats = {
+                'cache_size': len(self._cache),
+                'cache_capacity': RESULT_CACHE_SIZE,
+                'cache_hits': self._cache_hits,
+                'cache_misses': self._cache_misses,
+                'cache_hit_rate': self._cache_hits / lookups if lookups else 0.0,
+                'cache_evictions': self._cache_evictions,
+                'cache_invalidations': self._cache_invalidations,
+                'data_version': self._cache_version,
+            }
+        stats.update({
             'popular_queries': [],
             'recent_searches': [],
             'zero_result_queries': []
-        }
+        })
         
         if self.db:
             with self.db.get_connection() as conn:
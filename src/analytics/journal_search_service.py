@@ -0,0 +1,296 @@
+"""Debounced, cancellable journal search that runs off the UI thread.
+
+Search-as-you-type produces a query for every pause in typing. Running each
+one synchronously blocks the UI on FTS5 ranking and snippet highlighting, and
+results for text the user has already changed are wasted work. This service
+waits for typing to settle, drops queries that a newer one superseded
+(interrupting the SQLite statement if it is already running), and searches on
+a worker thread that keeps its own read connection. The first page is emitted
+as soon as it is ranked, without snippets; snippets are generated only for
+the results the view asks for, usually the rows on screen.
+
+Example:
+    >>> service = JournalSearchService()
+    >>> service.pageReady.connect(on_page)
+    >>> search_input.textChanged.connect(service.search)
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..database import DatabaseManager
+from ..utils.logging_config import get_logger
+from .journal_search_engine import JournalSearchEngine, SearchResult
+
+logger = get_logger(__name__)
+
+DEFAULT_DEBOUNCE_MS = 200
+FIRST_PAGE_SIZE = 20
+PAGE_SIZE = 50
+
+
+@dataclass
+class _SearchTask:
+    """One unit of work for the search thread.
+
+    Attributes:
+        generation: Search the task belongs to; stale tasks are dropped.
+        kind: 'search' for a first page, 'page' or 'snippets' for follow-ups.
+        query: Query text.
+        filters: Search filters.
+        offset: First result of the requested page.
+        limit: Page size.
+        results: Results to generate snippets for.
+        log: Whether the search is recorded in search history.
+    """
+    generation: int
+    kind: str
+    query: str
+    filters: Optional[Dict[str, Any]]
+    offset: int = 0
+    limit: int = 0
+    results: List[SearchResult] = field(default_factory=list)
+    log: bool = False
+
+
+class JournalSearchService(QObject):
+    """Search-as-you-type service over JournalSearchEngine.
+
+    Every call to search() starts a new generation. Results are delivered
+    with the generation they belong to, and nothing is emitted for a
+    generation that has been superseded or cancelled.
+
+    Signals:
+        searchStarted(int, str): The search thread began ranking a query.
+        pageReady(int, int, list): Generation, offset and results of a page.
+            Results carry empty snippets until request_snippets is called.
+        snippetsReady(int, list): Results whose snippets were filled in.
+        searchFailed(int, str): Generation and error message.
+    """
+
+    searchStarted = pyqtSignal(int, str)
+    pageReady = pyqtSignal(int, int, list)
+    snippetsReady = pyqtSignal(int, list)
+    searchFailed = pyqtSignal(int, str)
+
+    def __init__(self, db_path: Optional[str] = None,
+                 debounce_ms: int = DEFAULT_DEBOUNCE_MS,
+                 first_page_size: int = FIRST_PAGE_SIZE,
+                 page_size: int = PAGE_SIZE,
+                 parent: Optional[QObject] = None):
+        """Initialize the service; the search thread starts on first use.
+
+        Args:
+            db_path: Optional database path. Defaults to the application
+                database, in which case immediate searches are also logged
+                to history.
+            debounce_ms: Quiet period after the last keystroke before searching.
+            first_page_size: Results in the first page of a search.
+            page_size: Results in each further page.
+            parent: Optional parent QObject.
+        """
+        super().__init__(parent)
+        self.db_path = db_path
+        self.debounce_ms = debounce_ms
+        self.first_page_size = first_page_size
+        self.page_size = page_size
+
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._current: Optional[_SearchTask] = None
+        self._pending: Optional[_SearchTask] = None
+        self._due = 0.0
+        self._follow_ups: Deque[_SearchTask] = deque()
+        self._running_generation: Optional[int] = None
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._engine: Optional[JournalSearchEngine] = None
+
+    @property
+    def generation(self) -> int:
+        """Generation of the most recent search request."""
+        return self._generation
+
+    def search(self, query: str, filters: Optional[Dict[str, Any]] = None,
+               immediate: bool = False) -> int:
+        """Request a search, superseding any earlier one.
+
+        Args:
+            query: Query text. Blank text cancels the current search.
+            filters: Optional search filters, as for JournalSearchEngine.search.
+            immediate: Skip the debounce and log the query to search
+                history, e.g. when the user pressed Enter. Queries typed on
+                the way are not logged.
+
+        Returns:
+            The generation that results for this query will carry.
+        """
+        query = query.strip()
+        if not query:
+            self.cancel()
+            return self._generation
+
+        with self._condition:
+            self._generation += 1
+            task = _SearchTask(self._generation, 'search', query,
+                               dict(filters) if filters else None,
+                               0, self.first_page_size, log=immediate)
+            self._current = task
+            self._pending = task
+            self._due = time.monotonic() + (0 if immediate else self.debounce_ms / 1000)
+            self._follow_ups.clear()
+            self._interrupt_superseded()
+            self._ensure_thread()
+            self._condition.notify()
+            return self._generation
+
+    def load_more(self, offset: int, limit: Optional[int] = None):
+        """Request the next page of the current search.
+
+        Args:
+            offset: Number of results already shown.
+            limit: Page size; defaults to page_size.
+        """
+        with self._condition:
+            if self._current is None:
+                return
+            self._follow_ups.append(_SearchTask(
+                self._current.generation, 'page', self._current.query,
+                self._current.filters, offset, limit or self.page_size))
+            self._condition.notify()
+
+    def request_snippets(self, results: List[SearchResult]):
+        """Request snippets for results of the current search.
+
+        Args:
+            results: Results about to be shown; those that already have a
+                snippet are skipped.
+        """
+        missing = [result for result in results if not result.snippet]
+        with self._condition:
+            if not missing or self._current is None:
+                return
+            self._follow_ups.append(_SearchTask(
+                self._current.generation, 'snippets', self._current.query,
+                self._current.filters, results=missing))
+            self._condition.notify()
+
+    def cancel(self):
+        """Cancel the current search and any queued work for it."""
+        with self._condition:
+            self._generation += 1
+            self._current = None
+            self._pending = None
+            self._follow_ups.clear()
+            self._interrupt_superseded()
+
+    def shutdown(self, timeout: float = 2.0):
+        """Stop the search thread and close its connection.
+
+        Args:
+            timeout: Seconds to wait for the thread to finish.
+        """
+        self.cancel()
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_thread(self):
+        """Start the search thread if it is not running (condition held)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='journal-search',
+                                            daemon=True)
+            self._thread.start()
+
+    def _interrupt_superseded(self):
+        """Abort the running statement if it belongs to an older search."""
+        if (self._connection is not None and self._running_generation is not None
+                and self._running_generation != self._generation):
+            self._connection.interrupt()
+
+    def _run(self):
+        """Search thread main loop."""
+        try:
+            while True:
+                task = self._next_task()
+                if task is None:
+                    return
+                try:
+                    self._execute(task)
+                finally:
+                    with self._condition:
+                        self._running_generation = None
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                self._engine = None
+
+    def _next_task(self) -> Optional[_SearchTask]:
+        """Wait for the next task, letting a pending search settle first."""
+        with self._condition:
+            while not self._stopping:
+                if self._pending is not None:
+                    remaining = self._due - time.monotonic()
+                    if remaining <= 0:
+                        task, self._pending = self._pending, None
+                        self._running_generation = task.generation
+                        return task
+                    self._condition.wait(remaining)
+                elif self._follow_ups:
+                    task = self._follow_ups.popleft()
+                    if task.generation == self._generation:
+                        self._running_generation = task.generation
+                        return task
+                else:
+                    self._condition.wait()
+            return None
+
+    def _get_engine(self) -> JournalSearchEngine:
+        """Open the thread's read connection and engine on first use."""
+        if self._engine is None:
+            db_path = self.db_path or DatabaseManager().db_path
+            self._connection = sqlite3.connect(str(db_path))
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA query_only = ON")
+            self._engine = JournalSearchEngine(self.db_path,
+                                               read_connection=self._connection)
+        return self._engine
+
+    def _is_current(self, task: _SearchTask) -> bool:
+        return task.generation == self._generation
+
+    def _execute(self, task: _SearchTask):
+        """Run one task and emit its results if still wanted."""
+        try:
+            engine = self._get_engine()
+            if task.kind == 'snippets':
+                engine.load_snippets(task.query, task.results, task.filters)
+                if self._is_current(task):
+                    self.snippetsReady.emit(task.generation, task.results)
+                return
+
+            if task.kind == 'search':
+                self.searchStarted.emit(task.generation, task.query)
+            results = engine.search(task.query, task.filters, task.limit, task.offset,
+                                    snippets=False, log=task.log)
+            if self._is_current(task):
+                self.pageReady.emit(task.generation, task.offset, results)
+
+        except Exception as e:
+            if not self._is_current(task):
+                logger.debug(f"Superseded journal search stopped: {task.query!r}")
+            else:
+                logger.error(f"Journal search failed: {e}", exc_info=True)
+                self.searchFailed.emit(task.generation, str(e))
@@ -0,0 +1,369 @@
+"""
+Online anomaly detectors for real-time detection.
+
+Each detector keeps running statistics per metric and scores every new point
+in O(1) time and memory, instead of recomputing statistics over the full
+series on every tick like the batch detectors in ``anomaly_detectors``.
+
+Detectors implement the ``BaseDetector`` interface: ``detect`` only processes
+points whose index is newer than the last point seen for that metric, so the
+same growing series (or just the latest points) can be passed on each tick,
+and they can be combined with ``EnsembleDetector``.
+"""
+
+import math
+from abc import abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .anomaly_detectors import BaseDetector
+from .anomaly_models import Anomaly, DetectionConfig, DetectionMethod
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm.
+
+    Tracks a single quantile with five markers (Jain & Chlamtac, 1985), so
+    each update is constant time and memory regardless of stream length.
+    """
+
+    def __init__(self, q: float):
+        if not 0 < q < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.q = q
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self._increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current quantile estimate (None before any observation)."""
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            ordered = sorted(self._heights)
+            return float(np.quantile(ordered, self.q))
+        return self._heights[2]
+
+    def add(self, x: float):
+        """Add one observation."""
+        self.count += 1
+        heights = self._heights
+
+        if self.count <= 5:
+            heights.append(x)
+            if self.count == 5:
+                heights.sort()
+            return
+
+        # Locate the cell containing x, extending the extremes if needed
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the three middle markers
+        for i in range(1, 4):
+            d = self._desired[i] - positions[i]
+            if ((d >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (d <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+
+class OnlineDetector(BaseDetector):
+    """Base class for detectors that update per point in constant time."""
+
+    def __init__(self, name: str, method: DetectionMethod, warmup: int = 30):
+        super().__init__(name, method)
+        self.warmup = warmup
+        self._states: Dict[str, Any] = {}
+        self._last_seen: Dict[str, Any] = {}
+        self.points_processed = 0
+
+    @abstractmethod
+    def _new_state(self) -> Any:
+        """Create empty running statistics for a metric."""
+
+    @abstractmethod
+    def _score(self, state: Any, value: float) -> Tuple[Optional[float], Dict[str, float]]:
+        """Score ``value`` against the statistics seen so far.
+
+        Returns:
+            (score, context); score is None when statistics are degenerate
+        """
+
+    @abstractmethod
+    def _absorb(self, state: Any, value: float):
+        """Fold ``value`` into the running statistics."""
+
+    @abstractmethod
+    def _threshold(self) -> float:
+        """Score magnitude above which a point is anomalous."""
+
+    def update(self, value: float, timestamp: Optional[datetime] = None,
+               metric: str = "unknown") -> Optional[Anomaly]:
+        """
+        Score one new observation and update the running statistics.
+
+        Args:
+            value: Observed value
+            timestamp: Observation time
+            metric: Metric name used to keep statistics separate
+
+        Returns:
+            Anomaly if the point is anomalous, otherwise None
+        """
+        self.points_processed += 1
+        if value is None or math.isnan(value):
+            return None
+
+        state = self._states.get(metric)
+        if state is None:
+            state = self._new_state()
+            self._states[metric] = state
+
+        anomaly = None
+        if state['count'] >= self.warmup:
+            score, context = self._score(state, value)
+            threshold = self._threshold()
+            if score is not None and abs(score) > threshold:
+                anomaly = Anomaly(
+                    timestamp=timestamp if isinstance(timestamp, datetime) else datetime.now(),
+                    metric=metric,
+                    value=value,
+                    score=float(score),
+                    method=self.method,
+                    severity=self._calculate_severity(score, threshold),
+                    threshold=threshold,
+                    context=context
+                )
+
+        state['count'] += 1
+        self._absorb(state, value)
+        return anomaly
+
+    def detect(self, data: Union[pd.Series, np.ndarray], metric: str = None) -> List[Anomaly]:
+        """Process points newer than the last seen for the metric."""
+        if isinstance(data, np.ndarray):
+            data = pd.Series(data)
+        if data.empty:
+            return []
+
+        metric = metric or data.name or "unknown"
+        last_seen = self._last_seen.get(metric)
+        if last_seen is not None:
+            try:
+                data = data.iloc[data.index.searchsorted(last_seen, side='right'):]
+            except TypeError:
+                # Index type changed; treat the input as a new stream
+                self.reset(metric)
+
+        anomalies = []
+        for timestamp, value in zip(data.index, data.values):
+            anomaly = self.update(float(value), timestamp, metric)
+            if anomaly is not None:
+                anomalies.append(anomaly)
+
+        if len(data):
+            self._last_seen[metric] = data.index[-1]
+        return anomalies
+
+    def reset(self, metric: Optional[str] = None):
+        """Clear running statistics for one metric, or all when None."""
+        if metric is None:
+            self._states.clear()
+            self._last_seen.clear()
+        else:
+            self._states.pop(metric, None)
+            self._last_seen.pop(metric, None)
+
+
+class OnlineZScoreDetector(OnlineDetector):
+    """Z-score against a running mean and variance (Welford)."""
+
+    def __init__(self, threshold: float = 3.0, warmup: int = 30):
+        super().__init__("Online Z-Score Detector", DetectionMethod.ZSCORE, warmup)
+        self.threshold = threshold
+
+    def _new_state(self) -> Dict[str, float]:
+        return {'count': 0, 'mean': 0.0, 'm2': 0.0}
+
+    def _score(self, state, value):
+        variance = state['m2'] / (state['count'] - 1) if state['count'] > 1 else 0.0
+        std = math.sqrt(variance)
+        if std == 0:
+            return None, {}
+        z_score = (value - state['mean']) / std
+        return z_score, {'mean': state['mean'], 'std': std, 'z_score': z_score}
+
+    def _absorb(self, state, value):
+        delta = value - state['mean']
+        state['mean'] += delta / state['count']
+        state['m2'] += delta * (value - state['mean'])
+
+    def _threshold(self) -> float:
+        return self.threshold
+
+
+class EWMAZScoreDetector(OnlineDetector):
+    """Z-score against exponentially weighted mean and variance.
+
+    Adapts to slow drifts in the metric, weighting recent behaviour by
+    ``alpha`` instead of treating the whole history equally.
+    """
+
+    def __init__(self, threshold: float = 3.0, alpha: float = 0.05, warmup: int = 30):
+        super().__init__("EWMA Z-Score Detector", DetectionMethod.ZSCORE, warmup)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.threshold = threshold
+        self.alpha = alpha
+
+    def _new_state(self) -> Dict[str, float]:
+        return {'count': 0, 'mean': None, 'var': 0.0}
+
+    def _score(self, state, value):
+        std = math.sqrt(state['var'])
+        if std == 0:
+            return None, {}
+        z_score = (value - state['mean']) / std
+        return z_score, {'ewma_mean': state['mean'], 'ewma_std': std, 'z_score': z_score}
+
+    def _absorb(self, state, value):
+        if state['mean'] is None:
+            state['mean'] = value
+            return
+        delta = value - state['mean']
+        increment = self.alpha * delta
+        state['mean'] += increment
+        state['var'] = (1 - self.alpha) * (state['var'] + delta * increment)
+
+    def _threshold(self) -> float:
+        return self.threshold
+
+
+class StreamingModifiedZScoreDetector(OnlineDetector):
+    """Modified z-score using streaming median and MAD sketches.
+
+    The median and the median absolute deviation are tracked with P-square
+    estimators; the MAD sketch is fed deviations from the current median.
+    """
+
+    def __init__(self, threshold: float = 3.5, warmup: int = 30):
+        super().__init__("Streaming Modified Z-Score Detector",
+                         DetectionMethod.MODIFIED_ZSCORE, warmup)
+        self.threshold = threshold
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {'count': 0, 'median': P2Quantile(0.5), 'mad': P2Quantile(0.5)}
+
+    def _score(self, state, value):
+        median = state['median'].value
+        mad = state['mad'].value
+        if not mad:
+            return None, {}
+        modified_z = 0.6745 * (value - median) / mad
+        return modified_z, {'median': median, 'mad': mad, 'modified_z_score': modified_z}
+
+    def _absorb(self, state, value):
+        state['median'].add(value)
+        state['mad'].add(abs(value - state['median'].value))
+
+    def _threshold(self) -> float:
+        return self.threshold
+
+
+class StreamingIQRDetector(OnlineDetector):
+    """IQR fences from streaming first and third quartile sketches."""
+
+    def __init__(self, multiplier: float = 1.5, warmup: int = 30):
+        super().__init__("Streaming IQR Detector", DetectionMethod.IQR, warmup)
+        self.multiplier = multiplier
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {'count': 0, 'q1': P2Quantile(0.25), 'q3': P2Quantile(0.75)}
+
+    def _score(self, state, value):
+        q1, q3 = state['q1'].value, state['q3'].value
+        iqr = q3 - q1
+        if iqr <= 0:
+            return None, {}
+        lower_bound = q1 - self.multiplier * iqr
+        upper_bound = q3 + self.multiplier * iqr
+        if value < lower_bound:
+            score = (lower_bound - value) / iqr
+        elif value > upper_bound:
+            score = (value - upper_bound) / iqr
+        else:
+            score = 0.0
+        # Scores are distances beyond the fences, so any positive score is anomalous
+        return score, {'Q1': q1, 'Q3': q3, 'IQR': iqr,
+                       'lower_bound': lower_bound, 'upper_bound': upper_bound}
+
+    def _absorb(self, state, value):
+        state['q1'].add(value)
+        state['q3'].add(value)
+
+    def _threshold(self) -> float:
+        return 0.0
+
+    def _calculate_severity(self, score, threshold):
+        # Match IQRDetector, which grades distance beyond the fences against 1 IQR
+        return super()._calculate_severity(score, 1.0)
+
+
+def create_streaming_detectors(config: Optional[DetectionConfig] = None,
+                               adaptive: bool = False) -> Dict[str, OnlineDetector]:
+    """Create online counterparts of the statistical batch detectors.
+
+    Keys match the batch detector names used by ``AnomalyDetectionSystem``.
+
+    Args:
+        config: Detection thresholds (defaults to ``DetectionConfig()``)
+        adaptive: Use exponentially weighted statistics for the z-score detector
+    """
+    config = config or DetectionConfig()
+    if adaptive:
+        zscore = EWMAZScoreDetector(threshold=config.zscore_threshold)
+    else:
+        zscore = OnlineZScoreDetector(threshold=config.zscore_threshold)
+    return {
+        'zscore': zscore,
+        'modified_zscore': StreamingModifiedZScoreDetector(
+            threshold=config.modified_zscore_threshold
+        ),
+        'iqr': StreamingIQRDetector(multiplier=config.iqr_multiplier),
+    }
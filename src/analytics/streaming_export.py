@@ -0,0 +1,588 @@
+"""
+Streaming data exporters for CSV, JSON and Excel.
+
+Raw exports can span years of records. Instead of loading every metric
+into memory and formatting rows one at a time, the exporters here pull
+records in fixed-size chunks from a record source, format each chunk with
+vectorized pandas/NumPy operations and write it straight to the output,
+so memory use is bounded by the chunk size:
+
+- CSV: one ``to_csv`` call per chunk.
+- JSON: an incremental encoder that writes the document skeleton and
+  appends each chunk's records, serialized with ``to_json``.
+- Excel: openpyxl write-only mode, which streams rows to disk.
+
+Summary statistics (count, mean, min, max, standard deviation, trend) are
+accumulated from the chunks as they pass, and per-day means are kept for
+insight generation, so no second pass over the data is needed.
+
+A record source is either a ``HealthRecordChunkSource`` reading the
+health_records table with a database cursor, or any object with
+``get_metric_data(metric, start, end)``, whose result is then written in
+chunks.
+
+Example:
+    >>> exporter = StreamingDataExporter(HealthRecordChunkSource(),
+    ...                                  progress=lambda pct, msg: print(pct, msg))
+    >>> exporter.write_csv('export.csv', config)
+"""
+
+import io
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import (Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence,
+                    Tuple, Union)
+
+import numpy as np
+import pandas as pd
+
+from ..utils.metric_types import record_types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Rows per Excel worksheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+ExportTarget = Union[str, Path, BinaryIO]
+ProgressCallback = Callable[[int, str], None]
+
+
+class ExportCancelledError(Exception):
+    """Raised when an export is cancelled between chunks."""
+
+
+class RunningStats:
+    """Summary statistics of a metric accumulated chunk by chunk.
+
+    Means and squared deviations are merged with Chan's parallel
+    algorithm, and the trend slope (value against record position, as in
+    ``WSJExportReportingSystem._calculate_trend``) from the co-moments of
+    position and value.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.positions = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._mean_x = 0.0
+        self._m2_x = 0.0
+        self._c_xy = 0.0
+        self._daily_sum: Dict[pd.Timestamp, float] = {}
+        self._daily_count: Dict[pd.Timestamp, int] = {}
+
+    def update(self, index: pd.DatetimeIndex, values: np.ndarray) -> None:
+        """Add one chunk of values (in export order) with their timestamps."""
+        x = np.arange(self.positions, self.positions + len(values), dtype=np.float64)
+        self.positions += len(values)
+        valid = ~np.isnan(values)
+        values, x = values[valid], x[valid]
+        n_b = len(values)
+        if n_b == 0:
+            return
+
+        mean_b, mean_x_b = values.mean(), x.mean()
+        m2_b = float(((values - mean_b) ** 2).sum())
+        m2_x_b = float(((x - mean_x_b) ** 2).sum())
+        c_xy_b = float(((x - mean_x_b) * (values - mean_b)).sum())
+
+        n_a = self.count
+        n = n_a + n_b
+        delta, delta_x = mean_b - self.mean, mean_x_b - self._mean_x
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self._m2_x += m2_x_b + delta_x ** 2 * n_a * n_b / n
+        self._c_xy += c_xy_b + delta * delta_x * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self._mean_x += delta_x * n_b / n
+        self.count = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        days = pd.Series(values, index=index[valid]).groupby(index[valid].normalize())
+        totals, counts = days.sum(), days.count()
+        for day, total, count in zip(totals.index, totals.to_numpy(), counts.to_numpy()):
+            self._daily_sum[day] = self._daily_sum.get(day, 0.0) + total
+            self._daily_count[day] = self._daily_count.get(day, 0) + count
+
+    @property
+    def trend(self) -> str:
+        if self.count < 2 or self._m2_x == 0:
+            return "Insufficient data"
+        slope = self._c_xy / self._m2_x
+        if abs(slope) < 0.01:
+            return "Stable"
+        return "Increasing" if slope > 0 else "Decreasing"
+
+    def as_summary(self) -> Optional[Dict[str, Any]]:
+        """Return statistics in the shape of the report summary_stats."""
+        if self.count == 0:
+            return None
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'std': float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float('nan'),
+            'trend': self.trend,
+        }
+
+    def daily_means(self) -> pd.DataFrame:
+        """Per-day mean values, indexed by day."""
+        days = sorted(self._daily_sum)
+        return pd.DataFrame(
+            {'value': [self._daily_sum[d] / self._daily_count[d] for d in days]},
+            index=pd.DatetimeIndex(days))
+
+
+class HealthRecordChunkSource:
+    """Reads metric records from health_records with a database cursor."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite database; the application database when None
+        """
+        self.db_path = db_path
+
+    @contextmanager
+    def _connect(self):
+        if self.db_path:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+        else:
+            from ..database import db_manager
+            with db_manager.get_connection() as conn:
+                yield conn
+
+    @staticmethod
+    def _bounds(start: Union[date, datetime], end: Union[date, datetime]) -> Tuple[str, str]:
+        if not isinstance(start, datetime):
+            start = datetime.combine(start, datetime.min.time())
+        if not isinstance(end, datetime):
+            end = datetime.combine(end, datetime.max.time())
+        # Stored dates look like '2024-01-31 08:00:00-05:00'
+        return (start.strftime('%Y-%m-%d %H:%M:%S'),
+                (end + timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S'))
+
+    def _where(self, metric, start, end) -> Tuple[str, List]:
+        types = record_types(metric)
+        placeholders = ','.join('?' * len(types))
+        return (f"type IN ({placeholders}) AND startDate >= ? AND startDate < ?",
+                [*types, *self._bounds(start, end)])
+
+    def count_metric_data(self, metric: str, start, end) -> int:
+        """Number of records ``iter_metric_data`` will yield."""
+        where, params = self._where(metric, start, end)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM health_records WHERE {where}",
+                                params).fetchone()[0]
+
+    def iter_metric_data(self, metric: str, start, end,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Yield chunks of records ordered by start date.
+
+        Each chunk is indexed by the local (wall clock) start time and has
+        ``value`` and ``unit`` columns.
+        """
+        where, params = self._where(metric, start, end)
+        query = (f"SELECT startDate, value, unit FROM health_records "
+                 f"WHERE {where} ORDER BY startDate")
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                dates, values, units = zip(*rows)
+                # Drop any UTC offset; the first 19 characters are the wall time
+                index = pd.to_datetime(pd.Series(dates, dtype=object).str.slice(0, 19),
+                                       format='ISO8601')
+                yield pd.DataFrame({
+                    'value': pd.to_numeric(pd.Series(values, dtype=object),
+                                           errors='coerce').to_numpy(dtype=np.float64),
+                    'unit': pd.Series(units, dtype=object).to_numpy(),
+                }, index=pd.DatetimeIndex(index, name='startDate'))
+
+
+def _wall_clock(index: pd.Index) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def _format_dates(index: pd.Index) -> np.ndarray:
+    """'%Y-%m-%d %H:%M:%S' strings for a datetime index."""
+    text = np.datetime_as_string(_wall_clock(index).values, unit='s')
+    return pd.Series(text).str.replace('T', ' ', n=1, regex=False).to_numpy()
+
+
+def _iso_timestamps(index: pd.Index) -> np.ndarray:
+    """``Timestamp.isoformat()`` strings for a datetime index."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None and not (index.asi8 % 10**9).any():
+        return np.datetime_as_string(index.values, unit='s')
+    return np.asarray(index.map(pd.Timestamp.isoformat), dtype=object)
+
+
+def _title(metric: str) -> str:
+    return metric.replace('_', ' ').title()
+
+
+class StreamingDataExporter:
+    """Writes metric records to CSV, JSON or Excel in bounded memory."""
+
+    def __init__(self, source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None,
+                 is_cancelled: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            source: ``HealthRecordChunkSource`` or an object with
+                ``get_metric_data(metric, start, end)``
+            chunk_size: Records per chunk
+            progress: Called with (percent, message) after every chunk
+            is_cancelled: Polled between chunks; a true result aborts the
+                export with ``ExportCancelledError``
+        """
+        self.source = source
+        self.chunk_size = chunk_size
+        self.progress = progress or (lambda percent, message: None)
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.stats: Dict[str, RunningStats] = {}
+        self._total = 0
+        self._written = 0
+
+    # Record access
+
+    def iter_chunks(self, metric: str, start, end) -> Iterator[pd.DataFrame]:
+        """Yield non-empty chunks of one metric."""
+        iterate = getattr(self.source, 'iter_metric_data', None)
+        if iterate is not None:
+            chunks = iterate(metric, start, end, self.chunk_size)
+        else:
+            frame = self.source.get_metric_data(metric, start, end)
+            if frame is None or frame.empty:
+                return
+            chunks = (frame.iloc[i:i + self.chunk_size]
+                      for i in range(0, len(frame), self.chunk_size))
+        for chunk in chunks:
+            if self.is_cancelled():
+                raise ExportCancelledError("Export cancelled")
+            if not chunk.empty:
+                yield chunk
+
+    def _count_records(self, metrics: Sequence[str], start, end) -> int:
+        count = getattr(self.source, 'count_metric_data', None)
+        if count is None:
+            return 0
+        return sum(count(metric, start, end) for metric in metrics)
+
+    def _metric_chunks(self, metric: str, start, end) -> Iterator[pd.DataFrame]:
+        """Chunks of ``metric`` with statistics and progress tracked."""
+        stats = self.stats.setdefault(metric, RunningStats())
+        for chunk in self.iter_chunks(metric, start, end):
+            values = (chunk['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+                      if 'value' in chunk.columns else np.full(len(chunk), np.nan))
+            stats.update(_wall_clock(chunk.index), values)
+            yield chunk
+            self._written += len(chunk)
+            if self._total:
+                percent = 5 + int(90 * min(self._written, self._total) / self._total)
+                self.progress(percent, f"Exported {self._written:,} of {self._total:,} records")
+            else:
+                self.progress(50, f"Exported {self._written:,} records of {_title(metric)}")
+
+    def _begin(self, config) -> None:
+        self.stats = {}
+        self._written = 0
+        self.progress(2, "Counting records...")
+        self._total = self._count_records(config.metrics, *config.date_range)
+
+    def summary_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of the metrics written by the last export."""
+        return {metric: summary for metric, stats in self.stats.items()
+                if (summary := stats.as_summary()) is not None}
+
+    def daily_metrics(self) -> Dict[str, pd.DataFrame]:
+        """Per-day means of the metrics written by the last export."""
+        return {metric: stats.daily_means() for metric, stats in self.stats.items()
+                if stats.count}
+
+    # Output handling
+
+    @contextmanager
+    def _open(self, target: ExportTarget, text: bool):
+        """Open ``target`` for writing; paths are replaced only on success."""
+        if isinstance(target, (str, Path)):
+            path = Path(target)
+            partial = path.with_name(path.name + '.part')
+            try:
+                if text:
+                    with open(partial, 'w', encoding='utf-8', newline='') as handle:
+                        yield handle
+                else:
+                    with open(partial, 'wb') as handle:
+                        yield handle
+                os.replace(partial, path)
+            finally:
+                if partial.exists():
+                    partial.unlink()
+        elif text:
+            handle = io.TextIOWrapper(target, encoding='utf-8', newline='', write_through=True)
+            try:
+                yield handle
+                handle.flush()
+            finally:
+                handle.detach()
+        else:
+            yield target
+
+    # Formats
+
+    def write_csv(self, target: ExportTarget, config,
+                  include_summary: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+        """Write metrics and summary statistics as CSV.
+
+        Args:
+            target: Output path or binary file object
+            config: ExportConfiguration with metrics and date range
+            include_summary: Append summary statistics; defaults to
+                ``config.include_insights``
+
+        Returns:
+            Summary statistics per metric
+        """
+        import csv
+
+        self._begin(config)
+        start, end = config.date_range
+        if include_summary is None:
+            include_summary = config.include_insights
+
+        with self._open(target, text=True) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['Apple Health Monitor Export'])
+            writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+            writer.writerow(['Date Range:', f"{start} to {end}"])
+            writer.writerow([])
+
+            for metric in config.metrics:
+                writer.writerow([f'Metric: {_title(metric)}'])
+                wrote_header = False
+                for chunk in self._metric_chunks(metric, start, end):
+                    if not wrote_header:
+                        writer.writerow(['Date', 'Value', 'Unit'])
+                        wrote_header = True
+                    pd.DataFrame({
+                        'Date': _format_dates(chunk.index),
+                        'Value': chunk['value'].to_numpy() if 'value' in chunk else '',
+                        'Unit': chunk['unit'].to_numpy() if 'unit' in chunk else '',
+                    }).to_csv(handle, header=False, index=False, lineterminator='\r\n')
+                if not wrote_header:
+                    writer.writerow(['No data available'])
+                writer.writerow([])
+
+            summary = self.summary_stats()
+            if include_summary and summary:
+                writer.writerow(['Summary Statistics'])
+                writer.writerow(['Metric', 'Count', 'Mean', 'Min', 'Max', 'Std Dev'])
+                for metric, stats in summary.items():
+                    writer.writerow([_title(metric), stats['count'], f"{stats['mean']:.2f}",
+                                     f"{stats['min']:.2f}", f"{stats['max']:.2f}",
+                                     f"{stats['std']:.2f}"])
+
+        self.progress(100, "CSV export completed")
+        return summary
+
+    def write_json(self, target: ExportTarget, config,
+                   insights_factory: Optional[Callable[[Dict[str, pd.DataFrame]], List[Dict]]] = None
+                   ) -> Dict[str, Dict[str, Any]]:
+        """Write metadata, records, statistics and insights as one JSON document.
+
+        Records are written as they are read; the summary statistics, which
+        depend on all records, follow the data.
+
+        Args:
+            target: Output path or binary file object
+            config: ExportConfiguration with metrics and date range
+            insights_factory: Builds the insights list from per-day metric
+                means; insights are omitted when None
+
+        Returns:
+            Summary statistics per metric
+        """
+        self._begin(config)
+        start, end = config.date_range
+        metadata = {
+            'export_date': datetime.now().isoformat(),
+            'date_range': {'start': start.isoformat(), 'end': end.isoformat()},
+            'version': '1.0',
+            'metrics': list(config.metrics),
+        }
+
+        with self._open(target, text=True) as handle:
+            handle.write('{\n  "metadata": ')
+            handle.write(json.dumps(metadata, indent=2).replace('\n', '\n  '))
+            handle.write(',\n  "data": {')
+            for position, metric in enumerate(config.metrics):
+                # Every requested metric is listed, with [] when it has no data
+                handle.write(',' if position else '')
+                handle.write(f'\n    {json.dumps(metric)}: [')
+                first_chunk = True
+                for chunk in self._metric_chunks(metric, start, end):
+                    if not first_chunk:
+                        handle.write(',')
+                    first_chunk = False
+                    records = pd.DataFrame({
+                        'timestamp': _iso_timestamps(chunk.index),
+                        'value': chunk['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+                        if 'value' in chunk else 0.0,
+                        'unit': chunk['unit'].to_numpy() if 'unit' in chunk else '',
+                    }).to_json(orient='records', double_precision=15)
+                    # Strip the list brackets so chunks join into one list
+                    handle.write(records[1:-1])
+                handle.write(']')
+            handle.write('\n  },\n  "summary_statistics": ')
+            summary = self.summary_stats()
+            handle.write(json.dumps(summary, indent=2, default=float).replace('\n', '\n  '))
+            if insights_factory is not None:
+                self.progress(96, "Generating insights...")
+                handle.write(',\n  "insights": ')
+                insights = insights_factory(self.daily_metrics())
+                handle.write(json.dumps(insights, indent=2, default=str).replace('\n', '\n  '))
+            handle.write('\n}\n')
+
+        self.progress(100, "JSON export completed")
+        return summary
+
+    def write_excel(self, target: ExportTarget, config,
+                    insights_factory: Optional[Callable[[Dict[str, pd.DataFrame]], List[Dict]]] = None
+                    ) -> Dict[str, Dict[str, Any]]:
+        """Write a Summary sheet, one sheet per metric and an Insights sheet.
+
+        Uses openpyxl's write-only mode, which streams rows to temporary
+        files instead of keeping cell objects in memory. Metrics longer
+        than an Excel sheet continue on numbered sheets.
+
+        Args:
+            target: Output path or binary file object
+            config: ExportConfiguration with metrics and date range
+            insights_factory: Builds the insights list from per-day metric
+                means; the sheet is omitted when None
+
+        Returns:
+            Summary statistics per metric
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+
+        self._begin(config)
+        start, end = config.date_range
+        workbook = Workbook(write_only=True)
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="FF8C42", end_color="FF8C42", fill_type="solid")
+        header_alignment = Alignment(horizontal="center", vertical="center")
+
+        def styled(sheet, value, **style):
+            cell = WriteOnlyCell(sheet, value=value)
+            for name, setting in style.items():
+                setattr(cell, name, setting)
+            return cell
+
+        def header_row(sheet, headers):
+            return [styled(sheet, header, font=header_font, fill=header_fill,
+                           alignment=header_alignment) for header in headers]
+
+        # The summary sheet comes first but is filled once statistics are known
+        summary_sheet = workbook.create_sheet("Summary")
+        for column in 'ABCDEF':
+            summary_sheet.column_dimensions[column].width = 15
+        summary_sheet.append([styled(summary_sheet, "Apple Health Monitor Export",
+                                     font=Font(bold=True, size=16))])
+        summary_sheet.append([f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+        summary_sheet.append([f"Date Range: {start} to {end}"])
+
+        used_names = {"Summary", "Insights"}
+        for metric in config.metrics:
+            base_name = _title(metric)[:31]
+            sheet, rows_left, part = None, 0, 1
+            for chunk in self._metric_chunks(metric, start, end):
+                wall = _wall_clock(chunk.index)
+                days = wall.date
+                times = wall.time
+                values = (chunk['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+                          if 'value' in chunk else np.zeros(len(chunk)))
+                values = np.where(np.isnan(values), None, values).tolist()
+                units = (chunk['unit'].to_numpy() if 'unit' in chunk
+                         else np.full(len(chunk), '', dtype=object)).tolist()
+                offset = 0
+                while offset < len(chunk):
+                    if rows_left == 0:
+                        name = base_name if part == 1 else f"{base_name[:26]} ({part})"
+                        while name in used_names:
+                            name = f"{name[:28]}_{part}"
+                        used_names.add(name)
+                        sheet = workbook.create_sheet(name)
+                        for column, width in zip('ABCD', (12, 10, 10, 10)):
+                            sheet.column_dimensions[column].width = width
+                        sheet.append(header_row(sheet, ['Date', 'Time', 'Value', 'Unit']))
+                        rows_left, part = EXCEL_MAX_ROWS - 1, part + 1
+                    stop = min(len(chunk), offset + rows_left)
+                    for row in zip(days[offset:stop], times[offset:stop],
+                                   values[offset:stop], units[offset:stop]):
+                        sheet.append(row)
+                    rows_left -= stop - offset
+                    offset = stop
+            if sheet is None:
+                name = base_name if base_name not in used_names else f"{base_name[:28]}_1"
+                used_names.add(name)
+                sheet = workbook.create_sheet(name)
+                sheet.append(header_row(sheet, ['Date', 'Time', 'Value', 'Unit']))
+
+        summary = self.summary_stats()
+        if summary:
+            summary_sheet.append([])
+            summary_sheet.append([])
+            summary_sheet.append([styled(summary_sheet, "Summary Statistics",
+                                         font=Font(bold=True, size=12))])
+            summary_sheet.append([])
+            summary_sheet.append(header_row(summary_sheet, ['Metric', 'Count', 'Average',
+                                                            'Min', 'Max', 'Std Dev']))
+            for metric, stats in summary.items():
+                summary_sheet.append([_title(metric), stats['count'],
+                                      round(stats['mean'], 2), round(stats['min'], 2),
+                                      round(stats['max'], 2), round(stats['std'], 2)])
+
+        if insights_factory is not None:
+            self.progress(96, "Adding insights...")
+            sheet = workbook.create_sheet("Insights")
+            sheet.column_dimensions['A'].width = 100
+            sheet.append([styled(sheet, "Health Insights & Recommendations",
+                                 font=Font(bold=True, size=14))])
+            sheet.append([])
+            for i, insight in enumerate(insights_factory(self.daily_metrics()), 1):
+                sheet.append([styled(sheet, f"{i}. {insight['title']}", font=Font(bold=True))])
+                sheet.append([f"Summary: {insight['summary']}"])
+                sheet.append([f"Recommendation: {insight['recommendation']}"])
+                sheet.append([styled(sheet, f"Evidence Level: {insight['evidence_level']}",
+                                     font=Font(italic=True))])
+                sheet.append([])
+
+        self.progress(98, "Finalizing workbook...")
+        with self._open(target, text=False) as handle:
+            workbook.save(handle)
+        self.progress(100, "Excel export completed")
+        return summary
@@ -21,6 +21,7 @@ from .anomaly_models import (
     InsufficientDataError
 )
 from .anomaly_detectors import BaseDetector
+from .incremental_decomposition import IncrementalSTL
 
 # Try to import TensorFlow/Keras
 try:
@@ -36,14 +37,27 @@ except ImportError:
 
 
 class STLAnomalyDetector(BaseDetector):
-    """Statistical anomaly detector using STL decomposition + IQR."""
+    """Statistical anomaly detector using STL decomposition + IQR.
+    
+    In incremental mode the decomposition of each metric is kept between
+    calls; refreshes that only append points re-decompose a trailing window,
+    compute IQR bounds over the most recent ``residual_window`` residuals and
+    report anomalies among the re-decomposed points only.
+    """
     
     def __init__(self, seasonal: int = 7, trend: Optional[int] = None, 
-                 iqr_multiplier: float = 1.5):
+                 iqr_multiplier: float = 1.5, incremental: bool = False,
+                 window: Optional[int] = None, overlap: Optional[int] = None,
+                 residual_window: int = 365):
         super().__init__("STL Anomaly Detector", DetectionMethod.IQR)
         self.seasonal = seasonal
         self.trend = trend
         self.iqr_multiplier = iqr_multiplier
+        self.incremental = incremental
+        self.window = window
+        self.overlap = overlap
+        self.residual_window = residual_window
+        self._decomposers: Dict[str, IncrementalSTL] = {}
     
     def detect(self, data: pd.Series) -> List[Anomaly]:
         """Detect anomalies using STL decomposition and IQR on residuals."""
@@ -52,6 +66,13 @@ class STLAnomalyDetector(BaseDetector):
         if len(data) < 2 * self.seasonal:
             raise InsufficientDataError(f"Need at least {2 * self.seasonal} points for STL")
         
+        if self.incremental:
+            try:
+                return self._detect_incremental(data)
+            except Exception as e:
+                warnings.warn(f"Incremental STL failed, using full decomposition: {e}")
+                self._decomposers.pop(data.name or "temporal_pattern", None)
+        
         try:
             # Perform STL decomposition
             stl = STL(data, seasonal=self.seasonal, trend=self.trend)
@@ -112,6 +133,72 @@ class STLAnomalyDetector(BaseDetector):
             warnings.warn(f"STL decomposition failed, using simple IQR: {e}")
             return self._simple_iqr_detection(data)
     
+    def reset_incremental_state(self, metric: Optional[str] = None):
+        """Drop stored decompositions for one metric, or all when None."""
+        if metric is None:
+            self._decomposers.clear()
+        else:
+            self._decomposers.pop(metric, None)
+    
+    def _detect_incremental(self, data: pd.Series) -> List[Anomaly]:
+        """Detect anomalies among points refreshed since the previous call."""
+        metric = data.name or "temporal_pattern"
+        decomposer = self._decomposers.get(metric)
+        if decomposer is None:
+            decomposer = IncrementalSTL(seasonal=self.seasonal, trend=self.trend,
+                                        window=self.window, overlap=self.overlap)
+            self._decomposers[metric] = decomposer
+        
+        state = decomposer.update(data)
+        start = state.refreshed_from
+        if start >= len(state):
+            return []
+        
+        # A full fit scores against all residuals, like batch detection
+        residuals = state.resid if start == 0 else state.resid[-self.residual_window:]
+        Q1, Q3 = np.nanpercentile(residuals, [25, 75])
+        IQR = Q3 - Q1
+        if IQR == 0:
+            return []
+        
+        lower_bound = Q1 - self.iqr_multiplier * IQR
+        upper_bound = Q3 + self.iqr_multiplier * IQR
+        
+        refreshed = state.resid[start:]
+        positions = np.nonzero((refreshed < lower_bound) | (refreshed > upper_bound))[0] + start
+        
+        anomalies = []
+        for pos in positions:
+            idx = state.index[pos]
+            residual_value = state.resid[pos]
+            if residual_value < lower_bound:
+                score = (lower_bound - residual_value) / IQR
+            else:
+                score = (residual_value - upper_bound) / IQR
+            
+            anomalies.append(Anomaly(
+                timestamp=idx if isinstance(idx, datetime) else datetime.now(),
+                metric=metric,
+                value=data.iloc[pos],
+                score=float(score),
+                method=self.method,
+                severity=self._calculate_severity(score, 1.0),
+                threshold=self.iqr_multiplier,
+                context={
+                    'trend_value': float(state.trend[pos]),
+                    'seasonal_value': float(state.seasonal[pos]),
+                    'residual_value': float(residual_value),
+                    'Q1': float(Q1),
+                    'Q3': float(Q3),
+                    'IQR': float(IQR),
+                    'lower_bound': float(lower_bound),
+                    'upper_bound': float(upper_bound),
+                    'decomposition_method': 'STL (incremental)'
+                }
+            ))
+        
+        return anomalies
+    
     def _simple_iqr_detection(self, data: pd.Series) -> List[Anomaly]:
         """Fallback to simple IQR detection without decomposition."""
         Q1 = data.quantile(0.25)
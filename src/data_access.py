@@ -63,6 +63,7 @@ from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 import json
 import hashlib
+import threading
 
 from .database import DatabaseManager
 from .models import (
@@ -124,6 +125,24 @@ class JournalDAO:
         >>> workout_entries = JournalDAO.search_journal_entries('workout')
     """
     
+    _data_version = 0
+    _data_version_lock = threading.Lock()
+    
+    @classmethod
+    def get_data_version(cls) -> int:
+        """Return a counter that changes whenever journal entries are written.
+        
+        Readers that cache journal-derived results, such as the journal search
+        engine, compare it with the value they cached under to detect stale data.
+        """
+        return cls._data_version
+    
+    @classmethod
+    def _bump_data_version(cls) -> None:
+        """Record that journal entries changed."""
+        with cls._data_version_lock:
+            cls._data_version += 1
+    
     @staticmethod
     def save_journal_entry(entry_date: date, entry_type: str, content: str,
                           week_start_date: Optional[date] = None,
@@ -197,6 +216,7 @@ class JournalDAO:
                     "SELECT id FROM journal_entries WHERE entry_date = ? AND entry_type = ?",
                     (entry_date.isoformat(), entry_type)
                 )
+                JournalDAO._bump_data_version()
                 if result:
                     logger.info(f"Updated {entry_type} journal entry for {entry_date} with version check")
                     return result[0]['id']
@@ -231,6 +251,7 @@ class JournalDAO:
             
             try:
                 entry_id = DatabaseManager().execute_command(query, params)
+                JournalDAO._bump_data_version()
                 logger.info(f"Saved {entry_type} journal entry for {entry_date}")
                 return entry_id
             except Exception as e:
@@ -363,6 +384,7 @@ class JournalDAO:
             )
             
             if rows_affected > 0:
+                JournalDAO._bump_data_version()
                 logger.info(f"Deleted {entry_type} journal entry for {entry_date}")
                 return True
             else:
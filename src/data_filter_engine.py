@@ -3,6 +3,12 @@ Data Filtering Engine for Apple Health Monitor
 
 This module provides a high-performance filtering engine for health data
 with support for date ranges, source names, and health metric types.
+
+Results are built column by column: the cursor is read in fixed-size
+batches, each column is appended to a typed buffer, and the DataFrame is
+assembled once at the end. Only the requested columns are selected, dates
+are parsed in a single vectorized pass per column, and repetitive text
+columns (type, sourceName, ...) are returned as categoricals.
 """
 
 import logging
@@ -10,8 +16,9 @@ import sqlite3
 import time
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .database import DatabaseManager
@@ -20,6 +27,18 @@ from .utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Columns of health_records and how the columnar path types them
+HEALTH_RECORD_COLUMNS = ('type', 'sourceName', 'sourceVersion', 'device', 'unit',
+                         'creationDate', 'startDate', 'endDate', 'value')
+DATE_COLUMNS = ('creationDate', 'startDate', 'endDate')
+CATEGORICAL_COLUMNS = ('type', 'sourceName', 'sourceVersion', 'device', 'unit')
+NUMERIC_COLUMNS = ('value',)
+
+# Columns returned for an empty result when no columns were requested
+EMPTY_RESULT_COLUMNS = ['startDate', 'type', 'value', 'sourceName']
+
+DEFAULT_BATCH_SIZE = 50_000
+
 
 @dataclass
 class FilterCriteria:
@@ -34,8 +53,12 @@ class FilterCriteria:
 class QueryBuilder:
     """Builds optimized SQL queries for filtering health data."""
     
-    def __init__(self):
-        self.base_query = "SELECT * FROM health_records"
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        if columns:
+            select_list = ', '.join(columns)
+        else:
+            select_list = '*'
+        self.base_query = f"SELECT {select_list} FROM health_records"
         self.conditions = []
         self.params = []
     
@@ -84,6 +107,63 @@ class QueryBuilder:
         return query, self.params
 
 
+class _ColumnBuffer:
+    """Accumulates one result column across cursor batches.
+
+    Text columns are dictionary-encoded while reading, so repeated values
+    such as metric types cost one int32 per row instead of a Python string
+    reference; numeric columns are converted batch by batch to float64.
+    """
+
+    def __init__(self, name: str, categorical: bool):
+        self.name = name
+        self.encode = categorical and name in CATEGORICAL_COLUMNS
+        self.numeric = name in NUMERIC_COLUMNS
+        self.chunks: List[np.ndarray] = []
+        self.categories: Dict[Any, int] = {}
+
+    def append(self, values: tuple) -> None:
+        if self.encode:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            # Factorize the batch in C, then map its uniques to global codes
+            codes, uniques = pd.factorize(array)
+            lookup = self.categories
+            mapping = np.array([lookup.setdefault(value, len(lookup)) for value in uniques]
+                               + [-1], dtype=np.int32)
+            self.chunks.append(mapping[codes])
+        elif self.numeric:
+            try:
+                array = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                # NULLs or text stored in a REAL column
+                array = pd.to_numeric(pd.Series(values, dtype=object),
+                                      errors='coerce').to_numpy(dtype=np.float64)
+            self.chunks.append(array)
+        else:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            self.chunks.append(array)
+
+    def finish(self) -> Any:
+        if self.encode:
+            codes = (np.concatenate(self.chunks) if self.chunks
+                     else np.empty(0, dtype=np.int32))
+            categories = np.empty(len(self.categories), dtype=object)
+            categories[:] = list(self.categories)
+            return pd.Categorical.from_codes(codes, categories=categories)
+        if self.numeric:
+            values = (np.concatenate(self.chunks) if self.chunks
+                      else np.empty(0, dtype=np.float64))
+            # Records without a numeric value count as one occurrence
+            values[np.isnan(values)] = 1.0
+            return values
+        values = np.concatenate(self.chunks) if self.chunks else np.empty(0, dtype=object)
+        if self.name in DATE_COLUMNS:
+            return pd.to_datetime(values)
+        return values
+
+
 class DataFilterEngine:
     """Main filtering engine for health data."""
     
@@ -100,7 +180,10 @@ class DataFilterEngine:
     
     def filter_data(self, criteria: FilterCriteria, 
                    return_dataframe: bool = True,
-                   limit: Optional[int] = None) -> pd.DataFrame:
+                   limit: Optional[int] = None,
+                   columns: Optional[Sequence[str]] = None,
+                   categorical: bool = True,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
         """
         Filter health data based on provided criteria.
         
@@ -108,18 +191,24 @@ class DataFilterEngine:
             criteria: FilterCriteria object with filter parameters
             return_dataframe: If True, return pandas DataFrame; else return raw rows
             limit: Maximum number of records to return
+            columns: Columns of health_records to return; all columns when None
+            categorical: Return text columns such as type and sourceName as
+                pandas categoricals
+            batch_size: Rows fetched from the cursor per batch
             
         Returns:
             Filtered data as DataFrame or list of rows
             
         Raises:
-            DataImportError: If filtering fails
+            DataImportError: If filtering fails or a column does not exist
         """
         start_time = time.time()
         
         try:
+            columns = self._validate_columns(columns)
+            
             # Build the query
-            builder = QueryBuilder()
+            builder = QueryBuilder(columns)
             builder.add_date_range(criteria.start_date, criteria.end_date)
             builder.add_source_filter(criteria.source_names)
             builder.add_type_filter(criteria.health_types)
@@ -128,50 +217,69 @@ class DataFilterEngine:
             
             self.logger.debug(f"Executing filter query: {query[:100]}...")
             
-            # Execute query
+            if not return_dataframe:
+                if self.db_path:
+                    with sqlite3.connect(self.db_path) as conn:
+                        conn.row_factory = sqlite3.Row
+                        rows = conn.execute(query, params).fetchall()
+                else:
+                    rows = self.db_manager.execute_query(query, tuple(params))
+                self._log_query(start_time, len(rows))
+                return rows
+            
             if self.db_path:
-                # Use specific database file
                 with sqlite3.connect(self.db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.cursor()
-                    cursor.execute(query, params)
-                    rows = cursor.fetchall()
+                    df = self._fetch_columnar(conn, query, params, categorical, batch_size)
             else:
-                # Use DatabaseManager
-                rows = self.db_manager.execute_query(query, tuple(params))
+                with self.db_manager.get_connection() as conn:
+                    df = self._fetch_columnar(conn, query, params, categorical, batch_size)
             
-            # Update performance metrics
-            query_time = (time.time() - start_time) * 1000  # Convert to ms
-            self._update_performance_metrics(query_time)
+            self._log_query(start_time, len(df))
             
-            self.logger.info(f"Filter query completed in {query_time:.2f}ms, returned {len(rows)} records")
-            
-            # Convert to DataFrame if requested
-            if return_dataframe and rows:
-                df = pd.DataFrame([dict(row) for row in rows])
-                
-                # Parse date columns
-                date_columns = ['creationDate', 'startDate', 'endDate']
-                for col in date_columns:
-                    if col in df.columns:
-                        df[col] = pd.to_datetime(df[col])
-                
-                # Convert value to numeric
-                if 'value' in df.columns:
-                    df['value'] = pd.to_numeric(df['value'], errors='coerce')
-                    df['value'] = df['value'].fillna(1.0)
-                
-                return df
-            elif return_dataframe:
+            if df.empty and not columns:
                 # Return empty DataFrame with expected columns
-                return pd.DataFrame(columns=['startDate', 'type', 'value', 'sourceName'])
-            else:
-                return rows
+                return pd.DataFrame(columns=EMPTY_RESULT_COLUMNS)
+            return df
                 
         except Exception as e:
             self.logger.error(f"Error filtering data: {e}")
             raise DataImportError(f"Failed to filter data: {str(e)}") from e
     
+    def _validate_columns(self, columns: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """Check requested columns against the schema before they reach SQL."""
+        if not columns:
+            return None
+        columns = list(dict.fromkeys(columns))
+        unknown = [col for col in columns if col not in HEALTH_RECORD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown health_records columns: {unknown}")
+        return columns
+    
+    def _fetch_columnar(self, conn: sqlite3.Connection, query: str, params: List,
+                        categorical: bool, batch_size: int) -> pd.DataFrame:
+        """Stream ``query`` in batches into typed column buffers."""
+        cursor = conn.cursor()
+        # Plain tuples are much cheaper to transpose than sqlite3.Row objects
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        names = [description[0] for description in cursor.description]
+        buffers = [_ColumnBuffer(name, categorical) for name in names]
+        
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for buffer, values in zip(buffers, zip(*rows)):
+                buffer.append(values)
+        
+        return pd.DataFrame({buffer.name: buffer.finish() for buffer in buffers})
+    
+    def _log_query(self, start_time: float, record_count: int):
+        """Record timing of a completed filter query."""
+        query_time = (time.time() - start_time) * 1000  # Convert to ms
+        self._update_performance_metrics(query_time)
+        self.logger.info(f"Filter query completed in {query_time:.2f}ms, returned {record_count} records")
+    
     def get_distinct_sources(self) -> List[str]:
         """Get list of distinct source names from the database."""
         try:
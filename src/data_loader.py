@@ -38,11 +38,12 @@ Attributes:
     logger: Module-level logger for tracking operations and errors.
 """
 
+import os
 import sqlite3
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -57,11 +58,42 @@ from src.utils.error_handler import (
 from src.utils.logging_config import get_logger
 from src.utils.xml_validator import AppleHealthXMLValidator, validate_apple_health_xml
 
+if TYPE_CHECKING:
+    from src.analytics.import_summary_accumulator import ImportSummaryAccumulator
+
 # Get logger for this module
 logger = get_logger(__name__)
 
+# health_records columns, the only ones CSV imports read
+CSV_COLUMNS = ('type', 'sourceName', 'sourceVersion', 'device', 'unit',
+               'creationDate', 'startDate', 'endDate', 'value')
+CSV_DATE_COLUMNS = ('creationDate', 'startDate', 'endDate')
+
+# Few distinct values repeat across millions of rows, so these are read as
+# categoricals and cleaned once per category rather than once per row
+CSV_DTYPES = {
+    'type': 'category',
+    'sourceName': 'category',
+    'sourceVersion': 'category',
+    'device': 'category',
+    'unit': 'category',
+    'creationDate': str,
+    'startDate': str,
+    'endDate': str,
+    'value': str,
+}
+
+# Timestamp layout of CSV exports, parsed without per-row format inference
+CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Rows per CSV chunk; bounds memory use regardless of file size
+CSV_CHUNK_ROWS = 100000
 
-def convert_xml_to_sqlite_with_validation(xml_path: str, db_path: str, validate_first: bool = True) -> Tuple[int, str]:
+_HEALTHKIT_PREFIX = r'HK(?:Quantity|Category)TypeIdentifier'
+
+
+def convert_xml_to_sqlite_with_validation(xml_path: str, db_path: str, validate_first: bool = True,
+                                          summary: Optional['ImportSummaryAccumulator'] = None) -> Tuple[int, str]:
     """Convert Apple Health XML export to SQLite database with comprehensive validation.
     
     This function provides a complete XML to SQLite conversion pipeline with optional
@@ -73,6 +105,8 @@ def convert_xml_to_sqlite_with_validation(xml_path: str, db_path: str, validate_
         db_path: Path where the SQLite database will be created.
         validate_first: Whether to validate XML structure before processing.
             Defaults to True for safety.
+        summary: Optional accumulator fed every inserted record, so metric
+            summaries need no scan after the import.
     
     Returns:
         A tuple containing:
@@ -120,10 +154,11 @@ def convert_xml_to_sqlite_with_validation(xml_path: str, db_path: str, validate_
     
     # Step 2: Import with transaction handling
     with ErrorContext("XML to SQLite conversion with transaction handling"):
-        return _convert_xml_with_transaction(xml_path, db_path), validation_summary
+        return _convert_xml_with_transaction(xml_path, db_path, summary), validation_summary
 
 
-def _convert_xml_with_transaction(xml_path: str, db_path: str) -> int:
+def _convert_xml_with_transaction(xml_path: str, db_path: str,
+                                  summary: Optional['ImportSummaryAccumulator'] = None) -> int:
     """Handle XML conversion with comprehensive transaction management.
     
     Internal function that performs the actual XML parsing and database import
@@ -133,6 +168,7 @@ def _convert_xml_with_transaction(xml_path: str, db_path: str) -> int:
     Args:
         xml_path: Path to the validated Apple Health XML file.
         db_path: Path where the SQLite database will be created.
+        summary: Optional accumulator fed every inserted record.
         
     Returns:
         Number of new records successfully imported to the database.
@@ -211,6 +247,8 @@ def _convert_xml_with_transaction(xml_path: str, db_path: str) -> int:
                     UNIQUE(type, sourceName, startDate, endDate, value)
                 )
             """)
+            if summary is not None:
+                summary.begin(conn)
             
             # Insert records one by one with INSERT OR IGNORE
             records_inserted = 0
@@ -233,9 +271,15 @@ def _convert_xml_with_transaction(xml_path: str, db_path: str) -> int:
                     ))
                     if conn.total_changes > records_inserted:
                         records_inserted = conn.total_changes
+                        if summary is not None:
+                            summary.add(row.get('type'), row.get('sourceName'),
+                                        row.get('startDate'), row.get('value'))
                 except Exception as e:
                     logger.warning(f"Failed to insert record: {e}")
             
+            if summary is not None:
+                summary.finish(conn)
+            
             # Log import results
             total_count = conn.execute('SELECT COUNT(*) FROM health_records').fetchone()[0]
             logger.info(f"Import complete: {records_inserted} new records added, {total_count} total records in database")
@@ -290,7 +334,8 @@ def _convert_xml_with_transaction(xml_path: str, db_path: str) -> int:
             conn.close()
 
 
-def convert_xml_to_sqlite(xml_path: str, db_path: str) -> int:
+def convert_xml_to_sqlite(xml_path: str, db_path: str,
+                          summary: Optional['ImportSummaryAccumulator'] = None) -> int:
     """Convert Apple Health XML export to SQLite database with basic error handling.
     
     This is a simplified version of the conversion function without XML validation.
@@ -300,6 +345,7 @@ def convert_xml_to_sqlite(xml_path: str, db_path: str) -> int:
     Args:
         xml_path: Path to the Apple Health export.xml file.
         db_path: Path where the SQLite database will be created.
+        summary: Optional accumulator fed every inserted record.
         
     Returns:
         Number of new records imported (excludes duplicates).
@@ -371,6 +417,8 @@ def convert_xml_to_sqlite(xml_path: str, db_path: str) -> int:
                     UNIQUE(type, sourceName, startDate, endDate, value)
                 )
             """)
+            if summary is not None:
+                summary.begin(conn)
             
             # Insert records using INSERT OR IGNORE
             records_inserted = 0
@@ -393,9 +441,15 @@ def convert_xml_to_sqlite(xml_path: str, db_path: str) -> int:
                     ))
                     if conn.total_changes > records_inserted:
                         records_inserted = conn.total_changes
+                        if summary is not None:
+                            summary.add(row.get('type'), row.get('sourceName'),
+                                        row.get('startDate'), row.get('value'))
                 except Exception as e:
                     logger.warning(f"Failed to insert record: {e}")
             
+            if summary is not None:
+                summary.finish(conn)
+            
             # Create indexes for fast queries
             conn.execute('CREATE INDEX IF NOT EXISTS idx_start_date ON health_records(startDate)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_type ON health_records(type)')
@@ -757,19 +811,111 @@ def get_date_range(db_path: str) -> Tuple[Optional[str], Optional[str]]:
         conn.close()
 
 
-def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Optional[Callable] = None) -> int:
+def _parse_csv_dates(values: pd.Series) -> pd.Series:
+    """Parse CSV timestamps, in one vectorized pass when they match CSV_DATE_FORMAT.
+    
+    Other layouts, such as Apple Health's trailing UTC offset, are parsed
+    from their first 19 characters, keeping the local time as the XML
+    importers do.
+    """
+    parsed = pd.to_datetime(values, format=CSV_DATE_FORMAT, errors='coerce')
+    missed = parsed.isna() & values.notna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(values[missed].str.slice(0, 19),
+                                        format='ISO8601', errors='coerce')
+    return parsed
+
+
+def _strip_type_prefixes(types: pd.Series) -> pd.Series:
+    """Remove HealthKit prefixes from categorical type names, once per category."""
+    categories = types.cat.categories
+    cleaned = categories.str.replace(_HEALTHKIT_PREFIX, '', regex=True)
+    # Prefixed and bare spellings of a type merge into one category
+    return types.map(dict(zip(categories, cleaned))).astype('category')
+
+
+def _read_csv_chunks(source, date_columns=CSV_DATE_COLUMNS,
+                     chunk_rows: int = CSV_CHUNK_ROWS,
+                     on_bad_lines: str = 'error') -> Iterator[pd.DataFrame]:
+    """Read a health CSV as cleaned, typed chunks.
+    
+    Only the health_records columns are read. Type names lose their
+    HealthKit prefix, values become numeric and date_columns are parsed.
+    Missing and non-numeric values, such as sleep categories, become 1.0,
+    as in the XML importers.
+    
+    Args:
+        source: Path or open file to read.
+        date_columns: Columns to parse as timestamps.
+        chunk_rows: Rows per chunk.
+        on_bad_lines: What pandas does with malformed lines.
+        
+    Yields:
+        DataFrames with the health_records columns found in the file.
+        
+    Raises:
+        DataValidationError: If the type or startDate column is missing.
+    """
+    reader = pd.read_csv(source, usecols=lambda column: column in CSV_COLUMNS,
+                         dtype=CSV_DTYPES, chunksize=chunk_rows, on_bad_lines=on_bad_lines)
+    with reader:
+        for chunk in reader:
+            missing = {'type', 'startDate'}.difference(chunk.columns)
+            if missing:
+                raise DataValidationError(
+                    f"CSV file is missing required columns: {', '.join(sorted(missing))}")
+            
+            chunk['type'] = _strip_type_prefixes(chunk['type'])
+            if 'value' in chunk:
+                chunk['value'] = pd.to_numeric(chunk['value'], errors='coerce').fillna(1.0)
+            for column in date_columns:
+                if column in chunk:
+                    chunk[column] = _parse_csv_dates(chunk[column])
+            yield chunk
+
+
+def _write_csv_chunk(conn: sqlite3.Connection, chunk: pd.DataFrame) -> int:
+    """Append a cleaned CSV chunk to health_records with one executemany.
+    
+    Returns:
+        Number of rows written.
+    """
+    rows = chunk.reindex(columns=list(CSV_COLUMNS))
+    for column in CSV_DATE_COLUMNS:
+        if pd.api.types.is_datetime64_any_dtype(rows[column]):
+            # Whole-second timestamps format as CSV_DATE_FORMAT
+            rows[column] = rows[column].astype(str).where(rows[column].notna())
+    rows = rows.astype(object).where(rows.notna(), None)
+    conn.executemany(
+        f"INSERT INTO health_records ({', '.join(CSV_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(CSV_COLUMNS))})",
+        rows.itertuples(index=False, name=None)
+    )
+    return len(rows)
+
+
+def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Optional[Callable] = None,
+                          summary: Optional['ImportSummaryAccumulator'] = None) -> int:
     """Migrate existing CSV health data to optimized SQLite format.
     
     Converts CSV files (typically exported from previous versions or other tools)
     to the standardized SQLite database format. Creates performance indexes and
     metadata tables for optimal query performance.
     
+    The file is read in typed chunks of CSV_CHUNK_ROWS rows, each written
+    straight to the database, so memory use does not grow with file size.
+    Columns other than the health_records columns are ignored, and values
+    that are not numbers, such as sleep categories, are stored as 1.0.
+    
     Args:
         csv_path: Path to the CSV file containing health data. Expected to have
             columns: type, sourceName, sourceVersion, device, unit, creationDate,
-            startDate, endDate, value.
+            startDate, endDate, value. type and startDate are required.
         db_path: Path where the SQLite database will be created. Overwrites
             existing files.
+        progress_callback: Optional callback taking (percentage, record_count);
+            returning False cancels the migration.
+        summary: Optional accumulator given every migrated record.
             
     Returns:
         Number of records successfully migrated to the database.
@@ -778,6 +924,7 @@ def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Option
         FileNotFoundError: If the CSV file doesn't exist at the specified path.
         sqlite3.Error: If database creation or data insertion fails.
         pd.errors.ParserError: If the CSV file is malformed or has invalid structure.
+        DataValidationError: If the type or startDate column is missing.
         
     Examples:
         Migrate legacy CSV data:
@@ -800,29 +947,50 @@ def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Option
     
     conn = None
     try:
-        logger.info(f"Reading CSV file: {csv_path}")
-        df = pd.read_csv(csv_path, parse_dates=['startDate'])
-        
         logger.info(f"Creating SQLite database: {db_path}")
         conn = sqlite3.connect(db_path)
         
         # Start transaction
         conn.execute('BEGIN IMMEDIATE')
+        if summary is not None:
+            summary.begin(conn, replace=True)
         
         try:
-            # Check for cancellation before processing
-            if progress_callback and progress_callback(20, len(df)) is False:
-                conn.rollback()
-                logger.info("CSV import cancelled by user")
-                return 0
-            
-            df.to_sql('health_records', conn, index=False, if_exists='replace')
+            conn.execute('DROP TABLE IF EXISTS health_records')
+            # Daily totals kept by ImportSummaryAccumulator describe the replaced records
+            conn.execute('DROP TABLE IF EXISTS import_daily_totals')
+            conn.execute("""
+                CREATE TABLE health_records (
+                    type TEXT,
+                    sourceName TEXT,
+                    sourceVersion TEXT,
+                    device TEXT,
+                    unit TEXT,
+                    creationDate TEXT,
+                    startDate TEXT,
+                    endDate TEXT,
+                    value REAL
+                )
+            """)
             
-            # Check for cancellation
-            if progress_callback and progress_callback(60, len(df)) is False:
-                conn.rollback()
-                logger.info("CSV import cancelled by user")
-                return 0
+            logger.info(f"Reading CSV file: {csv_path}")
+            record_count = 0
+            file_size = os.path.getsize(csv_path) or 1
+            with open(csv_path, 'rb') as csv_file:
+                for chunk in _read_csv_chunks(csv_file, chunk_rows=CSV_CHUNK_ROWS):
+                    record_count += _write_csv_chunk(conn, chunk)
+                    if summary is not None:
+                        summary.add_frame(chunk)
+                    
+                    # Check for cancellation after each chunk
+                    percentage = 60 * csv_file.tell() / file_size
+                    if progress_callback and progress_callback(percentage, record_count) is False:
+                        conn.rollback()
+                        logger.info("CSV import cancelled by user")
+                        return 0
+            
+            if summary is not None:
+                summary.finish(conn)
             
             # Add same indexes as XML import
             conn.execute('CREATE INDEX idx_start_date ON health_records(startDate)')
@@ -830,7 +998,7 @@ def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Option
             conn.execute('CREATE INDEX idx_type_date ON health_records(type, startDate)')
             
             # Check for cancellation
-            if progress_callback and progress_callback(80, len(df)) is False:
+            if progress_callback and progress_callback(80, record_count) is False:
                 conn.rollback()
                 logger.info("CSV import cancelled by user")
                 return 0
@@ -843,12 +1011,13 @@ def migrate_csv_to_sqlite(csv_path: str, db_path: str, progress_callback: Option
                 )
             ''')
             conn.execute("INSERT OR REPLACE INTO metadata VALUES ('import_date', datetime('now'))")
-            conn.execute(f"INSERT OR REPLACE INTO metadata VALUES ('record_count', '{len(df)}')")
+            conn.execute("INSERT OR REPLACE INTO metadata VALUES ('record_count', ?)",
+                         (str(record_count),))
             
             # Commit transaction
             conn.commit()
-            logger.info(f"Successfully migrated {len(df)} records")
-            return len(df)
+            logger.info(f"Successfully migrated {record_count} records")
+            return record_count
         except Exception as e:
             # Rollback on any error
             conn.rollback()
@@ -1007,7 +1176,8 @@ class DataLoader:
         
         Reads CSV files with automatic date parsing, data type conversion, and
         standardization. Handles common data quality issues and applies consistent
-        formatting for downstream analysis.
+        formatting for downstream analysis. The file is read in typed chunks of
+        the health_records columns, as migrate_csv_to_sqlite does.
         
         Args:
             file_path: Path to the CSV file containing health data.
@@ -1017,7 +1187,8 @@ class DataLoader:
                 - creationDate, startDate, endDate: Parsed as datetime objects
                 - value: Converted to numeric, NaN filled with 1.0
                 - type: Cleaned health metric type names
-                - Other columns preserved as-is
+                - type, sourceName, sourceVersion, device, unit: Categorical
+                Other columns are not read.
                 
         Raises:
             FileNotFoundError: If CSV file doesn't exist at the specified path.
@@ -1042,23 +1213,15 @@ class DataLoader:
         try:
             self.logger.info(f"Loading CSV file: {file_path}")
             
-            # Read CSV with common date columns parsed
-            df = pd.read_csv(
-                file_path,
-                parse_dates=['creationDate', 'startDate', 'endDate'],
-                date_parser=pd.to_datetime,
-                on_bad_lines='skip'
-            )
-            
-            # Convert value column to numeric if it exists
-            if 'value' in df.columns:
-                df['value'] = pd.to_numeric(df['value'], errors='coerce')
-                df['value'] = df['value'].fillna(1.0)
+            chunks = list(_read_csv_chunks(file_path, chunk_rows=CSV_CHUNK_ROWS,
+                                           on_bad_lines='skip'))
+            df = (pd.concat(chunks, ignore_index=True) if chunks
+                  else pd.DataFrame(columns=list(CSV_COLUMNS)))
             
-            # Clean type names if they exist
-            if 'type' in df.columns:
-                df['type'] = df['type'].str.replace('HKQuantityTypeIdentifier', '')
-                df['type'] = df['type'].str.replace('HKCategoryTypeIdentifier', '')
+            # Chunks have their own categories; concatenating them falls back to object
+            for column, dtype in CSV_DTYPES.items():
+                if dtype == 'category' and column in df.columns:
+                    df[column] = df[column].astype('category')
             
             self.logger.info(f"Successfully loaded {len(df)} records from CSV")
             return df
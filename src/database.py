@@ -49,6 +49,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from . import config
+from .import_history import ensure_import_history_table
 
 logger = logging.getLogger(__name__)
 
@@ -490,22 +491,7 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sources_active ON data_sources(is_active)")
             
             # Create import_history table as per spec
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS import_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    file_path TEXT NOT NULL,
-                    file_hash VARCHAR(64),
-                    import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    row_count INTEGER,
-                    date_range_start DATE,
-                    date_range_end DATE,
-                    unique_types INTEGER,
-                    unique_sources INTEGER,
-                    import_duration_ms INTEGER
-                )
-            """)
-            
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_import_date ON import_history(import_date DESC)")
+            ensure_import_history_table(cursor)
             
             # Create health_records table for imported health data
             cursor.execute("""
@@ -877,8 +863,7 @@ class DatabaseManager:
                     entry_date UNINDEXED,
                     entry_type UNINDEXED,
                     content,
-                    tokenize='porter unicode61',
-                    content_rowid='entry_id'
+                    tokenize='porter unicode61'
                 )
             """)
             
@@ -938,6 +923,123 @@ class DatabaseManager:
             # Record migration
             cursor.execute("INSERT INTO schema_migrations (version) VALUES (8)")
             logger.info("Migration 8 applied successfully")
+        
+        # Migration 9: Add vocabulary indexes for search suggestions
+        if current_version < 9:
+            logger.info("Applying migration 9: Adding journal vocabulary and query indexes")
+            
+            # Databases created by an earlier migration 8 declared
+            # content_rowid on journal_search, which FTS5 only supports for
+            # external content tables; every update or delete of a journal
+            # entry then failed in the sync triggers. Rebuild it without.
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'journal_search'")
+            row = cursor.fetchone()
+            if row and 'content_rowid' in row[0]:
+                cursor.execute("DROP TABLE journal_search")
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE journal_search USING fts5(
+                        entry_id UNINDEXED,
+                        entry_date UNINDEXED,
+                        entry_type UNINDEXED,
+                        content,
+                        tokenize='porter unicode61'
+                    )
+                """)
+                cursor.execute("""
+                    INSERT INTO journal_search(entry_id, entry_date, entry_type, content)
+                    SELECT id, entry_date, entry_type, content
+                    FROM journal_entries
+                    WHERE content IS NOT NULL
+                """)
+            
+            # Unstemmed term index over journal content; only the vocabulary
+            # is read, so no positions are stored
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS journal_terms USING fts5(
+                    content,
+                    content='journal_entries',
+                    content_rowid='id',
+                    tokenize='unicode61',
+                    detail='none'
+                )
+            """)
+            cursor.execute("INSERT INTO journal_terms(journal_terms) VALUES ('rebuild')")
+            
+            # One row per distinct term with its document count
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS journal_terms_vocab
+                USING fts5vocab(journal_terms, 'row')
+            """)
+            
+            # Keep the term index in sync with journal writes
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS journal_terms_insert
+                AFTER INSERT ON journal_entries
+                BEGIN
+                    INSERT INTO journal_terms(rowid, content) VALUES (NEW.id, NEW.content);
+                END
+            """)
+            
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS journal_terms_update
+                AFTER UPDATE OF content ON journal_entries
+                BEGIN
+                    INSERT INTO journal_terms(journal_terms, rowid, content)
+                    VALUES ('delete', OLD.id, OLD.content);
+                    INSERT INTO journal_terms(rowid, content) VALUES (NEW.id, NEW.content);
+                END
+            """)
+            
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS journal_terms_delete
+                AFTER DELETE ON journal_entries
+                BEGIN
+                    INSERT INTO journal_terms(journal_terms, rowid, content)
+                    VALUES ('delete', OLD.id, OLD.content);
+                END
+            """)
+            
+            # Per-query search counts, prefix-searchable through the
+            # case-insensitive primary key
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS search_query_stats (
+                    query TEXT PRIMARY KEY COLLATE NOCASE,
+                    frequency INTEGER NOT NULL DEFAULT 0,
+                    last_searched TIMESTAMP
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO search_query_stats (query, frequency, last_searched)
+                SELECT query, COUNT(*), MAX(searched_at)
+                FROM search_history
+                GROUP BY query COLLATE NOCASE
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS search_query_stats_insert
+                AFTER INSERT ON search_history
+                BEGIN
+                    INSERT INTO search_query_stats (query, frequency, last_searched)
+                    VALUES (NEW.query, 1, NEW.searched_at)
+                    ON CONFLICT(query) DO UPDATE SET
+                        frequency = frequency + 1,
+                        last_searched = excluded.last_searched;
+                END
+            """)
+            
+            # Record migration
+            cursor.execute("INSERT INTO schema_migrations (version) VALUES (9)")
+            logger.info("Migration 9 applied successfully")
+        
+        # Migration 10: Add checkpoint columns to import_history
+        if current_version < 10:
+            logger.info("Applying migration 10: Adding import checkpoint columns")
+            
+            # The streaming importer may already have added them
+            ensure_import_history_table(cursor)
+            
+            # Record migration
+            cursor.execute("INSERT INTO schema_migrations (version) VALUES (10)")
+            logger.info("Migration 10 applied successfully")
     
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[sqlite3.Row]:
         """Execute SELECT query and return all matching rows.
@@ -1033,7 +1135,9 @@ class DatabaseManager:
             else:
                 cursor.execute(query)
             conn.commit()
-            return cursor.lastrowid
+            if query.lstrip().upper().startswith(('INSERT', 'REPLACE')):
+                return cursor.lastrowid
+            return cursor.rowcount
     
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
         """Execute same command multiple times with different parameters efficiently.
@@ -0,0 +1,340 @@
+"""Online database backups using the SQLite backup API.
+
+A backup is a zip archive holding a ``manifest.json`` and the database
+content. The live database is first copied page by page with
+``sqlite3.Connection.backup``, a few hundred pages per step, so the
+application can keep reading and writing while the copy runs and progress
+is reported between steps. The copy is then cut into fixed-size chunks of
+pages; every chunk is hashed and streamed through the zip compressor, so
+memory use is bounded by the chunk size whatever the database size.
+
+Backups are either full or incremental:
+
+- A full backup stores every chunk as ``database.sqlite``; unzipped it is
+  a working database.
+- An incremental backup is taken against a previous backup's manifest and
+  stores only the chunks whose checksum changed, as ``changed_chunks.bin``.
+  Restoring it needs the chain of backups back to the last full one.
+
+The manifest records the checksum of every chunk, the checksum of the whole
+database and per-table row counts, so ``verify_backup`` can check an
+archive without restoring it and incremental backups know what changed.
+
+Example:
+    >>> engine = DatabaseBackupEngine(progress=lambda pct, msg: print(pct, msg))
+    >>> full = engine.create_backup('backup_full.zip')
+    >>> engine.create_backup('backup_inc1.zip', base='backup_full.zip')
+    >>> DatabaseBackupEngine.restore(['backup_full.zip', 'backup_inc1.zip'], 'restored.db')
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import uuid
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from .utils.error_handler import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+BACKUP_FORMAT_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+FULL_MEMBER = 'database.sqlite'
+INCREMENTAL_MEMBER = 'changed_chunks.bin'
+SETTINGS_MEMBER = 'settings.json'
+
+# Pages copied per backup step; the source is unlocked between steps
+DEFAULT_PAGES_PER_STEP = 1024
+# Pages per checksummed chunk (1 MiB with 4 KiB pages)
+DEFAULT_CHUNK_PAGES = 256
+
+BackupTarget = Union[str, Path, BinaryIO]
+Manifest = Dict[str, Any]
+
+
+class BackupCancelledError(Exception):
+    """Raised when a backup is cancelled between steps."""
+
+
+class DatabaseBackupEngine:
+    """Creates, verifies and restores page-level database backups."""
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None,
+                 pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                 chunk_pages: int = DEFAULT_CHUNK_PAGES,
+                 compresslevel: int = 6,
+                 progress: Optional[Callable[[int, str], None]] = None,
+                 is_cancelled: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            db_path: Database to back up; the application database when None
+            pages_per_step: Pages copied per backup step
+            chunk_pages: Pages per checksummed chunk
+            compresslevel: Deflate level (0-9) of the archive
+            progress: Called with (percent, message) as the backup advances
+            is_cancelled: Polled between steps; a true result aborts the
+                backup with ``BackupCancelledError``
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.pages_per_step = max(1, pages_per_step)
+        self.chunk_pages = max(1, chunk_pages)
+        self.compresslevel = compresslevel
+        self.progress = progress or (lambda percent, message: None)
+        self.is_cancelled = is_cancelled or (lambda: False)
+
+    def _source_path(self) -> Path:
+        if self.db_path is not None:
+            return self.db_path
+        from .database import db_manager
+        return db_manager.db_path
+
+    def _check_cancelled(self) -> None:
+        if self.is_cancelled():
+            raise BackupCancelledError("Backup cancelled")
+
+    # Snapshot
+
+    def snapshot(self, target_path: Union[str, Path]) -> Dict[str, Any]:
+        """Copy the live database to ``target_path`` with the backup API.
+
+        Returns:
+            Page size, page count and row counts per table of the copy
+        """
+        source_path = self._source_path()
+        if not Path(source_path).exists():
+            raise DatabaseError(f"Database file not found: {source_path}")
+
+        def on_step(status, remaining, total):
+            self._check_cancelled()
+            if total:
+                self.progress(5 + int(45 * (total - remaining) / total),
+                              f"Copied {total - remaining:,} of {total:,} pages")
+
+        source = sqlite3.connect(str(source_path), timeout=30.0)
+        target = sqlite3.connect(str(target_path))
+        try:
+            source.backup(target, pages=self.pages_per_step, progress=on_step)
+            page_size = target.execute("PRAGMA page_size").fetchone()[0]
+            page_count = target.execute("PRAGMA page_count").fetchone()[0]
+            tables = [row[0] for row in target.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+            row_counts = {table: target.execute(
+                f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+        finally:
+            target.close()
+            source.close()
+
+        logger.info(f"Snapshot of {source_path}: {page_count} pages of {page_size} bytes")
+        return {'page_size': page_size, 'page_count': page_count, 'tables': row_counts}
+
+    # Backup
+
+    def create_backup(self, target: BackupTarget,
+                      base: Optional[Union[BackupTarget, Manifest]] = None,
+                      settings: Optional[Dict[str, Any]] = None,
+                      temp_dir: Optional[Union[str, Path]] = None) -> Manifest:
+        """Write a full backup, or an incremental one when ``base`` is given.
+
+        Args:
+            target: Archive path or binary file object
+            base: Previous backup (archive or its manifest) to diff against
+            settings: Application settings stored alongside the data
+            temp_dir: Directory for the intermediate snapshot
+
+        Returns:
+            Manifest of the new backup
+        """
+        base_manifest = self.read_manifest(base) if base is not None and \
+            not isinstance(base, dict) else base
+        self.progress(2, "Starting backup...")
+
+        with tempfile.TemporaryDirectory(dir=temp_dir, prefix='backup-') as work_dir:
+            snapshot_path = Path(work_dir) / 'snapshot.db'
+            info = self.snapshot(snapshot_path)
+            chunk_bytes = info['page_size'] * self.chunk_pages
+
+            incremental = (base_manifest is not None
+                           and base_manifest.get('page_size') == info['page_size']
+                           and base_manifest.get('chunk_bytes') == chunk_bytes)
+            if base_manifest is not None and not incremental:
+                logger.warning("Base backup uses a different page or chunk size; "
+                               "writing a full backup instead")
+            previous = base_manifest['chunks'] if incremental else []
+
+            manifest: Manifest = {
+                'format_version': BACKUP_FORMAT_VERSION,
+                'backup_id': uuid.uuid4().hex,
+                'backup_date': datetime.now().isoformat(),
+                'kind': 'incremental' if incremental else 'full',
+                'base_id': base_manifest['backup_id'] if incremental else None,
+                'page_size': info['page_size'],
+                'page_count': info['page_count'],
+                'chunk_bytes': chunk_bytes,
+                'database_size': snapshot_path.stat().st_size,
+                'tables': info['tables'],
+                'member': INCREMENTAL_MEMBER if incremental else FULL_MEMBER,
+                'chunks': [],
+            }
+
+            with self._open_archive(target) as archive:
+                self._write_chunks(archive, snapshot_path, manifest, previous)
+                if settings is not None:
+                    archive.writestr(SETTINGS_MEMBER, json.dumps(settings, indent=2))
+                    manifest['settings_sha256'] = hashlib.sha256(
+                        json.dumps(settings, indent=2).encode('utf-8')).hexdigest()
+                archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+        stored = sum(1 for chunk in manifest['chunks'] if chunk['stored'])
+        logger.info(f"{manifest['kind'].title()} backup {manifest['backup_id']}: "
+                    f"{stored} of {len(manifest['chunks'])} chunks stored")
+        self.progress(100, "Backup completed")
+        return manifest
+
+    def _open_archive(self, target: BackupTarget):
+        if isinstance(target, (str, Path)):
+            return _AtomicArchive(Path(target), self.compresslevel)
+        return zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
+
+    def _write_chunks(self, archive: zipfile.ZipFile, snapshot_path: Path,
+                      manifest: Manifest, previous: List[Dict[str, Any]]) -> None:
+        """Hash every chunk of the snapshot and stream new ones into the archive."""
+        total = max(1, manifest['database_size'])
+        database_hash = hashlib.sha256()
+        done = 0
+        with open(snapshot_path, 'rb') as source, \
+                archive.open(manifest['member'], 'w', force_zip64=True) as member:
+            for index, chunk in enumerate(_read_chunks(source, manifest['chunk_bytes'])):
+                self._check_cancelled()
+                database_hash.update(chunk)
+                digest = hashlib.sha256(chunk).hexdigest()
+                unchanged = (index < len(previous) and previous[index]['sha256'] == digest
+                             and previous[index]['length'] == len(chunk))
+                if not unchanged:
+                    member.write(chunk)
+                manifest['chunks'].append(
+                    {'index': index, 'length': len(chunk), 'sha256': digest,
+                     'stored': not unchanged})
+                done += len(chunk)
+                self.progress(50 + int(48 * done / total),
+                              f"Compressed {done // 1024:,} of {total // 1024:,} KiB")
+        manifest['database_sha256'] = database_hash.hexdigest()
+
+    # Reading
+
+    @staticmethod
+    def read_manifest(source: BackupTarget) -> Manifest:
+        """Return the manifest of a backup archive."""
+        with zipfile.ZipFile(source) as archive:
+            try:
+                return json.loads(archive.read(MANIFEST_NAME))
+            except KeyError:
+                raise DatabaseError("Not a database backup: manifest.json missing")
+
+    @staticmethod
+    def _stored_chunks(archive: zipfile.ZipFile,
+                       manifest: Manifest) -> Iterator[tuple]:
+        """Yield (chunk entry, bytes) for every chunk stored in ``archive``."""
+        with archive.open(manifest['member']) as member:
+            for entry in manifest['chunks']:
+                if entry['stored']:
+                    yield entry, member.read(entry['length'])
+
+    @classmethod
+    def verify_backup(cls, source: BackupTarget) -> bool:
+        """Check the stored chunks (and, for full backups, the database) checksums."""
+        manifest = cls.read_manifest(source)
+        database_hash = hashlib.sha256()
+        with zipfile.ZipFile(source) as archive:
+            for entry, chunk in cls._stored_chunks(archive, manifest):
+                if len(chunk) != entry['length'] or \
+                        hashlib.sha256(chunk).hexdigest() != entry['sha256']:
+                    logger.error(f"Backup chunk {entry['index']} failed verification")
+                    return False
+                database_hash.update(chunk)
+        if manifest['kind'] == 'full' and database_hash.hexdigest() != manifest['database_sha256']:
+            logger.error("Backup database checksum mismatch")
+            return False
+        return True
+
+    @classmethod
+    def restore(cls, backups: Sequence[BackupTarget], target_path: Union[str, Path]) -> Manifest:
+        """Rebuild the database from a full backup and its incremental successors.
+
+        Args:
+            backups: Full backup followed by incremental backups, oldest first
+            target_path: Database file to write; replaced only on success
+
+        Returns:
+            Manifest of the last backup applied
+        """
+        if not backups:
+            raise ValueError("No backups to restore")
+        manifests = [cls.read_manifest(backup) for backup in backups]
+        if manifests[0]['kind'] != 'full':
+            raise ValueError("The first backup to restore must be a full backup")
+        for parent, child in zip(manifests, manifests[1:]):
+            if child['base_id'] != parent['backup_id']:
+                raise ValueError(f"Backup {child['backup_id']} is not based on "
+                                 f"{parent['backup_id']}")
+
+        target_path = Path(target_path)
+        partial = target_path.with_name(target_path.name + '.part')
+        try:
+            with open(partial, 'w+b') as output:
+                for backup, manifest in zip(backups, manifests):
+                    with zipfile.ZipFile(backup) as archive:
+                        for entry, chunk in cls._stored_chunks(archive, manifest):
+                            if hashlib.sha256(chunk).hexdigest() != entry['sha256']:
+                                raise DatabaseError(
+                                    f"Backup chunk {entry['index']} failed verification")
+                            output.seek(entry['index'] * manifest['chunk_bytes'])
+                            output.write(chunk)
+                last = manifests[-1]
+                output.truncate(last['database_size'])
+                output.seek(0)
+                database_hash = hashlib.sha256()
+                for chunk in _read_chunks(output, last['chunk_bytes']):
+                    database_hash.update(chunk)
+            if database_hash.hexdigest() != last['database_sha256']:
+                raise DatabaseError("Restored database does not match the backup checksum")
+            os.replace(partial, target_path)
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+        logger.info(f"Restored {len(backups)} backup(s) to {target_path}")
+        return last
+
+
+class _AtomicArchive(zipfile.ZipFile):
+    """Zip archive written to a ``.part`` file and renamed when closed cleanly."""
+
+    def __init__(self, path: Path, compresslevel: int):
+        self._final_path = path
+        self._partial_path = path.with_name(path.name + '.part')
+        super().__init__(self._partial_path, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=compresslevel)
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        if exc_type is None:
+            os.replace(self._partial_path, self._final_path)
+        elif self._partial_path.exists():
+            self._partial_path.unlink()
+        return False
+
+
+def _read_chunks(handle: BinaryIO, size: int) -> Iterator[bytes]:
+    while True:
+        chunk = handle.read(size)
+        if not chunk:
+            break
+        yield chunk
@@ -0,0 +1,57 @@
+"""Schema of the import_history table.
+
+Both DatabaseManager and the streaming XML importer create or upgrade the
+table. It lives in its own module because importing ``src.database`` creates
+the application database as a side effect, which the importer, working on a
+database of its own, must not do.
+
+Example:
+    >>> with sqlite3.connect("health.db") as conn:
+    ...     ensure_import_history_table(conn.cursor())
+"""
+
+import sqlite3
+
+# import_history columns that let a streaming import resume from its last
+# committed checkpoint (added by migration 10)
+IMPORT_CHECKPOINT_COLUMNS = (
+    ('import_id', 'TEXT'),
+    ('status', "TEXT DEFAULT 'completed'"),
+    ('header_bytes', 'INTEGER'),
+    ('byte_offset', 'INTEGER DEFAULT 0'),
+    ('records_processed', 'INTEGER DEFAULT 0'),
+    ('checkpoint_at', 'TIMESTAMP'),
+)
+
+
+def ensure_import_history_table(cursor: sqlite3.Cursor):
+    """Create the import_history table, or add the checkpoint columns it lacks.
+    
+    Idempotent, so both database initialization and the streaming importer,
+    which may open a database the manager has not initialized yet, call it.
+    
+    Args:
+        cursor: Cursor on the database to update.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            file_hash VARCHAR(64),
+            import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            row_count INTEGER,
+            date_range_start DATE,
+            date_range_end DATE,
+            unique_types INTEGER,
+            unique_sources INTEGER,
+            import_duration_ms INTEGER
+        )
+    """)
+    
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(import_history)").fetchall()}
+    for name, declaration in IMPORT_CHECKPOINT_COLUMNS:
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE import_history ADD COLUMN {name} {declaration}")
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_import_date ON import_history(import_date DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_import_file ON import_history(file_path, file_hash)")
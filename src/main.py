@@ -4,6 +4,7 @@
 import os
 import sys
 import argparse
+import multiprocessing
 
 # Fix Python path before any local imports
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -393,4 +394,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Chart rendering uses spawn worker processes; a frozen executable
+    # must hand them to multiprocessing instead of starting another window
+    multiprocessing.freeze_support()
     main()
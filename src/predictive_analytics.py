@@ -632,11 +632,16 @@ class PredictiveAnalytics:
                 model_contributions={}
             )
     
-    def forecast_weekly_trend(self, metric: str, historical_data: pd.Series) -> WeeklyForecast:
-        """Generate 7-day forecast with scenarios."""
+    def forecast_weekly_trend(self, metric: str, historical_data: pd.Series,
+                              periods: int = 7, fallback: bool = True) -> WeeklyForecast:
+        """Generate a forecast with scenarios, 7 days ahead by default.
+
+        With ``fallback`` disabled, a failed fit raises instead of returning a
+        flat forecast of the last value.
+        """
         try:
             # Base forecast using ARIMA
-            base_forecast = self.models['arima'].forecast(historical_data, periods=7)
+            base_forecast = self.models['arima'].forecast(historical_data, periods=periods)
             
             # Scenario analysis
             scenarios = {
@@ -661,15 +666,17 @@ class PredictiveAnalytics:
             )
             
         except Exception as e:
+            if not fallback:
+                raise
             logging.error(f"Weekly forecast failed for {metric}: {e}")
             # Return fallback forecast
             last_value = historical_data.iloc[-1]
             return WeeklyForecast(
-                daily_predictions=[last_value] * 7,
+                daily_predictions=[last_value] * periods,
                 scenarios={
-                    'optimistic': [last_value * 1.1] * 7,
-                    'realistic': [last_value] * 7,
-                    'pessimistic': [last_value * 0.9] * 7
+                    'optimistic': [last_value * 1.1] * periods,
+                    'realistic': [last_value] * periods,
+                    'pessimistic': [last_value * 0.9] * periods
                 },
                 trend_direction='stable',
                 trend_confidence=0.3,
@@ -807,7 +814,7 @@ class PredictiveAnalytics:
         if forecast:
             peak_day = np.argmax(forecast)
             peak_day_name = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                           'Friday', 'Saturday', 'Sunday'][peak_day]
+                           'Friday', 'Saturday', 'Sunday'][peak_day % 7]
             insights.append(f"Highest value expected on {peak_day_name}")
             
         return insights
@@ -250,14 +250,17 @@ class StatisticsCalculator:
                 date_range = (None, None)
         
         # Records by type
-        records_by_type = df['type'].value_counts().to_dict()
+        # (unused categories of categorical columns are dropped)
+        type_counts = df['type'].value_counts()
+        records_by_type = type_counts[type_counts > 0].to_dict()
         
         # Records by source
-        records_by_source = df['sourceName'].value_counts().to_dict()
+        source_counts = df['sourceName'].value_counts()
+        records_by_source = source_counts[source_counts > 0].to_dict()
         
         # Types by source
         types_by_source = defaultdict(list)
-        grouped = df.groupby(['sourceName', 'type']).size()
+        grouped = df.groupby(['sourceName', 'type'], observed=True).size()
         for (source, type_name), _ in grouped.items():
             if type_name not in types_by_source[source]:
                 types_by_source[source].append(type_name)
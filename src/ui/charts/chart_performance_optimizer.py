@@ -13,6 +13,8 @@ import pickle
 from functools import lru_cache
 import logging
 
+from .downsampling import downsample_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +32,7 @@ class ChartPerformanceOptimizer:
     def optimize_data(self, 
                      data: pd.DataFrame,
                      target_points: Optional[int] = None,
-                     algorithm: Literal['lttb', 'decimation', 'aggregation', 'auto'] = 'auto',
+                     algorithm: Literal['lttb', 'm4', 'decimation', 'aggregation', 'auto'] = 'auto',
                      preserve_peaks: bool = True) -> pd.DataFrame:
         """
         Optimize data for chart rendering.
@@ -68,6 +70,8 @@ class ChartPerformanceOptimizer:
         # Apply optimization
         if algorithm == 'lttb':
             optimized = self._lttb_downsample(data, target_points, preserve_peaks)
+        elif algorithm == 'm4':
+            optimized = downsample_frame(data, target_points, method='m4')
         elif algorithm == 'decimation':
             optimized = self._decimation_downsample(data, target_points)
         elif algorithm == 'aggregation':
@@ -130,73 +134,11 @@ class ChartPerformanceOptimizer:
         Largest Triangle Three Buckets (LTTB) downsampling.
         
         This algorithm is excellent for preserving the visual shape of time series.
+        All numeric columns are downsampled together and the result keeps
+        every row selected for any of them.
         """
-        if len(data) <= target_points:
-            return data
-            
-        # Handle multi-column data
-        if len(data.columns) > 1:
-            # Apply LTTB to each column
-            results = []
-            for col in data.columns:
-                col_data = data[[col]]
-                downsampled = self._lttb_single_series(col_data, target_points)
-                results.append(downsampled)
-            
-            # Merge on index
-            result = results[0]
-            for df in results[1:]:
-                result = result.join(df, how='outer')
-            return result.sort_index()
-        else:
-            return self._lttb_single_series(data, target_points)
-            
-    def _lttb_single_series(self, data: pd.DataFrame, target_points: int) -> pd.DataFrame:
-        """LTTB implementation for single series."""
-        n = len(data)
-        
-        # Convert to numpy for performance
-        x = np.arange(n)
-        y = data.iloc[:, 0].values
-        
-        # Bucket size
-        every = (n - 2) / (target_points - 2)
-        
-        # Always include first and last points
-        sampled_indices = [0]
-        
-        # Previous selected point
-        a = 0
-        
-        for i in range(target_points - 2):
-            # Calculate average point in next bucket
-            avg_range_start = int((i + 1) * every) + 1
-            avg_range_end = int((i + 2) * every) + 1
-            avg_range_end = min(avg_range_end, n)
-            
-            avg_x = np.mean(x[avg_range_start:avg_range_end])
-            avg_y = np.mean(y[avg_range_start:avg_range_end])
+        return downsample_frame(data, target_points, method='lttb')
             
-            # Calculate point in current bucket with largest triangle area
-            range_start = int(i * every) + 1
-            range_end = int((i + 1) * every) + 1
-            range_end = min(range_end, n)
-            
-            # Vectorized triangle area calculation
-            areas = 0.5 * np.abs(
-                (x[a] - avg_x) * (y[range_start:range_end] - y[a]) -
-                (x[a] - x[range_start:range_end]) * (avg_y - y[a])
-            )
-            
-            max_area_idx = range_start + np.argmax(areas)
-            sampled_indices.append(max_area_idx)
-            a = max_area_idx
-            
-        # Always include last point
-        sampled_indices.append(n - 1)
-        
-        return data.iloc[sampled_indices]
-        
     def _decimation_downsample(self, data: pd.DataFrame, 
                               target_points: int) -> pd.DataFrame:
         """Simple decimation downsampling - takes every nth point."""
@@ -217,40 +159,8 @@ class ChartPerformanceOptimizer:
             # Fall back to decimation for non-time series
             return self._decimation_downsample(data, target_points)
             
-        # Calculate appropriate frequency
-        time_range = data.index[-1] - data.index[0]
-        target_freq = time_range / target_points
-        
-        # Convert to pandas frequency string
-        if target_freq.total_seconds() < 60:
-            freq = f"{int(target_freq.total_seconds())}s"
-        elif target_freq.total_seconds() < 3600:
-            freq = f"{int(target_freq.total_seconds() / 60)}min"
-        elif target_freq.total_seconds() < 86400:
-            freq = f"{int(target_freq.total_seconds() / 3600)}h"
-        else:
-            freq = f"{int(target_freq.total_seconds() / 86400)}D"
-            
-        # Resample with appropriate aggregation
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
-        agg_dict = {col: ['mean', 'min', 'max'] for col in numeric_cols}
-        
-        resampled = data.resample(freq).agg(agg_dict)
-        
-        # Flatten multi-level columns
-        resampled.columns = ['_'.join(col).strip() for col in resampled.columns.values]
-        
-        # Select mean values as primary (include min/max for reference)
-        mean_cols = [col for col in resampled.columns if col.endswith('_mean')]
-        result_cols = []
-        
-        for mean_col in mean_cols:
-            base_name = mean_col.replace('_mean', '')
-            # Rename mean column to original name
-            resampled[base_name] = resampled[mean_col]
-            result_cols.append(base_name)
-            
-        return resampled[result_cols]
+        # Mean of equal-width time buckets, labelled by their first timestamp
+        return downsample_frame(data, target_points, method='mean')
         
     def optimize_for_viewport(self, data: pd.DataFrame,
                             viewport_start: Any,
@@ -265,11 +175,11 @@ class ChartPerformanceOptimizer:
         else:
             viewport_data = data.iloc[viewport_start:viewport_end]
             
-        # Calculate optimal points for viewport
-        # 2-3 data points per pixel is optimal
-        target_points = min(len(viewport_data), viewport_pixels * 2)
+        # M4 keeps first, last, min and max per pixel column, which
+        # rasterizes exactly like the full data
+        target_points = min(len(viewport_data), viewport_pixels * 4)
         
-        return self.optimize_data(viewport_data, target_points)
+        return self.optimize_data(viewport_data, target_points, algorithm='m4')
         
     def clear_cache(self):
         """Clear optimization cache."""
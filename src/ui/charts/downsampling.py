@@ -0,0 +1,263 @@
+"""
+Downsampling kernels for chart data.
+
+Every kernel takes ``x`` of shape (n,) (or None for positions) and ``y`` of
+shape (n,) or (n, k) holding k series that share ``x``, and processes all
+series in the same NumPy passes:
+
+- ``lttb_indices``: Largest Triangle Three Buckets. Keeps the visual shape
+  of a line with a fixed number of points per series.
+- ``m4_indices``: first, last, minimum and maximum point of each pixel
+  column, so a line rasterized at that width looks the same as the full
+  resolution line.
+- ``mean_buckets``: mean of each bucket, for heavy aggregation.
+
+``downsample_frame`` applies one of them to the numeric columns of a
+DataFrame and is what the chart optimizers call.
+
+Example:
+    >>> rows = lttb_indices(None, values, 2000)          # (2000,) indices
+    >>> rows = m4_indices(timestamps, values, 800)       # <= 3200 indices
+    >>> reduced = downsample_frame(df, 5000, method='lttb')
+"""
+
+import logging
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DownsampleMethod = Literal['lttb', 'm4', 'mean']
+
+
+def _as_2d(y) -> Tuple[np.ndarray, bool]:
+    """Return ``y`` as float64 (n, k) and whether it was one series."""
+    values = np.asarray(y, dtype=np.float64)
+    if values.ndim == 1:
+        return values[:, None], True
+    return values, False
+
+
+def _x_values(x, n: int) -> np.ndarray:
+    """Return x as float64 offsets from its first value (positions if None)."""
+    if x is None:
+        return np.arange(n, dtype=np.float64)
+    values = np.asarray(x)
+    if values.dtype.kind in 'mM':
+        values = values.view(np.int64)
+    values = values.astype(np.float64)
+    # Offsets keep timestamps in nanoseconds well inside float64 precision
+    return values - values[0] if n else values
+
+
+def _bucket_starts(x, n: int, n_buckets: int) -> np.ndarray:
+    """Start positions of ``n_buckets`` equal-width buckets, empty ones dropped.
+
+    Buckets are equal width in x when x is given and sorted, otherwise
+    equal counts of points.
+    """
+    if x is not None:
+        xs = _x_values(x, n)
+        if n > 1 and xs[-1] > 0 and np.all(xs[1:] >= xs[:-1]):
+            edges = np.linspace(0.0, xs[-1], n_buckets + 1)[:-1]
+            return np.unique(np.searchsorted(xs, edges, side='left'))
+    return np.unique((np.arange(n_buckets, dtype=np.int64) * n) // n_buckets)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Select ``n_out`` points per series with Largest Triangle Three Buckets.
+
+    Bucket averages and the candidate points of every bucket are gathered
+    for all series up front; the walk from bucket to bucket, which depends
+    on the point chosen in the previous bucket, then only evaluates one
+    padded bucket row per step for all series together.
+
+    Args:
+        x: X values of shape (n,), or None to use positions
+        y: Values of shape (n,) or (n, k); NaN values are never selected
+            unless a bucket has nothing else
+        n_out: Points to keep per series, including first and last
+
+    Returns:
+        Sorted row indices of shape (n_out,) for one series, or (n_out, k)
+        with one column per series
+    """
+    y2, single = _as_2d(y)
+    n, k = y2.shape
+    if n_out >= n:
+        selected = np.repeat(np.arange(n)[:, None], k, axis=1)
+        return selected[:, 0] if single else selected
+    if n_out < 3:
+        selected = np.repeat(np.linspace(0, n - 1, max(n_out, 1)).astype(np.int64)[:, None],
+                             k, axis=1)
+        return selected[:, 0] if single else selected
+
+    xs = _x_values(x, n)
+    every = (n - 2) / (n_out - 2)
+    # Bucket b covers [starts[b], starts[b + 1]); the last one runs to n
+    starts = np.minimum((np.arange(n_out - 1) * every).astype(np.int64) + 1, n - 1)
+    lengths = np.diff(np.append(starts, n))
+
+    valid = ~np.isnan(y2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_x = np.add.reduceat(xs, starts) / lengths
+        avg_y = (np.add.reduceat(np.where(valid, y2, 0.0), starts, axis=0)
+                 / np.add.reduceat(valid, starts, axis=0))
+
+    # Candidates of buckets 0 .. n_out - 3 as a padded (buckets, width)
+    # grid; padding repeats a bucket's first point
+    width = int(lengths[:-1].max())
+    offsets = np.arange(width)
+    offsets = np.where(offsets < lengths[:-1, None], offsets, 0)
+    candidates = starts[:-1, None] + offsets
+    cand_x = xs[candidates][:, :, None]
+    cand_y = y2[candidates]
+
+    # Twice the triangle area between the previous point (px, py), a
+    # candidate (cx, cy) and the next bucket's average (ax, ay) is
+    # |px * (cy - ay) + py * (ax - cx) + (cx * ay - ax * cy)|: a dot product
+    # of (px, py, 1) with terms computed here for every bucket at once
+    next_x = avg_x[1:][:, None, None]
+    next_y = avg_y[1:][:, None, :]
+    terms = np.empty((n_out - 2, k, 3, width))
+    with np.errstate(invalid='ignore'):
+        terms[:, :, 0] = (cand_y - next_y).transpose(0, 2, 1)
+        terms[:, :, 1] = np.broadcast_to(next_x - cand_x, cand_y.shape).transpose(0, 2, 1)
+        terms[:, :, 2] = (cand_x * next_y - next_x * cand_y).transpose(0, 2, 1)
+    # Missing values get zero area
+    terms[np.broadcast_to(np.isnan(cand_y).transpose(0, 2, 1)[:, :, None], terms.shape)] = 0.0
+    # (px, py) of every candidate, per bucket and series
+    points = np.stack([np.broadcast_to(cand_x, cand_y.shape), cand_y], axis=-1).transpose(0, 2, 1, 3)
+
+    columns = np.arange(k)
+    previous = np.ones((k, 1, 3))
+    previous[:, 0, 0] = xs[0]
+    previous[:, 0, 1] = y2[0]
+    best = np.empty((n_out - 2, k), dtype=np.int64)
+
+    for b in range(n_out - 2):
+        best[b] = np.abs(np.matmul(previous, terms[b])[:, 0]).argmax(axis=1)
+        previous[:, 0, :2] = points[b, columns, best[b]]
+
+    selected = np.empty((n_out, k), dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    selected[1:-1] = np.take_along_axis(candidates, best, axis=1)
+    return selected[:, 0] if single else selected
+
+
+def m4_indices(x, y, n_buckets: int) -> np.ndarray:
+    """Select first, last, minimum and maximum rows of each bucket.
+
+    With one bucket per pixel column this is the M4 aggregation: drawing
+    the selected points as a line gives the same raster as drawing all
+    points. Rows are selected for the union of all series.
+
+    Args:
+        x: X values of shape (n,), or None to use positions
+        y: Values of shape (n,) or (n, k)
+        n_buckets: Number of buckets (pixel columns)
+
+    Returns:
+        Sorted unique row indices, at most ``(2 + 2 * k) * n_buckets``
+    """
+    y2, _ = _as_2d(y)
+    n = len(y2)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    starts = _bucket_starts(x, n, n_buckets)
+    ends = np.append(starts[1:], n)
+    bucket_of = np.repeat(np.arange(len(starts)), ends - starts)
+    positions = np.arange(n)[:, None]
+
+    picks = [starts, ends - 1]
+    with np.errstate(invalid='ignore'):
+        for reduce in (np.fmin, np.fmax):
+            extreme = reduce.reduceat(y2, starts, axis=0)
+            # First position in each bucket holding its extreme; all-NaN
+            # buckets match nothing and yield the sentinel n
+            hits = np.where(y2 == extreme[bucket_of], positions, n)
+            picks.append(np.minimum.reduceat(hits, starts, axis=0).ravel())
+
+    rows = np.concatenate(picks)
+    return np.unique(rows[rows < n])
+
+
+def mean_buckets(x, y, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Average each series over ``n_buckets`` buckets, ignoring NaN.
+
+    Args:
+        x: X values of shape (n,), or None to use positions
+        y: Values of shape (n,) or (n, k)
+        n_buckets: Number of buckets
+
+    Returns:
+        Tuple of (first row index of each non-empty bucket, means of shape
+        (buckets,) or (buckets, k))
+    """
+    y2, single = _as_2d(y)
+    n = len(y2)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), (y2[:, 0] if single else y2)
+
+    starts = _bucket_starts(x, n, n_buckets)
+    valid = ~np.isnan(y2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (np.add.reduceat(np.where(valid, y2, 0.0), starts, axis=0)
+                 / np.add.reduceat(valid, starts, axis=0))
+    return starts, (means[:, 0] if single else means)
+
+
+def index_positions(index: pd.Index) -> Optional[np.ndarray]:
+    """Return a sorted numeric or datetime index as x values, else None."""
+    if not index.is_monotonic_increasing:
+        return None
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8
+    if pd.api.types.is_numeric_dtype(index.dtype):
+        return index.to_numpy()
+    return None
+
+
+def downsample_frame(data: pd.DataFrame, target_points: int,
+                     method: DownsampleMethod = 'lttb') -> pd.DataFrame:
+    """Reduce a DataFrame to about ``target_points`` rows for plotting.
+
+    ``lttb`` and ``m4`` keep original rows: the union of the rows each
+    numeric column selects, with all columns' real values. ``mean`` returns
+    bucket means of the numeric columns, labelled by each bucket's first
+    index value. LTTB buckets by position as before; M4 and mean buckets
+    are equal-width in the index when it is a sorted time or numeric index.
+
+    Args:
+        data: Frame to reduce
+        target_points: Approximate number of rows to return (points per
+            series for LTTB, four per bucket for M4)
+        method: 'lttb', 'm4' or 'mean'
+
+    Returns:
+        Reduced frame, or ``data`` itself if it is already small enough
+    """
+    n = len(data)
+    if n <= target_points:
+        return data
+
+    numeric = data.select_dtypes(include=[np.number])
+    if numeric.shape[1] == 0:
+        rows = np.linspace(0, n - 1, max(target_points, 1)).astype(np.int64)
+        return data.iloc[np.unique(rows)]
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    if method == 'lttb':
+        rows = np.unique(lttb_indices(None, values, target_points))
+        return data.iloc[rows]
+    if method == 'm4':
+        rows = m4_indices(index_positions(data.index), values, max(1, target_points // 4))
+        return data.iloc[rows]
+    if method == 'mean':
+        starts, means = mean_buckets(index_positions(data.index), values, target_points)
+        return pd.DataFrame(means, index=data.index[starts], columns=numeric.columns)
+    raise ValueError(f"Unknown downsampling method: {method}")
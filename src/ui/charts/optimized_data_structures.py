@@ -18,6 +18,8 @@ import tempfile
 import os
 import logging
 
+from .range_index import TimeRangeIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -138,76 +140,25 @@ class TypedTimeSeriesArray:
         return pd.DataFrame({'value': self.values}, index=dates)
 
 
-class SpatialTimeSeriesIndex:
+class SpatialTimeSeriesIndex(TimeRangeIndex):
     """
-    Spatial index for fast time-based queries.
+    Index for fast time-based queries over the timestamps of a series.
     
-    Uses a simple grid-based approach optimized for time series data.
+    ``build(timestamps)`` indexes points; ``query_range`` and
+    ``query_nearest`` return positions into the timestamp array using
+    binary search, so the cost no longer depends on bucket sizes.
     """
     
-    def __init__(self, bucket_size: int = 3600):  # 1 hour buckets by default
-        self.bucket_size = bucket_size
-        self.buckets: Dict[int, List[int]] = {}
-        self.data_bounds: Optional[Tuple[int, int]] = None
-        
-    def build(self, timestamps: np.ndarray):
-        """Build index from timestamps."""
-        if len(timestamps) == 0:
-            return
-            
-        self.data_bounds = (int(timestamps[0]), int(timestamps[-1]))
-        
-        # Clear existing buckets
-        self.buckets.clear()
-        
-        # Build buckets
-        for i, ts in enumerate(timestamps):
-            bucket_id = int(ts) // self.bucket_size
-            if bucket_id not in self.buckets:
-                self.buckets[bucket_id] = []
-            self.buckets[bucket_id].append(i)
-            
-        logger.debug(f"Built spatial index with {len(self.buckets)} buckets")
-        
-    def query_range(self, start_time: int, end_time: int) -> np.ndarray:
-        """Query indices within time range."""
-        if not self.buckets:
-            return np.array([], dtype=int)
-            
-        # Find relevant buckets
-        start_bucket = start_time // self.bucket_size
-        end_bucket = end_time // self.bucket_size
-        
-        indices = []
-        for bucket_id in range(start_bucket, end_bucket + 1):
-            if bucket_id in self.buckets:
-                indices.extend(self.buckets[bucket_id])
-                
-        return np.array(sorted(set(indices)), dtype=int)
-        
-    def query_nearest(self, timestamp: int, n: int = 1) -> np.ndarray:
-        """Find n nearest points to timestamp."""
-        bucket_id = timestamp // self.bucket_size
+    def __init__(self, bucket_size: Optional[int] = None):
+        # bucket_size is accepted for compatibility with the former
+        # grid-based index and has no effect
+        super().__init__()
         
-        # Search in expanding buckets
-        indices = []
-        distance = 0
-        
-        while len(indices) < n and distance < 100:  # Limit search
-            # Check buckets at current distance
-            for bid in [bucket_id - distance, bucket_id + distance]:
-                if bid in self.buckets:
-                    indices.extend(self.buckets[bid])
-                    
-            distance += 1
-            
-        # Sort by actual distance and return n closest
-        if indices:
-            indices = np.array(indices)
-            # This would need access to actual timestamps for true nearest
-            return indices[:n]
-        
-        return np.array([], dtype=int)
+    @property
+    def data_bounds(self) -> Optional[Tuple[int, int]]:
+        """First and last timestamp, or None when empty."""
+        bounds = self.bounds
+        return None if bounds is None else (int(bounds[0]), int(bounds[1]))
 
 
 class MemoryMappedTimeSeries:
@@ -390,6 +341,7 @@ class ChunkedDataStore:
         self.chunk_size = chunk_size
         self.chunks: List[TypedTimeSeriesArray] = []
         self.chunk_bounds: List[Tuple[int, int]] = []
+        self.chunk_index = TimeRangeIndex()
         
     def add_data(self, timestamps: np.ndarray, values: np.ndarray):
         """Add data to store, creating chunks as needed."""
@@ -408,18 +360,17 @@ class ChunkedDataStore:
                 int(timestamps[i]),
                 int(timestamps[chunk_end - 1])
             ))
+            self.chunk_index.insert(len(self.chunks) - 1, *self.chunk_bounds[-1])
             
     def query_range(self, start_time: int, end_time: int) -> TypedTimeSeriesArray:
         """Query data within time range."""
         relevant_chunks = []
         
-        # Find relevant chunks
-        for i, (chunk_start, chunk_end) in enumerate(self.chunk_bounds):
-            if chunk_end >= start_time and chunk_start <= end_time:
-                # Chunk overlaps with query range
-                chunk_data = self.chunks[i].slice_time_range(start_time, end_time)
-                if len(chunk_data) > 0:
-                    relevant_chunks.append(chunk_data)
+        # Find chunks overlapping the query range
+        for i in self.chunk_index.query_range(start_time, end_time):
+            chunk_data = self.chunks[i].slice_time_range(start_time, end_time)
+            if len(chunk_data) > 0:
+                relevant_chunks.append(chunk_data)
                     
         # Combine chunks
         if not relevant_chunks:
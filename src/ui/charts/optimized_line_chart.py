@@ -26,7 +26,8 @@ from .visualization_performance_optimizer import (
     RealTimePerformanceMonitor
 )
 from .chart_performance_optimizer import ChartPerformanceOptimizer
-from .optimized_data_structures import TypedTimeSeriesArray, SpatialTimeSeriesIndex
+from .optimized_data_structures import TypedTimeSeriesArray
+from .range_index import TimeRangeIndex
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +68,7 @@ class OptimizedLineChart(EnhancedLineChart):
         
         # Optimized data storage
         self.optimized_series: Dict[str, TypedTimeSeriesArray] = {}
-        self.spatial_indices: Dict[str, SpatialTimeSeriesIndex] = {}
+        self.spatial_indices: Dict[str, TimeRangeIndex] = {}
         self.virtual_sources = {}
         
         # Performance state
@@ -109,7 +110,7 @@ class OptimizedLineChart(EnhancedLineChart):
             self.optimized_series[name] = typed_array
             
             # Build spatial index
-            index = SpatialTimeSeriesIndex()
+            index = TimeRangeIndex()
             index.build(typed_array.timestamps)
             self.spatial_indices[name] = index
             
@@ -0,0 +1,230 @@
+"""
+Range indexes for viewport queries.
+
+Panning and zooming ask the same question many times per second: which
+chunks or points fall inside the visible range? The indexes here answer it
+in logarithmic time instead of scanning every item.
+
+- ``TimeRangeIndex``: 1-D intervals (or points) sorted by start, queried
+  with binary search. Used for time-only lookups such as the visible
+  points of a series.
+- ``BoundsIndex``: a packed R-tree over (x_min, y_min, x_max, y_max)
+  boxes, built in bulk with Sort-Tile-Recursive packing. Used for chunk
+  lookups that also filter on the value axis.
+
+Both accept items one by one through ``insert`` and build lazily on the
+first query, so they drop in where a list of bounds was scanned before.
+
+Example:
+    >>> index = TimeRangeIndex()
+    >>> index.build(timestamps)                  # sorted or not
+    >>> visible = index.query_range(t0, t1)      # positions into timestamps
+    >>> boxes = BoundsIndex()
+    >>> boxes.insert(chunk_id, (x0, y0, x1, y1))
+    >>> boxes.query(vx0, vy0, vx1, vy1)          # ids of intersecting chunks
+"""
+
+import logging
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Bounds = Tuple[float, float, float, float]
+
+
+class TimeRangeIndex:
+    """Interval index over [start, end] ranges using binary search.
+
+    Items are kept sorted by start together with the running maximum of
+    their ends. A query for [t0, t1] bisects the starts for the last item
+    starting at or before t1 and the running maximum for the first item
+    that could reach t0; only items in between are checked. For
+    non-overlapping ranges such as sequential chunks or points every one
+    of them matches, so a query costs two binary searches.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[int, float, float]] = []
+        self._ids = np.empty(0, dtype=np.int64)
+        self._starts = np.empty(0)
+        self._ends = np.empty(0)
+        self._reach = np.empty(0)
+        self._identity = True
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending)
+
+    def build(self, starts: Sequence[float], ends: Optional[Sequence[float]] = None,
+              ids: Optional[Sequence[int]] = None) -> None:
+        """Replace the index contents in bulk.
+
+        Args:
+            starts: Range starts; with ``ends`` omitted, points (for example
+                the timestamps of a series)
+            ends: Range ends, same length as ``starts``
+            ids: Item ids; positions 0..n-1 when omitted
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = starts if ends is None else np.asarray(ends, dtype=np.float64)
+        ids = np.arange(len(starts)) if ids is None else np.asarray(ids, dtype=np.int64)
+        if not (len(starts) == len(ends) == len(ids)):
+            raise ValueError("starts, ends and ids must have the same length")
+
+        self._pending.clear()
+        if len(starts) > 1 and np.any(starts[1:] < starts[:-1]):
+            order = np.argsort(starts, kind='stable')
+            starts, ends, ids = starts[order], ends[order], ids[order]
+        self._starts = starts
+        self._ends = ends
+        self._ids = ids
+        self._reach = np.maximum.accumulate(ends) if len(ends) else ends
+        self._identity = bool(np.array_equal(ids, np.arange(len(ids))))
+        logger.debug(f"Built time range index over {len(ids)} items")
+
+    def insert(self, item_id: int, start: float, end: Optional[float] = None) -> None:
+        """Add one item; the index is rebuilt on the next query."""
+        self._pending.append((item_id, start, start if end is None else end))
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        ids, starts, ends = zip(*self._pending)
+        self.build(np.concatenate([self._starts, starts]),
+                   np.concatenate([self._ends, ends]),
+                   np.concatenate([self._ids, np.asarray(ids, dtype=np.int64)]))
+
+    def query_range(self, start: float, end: float) -> np.ndarray:
+        """Return ids of items intersecting [start, end], in ascending order."""
+        self._flush()
+        hi = int(np.searchsorted(self._starts, end, side='right'))
+        lo = int(np.searchsorted(self._reach[:hi], start, side='left'))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+        if self._identity and self._ends[lo:hi].min() >= start:
+            return np.arange(lo, hi)
+        hits = self._ids[lo:hi][self._ends[lo:hi] >= start]
+        return np.sort(hits)
+
+    def query_nearest(self, timestamp: float, n: int = 1) -> np.ndarray:
+        """Return ids of the ``n`` item starts closest to ``timestamp``, nearest first."""
+        self._flush()
+        position = int(np.searchsorted(self._starts, timestamp))
+        lo = max(0, position - n)
+        hi = min(len(self._starts), position + n)
+        distance = np.abs(self._starts[lo:hi] - timestamp)
+        nearest = np.argsort(distance, kind='stable')[:n]
+        return self._ids[lo:hi][nearest]
+
+    @property
+    def bounds(self) -> Optional[Tuple[float, float]]:
+        """Smallest start and largest end, or None when empty."""
+        self._flush()
+        if not len(self._starts):
+            return None
+        return float(self._starts[0]), float(self._reach[-1])
+
+
+class BoundsIndex:
+    """Packed R-tree over 2-D bounding boxes.
+
+    Leaves are boxes grouped ``node_size`` at a time after
+    Sort-Tile-Recursive ordering (vertical slabs by x center, each sorted
+    by y center), and every level above stores the bounds of its children,
+    so a query descends only into nodes whose box intersects the viewport.
+    NaN bounds are treated as unbounded, so such items always match on
+    that axis, as a plain intersection test on them would.
+    """
+
+    def __init__(self, node_size: int = 16):
+        """
+        Args:
+            node_size: Children per tree node
+        """
+        self.node_size = max(2, node_size)
+        self._items: List[Tuple[int, Bounds]] = []
+        self._levels: Optional[List[np.ndarray]] = None
+        self._leaf_ids = np.empty(0, dtype=np.int64)
+        self._leaf_rank = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def insert(self, item_id: int, bounds: Bounds) -> None:
+        """Insert item with (x_min, y_min, x_max, y_max) bounds."""
+        self._items.append((item_id, tuple(float(b) for b in bounds)))
+        self._levels = None
+
+    def build(self) -> None:
+        """Pack the tree; called automatically by the first query."""
+        if not self._items:
+            self._levels = []
+            self._leaf_ids = np.empty(0, dtype=np.int64)
+            self._leaf_rank = np.empty(0, dtype=np.int64)
+            return
+
+        ids = np.array([item_id for item_id, _ in self._items], dtype=np.int64)
+        boxes = np.array([bounds for _, bounds in self._items], dtype=np.float64)
+        lower = np.where(np.isnan(boxes[:, :2]), -np.inf, boxes[:, :2])
+        upper = np.where(np.isnan(boxes[:, 2:]), np.inf, boxes[:, 2:])
+        boxes = np.hstack([lower, upper])
+
+        order = self._str_order(boxes)
+        self._leaf_ids = ids[order]
+        self._leaf_rank = order
+        level = boxes[order]
+        self._levels = [level]
+        while len(level) > self.node_size:
+            starts = np.arange(0, len(level), self.node_size)
+            level = np.column_stack([
+                np.minimum.reduceat(level[:, 0], starts),
+                np.minimum.reduceat(level[:, 1], starts),
+                np.maximum.reduceat(level[:, 2], starts),
+                np.maximum.reduceat(level[:, 3], starts),
+            ])
+            self._levels.append(level)
+
+    def _str_order(self, boxes: np.ndarray) -> np.ndarray:
+        """Sort-Tile-Recursive order of the boxes."""
+        count = len(boxes)
+        with np.errstate(invalid='ignore'):
+            centers_x = (boxes[:, 0] + boxes[:, 2]) / 2
+            centers_y = (boxes[:, 1] + boxes[:, 3]) / 2
+        # Unbounded centers sort last instead of becoming NaN
+        centers_x = np.nan_to_num(centers_x, nan=np.inf)
+        centers_y = np.nan_to_num(centers_y, nan=np.inf)
+
+        slabs = max(1, math.ceil(math.sqrt(count / self.node_size)))
+        slab_size = math.ceil(count / slabs)
+        by_x = np.argsort(centers_x, kind='stable')
+        slab_of = np.empty(count, dtype=np.int64)
+        slab_of[by_x] = np.arange(count) // slab_size
+        return np.lexsort((centers_y, slab_of))
+
+    def query(self, x_min: float, y_min: float,
+              x_max: float, y_max: float) -> List[int]:
+        """Return ids of items intersecting the box, in insertion order."""
+        if self._levels is None:
+            self.build()
+        if not self._levels:
+            return []
+
+        # Start with every node of the top level and descend level by level
+        candidates = np.arange(len(self._levels[-1]))
+        for depth in range(len(self._levels) - 1, -1, -1):
+            boxes = self._levels[depth][candidates]
+            hit = ~((x_max < boxes[:, 0]) | (x_min > boxes[:, 2]) |
+                    (y_max < boxes[:, 1]) | (y_min > boxes[:, 3]))
+            candidates = candidates[hit]
+            if depth == 0 or not len(candidates):
+                break
+            child_count = len(self._levels[depth - 1])
+            first = candidates * self.node_size
+            sizes = np.minimum(first + self.node_size, child_count) - first
+            candidates = (np.repeat(first - np.cumsum(sizes) + sizes, sizes)
+                          + np.arange(sizes.sum()))
+
+        candidates = candidates[np.argsort(self._leaf_rank[candidates])]
+        return self._leaf_ids[candidates].tolist()
@@ -22,6 +22,9 @@ import logging
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QRect, QSize, QPointF
 from PyQt6.QtWidgets import QWidget
 
+from .downsampling import downsample_frame
+from .range_index import BoundsIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,6 +128,7 @@ class ChartVirtualizationEngine:
         
         for chunk in chunks:
             index.insert(chunk.id, chunk.bounds)
+        index.build()
             
         return index
     
@@ -212,8 +216,13 @@ class ChartVirtualizationEngine:
         if len(data) <= viewport.max_renderable_points:
             return data
             
-        # Apply adaptive downsampling
-        return self._adaptive_downsample(data, viewport.max_renderable_points)
+        # First, last, min and max per pixel column (M4) draws the same
+        # line as the full data. Each bucket keeps up to 2 + 2 * series
+        # rows, so fewer buckets are used when that exceeds the budget.
+        series = max(1, data.select_dtypes(include=[np.number]).shape[1])
+        buckets = max(1, min(viewport.width_pixels,
+                             viewport.max_renderable_points // (2 + 2 * series)))
+        return downsample_frame(data, buckets * 4, method='m4')
     
     def _adaptive_downsample(self, 
                             data: pd.DataFrame,
@@ -226,61 +235,8 @@ class ChartVirtualizationEngine:
         return self._lttb_downsample(data, target_points)
     
     def _lttb_downsample(self, data: pd.DataFrame, target_points: int) -> pd.DataFrame:
-        """LTTB downsampling algorithm implementation."""
-        if len(data) <= target_points:
-            return data
-            
-        # Convert to numpy for performance
-        x = np.arange(len(data))
-        y = data.iloc[:, 0].values
-        
-        # Bucket size
-        every = (len(data) - 2) / (target_points - 2)
-        
-        # Always include first and last
-        sampled_indices = [0]
-        
-        # Bucket processing
-        a = 0  # Previous selected point
-        
-        for i in range(target_points - 2):
-            # Calculate bucket range
-            avg_range_start = int((i + 1) * every) + 1
-            avg_range_end = int((i + 2) * every) + 1
-            
-            if avg_range_end >= len(data):
-                avg_range_end = len(data)
-                
-            # Calculate average point in next bucket
-            avg_x = np.mean(x[avg_range_start:avg_range_end])
-            avg_y = np.mean(y[avg_range_start:avg_range_end])
-            
-            # Find point in current bucket with largest triangle area
-            range_start = int(i * every) + 1
-            range_end = int((i + 1) * every) + 1
-            
-            if range_end >= len(data):
-                range_end = len(data)
-                
-            max_area = -1
-            max_area_idx = range_start
-            
-            for j in range(range_start, range_end):
-                # Calculate triangle area
-                area = abs((x[a] - avg_x) * (y[j] - y[a]) - 
-                          (x[a] - x[j]) * (avg_y - y[a])) * 0.5
-                
-                if area > max_area:
-                    max_area = area
-                    max_area_idx = j
-                    
-            sampled_indices.append(max_area_idx)
-            a = max_area_idx
-            
-        # Always include last point
-        sampled_indices.append(len(data) - 1)
-        
-        return data.iloc[sampled_indices]
+        """LTTB downsampling of all numeric columns."""
+        return downsample_frame(data, target_points, method='lttb')
     
     def _prefetch_adjacent_chunks(self,
                                  source: 'VirtualDataSource',
@@ -337,28 +293,8 @@ class VirtualDataSource:
         return None
 
 
-class SpatialIndex:
-    """Simple spatial index for viewport queries."""
-    
-    def __init__(self):
-        self.items = {}
-        
-    def insert(self, item_id: int, bounds: Tuple[float, float, float, float]):
-        """Insert item with bounds into index."""
-        self.items[item_id] = bounds
-        
-    def query(self, x_min: float, y_min: float, 
-              x_max: float, y_max: float) -> List[int]:
-        """Query items intersecting with given bounds."""
-        results = []
-        
-        for item_id, (bx_min, by_min, bx_max, by_max) in self.items.items():
-            # Check intersection
-            if not (x_max < bx_min or x_min > bx_max or 
-                    y_max < by_min or y_min > by_max):
-                results.append(item_id)
-                
-        return results
+class SpatialIndex(BoundsIndex):
+    """Spatial index for viewport queries over chunk bounds (packed R-tree)."""
 
 
 class LevelOfDetailManager:
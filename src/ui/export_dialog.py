@@ -74,7 +74,8 @@ class ExportWorker(QThread):
             if not self._is_cancelled:
                 # Determine filename
                 filename = self._generate_filename()
-                self.export_completed.emit(filename, result)
+                # Streamed exports are already on disk and return their path
+                self.export_completed.emit(filename, result if isinstance(result, bytes) else b'')
                 
         except Exception as e:
             if not self._is_cancelled:
@@ -645,14 +646,11 @@ class ExportDialog(QDialog):
         progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
         
         try:
-            # Create backup
-            backup_data = self.export_system.create_backup(
-                include_settings=self.backup_settings_check.isChecked()
+            # Create backup; the archive is streamed straight to the file
+            self.export_system.create_backup(
+                include_settings=self.backup_settings_check.isChecked(),
+                output_path=Path(file_path)
             )
-            
-            # Save to file
-            with open(file_path, 'wb') as f:
-                f.write(backup_data)
                 
             progress_dialog.setValue(100)
             
@@ -673,9 +671,10 @@ class ExportDialog(QDialog):
                            output_path: Path, progress_dialog: QProgressDialog):
         """Handle successful export completion."""
         try:
-            # Save data to file
-            with open(output_path, 'wb') as f:
-                f.write(data)
+            # Save data to file unless the export streamed it there
+            if data:
+                with open(output_path, 'wb') as f:
+                    f.write(data)
                 
             progress_dialog.close()
             
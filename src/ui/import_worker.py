@@ -7,6 +7,7 @@ during long-running import operations.
 
 import os
 import shutil
+import sqlite3
 import time
 import uuid
 from datetime import datetime
@@ -22,9 +23,8 @@ try:
     from ..database import db_manager
     from ..config import DATA_DIR, DEFAULT_MEMORY_LIMIT_MB
     from ..xml_streaming_processor import XMLStreamingProcessor
-    from ..analytics.summary_calculator import SummaryCalculator
+    from ..analytics.import_summary_accumulator import ImportSummaryAccumulator
     from ..analytics.cache_manager import AnalyticsCacheManager
-    from ..data_access import DataAccess
 except (ImportError, ValueError) as e:
     # Fallback for when running in a thread context
     # ValueError catches "attempted relative import with no known parent package"
@@ -41,9 +41,8 @@ except (ImportError, ValueError) as e:
     from src.database import db_manager
     from src.config import DATA_DIR, DEFAULT_MEMORY_LIMIT_MB
     from src.xml_streaming_processor import XMLStreamingProcessor
-    from src.analytics.summary_calculator import SummaryCalculator
+    from src.analytics.import_summary_accumulator import ImportSummaryAccumulator
     from src.analytics.cache_manager import AnalyticsCacheManager
-    from src.data_access import DataAccess
 
 logger = get_logger(__name__)
 
@@ -75,7 +74,9 @@ class ImportWorker(QThread):
         self.record_count = 0
         self.db_path = None
         self.import_id = None
+        self.summary_accumulator = None  # Fed by the importer when summaries are cached
         self._backup_db_path = None  # For rollback support
+        self._resumable = False  # Streaming imports keep their checkpoints instead
         
         # Auto-detect import type if needed
         if import_type == "auto":
@@ -112,16 +113,17 @@ class ImportWorker(QThread):
         try:
             start_time = time.time()
             
-            # Create database backup for rollback
-            self._create_database_backup()
+            # Streaming XML imports commit in checkpoints and resume after a
+            # cancel or failure; every other import is rolled back from a backup
+            self._resumable = self._is_resumable_import()
+            if self._resumable:
+                self.db_path = os.path.join(DATA_DIR, 'health_monitor.db')
+            else:
+                self._create_database_backup()
             
-            # Invalidate existing cache before import
-            try:
-                from ..analytics.cache_manager import invalidate_all_cache
-                invalidate_all_cache()
-                logger.info("Invalidated cache before import")
-            except Exception as e:
-                logger.warning(f"Could not invalidate cache before import: {e}")
+            # Remember where existing records end so cached results can be
+            # invalidated only for the metrics and days this import adds
+            self._record_watermark = self._get_record_watermark()
             
             if self.import_type == 'xml':
                 result = self._import_xml()
@@ -146,7 +148,7 @@ class ImportWorker(QThread):
                 if self.is_cancelled():
                     self.import_error.emit(
                         "Import Cancelled",
-                        "Import was cancelled. All changes have been rolled back."
+                        f"Import was cancelled. {self._rollback_summary()}"
                     )
             
         except Exception as e:
@@ -155,7 +157,7 @@ class ImportWorker(QThread):
             self._rollback_database()
             self.import_error.emit(
                 "Import Error",
-                f"An unexpected error occurred during import:\n{str(e)}\n\nAll changes have been rolled back."
+                f"An unexpected error occurred during import:\n{str(e)}\n\n{self._rollback_summary()}"
             )
     
     def _import_xml(self) -> Dict[str, Any]:
@@ -218,7 +220,8 @@ class ImportWorker(QThread):
                 record_count = processor.process_xml_file(
                     self.file_path, 
                     db_path, 
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    summary=self._new_summary_accumulator()
                 )
                 
             else:
@@ -237,7 +240,8 @@ class ImportWorker(QThread):
                 
                 # Use standard conversion with validation
                 record_count, validation_summary = convert_xml_to_sqlite_with_validation(
-                    self.file_path, db_path, validate_first=True
+                    self.file_path, db_path, validate_first=True,
+                    summary=self._new_summary_accumulator()
                 )
                 
                 # Update with final count
@@ -250,6 +254,7 @@ class ImportWorker(QThread):
             
             # Initialize database manager
             db_manager.initialize_database()
+            self._record_data_changes(db_path)
             
             # Store values for summary calculation
             self.record_count = record_count
@@ -307,7 +312,8 @@ class ImportWorker(QThread):
                 return True  # Continue processing
             
             # Use migrate_csv_to_sqlite to import CSV data into the database
-            record_count = migrate_csv_to_sqlite(self.file_path, db_path, csv_progress_callback)
+            record_count = migrate_csv_to_sqlite(self.file_path, db_path, csv_progress_callback,
+                                                 summary=self._new_summary_accumulator())
             
             if self.is_cancelled():
                 return {'success': False, 'message': 'Import cancelled'}
@@ -316,6 +322,7 @@ class ImportWorker(QThread):
             
             # Initialize database manager
             db_manager.initialize_database()
+            self._record_data_changes(db_path)
             
             # Store values for summary calculation
             self.record_count = record_count
@@ -345,33 +352,28 @@ class ImportWorker(QThread):
             logger.error(f"CSV import failed: {e}")
             raise
     
+    def _new_summary_accumulator(self) -> Optional[ImportSummaryAccumulator]:
+        """Create the accumulator the importer feeds, if summaries are wanted."""
+        self.summary_accumulator = (
+            ImportSummaryAccumulator(months_back=12) if self.include_summaries else None
+        )
+        return self.summary_accumulator
+    
     def _calculate_and_cache_summaries(self) -> None:
-        """Calculate and cache metric summaries after import."""
+        """Cache the metric summaries accumulated during the import.
+        
+        The importer filled the accumulator as it inserted records, so no
+        query over health_records is needed here.
+        """
         self.progress_updated.emit(91, "Calculating metric summaries...", self.record_count)
         
         try:
-            # Create calculator with database access
-            data_access = DataAccess()
-            calculator = SummaryCalculator(data_access)
-            
-            # Define progress callback
-            def progress_callback(percentage: float, message: str):
-                # Map calculator progress (0-100) to import progress (91-98)
-                import_progress = 91 + int(percentage * 7 / 100)
-                self.progress_updated.emit(import_progress, message, self.record_count)
-            
-            # Calculate all summaries
-            summaries = calculator.calculate_all_summaries(
-                progress_callback=progress_callback,
-                months_back=12  # Default to 12 months of history
-            )
+            if self.summary_accumulator is None:
+                raise RuntimeError("Import did not accumulate summaries")
+            summaries = self.summary_accumulator.summaries()
             
-            # Also calculate source-aware summaries
             self.progress_updated.emit(92, "Calculating source-specific summaries...", self.record_count)
-            source_summaries = calculator.calculate_summaries_by_source(
-                progress_callback=progress_callback,
-                months_back=12
-            )
+            source_summaries = self.summary_accumulator.summaries_by_source()
             
             # Cache the summaries
             self.progress_updated.emit(98, "Caching summaries...", self.record_count)
@@ -594,6 +596,63 @@ class ImportWorker(QThread):
             logger.error(f"Error populating source-specific cached_metrics: {e}")
             # Don't raise - this is not critical
     
+    def _get_record_watermark(self) -> int:
+        """Return the highest health_records rowid before the import."""
+        db_path = os.path.join(DATA_DIR, 'health_monitor.db')
+        if not Path(db_path).exists():
+            return 0
+        try:
+            with sqlite3.connect(db_path) as conn:
+                row = conn.execute("SELECT MAX(rowid) FROM health_records").fetchone()
+                return row[0] or 0
+        except sqlite3.Error:
+            # No health_records table yet
+            return 0
+    
+    def _record_data_changes(self, db_path: str) -> None:
+        """Bump data versions for the metrics and days the import changed.
+        
+        XML imports only append rows (duplicates are ignored), so rows past
+        the pre-import watermark give each metric's changed day range. CSV
+        imports replace the table, so every metric is treated as changed.
+        """
+        from ..analytics.cache_manager import get_cache_manager, invalidate_all_cache
+        
+        try:
+            cache_manager = get_cache_manager()
+            if self.import_type == 'csv':
+                cache_manager.record_data_change(None)
+                return
+            
+            with sqlite3.connect(db_path) as conn:
+                changed = conn.execute("""
+                    SELECT type, MIN(substr(startDate, 1, 10)), MAX(substr(startDate, 1, 10))
+                    FROM health_records
+                    WHERE rowid > ?
+                    GROUP BY type
+                """, (getattr(self, '_record_watermark', 0),)).fetchall()
+            
+            for metric, first_day, last_day in changed:
+                cache_manager.record_data_change(metric, first_day, last_day)
+            logger.info(f"Recorded data changes for {len(changed)} metrics")
+        except Exception as e:
+            logger.warning(f"Could not record data changes, invalidating all cache: {e}")
+            invalidate_all_cache()
+    
+    def _is_resumable_import(self) -> bool:
+        """Whether the import commits checkpoints rather than one transaction."""
+        if self.import_type != 'xml' or not Path(self.file_path).exists():
+            return False
+        processor = XMLStreamingProcessor(memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB)
+        return processor.should_use_streaming(self.file_path)
+    
+    def _rollback_summary(self) -> str:
+        """Describe what happened to the data of a cancelled or failed import."""
+        if self._resumable:
+            return ("Records imported so far were kept. "
+                    "Importing the same file again resumes where it stopped.")
+        return "All changes have been rolled back."
+    
     def _create_database_backup(self):
         """Create a backup of the current database for rollback."""
         try:
@@ -619,6 +678,12 @@ class ImportWorker(QThread):
     
     def _rollback_database(self):
         """Rollback database to the backup state."""
+        if self._resumable:
+            # Committed checkpoints are valid records; keep them for resuming
+            # and invalidate the cached results they affect
+            if self.db_path and Path(self.db_path).exists():
+                self._record_data_changes(self.db_path)
+            return
         try:
             if self._backup_db_path and Path(self._backup_db_path).exists():
                 import shutil
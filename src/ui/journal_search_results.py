@@ -281,11 +281,14 @@ class SearchResultsWidget(QListWidget):
         resultClicked(int): Emitted when a result is clicked (entry_id)
         loadMoreRequested(): Emitted when scrolled near bottom
         copyRequested(str): Emitted when user copies snippet
+        snippetsNeeded(list): Emitted with visible results that have no
+            snippet yet
     """
     
     resultClicked = pyqtSignal(int)
     loadMoreRequested = pyqtSignal()
     copyRequested = pyqtSignal(str)
+    snippetsNeeded = pyqtSignal(list)
     
     def __init__(self, parent: Optional[QWidget] = None):
         """Initialize the results widget."""
@@ -340,6 +343,7 @@ class SearchResultsWidget(QListWidget):
         """Set up infinite scrolling behavior."""
         scrollbar = self.verticalScrollBar()
         scrollbar.valueChanged.connect(self._check_scroll_position)
+        scrollbar.valueChanged.connect(self._request_visible_snippets)
         
     def _check_scroll_position(self, value: int):
         """Check if scrolled near bottom for infinite loading.
@@ -378,6 +382,29 @@ class SearchResultsWidget(QListWidget):
             self._show_empty_state()
         else:
             self._hide_empty_state()
+            # Items are laid out on the next event loop pass
+            QTimer.singleShot(0, self._request_visible_snippets)
+            
+    def visible_results(self) -> List[SearchResult]:
+        """Return the results whose rows intersect the viewport."""
+        viewport = self.viewport().rect()
+        first = self.indexAt(viewport.topLeft())
+        last = self.indexAt(viewport.bottomLeft())
+        start = first.row() if first.isValid() else 0
+        end = last.row() if last.isValid() else self.count() - 1
+        return [self.item(row).data(Qt.ItemDataRole.UserRole)
+                for row in range(start, min(end, self.count() - 1) + 1)]
+        
+    def _request_visible_snippets(self, *_):
+        """Ask for snippets of visible rows that do not have one yet."""
+        missing = [result for result in self.visible_results()
+                   if isinstance(result, SearchResult) and not result.snippet]
+        if missing:
+            self.snippetsNeeded.emit(missing)
+            
+    def refresh_results(self):
+        """Repaint rows after their results were updated in place."""
+        self.viewport().update()
             
     def _show_empty_state(self):
         """Show the empty state widget."""
@@ -476,6 +503,7 @@ class SearchResultsWidget(QListWidget):
             event: The resize event.
         """
         super().resizeEvent(event)
+        self._request_visible_snippets()
         if self._empty_state and self._empty_state.isVisible():
             self._empty_state.resize(self.width() - 40, 300)
             self._empty_state.move(
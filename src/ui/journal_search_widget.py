@@ -5,6 +5,7 @@ integrating the search bar, results display, and search engine components.
 
 The widget provides:
     - Unified search interface
+    - Search-as-you-type on a background search service
     - Search execution and result display
     - Progress indication during search
     - Integration with journal editor
@@ -23,12 +24,13 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QProgressBar,
     QSplitter, QMessageBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, pyqtSlot
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QIcon
 
 from .journal_search_bar import JournalSearchBar
 from .journal_search_results import SearchResultsWidget
 from ..analytics.journal_search_engine import JournalSearchEngine, SearchResult
+from ..analytics.journal_search_service import JournalSearchService
 from ..database import DatabaseManager
 from .style_manager import StyleManager
 from ..utils.logging_config import get_logger
@@ -36,75 +38,6 @@ from ..utils.logging_config import get_logger
 logger = get_logger(__name__)
 
 
-class SearchWorker(QThread):
-    """Background worker for executing searches."""
-    
-    resultsReady = pyqtSignal(list)  # List of SearchResult
-    errorOccurred = pyqtSignal(str)
-    progressUpdate = pyqtSignal(int, str)  # percent, message
-    
-    def __init__(self, search_engine: JournalSearchEngine):
-        """Initialize the search worker.
-        
-        Args:
-            search_engine: The search engine instance to use.
-        """
-        super().__init__()
-        self.search_engine = search_engine
-        self.query = ""
-        self.filters = None
-        self.limit = 50
-        self._is_cancelled = False
-        
-    def set_search_params(self, query: str, filters: Optional[Dict[str, Any]] = None,
-                         limit: int = 50):
-        """Set search parameters for the next search.
-        
-        Args:
-            query: Search query string.
-            filters: Optional search filters.
-            limit: Maximum results to return.
-        """
-        self.query = query
-        self.filters = filters
-        self.limit = limit
-        self._is_cancelled = False
-        
-    def cancel(self):
-        """Cancel the current search operation."""
-        self._is_cancelled = True
-        
-    def run(self):
-        """Execute the search in background thread."""
-        try:
-            self.progressUpdate.emit(20, "Parsing query...")
-            if self._is_cancelled:
-                return
-                
-            self.progressUpdate.emit(40, "Searching entries...")
-            if self._is_cancelled:
-                return
-                
-            # Execute search
-            results = self.search_engine.search(
-                self.query,
-                self.filters,
-                self.limit
-            )
-            
-            if self._is_cancelled:
-                return
-                
-            self.progressUpdate.emit(80, "Processing results...")
-            
-            # Emit results
-            self.resultsReady.emit(results)
-            
-        except Exception as e:
-            logger.error(f"Search error: {e}", exc_info=True)
-            self.errorOccurred.emit(str(e))
-
-
 class JournalSearchWidget(QWidget):
     """Complete journal search interface widget.
     
@@ -127,10 +60,14 @@ class JournalSearchWidget(QWidget):
         self.style_manager = StyleManager()
         self.db = DatabaseManager()
         self.search_engine = JournalSearchEngine()
-        self.search_worker = SearchWorker(self.search_engine)
+        self.search_service = JournalSearchService()
         self._current_query = ""
         self._current_offset = 0
         self._has_more_results = True
+        self._last_request = None
+        self._search_generation = 0
+        self._page_size = self.search_service.first_page_size
+        self._loading_page = False
         self._setup_ui()
         self._connect_signals()
         self._load_search_suggestions()
@@ -172,17 +109,20 @@ class JournalSearchWidget(QWidget):
         """Connect internal signals."""
         # Search bar signals
         self.search_bar.searchRequested.connect(self._on_search_requested)
+        self.search_bar.search_input.textChanged.connect(self._on_query_edited)
         self.search_bar.filtersChanged.connect(self._on_filters_changed)
         self.search_bar.clearRequested.connect(self._clear_search)
         
         # Results widget signals
         self.results_widget.resultClicked.connect(self.entryRequested)
         self.results_widget.loadMoreRequested.connect(self._load_more_results)
+        self.results_widget.snippetsNeeded.connect(self.search_service.request_snippets)
         
-        # Search worker signals
-        self.search_worker.resultsReady.connect(self._on_results_ready)
-        self.search_worker.errorOccurred.connect(self._on_search_error)
-        self.search_worker.progressUpdate.connect(self._update_progress)
+        # Search service signals
+        self.search_service.pageReady.connect(self._on_page_ready)
+        self.search_service.snippetsReady.connect(self._on_snippets_ready)
+        self.search_service.searchFailed.connect(self._on_search_failed)
+        self.destroyed.connect(lambda: self.search_service.shutdown(timeout=0))
         
     def _load_search_suggestions(self):
         """Load initial search suggestions from history."""
@@ -210,21 +150,43 @@ class JournalSearchWidget(QWidget):
         Args:
             query: The search query.
         """
-        if not query.strip():
+        self._start_search(query, immediate=True)
+        
+    @pyqtSlot(str)
+    def _on_query_edited(self, text: str):
+        """Search as the user types; the service waits for typing to pause.
+        
+        Args:
+            text: Current search input text.
+        """
+        self._start_search(text, immediate=False)
+        
+    def _start_search(self, query: str, immediate: bool):
+        """Hand a query to the search service, superseding the previous one.
+        
+        Args:
+            query: The search query.
+            immediate: Whether to skip the service's typing debounce.
+        """
+        query = query.strip()
+        if not query:
             return
             
-        # Cancel any ongoing search
-        if self.search_worker.isRunning():
-            self.search_worker.cancel()
-            self.search_worker.wait()
+        # Get filters
+        filters = self.search_bar.get_filters()
+        
+        # The debounced keystroke search already covers this request
+        request = (query, filters)
+        if request == self._last_request:
+            return
+        self._last_request = request
             
         # Update state
         self._current_query = query
         self._current_offset = 0
         self._has_more_results = True
-        
-        # Get filters
-        filters = self.search_bar.get_filters()
+        self._loading_page = True
+        self._page_size = self.search_service.first_page_size
         
         # Show progress
         self.progress_bar.show()
@@ -234,8 +196,9 @@ class JournalSearchWidget(QWidget):
         self.searchStarted.emit(query)
         
         # Start search
-        self.search_worker.set_search_params(query, filters, limit=50)
-        self.search_worker.start()
+        self._search_generation = self.search_service.search(
+            query, filters, immediate=immediate
+        )
         
     @pyqtSlot(dict)
     def _on_filters_changed(self, filters: Dict[str, Any]):
@@ -248,6 +211,44 @@ class JournalSearchWidget(QWidget):
         if self._current_query:
             self._on_search_requested(self._current_query)
             
+    @pyqtSlot(int, int, list)
+    def _on_page_ready(self, generation: int, offset: int, results: List[SearchResult]):
+        """Handle a page of results from the search service.
+        
+        Args:
+            generation: Search the page belongs to.
+            offset: Position of the page in the ranked results.
+            results: Results without snippets; visible rows request them.
+        """
+        if generation != self._search_generation:
+            return
+        self._loading_page = False
+        self._current_offset = offset
+        self._on_results_ready(results)
+        
+    @pyqtSlot(int, list)
+    def _on_snippets_ready(self, generation: int, results: List[SearchResult]):
+        """Repaint rows whose snippets were generated.
+        
+        Args:
+            generation: Search the results belong to.
+            results: Results whose snippets were filled in.
+        """
+        if generation == self._search_generation:
+            self.results_widget.refresh_results()
+            
+    @pyqtSlot(int, str)
+    def _on_search_failed(self, generation: int, error_message: str):
+        """Report a failure of the current search.
+        
+        Args:
+            generation: Search that failed.
+            error_message: The error message.
+        """
+        if generation == self._search_generation:
+            self._loading_page = False
+            self._on_search_error(error_message)
+            
     @pyqtSlot(list)
     def _on_results_ready(self, results: List[SearchResult]):
         """Handle search results from worker.
@@ -271,7 +272,7 @@ class JournalSearchWidget(QWidget):
             self._update_suggestions_from_results(results)
             
         # Check if more results available
-        self._has_more_results = len(results) == 50
+        self._has_more_results = len(results) == self._page_size
         
         # Update offset for pagination
         self._current_offset += len(results)
@@ -316,6 +317,9 @@ class JournalSearchWidget(QWidget):
         self._current_query = ""
         self._current_offset = 0
         self._has_more_results = True
+        self._last_request = None
+        self._loading_page = False
+        self.search_service.cancel()
         self.results_widget.clear_results()
         self.search_bar.update_result_count(0)
         
@@ -324,25 +328,13 @@ class JournalSearchWidget(QWidget):
         if not self._has_more_results or not self._current_query:
             return
             
-        if self.search_worker.isRunning():
+        if self._loading_page:
             return
             
-        # Get filters
-        filters = self.search_bar.get_filters()
-        
-        # Adjust filters for pagination
-        if filters:
-            filters = filters.copy()
-        else:
-            filters = {}
-            
-        # Start search with offset
-        self.search_worker.set_search_params(
-            self._current_query,
-            filters,
-            limit=50
-        )
-        self.search_worker.start()
+        # Next page is sliced from the ranking the first page came from
+        self._loading_page = True
+        self._page_size = self.search_service.page_size
+        self.search_service.load_more(self._current_offset, self._page_size)
         
     def _update_suggestions_from_results(self, results: List[SearchResult]):
         """Update search suggestions based on results.
@@ -207,14 +207,10 @@ class MainWindow(QMainWindow):
         # Initialize personal records tracker
         self.personal_records_tracker = PersonalRecordsTracker(db_manager)
         
-        # Cache calculator instances to avoid recreation
-        self._calculator_cache = {
-            'daily': None,
-            'weekly': None,
-            'monthly': None,
-            'daily_base': None  # Base calculator used by weekly/monthly
-        }
-        self._last_data_hash = None
+        # Calculator sets keyed by a content fingerprint of their data
+        from ..analytics.calculator_registry import CalculatorRegistry
+        self._calculator_registry = CalculatorRegistry(self._build_calculators,
+                                                       derive=self._derive_calculators)
         
         # Initialize background trend processor
         self.background_trend_processor = None
@@ -596,6 +592,9 @@ class MainWindow(QMainWindow):
         # Connect tab change signal
         self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
+        # Dashboards refresh lazily: only the visible tab, when its data is stale
+        self._setup_tab_refresh_scheduler()
+        
         # Connect transition manager signals
         self.transition_manager.transition_started.connect(self._on_transition_started)
         self.transition_manager.transition_completed.connect(self._on_transition_completed)
@@ -1757,9 +1756,55 @@ class MainWindow(QMainWindow):
         # Save the current tab index
         self.settings_manager.set_setting("MainWindow/lastActiveTab", index)
         
-        # Unified refresh method without delays
-        self._refresh_tab_data(index)
+        # Scheduled dashboards refresh only when stale; other tabs as before
+        if index in self.SCHEDULED_DASHBOARD_TABS:
+            self._tab_refresh_scheduler.tab_shown(index)
+        else:
+            self._refresh_tab_data(index)
+    
+    # Tab index -> name of dashboards refreshed through the scheduler
+    SCHEDULED_DASHBOARD_TABS = {1: 'daily', 2: 'weekly', 3: 'monthly', 4: 'compare'}
+    
+    def _setup_tab_refresh_scheduler(self):
+        """Register the dashboard tabs with the lazy refresh scheduler.
+        
+        Building calculators for new data runs once on a worker thread and
+        is shared by every dashboard tab; the dashboard update itself then
+        uses them on the UI thread.
+        """
+        from .tab_refresh_scheduler import TabRefreshScheduler
+        self._tab_refresh_scheduler = TabRefreshScheduler(self.tab_widget.currentIndex, parent=self)
+        
+        refreshers = {
+            1: self._refresh_daily_data,
+            2: self._refresh_weekly_data,
+            3: self._refresh_monthly_data,
+            4: self._refresh_comparative_data,
+        }
+        for index, name in self.SCHEDULED_DASHBOARD_TABS.items():
+            refresh = refreshers[index]
+            self._tab_refresh_scheduler.register(
+                index,
+                refresh=lambda prepared, refresh=refresh: self._refresh_scheduled_tab(refresh, prepared),
+                prepare=self._prepare_dashboard_data,
+                name=name
+            )
+    
+    def _prepare_dashboard_data(self, data):
+        """Worker-thread step shared by the dashboard tabs."""
+        return data, self._get_or_create_calculators(data)
     
+    def _refresh_scheduled_tab(self, refresh, prepared):
+        """UI-thread step of a dashboard tab.
+        
+        ``prepared`` is the ``(data, calculators)`` pair from
+        ``_prepare_dashboard_data``, or the bare data if preparing failed.
+        """
+        if isinstance(prepared, tuple):
+            refresh(*prepared)
+        else:
+            refresh(prepared)
+
     def _refresh_tab_data(self, tab_index: int):
         """Unified tab refresh method without delays or complex logic."""
         widget = self.tab_widget.widget(tab_index)
@@ -1827,57 +1872,57 @@ class MainWindow(QMainWindow):
         return data if data is not None and not data.empty else None
     
     def _get_or_create_calculators(self, data):
-        """Get existing calculators or create new ones if data changed."""
+        """Get calculators for ``data``, reusing them when its content is unchanged."""
         if data is None:
             return None
-            
-        # Check if data has changed
-        data_hash = hash(str(data.shape) + str(data.columns.tolist()) + str(len(data)))
-        
-        if self._last_data_hash == data_hash and self._calculator_cache['daily_base'] is not None:
-            logger.debug("Using cached calculators")
-            return self._calculator_cache
+        return self._calculator_registry.get(data, timezone=get_local_timezone())
+    
+    def _build_calculators(self, data, timezone):
+        """Build the daily, weekly and monthly calculator set for ``data``."""
+        from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
         
-        logger.debug("Creating new calculators due to data change")
+        # Label prepared rows by position so later sets can be derived from them
+        daily_calculator = DailyMetricsCalculator(data.reset_index(drop=True), timezone=timezone)
+        return self._calculator_set(daily_calculator)
+    
+    def _derive_calculators(self, calculators, rows, timezone):
+        """Build a calculator set from rows ``calculators`` already prepared."""
+        from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
         
-        # Create new calculators only when data changes
+        prepared = calculators['daily_base'].data.loc[rows]
+        prepared.index = pd.RangeIndex(len(prepared))
+        prepared = prepared.sort_values('startDate', kind='stable')
+        return self._calculator_set(DailyMetricsCalculator.from_prepared(prepared, timezone))
+    
+    def _calculator_set(self, daily_calculator):
+        """Wrap a daily calculator with weekly, monthly and cached calculators."""
         from ..analytics.cached_calculators import (
             CachedDailyMetricsCalculator,
             CachedMonthlyMetricsCalculator,
             CachedWeeklyMetricsCalculator,
         )
-        from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
         from ..analytics.monthly_metrics_calculator import MonthlyMetricsCalculator
         from ..analytics.weekly_metrics_calculator import WeeklyMetricsCalculator
-
-        # Get local timezone
-        local_tz = get_local_timezone()
-        
-        # Create base daily calculator
-        daily_calculator = DailyMetricsCalculator(data, timezone=local_tz)
-        self._calculator_cache['daily_base'] = daily_calculator
         
-        # Create cached daily calculator
-        self._calculator_cache['daily'] = CachedDailyMetricsCalculator(daily_calculator)
-        
-        # Create weekly calculator with the daily calculator
+        # Weekly and monthly calculators share the daily calculator's prepared data
         weekly_calculator = WeeklyMetricsCalculator(daily_calculator)
-        self._calculator_cache['weekly'] = CachedWeeklyMetricsCalculator(weekly_calculator)
-        
-        # Create monthly calculator with the daily calculator
         monthly_calculator = MonthlyMetricsCalculator(daily_calculator)
-        self._calculator_cache['monthly'] = CachedMonthlyMetricsCalculator(monthly_calculator)
         
-        self._last_data_hash = data_hash
-        return self._calculator_cache
+        return {
+            'daily_base': daily_calculator,
+            'daily': CachedDailyMetricsCalculator(daily_calculator),
+            'weekly': CachedWeeklyMetricsCalculator(weekly_calculator),
+            'monthly': CachedMonthlyMetricsCalculator(monthly_calculator),
+        }
     
-    def _refresh_daily_with_data(self, data):
+    def _refresh_daily_with_data(self, data, calculators=None):
         """Refresh daily dashboard with cached calculators."""
         logger.debug("Refreshing daily dashboard")
         if not hasattr(self, 'daily_dashboard'):
             return
             
-        calculators = self._get_or_create_calculators(data)
+        if calculators is None:
+            calculators = self._get_or_create_calculators(data)
         if not calculators:
             return
             
@@ -1894,13 +1939,14 @@ class MainWindow(QMainWindow):
         
         logger.info(f"Daily dashboard refreshed with {len(data)} records")
     
-    def _refresh_weekly_with_data(self, data):
+    def _refresh_weekly_with_data(self, data, calculators=None):
         """Refresh weekly dashboard with cached calculators."""
         logger.debug("Refreshing weekly dashboard")
         if not hasattr(self, 'weekly_dashboard'):
             return
             
-        calculators = self._get_or_create_calculators(data)
+        if calculators is None:
+            calculators = self._get_or_create_calculators(data)
         if not calculators:
             return
             
@@ -1916,13 +1962,14 @@ class MainWindow(QMainWindow):
         
         logger.info(f"Weekly dashboard refreshed with {len(data)} records")
     
-    def _refresh_monthly_with_data(self, data):
+    def _refresh_monthly_with_data(self, data, calculators=None):
         """Refresh monthly dashboard with cached calculators."""
         logger.debug("Refreshing monthly dashboard")
         if not hasattr(self, 'monthly_dashboard'):
             return
             
-        calculators = self._get_or_create_calculators(data)
+        if calculators is None:
+            calculators = self._get_or_create_calculators(data)
         if not calculators:
             return
             
@@ -1938,13 +1985,14 @@ class MainWindow(QMainWindow):
         
         logger.info(f"Monthly dashboard refreshed with {len(data)} records")
     
-    def _refresh_comparative_with_data(self, data):
+    def _refresh_comparative_with_data(self, data, calculators=None):
         """Refresh comparative analytics with cached calculators."""
         logger.debug("Refreshing comparative analytics")
         if not hasattr(self, 'comparative_engine') or not hasattr(self, 'comparative_widget'):
             return
             
-        calculators = self._get_or_create_calculators(data)
+        if calculators is None:
+            calculators = self._get_or_create_calculators(data)
         if not calculators:
             return
             
@@ -2425,8 +2473,8 @@ class MainWindow(QMainWindow):
     def _on_data_loaded(self, data):
         """Handle data loaded signal from configuration tab.
         
-        CRITICAL FIX: Now refreshes ALL dashboard tabs, not just the current one.
-        This ensures data is propagated to all tabs when imported or when filters change.
+        Marks every dashboard tab stale; only the visible one is refreshed
+        (after a short coalescing delay), the others when they are shown.
         """
         # If data is None, fetch it from config tab
         if data is None:
@@ -2440,34 +2488,12 @@ class MainWindow(QMainWindow):
         
         # Enable other tabs when data is loaded
         if data is not None and not data.empty:
-            logger.info("Enabling all dashboard tabs and refreshing data")
+            logger.info("Enabling all dashboard tabs and scheduling refresh")
             for i in range(1, self.tab_widget.count()):
                 self.tab_widget.setTabEnabled(i, True)
             
-            # CRITICAL FIX: Refresh ALL tabs, not just current tab
-            logger.debug("Refreshing all dashboard tabs with new data")
-            try:
-                # Refresh daily dashboard
-                logger.debug("Refreshing daily dashboard")
-                self._refresh_daily_data()
-                
-                # Refresh weekly dashboard  
-                logger.debug("Refreshing weekly dashboard")
-                self._refresh_weekly_data()
-                
-                # Refresh monthly dashboard
-                logger.debug("Refreshing monthly dashboard")
-                self._refresh_monthly_data()
-                
-                # Update comparative analytics engine with new calculators
-                logger.debug("Refreshing comparative analytics")
-                self._refresh_comparative_data()
-                
-                logger.info("Successfully refreshed all dashboard tabs")
-                
-            except Exception as e:
-                logger.error(f"Error refreshing dashboard tabs: {e}", exc_info=True)
-                self.statusBar().showMessage(f"Data loaded with some errors: {str(e)}")
+            self._tab_refresh_scheduler.invalidate(self._get_current_data())
+            self._queue_background_analytics(data)
                 
         else:
             logger.warning("No data loaded or data is empty - disabling dashboard tabs")
@@ -2475,6 +2501,37 @@ class MainWindow(QMainWindow):
             for i in range(1, self.tab_widget.count()):
                 self.tab_widget.setTabEnabled(i, False)
     
+    def _queue_background_analytics(self, data):
+        """Queue trend calculation and insights for newly loaded data."""
+        # Trigger background trend calculation for all metrics
+        if self.background_trend_processor:
+            logger.info("Triggering background trend calculation for all metrics")
+            # Get unique metrics from the data
+            if hasattr(data, 'columns') and 'type' in data.columns:
+                unique_metrics = data['type'].unique().tolist()
+                for metric in unique_metrics:
+                    if hasattr(self.background_trend_processor, 'VALID_METRICS'):
+                        if metric in self.background_trend_processor.VALID_METRICS:
+                            self.background_trend_processor.queue_trend_calculation(
+                                metric, priority=5, force_refresh=True
+                            )
+                    else:
+                        # Queue without validation if VALID_METRICS not available
+                        self.background_trend_processor.queue_trend_calculation(
+                            metric, priority=5, force_refresh=True
+                        )
+            else:
+                # Queue all known metrics
+                if hasattr(self.background_trend_processor, 'queue_all_metrics'):
+                    self.background_trend_processor.queue_all_metrics(priority=5)
+        
+        # Trigger health insights generation if available
+        if hasattr(self, 'health_insights_widget'):
+            self.health_insights_widget.load_insights({
+                'data': data,
+                'timezone': get_local_timezone()
+            })
+    
     def _handle_metric_selection(self, metric_name: str):
         """Handle metric selection from daily dashboard.
         
@@ -2491,8 +2548,13 @@ class MainWindow(QMainWindow):
         """
         logger.debug(f"Date changed to: {new_date}")
     
-    def _refresh_daily_data(self):
-        """Refresh data in the daily dashboard."""
+    def _refresh_daily_data(self, data=None, calculators=None):
+        """Refresh data in the daily dashboard.
+        
+        Args:
+            data: Filtered records; read from the configuration tab if None
+            calculators: Calculator set prepared for ``data``, if any
+        """
         logger.debug("Refreshing daily dashboard data")
         if hasattr(self, 'daily_dashboard'):
             # Check if we're in portable mode (daily dashboard has data_access)
@@ -2507,124 +2569,24 @@ class MainWindow(QMainWindow):
                         logger.error(f"Failed to refresh daily dashboard: {e}")
             
             # Non-portable mode: Get current data from configuration tab
-            data = None
-            if hasattr(self, 'config_tab'):
-                if hasattr(self.config_tab, 'get_filtered_data'):
-                    data = self.config_tab.get_filtered_data()
-                elif hasattr(self.config_tab, 'filtered_data'):
-                    data = self.config_tab.filtered_data
-                    
-                if data is not None and not data.empty:
-                    # Create cached daily calculator with the data
-                    from ..analytics.cached_calculators import CachedDailyMetricsCalculator
-                    from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
-
-                    # Get local timezone
-                    local_tz = get_local_timezone()
-                    daily_calculator = DailyMetricsCalculator(data, timezone=local_tz)
-                    cached_daily_calculator = CachedDailyMetricsCalculator(daily_calculator)
-                    
-                    # Set the cached calculator in the daily dashboard
-                    self.daily_dashboard.set_daily_calculator(cached_daily_calculator)
-                    
-                    # Set up cached data access for pre-computed summaries
-                    from ..analytics.cached_metrics_access import get_cached_metrics_access
-                    cached_data_access = get_cached_metrics_access()
-                    self.daily_dashboard.set_cached_data_access(cached_data_access)
-                    
-                    # Create and set personal records tracker
-                    if not hasattr(self, 'personal_records_tracker'):
-                        self.personal_records_tracker = PersonalRecordsTracker(db_manager)
-                    self.daily_dashboard.set_personal_records(self.personal_records_tracker)
-                    
-                    logger.info(f"Set daily calculator with {len(data)} records")
-                else:
-                    logger.warning("No data available to refresh daily dashboard")
-        
-        # Trigger background trend calculation for all metrics
-        if self.background_trend_processor and hasattr(self, 'config_tab'):
-            data = None
-            if hasattr(self.config_tab, 'get_filtered_data'):
-                data = self.config_tab.get_filtered_data()
-            elif hasattr(self.config_tab, 'filtered_data'):
-                data = self.config_tab.filtered_data
-                
+            if data is None:
+                data, calculators = self._get_current_data(), None
             if data is not None:
-                logger.info("Triggering background trend calculation for all metrics")
-                # Get unique metrics from the data
-                if hasattr(data, 'columns') and 'type' in data.columns:
-                    unique_metrics = data['type'].unique().tolist()
-                    for metric in unique_metrics:
-                        if hasattr(self.background_trend_processor, 'VALID_METRICS'):
-                            if metric in self.background_trend_processor.VALID_METRICS:
-                                self.background_trend_processor.queue_trend_calculation(
-                                    metric, priority=5, force_refresh=True
-                                )
-                        else:
-                            # Queue without validation if VALID_METRICS not available
-                            self.background_trend_processor.queue_trend_calculation(
-                                metric, priority=5, force_refresh=True
-                            )
-                else:
-                    # Queue all known metrics
-                    if hasattr(self.background_trend_processor, 'queue_all_metrics'):
-                        self.background_trend_processor.queue_all_metrics(priority=5)
-        
-        # Trigger health insights generation if available
-        if hasattr(self, 'health_insights_widget') and data is not None:
-            # Prepare user data for health insights
-            user_data = {
-                'data': data,
-                'timezone': get_local_timezone() if 'get_local_timezone' in locals() else None
-            }
-            self.health_insights_widget.load_insights(user_data)
+                self._refresh_daily_with_data(data, calculators)
+            else:
+                logger.warning("No data available to refresh daily dashboard")
     
-    def _refresh_weekly_data(self):
+    def _refresh_weekly_data(self, data=None, calculators=None):
         """Refresh data in the weekly dashboard."""
         logger.debug("Refreshing weekly dashboard data")
-        if hasattr(self, 'weekly_dashboard'):
-            # Get current data from configuration tab
-            data = None
-            if hasattr(self, 'config_tab'):
-                if hasattr(self.config_tab, 'get_filtered_data'):
-                    data = self.config_tab.get_filtered_data()
-                elif hasattr(self.config_tab, 'filtered_data'):
-                    data = self.config_tab.filtered_data
-                    
-                if data is not None and not data.empty:
-                    # Create cached calculators
-                    from ..analytics.cached_calculators import (
-                        CachedDailyMetricsCalculator,
-                        CachedWeeklyMetricsCalculator,
-                    )
-                    from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
-                    from ..analytics.weekly_metrics_calculator import WeeklyMetricsCalculator
-
-                    # Get local timezone
-                    local_tz = get_local_timezone()
-                    
-                    daily_calculator = DailyMetricsCalculator(data, timezone=local_tz)
-                    cached_daily_calculator = CachedDailyMetricsCalculator(daily_calculator)
-                    
-                    # Create cached weekly calculator with the daily calculator
-                    weekly_calculator = WeeklyMetricsCalculator(daily_calculator)
-                    cached_weekly_calculator = CachedWeeklyMetricsCalculator(weekly_calculator)
-                    
-                    # Set the cached calculator in the weekly dashboard
-                    if hasattr(self.weekly_dashboard, 'set_weekly_calculator'):
-                        self.weekly_dashboard.set_weekly_calculator(cached_weekly_calculator)
-                    
-                    # Set up cached data access for pre-computed summaries
-                    from ..analytics.cached_data_access import CachedDataAccess
-                    cached_data_access = CachedDataAccess()
-                    if hasattr(self.weekly_dashboard, 'set_cached_data_access'):
-                        self.weekly_dashboard.set_cached_data_access(cached_data_access)
-                    
-                    logger.info(f"Set weekly calculator with {len(data)} records")
-                else:
-                    logger.warning("No data available to refresh weekly dashboard")
+        if data is None:
+            data, calculators = self._get_current_data(), None
+        if data is not None:
+            self._refresh_weekly_with_data(data, calculators)
+        else:
+            logger.warning("No data available to refresh weekly dashboard")
     
-    def _refresh_monthly_data(self):
+    def _refresh_monthly_data(self, data=None, calculators=None):
         """Refresh data in the monthly dashboard."""
         logger.debug("Refreshing monthly dashboard data")
         if hasattr(self, 'monthly_dashboard'):
@@ -2634,45 +2596,17 @@ class MainWindow(QMainWindow):
             QApplication.processEvents()
             
             # Get current data from configuration tab
-            data = None
-            if hasattr(self, 'config_tab'):
+            if data is None and hasattr(self, 'config_tab'):
+                calculators = None
                 if hasattr(self.config_tab, 'get_filtered_data'):
                     data = self.config_tab.get_filtered_data()
                 elif hasattr(self.config_tab, 'filtered_data'):
                     data = self.config_tab.filtered_data
-                    
-                if data is not None and not data.empty:
-                    # Create cached calculators
-                    from ..analytics.cached_calculators import (
-                        CachedDailyMetricsCalculator,
-                        CachedMonthlyMetricsCalculator,
-                    )
-                    from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
-                    from ..analytics.monthly_metrics_calculator import MonthlyMetricsCalculator
-
-                    # Get local timezone
-                    local_tz = get_local_timezone()
-                    
-                    daily_calculator = DailyMetricsCalculator(data, timezone=local_tz)
-                    cached_daily_calculator = CachedDailyMetricsCalculator(daily_calculator)
-                    
-                    # Create cached monthly calculator with the daily calculator
-                    monthly_calculator = MonthlyMetricsCalculator(daily_calculator)
-                    cached_monthly_calculator = CachedMonthlyMetricsCalculator(monthly_calculator)
-                    
-                    # Set the cached calculator in the monthly dashboard
-                    if hasattr(self.monthly_dashboard, 'set_data_source'):
-                        self.monthly_dashboard.set_data_source(cached_monthly_calculator)
-                    
-                    # Set up cached data access for pre-computed summaries
-                    from ..analytics.cached_data_access import CachedDataAccess
-                    cached_data_access = CachedDataAccess()
-                    if hasattr(self.monthly_dashboard, 'set_cached_data_access'):
-                        self.monthly_dashboard.set_cached_data_access(cached_data_access)
-                    
-                    logger.info(f"Set monthly calculator with {len(data)} records")
-                else:
-                    logger.warning("No data available to refresh monthly dashboard")
+            
+            if data is not None and not data.empty:
+                self._refresh_monthly_with_data(data, calculators)
+            else:
+                logger.warning("No data available to refresh monthly dashboard")
             
             # Trigger the showEvent manually to ensure full refresh
             if hasattr(self.monthly_dashboard, 'showEvent'):
@@ -2683,11 +2617,13 @@ class MainWindow(QMainWindow):
             self.monthly_dashboard.update()
             QApplication.processEvents()
     
-    def _refresh_comparative_data(self):
+    def _refresh_comparative_data(self, data=None, calculators=None):
         """Refresh the comparative analytics tab with new data."""
         logger.debug("Refreshing comparative analytics data")
         
-        if hasattr(self, 'comparative_engine') and hasattr(self, 'comparative_widget'):
+        if data is not None and not data.empty:
+            self._refresh_comparative_with_data(data, calculators)
+        elif hasattr(self, 'comparative_engine') and hasattr(self, 'comparative_widget'):
             # Update the comparative engine with new calculators
             if hasattr(self, 'config_tab'):
                 # Get or create calculators
@@ -2720,37 +2656,7 @@ class MainWindow(QMainWindow):
                         logger.error(f"Failed to load data for comparative analytics: {e}")
                 
                 if data is not None and not data.empty:
-                    # Create cached calculators
-                    from ..analytics.cached_calculators import (
-                        CachedDailyMetricsCalculator,
-                        CachedMonthlyMetricsCalculator,
-                        CachedWeeklyMetricsCalculator,
-                    )
-                    from ..analytics.daily_metrics_calculator import DailyMetricsCalculator
-                    from ..analytics.monthly_metrics_calculator import MonthlyMetricsCalculator
-                    from ..analytics.weekly_metrics_calculator import WeeklyMetricsCalculator
-
-                    # Get local timezone
-                    local_tz = get_local_timezone()
-                    
-                    daily_calculator = DailyMetricsCalculator(data, timezone=local_tz)
-                    cached_daily_calculator = CachedDailyMetricsCalculator(daily_calculator)
-                    
-                    weekly_calculator = WeeklyMetricsCalculator(daily_calculator)
-                    cached_weekly_calculator = CachedWeeklyMetricsCalculator(weekly_calculator)
-                    
-                    monthly_calculator = MonthlyMetricsCalculator(data)
-                    cached_monthly_calculator = CachedMonthlyMetricsCalculator(monthly_calculator)
-                    
-                    # Update comparative engine with cached calculators
-                    self.comparative_engine.daily_calculator = cached_daily_calculator
-                    self.comparative_engine.weekly_calculator = cached_weekly_calculator
-                    self.comparative_engine.monthly_calculator = cached_monthly_calculator
-                    
-                    # Re-set the engine in the widget to trigger updates
-                    self.comparative_widget.set_comparative_engine(self.comparative_engine)
-                    
-                    logger.info("Updated comparative analytics with new data")
+                    self._refresh_comparative_with_data(data)
                 else:
                     logger.info("No data available yet - comparative analytics will update when data is loaded")
     
@@ -2759,8 +2665,10 @@ class MainWindow(QMainWindow):
         logger.info(f"Filters applied: {filters}")
         self.statusBar().showMessage("Filters applied successfully")
         
-        # TODO: Pass filtered data to other tabs
-        # This will be implemented when other tabs are created
+        # Rapid successive filter changes coalesce into one refresh
+        data = self._get_current_data()
+        if data is not None:
+            self._tab_refresh_scheduler.invalidate(data)
         
     def _on_month_changed(self, year: int, month: int):
         """Handle month change signal from monthly dashboard."""
@@ -2899,6 +2807,12 @@ class MainWindow(QMainWindow):
         # Save window state before closing
         self.settings_manager.save_window_state(self)
         
+        self._tab_refresh_scheduler.shutdown()
+        
+        # Stop the export system's chart render processes
+        if hasattr(self, 'export_system'):
+            self.export_system.shutdown()
+        
         # Shutdown background trend processor
         if self.background_trend_processor:
             logger.info("Shutting down background trend processor")
@@ -3041,12 +2955,14 @@ class MainWindow(QMainWindow):
         progress.show()
         
         try:
-            # Generate export
+            # Generate export; data exports stream straight to the file
+            config.output_path = Path(file_path)
             result = self.export_system.generate_report(config)
             
             # Save to file
-            with open(file_path, 'wb') as f:
-                f.write(result)
+            if isinstance(result, bytes):
+                with open(file_path, 'wb') as f:
+                    f.write(result)
                 
             progress.setValue(100)
             
@@ -3075,6 +2991,7 @@ class MainWindow(QMainWindow):
             self._initialize_export_system()
             
         from datetime import datetime
+        from pathlib import Path
 
         from PyQt6.QtWidgets import QFileDialog, QProgressDialog
 
@@ -3095,12 +3012,9 @@ class MainWindow(QMainWindow):
         progress.show()
         
         try:
-            # Create backup
-            backup_data = self.export_system.create_backup(include_settings=True)
-            
-            # Save to file
-            with open(file_path, 'wb') as f:
-                f.write(backup_data)
+            # Create backup; the archive is streamed straight to the file
+            self.export_system.create_backup(include_settings=True,
+                                             output_path=Path(file_path))
                 
             progress.setValue(100)
             
@@ -3127,6 +3041,7 @@ class MainWindow(QMainWindow):
         # Import necessary modules
         from ..analytics.export_reporting_system import WSJExportReportingSystem
         from ..analytics.health_insights_engine import HealthInsightsEngine
+        from ..analytics.streaming_export import HealthRecordChunkSource
         from ..ui.charts.wsj_health_visualization_suite import WSJHealthVisualizationSuite
         from ..ui.charts.wsj_style_manager import WSJStyleManager
 
@@ -3147,7 +3062,8 @@ class MainWindow(QMainWindow):
             data_manager=self.config_tab,
             viz_suite=viz_suite,
             insights_engine=insights_engine,
-            style_manager=wsj_style_manager
+            style_manager=wsj_style_manager,
+            record_source=HealthRecordChunkSource()
         )
         
         logger.info("Export system initialized successfully")
@@ -3158,25 +3074,14 @@ class MainWindow(QMainWindow):
         
         if 'type' in data.columns:
             # Map Apple Health types to readable names
-            metric_mapping = {
-                'HKQuantityTypeIdentifierStepCount': 'step_count',
-                'HKQuantityTypeIdentifierSleepAnalysis': 'sleep_analysis',
-                'HKQuantityTypeIdentifierRestingHeartRate': 'resting_heart_rate',
-                'HKQuantityTypeIdentifierActiveEnergyBurned': 'active_energy',
-                'HKQuantityTypeIdentifierBodyMass': 'body_mass',
-                'HKQuantityTypeIdentifierHeartRateVariabilitySDNN': 'heart_rate_variability',
-                'HKQuantityTypeIdentifierWalkingHeartRateAverage': 'walking_heart_rate',
-                'HKQuantityTypeIdentifierVO2Max': 'vo2_max',
-                'HKQuantityTypeIdentifierBodyFatPercentage': 'body_fat_percentage',
-                'HKQuantityTypeIdentifierLeanBodyMass': 'lean_body_mass'
-            }
+            from ..utils.metric_types import METRIC_NAMES
             
             # Get unique types from data
             unique_types = data['type'].unique()
             
             for health_type in unique_types:
-                if health_type in metric_mapping:
-                    metrics.append(metric_mapping[health_type])
+                if health_type in METRIC_NAMES:
+                    metrics.append(METRIC_NAMES[health_type])
                     
         return metrics
     
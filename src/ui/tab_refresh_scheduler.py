@@ -0,0 +1,259 @@
+"""Lazy refresh scheduling for dashboard tabs.
+
+When data loads or filters change, every dashboard tab becomes stale but
+only one of them is visible. The scheduler marks tabs dirty, waits a short
+coalescing interval so a burst of filter changes causes a single refresh,
+then refreshes only the visible tab. Each tab may register a ``prepare``
+step (building calculators, querying data) that runs on a worker thread;
+its ``refresh`` step then updates widgets on the UI thread. Tabs registered
+with the same ``prepare`` callable share its result for a given payload.
+After the visible tab is done, the tab the user most often switches to next
+is prepared in the background unless it shares that result, so switching to
+it only runs the UI step.
+
+Example:
+    >>> scheduler = TabRefreshScheduler(tab_widget.currentIndex, parent=window)
+    >>> scheduler.register(1, refresh=window.refresh_daily, prepare=build_calculators)
+    >>> scheduler.invalidate(filtered_data)   # on data load or filter change
+    >>> tab_widget.currentChanged.connect(scheduler.tab_shown)
+"""
+
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TabTimings:
+    """Refresh timings of one tab in milliseconds."""
+
+    refreshes: int = 0
+    prefetches: int = 0
+    last_prepare_ms: float = 0.0
+    last_refresh_ms: float = 0.0
+    total_prepare_ms: float = 0.0
+    total_refresh_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        mean = (lambda total: total / self.refreshes if self.refreshes else 0.0)
+        return {
+            'refreshes': self.refreshes,
+            'prefetches': self.prefetches,
+            'last_prepare_ms': self.last_prepare_ms,
+            'last_refresh_ms': self.last_refresh_ms,
+            'mean_prepare_ms': mean(self.total_prepare_ms),
+            'mean_refresh_ms': mean(self.total_refresh_ms),
+        }
+
+
+@dataclass
+class _TabEntry:
+    refresh: Callable[[Any], None]
+    prepare: Optional[Callable[[Any], Any]] = None
+    name: str = ''
+    timings: TabTimings = field(default_factory=TabTimings)
+    # (generation, prepared result) of the latest completed prepare step
+    prepared: Optional[tuple] = None
+    pending_generation: Optional[int] = None
+    refresh_when_prepared: bool = False
+
+
+class TabRefreshScheduler(QObject):
+    """Marks tabs dirty on data changes and refreshes them when shown.
+
+    Signals:
+        tab_refreshed(int, float): Tab index and total refresh time in ms
+    """
+
+    tab_refreshed = pyqtSignal(int, float)
+    _prepare_finished = pyqtSignal(int, int, object, float, bool)
+
+    def __init__(self, current_index: Callable[[], int], coalesce_ms: int = 150,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            current_index: Returns the index of the visible tab
+            coalesce_ms: Quiet period after the last invalidation before
+                the visible tab is refreshed
+            parent: Owning QObject
+        """
+        super().__init__(parent)
+        self._current_index = current_index
+        self._tabs: Dict[int, _TabEntry] = {}
+        self._dirty: Set[int] = set()
+        self._payload: Any = None
+        self._generation = 0
+        self._transitions: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._last_shown: Optional[int] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tab-prepare')
+        self._closed = False
+        self._prepare_finished.connect(self._on_prepare_finished)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(coalesce_ms)
+        self._timer.timeout.connect(self._flush)
+
+    def register(self, index: int, refresh: Callable[[Any], None],
+                 prepare: Optional[Callable[[Any], Any]] = None, name: str = '') -> None:
+        """Register a tab.
+
+        Args:
+            index: Tab index
+            refresh: UI-thread step; receives the prepared result, or the
+                payload when the tab has no ``prepare`` step
+            prepare: Optional worker-thread step; receives the payload.
+                Tabs passing an equal callable (e.g. the same bound method)
+                run it once per payload and share the result.
+            name: Label used in logs
+        """
+        self._tabs[index] = _TabEntry(refresh=refresh, prepare=prepare, name=name or str(index))
+        self._dirty.add(index)
+
+    def invalidate(self, payload: Any = None, indices: Optional[Iterable[int]] = None) -> None:
+        """Mark tabs stale and schedule a refresh of the visible one.
+
+        Calls within the coalescing interval restart it, so only the last
+        payload of a burst is refreshed.
+        """
+        self._payload = payload
+        self._generation += 1
+        self._dirty.update(self._tabs if indices is None else indices)
+        self._timer.start()
+
+    def is_dirty(self, index: int) -> bool:
+        return index in self._dirty
+
+    def tab_shown(self, index: int) -> None:
+        """Refresh ``index`` if it is stale; call when the user switches tabs."""
+        if self._last_shown is not None and self._last_shown != index:
+            self._transitions[self._last_shown][index] += 1
+        self._last_shown = index
+        if not self._timer.isActive():
+            self._refresh_if_dirty(index)
+
+    def flush(self) -> None:
+        """Refresh the visible tab now instead of after the coalescing interval."""
+        self._timer.stop()
+        self._flush()
+
+    def _flush(self) -> None:
+        self._refresh_if_dirty(self._current_index())
+
+    def _refresh_if_dirty(self, index: int) -> None:
+        entry = self._tabs.get(index)
+        if entry is None or index not in self._dirty:
+            return
+        if entry.prepare is None:
+            self._run_refresh(index, self._payload, 0.0)
+            self._prefetch_next(index)
+            return
+        if entry.prepared is not None and entry.prepared[0] == self._generation:
+            self._run_refresh(index, entry.prepared[1], 0.0)
+            self._prefetch_next(index)
+            return
+        entry.refresh_when_prepared = True
+        self._submit_prepare(index, entry)
+
+    def _submit_prepare(self, index: int, entry: _TabEntry) -> None:
+        generation = self._generation
+        if self._closed or entry.pending_generation == generation:
+            return
+        entry.pending_generation = generation
+        payload = self._payload
+
+        def run():
+            start = time.perf_counter()
+            try:
+                result, ok = entry.prepare(payload), True
+            except Exception as e:
+                logger.error(f"Preparing tab {entry.name} failed: {e}", exc_info=True)
+                result, ok = None, False
+            elapsed = (time.perf_counter() - start) * 1000
+            # Queued to the UI thread via the signal
+            self._prepare_finished.emit(index, generation, result, elapsed, ok)
+
+        self._executor.submit(run)
+
+    def _on_prepare_finished(self, index: int, generation: int, result: Any,
+                             elapsed_ms: float, ok: bool) -> None:
+        entry = self._tabs.get(index)
+        if entry is None:
+            return
+        if entry.pending_generation == generation:
+            entry.pending_generation = None
+        if generation != self._generation:
+            # Superseded by a newer invalidation
+            if entry.refresh_when_prepared and index == self._current_index():
+                self._submit_prepare(index, entry)
+            return
+        entry.timings.last_prepare_ms = elapsed_ms
+        if ok:
+            for other in self._tabs.values():
+                if other is entry or other.prepare == entry.prepare:
+                    other.prepared = (generation, result)
+        if not entry.refresh_when_prepared:
+            entry.timings.prefetches += 1
+            logger.debug(f"Prefetched tab {entry.name} in {elapsed_ms:.0f}ms")
+            return
+        entry.refresh_when_prepared = False
+        if index != self._current_index():
+            return
+        self._run_refresh(index, result if ok else self._payload, elapsed_ms)
+        self._prefetch_next(index)
+
+    def _run_refresh(self, index: int, argument: Any, prepare_ms: float) -> None:
+        entry = self._tabs[index]
+        self._dirty.discard(index)
+        start = time.perf_counter()
+        try:
+            entry.refresh(argument)
+        except Exception as e:
+            logger.error(f"Refreshing tab {entry.name} failed: {e}", exc_info=True)
+        refresh_ms = (time.perf_counter() - start) * 1000
+
+        timings = entry.timings
+        timings.refreshes += 1
+        timings.last_refresh_ms = refresh_ms
+        timings.total_refresh_ms += refresh_ms
+        timings.total_prepare_ms += prepare_ms
+        logger.info(f"Refreshed tab {entry.name}: prepare {prepare_ms:.0f}ms, "
+                    f"UI {refresh_ms:.0f}ms")
+        self.tab_refreshed.emit(index, prepare_ms + refresh_ms)
+
+    def likely_next(self, index: int) -> Optional[int]:
+        """Return the tab most often shown after ``index`` (default: the next one)."""
+        candidates = {i: n for i, n in self._transitions.get(index, {}).items()
+                      if i in self._tabs and i != index}
+        if candidates:
+            return max(candidates, key=candidates.get)
+        following = sorted(i for i in self._tabs if i > index)
+        return following[0] if following else None
+
+    def _prefetch_next(self, index: int) -> None:
+        next_index = self.likely_next(index)
+        if next_index is None or next_index not in self._dirty:
+            return
+        entry = self._tabs[next_index]
+        if entry.prepare is None:
+            return
+        if entry.prepared is not None and entry.prepared[0] == self._generation:
+            return
+        self._submit_prepare(next_index, entry)
+
+    def get_timings(self) -> Dict[str, Dict[str, float]]:
+        """Return refresh timings per tab name."""
+        return {entry.name: entry.timings.as_dict() for entry in self._tabs.values()}
+
+    def shutdown(self) -> None:
+        """Stop pending work; queued prepare steps are abandoned."""
+        self._closed = True
+        self._timer.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
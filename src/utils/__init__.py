@@ -9,6 +9,8 @@ The utilities package includes:
 - **Error Handling**: Centralized error handling and exception management
 - **Logging Configuration**: Application-wide logging setup and configuration
 - **XML Validation**: Apple Health export XML validation and parsing utilities
+- **Data Fingerprints**: Content hashes for reusing models and results on identical data
+- **Metric Types**: Dashboard metric names and their Apple Health record types
 
 These utilities provide foundational support for the entire application,
 ensuring robust error handling, comprehensive logging, and reliable data
@@ -0,0 +1,70 @@
+"""Dashboard metric names and the Apple Health record types behind them.
+
+The dashboard refers to metrics by snake_case names such as ``active_energy``,
+while Apple Health identifies records by HealthKit type identifiers such as
+``HKQuantityTypeIdentifierActiveEnergyBurned``. The names are not a simple
+case conversion of the identifiers, so both directions are looked up here.
+Imported records are stored with the identifier prefix removed
+(``ActiveEnergyBurned``).
+
+Example:
+    >>> from src.utils.metric_types import record_types
+    >>> record_types('vo2_max')[:3]
+    ['vo2_max', 'HKQuantityTypeIdentifierVO2Max', 'VO2Max']
+"""
+
+from typing import Dict, List
+
+TYPE_PREFIXES = ('HKQuantityTypeIdentifier', 'HKCategoryTypeIdentifier')
+
+# HealthKit type identifier -> dashboard metric name
+METRIC_NAMES: Dict[str, str] = {
+    'HKQuantityTypeIdentifierStepCount': 'step_count',
+    'HKQuantityTypeIdentifierSleepAnalysis': 'sleep_analysis',
+    'HKQuantityTypeIdentifierRestingHeartRate': 'resting_heart_rate',
+    'HKQuantityTypeIdentifierActiveEnergyBurned': 'active_energy',
+    'HKQuantityTypeIdentifierBodyMass': 'body_mass',
+    'HKQuantityTypeIdentifierHeartRateVariabilitySDNN': 'heart_rate_variability',
+    'HKQuantityTypeIdentifierWalkingHeartRateAverage': 'walking_heart_rate',
+    'HKQuantityTypeIdentifierVO2Max': 'vo2_max',
+    'HKQuantityTypeIdentifierBodyFatPercentage': 'body_fat_percentage',
+    'HKQuantityTypeIdentifierLeanBodyMass': 'lean_body_mass'
+}
+
+# Dashboard metric name -> HealthKit type identifier
+METRIC_TYPE_IDENTIFIERS: Dict[str, str] = {name: type_id for type_id, name in METRIC_NAMES.items()}
+
+
+def strip_type_prefix(type_id: str) -> str:
+    """Remove the HealthKit prefix, as imports do before storing a record."""
+    for prefix in TYPE_PREFIXES:
+        if type_id.startswith(prefix):
+            return type_id[len(prefix):]
+    return type_id
+
+
+def record_types(metric: str) -> List[str]:
+    """Record types a metric name may be stored under.
+
+    Accepts full identifiers, stored types or snake_case metric names. Names
+    without a known identifier fall back to their CamelCase spelling, so
+    ``heart_rate`` matches ``HeartRate``.
+
+    Returns:
+        The metric itself, then each candidate type with and without prefix
+    """
+    types = [metric]
+    if metric.startswith('HK'):
+        bases = [strip_type_prefix(metric)]
+    else:
+        bases = [''.join(part.capitalize() for part in metric.split('_'))]
+        type_id = METRIC_TYPE_IDENTIFIERS.get(metric)
+        if type_id:
+            types.append(type_id)
+            bases.insert(0, strip_type_prefix(type_id))
+
+    for base in bases:
+        for candidate in (base, *(prefix + base for prefix in TYPE_PREFIXES)):
+            if candidate not in types:
+                types.append(candidate)
+    return types
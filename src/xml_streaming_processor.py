@@ -7,26 +7,62 @@ following the hybrid approach defined in ADR-002. It provides:
 - Memory usage monitoring and adaptive processing
 - Progress callback support for UI integration
 - Chunked database insertion for optimal performance
+- Checkpointed commits, so an interrupted import resumes where it stopped
 """
 
+import hashlib
 import os
 import sqlite3
+import uuid
+import xml.parsers.expat
 import xml.sax
 import xml.sax.handler
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 import psutil
 
 from src.config import DEFAULT_MEMORY_LIMIT_MB, MAX_MEMORY_LIMIT_MB, MIN_MEMORY_LIMIT_MB
+from src.import_history import ensure_import_history_table
 from src.utils.error_handler import DataImportError
 from src.utils.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from src.analytics.import_summary_accumulator import ImportSummaryAccumulator
+
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Records committed per checkpoint; bounds the open transaction and the WAL
+CHECKPOINT_INTERVAL = 50000
+
+# Bytes read from the export per parser feed
+PARSE_BUFFER_SIZE = 1024 * 1024
+
+# Bytes hashed at each end of the export to recognise it on resume
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+def file_fingerprint(path: str) -> str:
+    """Identify an export file cheaply, without hashing all of it.
+    
+    Args:
+        path: Path to the export file.
+        
+    Returns:
+        SHA-256 hex digest of the file size and its first and last megabyte.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()
+
 
 class MemoryMonitor:
     """Monitor memory usage during processing."""
@@ -61,10 +97,21 @@ class MemoryMonitor:
 
 
 class AppleHealthHandler(xml.sax.handler.ContentHandler):
-    """SAX handler for processing Apple Health XML records."""
+    """SAX handler for processing Apple Health XML records.
+    
+    When given the export's path, the handler commits every
+    checkpoint_interval records and stores its position in import_history,
+    at the start of the next element under the root. A later import of the
+    same file feeds the parser the document header followed by the rest of
+    the file from that position, instead of starting over.
+    """
     
     def __init__(self, db_path: str, progress_callback: Optional[Callable] = None,
-                 chunk_size: int = 10000, memory_monitor: Optional[MemoryMonitor] = None):
+                 chunk_size: int = 10000, memory_monitor: Optional[MemoryMonitor] = None,
+                 summary: Optional['ImportSummaryAccumulator'] = None,
+                 xml_path: Optional[str] = None,
+                 checkpoint_interval: int = CHECKPOINT_INTERVAL,
+                 resume: bool = True):
         """Initialize the SAX handler.
         
         Args:
@@ -72,21 +119,42 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
             progress_callback: Optional callback for progress updates
             chunk_size: Number of records to batch before database insert
             memory_monitor: Optional memory monitoring instance
+            summary: Optional accumulator fed every inserted record
+            xml_path: Path of the export being parsed; enables checkpoints
+            checkpoint_interval: Records to process between commits
+            resume: Whether to continue an interrupted import of the same file
         """
         super().__init__()
         self.db_path = db_path
         self.progress_callback = progress_callback
         self.chunk_size = chunk_size
         self.memory_monitor = memory_monitor
+        self.summary = summary
+        self.xml_path = xml_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
         
         # Tracking variables
         self.records = []
         self.record_count = 0
+        self.records_seen = 0  # Record elements parsed, valid or not
         self.bytes_processed = 0
         self.file_size = 0
         self.in_record = False
         self.current_record = {}
         
+        # Checkpoint state
+        self.import_id = None
+        self.history_id = None
+        self.resume_point: Optional[Tuple[int, int]] = None  # (header bytes, byte offset)
+        self._resumed_counts = (0, 0)  # (record_count, records_seen)
+        self._byte_index: Optional[Callable[[], int]] = None
+        self._offset_shift = 0
+        self._header_end = None
+        self._depth = 0
+        self._since_checkpoint = 0
+        self._checkpoint_due = False
+        
         # Progress update optimization
         self.last_progress_update = 0
         self.progress_update_interval = 10000  # Update UI every 10,000 records
@@ -134,17 +202,77 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
                 )
             ''')
             
+            ensure_import_history_table(self.conn.cursor())
+            if self.xml_path:
+                self._open_import_history()
+            
             self.conn.commit()
+            
+            if self.summary is not None:
+                self.summary.begin(self.conn)
             logger.info("Database initialized successfully")
             
         except sqlite3.Error as e:
             logger.error(f"Failed to initialize database: {e}")
             raise DataImportError(f"Database initialization failed: {str(e)}")
     
+    def _open_import_history(self):
+        """Find the checkpoint to resume from, or start a new import_history row."""
+        file_path = str(Path(self.xml_path).resolve())
+        fingerprint = file_fingerprint(self.xml_path)
+        
+        row = None
+        if self.resume:
+            row = self.conn.execute("""
+                SELECT id, import_id, header_bytes, byte_offset, row_count, records_processed
+                FROM import_history
+                WHERE file_path = ? AND file_hash = ? AND status != 'completed'
+                  AND byte_offset > 0 AND header_bytes IS NOT NULL
+                ORDER BY id DESC
+                LIMIT 1
+            """, (file_path, fingerprint)).fetchone()
+        
+        if row:
+            self.history_id, self.import_id, header_bytes, byte_offset = row[:4]
+            self.resume_point = (header_bytes, byte_offset)
+            self._resumed_counts = (row[4] or 0, row[5] or 0)
+            self._header_end = header_bytes
+            self._offset_shift = byte_offset - header_bytes
+            self.conn.execute("UPDATE import_history SET status = 'in_progress' WHERE id = ?",
+                              (self.history_id,))
+            logger.info(f"Resuming import {self.import_id} at byte {byte_offset} "
+                        f"after {self._resumed_counts[0]} records")
+        else:
+            self.import_id = uuid.uuid4().hex
+            cursor = self.conn.execute("""
+                INSERT INTO import_history
+                (file_path, file_hash, row_count, import_id, status, byte_offset, records_processed)
+                VALUES (?, ?, 0, ?, 'in_progress', 0, 0)
+            """, (file_path, fingerprint, self.import_id))
+            self.history_id = cursor.lastrowid
+    
     def set_file_size(self, file_size: int):
         """Set the total file size for progress calculation."""
         self.file_size = file_size
     
+    def set_byte_index(self, byte_index: Callable[[], int]):
+        """Give the handler the parser's position, which checkpoints need.
+        
+        Args:
+            byte_index: Returns the byte offset of the current event in the
+                data fed to the parser.
+        """
+        self._byte_index = byte_index
+    
+    def _current_offset(self) -> Optional[int]:
+        """File offset of the current event, accounting for a resumed feed."""
+        if self._byte_index is None:
+            return None
+        index = self._byte_index()
+        if self._header_end is not None and index >= self._header_end:
+            index += self._offset_shift
+        return index
+    
     def startElement(self, name: str, attrs: xml.sax.xmlreader.AttributesImpl):
         """Handle start of XML element."""
         # Track bytes for element name and attributes for progress calculation
@@ -154,6 +282,16 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
         element_bytes += len('>'.encode('utf-8'))
         self.bytes_processed += element_bytes
         
+        self._depth += 1
+        if self._depth == 2 and self.history_id is not None:
+            # Every record before a child of the root has been processed, so
+            # its start is a safe place to resume from
+            offset = self._current_offset()
+            if self._header_end is None:
+                self._header_end = offset
+            if self._checkpoint_due:
+                self._commit_checkpoint(offset)
+        
         if name == 'Record':
             self.in_record = True
             self.current_record = dict(attrs.items())
@@ -162,6 +300,7 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
         """Handle end of XML element."""
         # Track bytes for closing element tag
         self.bytes_processed += len(f"</{name}>".encode('utf-8'))
+        self._depth -= 1
         
         if name == 'Record' and self.in_record:
             self.in_record = False
@@ -170,6 +309,8 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
     
     def _process_record(self, record: Dict[str, Any]):
         """Process a single health record."""
+        self.records_seen += 1
+        
         # Clean and validate the record
         processed_record = self._clean_record(record)
         if processed_record:
@@ -180,6 +321,11 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
             if len(self.records) >= self.chunk_size:
                 self._flush_to_database()
             
+            # Commit at the next safe position once enough records are pending
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self.checkpoint_interval:
+                self._checkpoint_due = True
+            
             # Update progress if callback provided (but only every N records for performance)
             if self.progress_callback and self.file_size > 0:
                 # Only update progress every 10,000 records or when reaching 100%
@@ -286,10 +432,13 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
                     ))
                     if cursor.rowcount > 0:
                         records_inserted += 1
+                        if self.summary is not None:
+                            self.summary.add(record.get('type'), record.get('sourceName'),
+                                             record.get('startDate'), record.get('value'))
                 except Exception as e:
                     logger.warning(f"Failed to insert record: {e}")
             
-            # Don't commit yet - wait until entire import is done
+            # Records are committed at the next checkpoint
             logger.debug(f"Flushed {records_inserted} new records to database (skipped {len(self.records) - records_inserted} duplicates)")
             
             # Clear records from memory
@@ -299,14 +448,48 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
             logger.error(f"Failed to flush records to database: {e}")
             raise DataImportError(f"Database write failed: {str(e)}")
     
+    def _commit_checkpoint(self, offset: Optional[int]):
+        """Commit the records processed so far and where parsing can resume.
+        
+        Args:
+            offset: File offset of the first unprocessed element, or None
+                when the parser's position is unknown.
+        """
+        self._flush_to_database()
+        if self.summary is not None:
+            self.summary.checkpoint(self.conn)
+        self._save_progress('in_progress', offset)
+        self.conn.commit()
+        
+        self._since_checkpoint = 0
+        self._checkpoint_due = False
+        logger.debug(f"Checkpoint: {self.record_count} records committed, offset {offset}")
+    
+    def _save_progress(self, status: str, offset: Optional[int] = None):
+        """Update this import's import_history row (within the open transaction)."""
+        if self.history_id is None:
+            return
+        self.conn.execute("""
+            UPDATE import_history
+            SET status = ?,
+                byte_offset = COALESCE(?, byte_offset),
+                header_bytes = COALESCE(?, header_bytes),
+                row_count = ?,
+                records_processed = ?,
+                checkpoint_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, offset, self._header_end, self.record_count, self.records_seen,
+              self.history_id))
+    
     def characters(self, content: str):
         """Handle character data (not used for Apple Health XML)."""
         self.bytes_processed += len(content.encode('utf-8'))
     
     def startDocument(self):
         """Handle start of document."""
-        self.bytes_processed = 0
-        self.record_count = 0
+        self.bytes_processed = self.resume_point[1] if self.resume_point else 0
+        self.record_count, self.records_seen = self._resumed_counts
+        self._depth = 0
     
     def ignorableWhitespace(self, whitespace):
         """Track whitespace for progress."""
@@ -320,15 +503,25 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
         """
         try:
             if cancelled:
-                # Rollback the entire transaction if cancelled
+                # Roll back the records since the last checkpoint; committed
+                # checkpoints stay so the import can be resumed
                 if self._transaction_started:
                     self.conn.rollback()
-                    logger.info("Import cancelled - transaction rolled back")
+                    logger.info("Import cancelled - uncommitted records rolled back")
+                if self.history_id is not None:
+                    self.conn.execute(
+                        "UPDATE import_history SET status = 'interrupted' WHERE id = ?",
+                        (self.history_id,))
+                    self.conn.commit()
+                    logger.info(f"Import {self.import_id} can be resumed from its last checkpoint")
                 return 0
             else:
                 # Flush any remaining records
                 self._flush_to_database()
                 
+                if self.summary is not None:
+                    self.summary.finish(self.conn)
+                
                 # Send final progress update if we haven't already
                 if self.progress_callback and self.record_count > self.last_progress_update:
                     self.progress_callback(100.0, self.record_count)
@@ -338,6 +531,7 @@ class AppleHealthHandler(xml.sax.handler.ContentHandler):
                                 (datetime.now().isoformat(),))
                 self.conn.execute("INSERT OR REPLACE INTO metadata VALUES ('record_count', ?)", 
                                 (str(self.record_count),))
+                self._save_progress('completed', self.file_size or None)
                 
                 # Commit the entire transaction
                 if self._transaction_started:
@@ -397,13 +591,18 @@ class XMLStreamingProcessor:
         return estimated_memory_mb > (self.memory_limit_mb * 0.8)  # Use 80% of limit as threshold
     
     def process_xml_file(self, xml_path: str, db_path: str, 
-                        progress_callback: Optional[Callable] = None) -> int:
+                        progress_callback: Optional[Callable] = None,
+                        summary: Optional['ImportSummaryAccumulator'] = None,
+                        resume: bool = True) -> int:
         """Process Apple Health XML file with optimal strategy.
         
         Args:
             xml_path: Path to XML file
             db_path: Path to output SQLite database
             progress_callback: Optional progress callback function
+            summary: Optional accumulator fed every inserted record
+            resume: Whether a streamed import continues from the last
+                checkpoint of an interrupted import of the same file
             
         Returns:
             Number of records processed
@@ -417,37 +616,65 @@ class XMLStreamingProcessor:
         # Determine processing strategy
         if self.should_use_streaming(xml_path):
             logger.info("Using streaming processor for large file")
-            return self._stream_process(xml_path, db_path, progress_callback)
+            return self._stream_process(xml_path, db_path, progress_callback, summary, resume)
         else:
             logger.info("Using memory-based processor for small file")
             # Fall back to existing memory-based approach for small files
             from .data_loader import convert_xml_to_sqlite
-            return convert_xml_to_sqlite(xml_path, db_path)
+            return convert_xml_to_sqlite(xml_path, db_path, summary=summary)
     
     def _stream_process(self, xml_path: str, db_path: str,
-                       progress_callback: Optional[Callable] = None) -> int:
-        """Process XML file using streaming SAX parser."""
+                       progress_callback: Optional[Callable] = None,
+                       summary: Optional['ImportSummaryAccumulator'] = None,
+                       resume: bool = True,
+                       checkpoint_interval: int = CHECKPOINT_INTERVAL) -> int:
+        """Process XML file using streaming SAX parser, committing in checkpoints.
+        
+        The SAX handler is driven by an expat parser directly rather than
+        through ``xml.sax.make_parser``, because checkpoints need the byte
+        position of each element, which expat exposes as the public
+        ``CurrentByteIndex``.
+        """
         handler = None
         cancelled = False
         try:
             file_size = os.path.getsize(xml_path)
             chunk_size = self.calculate_chunk_size(file_size)
             
-            # Create SAX parser and handler
-            parser = xml.sax.make_parser()
+            # Create SAX handler and the expat parser driving it
             handler = AppleHealthHandler(
                 db_path=db_path,
                 progress_callback=progress_callback,
                 chunk_size=chunk_size,
-                memory_monitor=self.memory_monitor
+                memory_monitor=self.memory_monitor,
+                summary=summary,
+                xml_path=xml_path,
+                checkpoint_interval=checkpoint_interval,
+                resume=resume
             )
             handler.set_file_size(file_size)
-            parser.setContentHandler(handler)
+            parser = xml.parsers.expat.ParserCreate()
+            parser.buffer_text = True
+            parser.StartElementHandler = handler.startElement
+            parser.EndElementHandler = handler.endElement
+            parser.CharacterDataHandler = handler.characters
+            # Byte offset of the current event in the data fed so far
+            handler.set_byte_index(lambda: parser.CurrentByteIndex)
             
             # Process the file
             logger.info(f"Starting streaming parse with chunk size: {chunk_size}")
-            with open(xml_path, 'r', encoding='utf-8') as xml_file:
-                parser.parse(xml_file)
+            handler.startDocument()
+            with open(xml_path, 'rb') as xml_file:
+                if handler.resume_point:
+                    # The header declares the document and opens its root
+                    # element; the rest continues after the last checkpoint
+                    header_bytes, byte_offset = handler.resume_point
+                    parser.Parse(xml_file.read(header_bytes), False)
+                    xml_file.seek(byte_offset)
+                for chunk in iter(lambda: xml_file.read(PARSE_BUFFER_SIZE), b''):
+                    parser.Parse(chunk, False)
+                parser.Parse(b'', True)
+            handler.endDocument()
             
             # Finalize and get record count
             record_count = handler.finalize(cancelled=False)
@@ -458,6 +685,11 @@ class XMLStreamingProcessor:
             
             return record_count
             
+        except xml.parsers.expat.ExpatError as e:
+            logger.error(f"XML parsing error: {e}")
+            if handler:
+                handler.finalize(cancelled=True)
+            raise DataImportError(f"Failed to parse XML: {str(e)}")
         except xml.sax.SAXException as e:
             # Check if this is a cancellation
             if "cancelled by user" in str(e).lower():
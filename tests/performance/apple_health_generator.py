@@ -0,0 +1,257 @@
+"""Deterministic synthetic Apple Health exports for import benchmarks.
+
+Writes ``export.xml`` files shaped like the Health app's export, with a DTD
+header, ``Me`` and ``ExportDate`` elements, records with metadata entries,
+correlations, and workouts. The same records can be written as the CSV that
+migrate_csv_to_sqlite reads. Output depends only on the ExportSpec, so runs
+on different machines or commits import identical data.
+
+Generate a large export by hand with::
+
+    python tests/performance/apple_health_generator.py export.xml --records 5000000
+"""
+
+import argparse
+import csv
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+from xml.sax.saxutils import quoteattr
+
+# (type identifier, unit, low, high); a None range marks category samples
+DEFAULT_TYPES: Tuple[Tuple[str, str, Optional[float], Optional[float]], ...] = (
+    ('HKQuantityTypeIdentifierStepCount', 'count', 10, 2500),
+    ('HKQuantityTypeIdentifierHeartRate', 'count/min', 48, 170),
+    ('HKQuantityTypeIdentifierActiveEnergyBurned', 'kcal', 0.5, 40),
+    ('HKQuantityTypeIdentifierDistanceWalkingRunning', 'km', 0.01, 1.8),
+    ('HKQuantityTypeIdentifierFlightsClimbed', 'count', 1, 6),
+    ('HKQuantityTypeIdentifierBodyMass', 'kg', 68, 74),
+    ('HKCategoryTypeIdentifierSleepAnalysis', '', None, None),
+)
+
+# (name, version, device)
+DEFAULT_SOURCES: Tuple[Tuple[str, str, str], ...] = (
+    ('iPhone', '17.4', '<<HKDevice: name:iPhone, manufacturer:Apple Inc., model:iPhone>>'),
+    ('Apple Watch', '10.4', '<<HKDevice: name:Apple Watch, manufacturer:Apple Inc., model:Watch>>'),
+    ('Health', '17.4', ''),
+)
+
+CSV_COLUMNS = ('type', 'sourceName', 'sourceVersion', 'device', 'unit',
+               'creationDate', 'startDate', 'endDate', 'value')
+
+_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE HealthData [
+<!ELEMENT HealthData (ExportDate,Me,(Record|Correlation|Workout)*)>
+<!ATTLIST HealthData locale CDATA #REQUIRED>
+<!ELEMENT ExportDate EMPTY>
+<!ATTLIST ExportDate value CDATA #REQUIRED>
+<!ELEMENT Me EMPTY>
+<!ELEMENT Record (MetadataEntry*)>
+<!ELEMENT MetadataEntry EMPTY>
+<!ELEMENT Correlation (MetadataEntry*,Record*)>
+<!ELEMENT Workout EMPTY>
+]>
+<HealthData locale="en_US">
+ <ExportDate value="{export_date}"/>
+ <Me HKCharacteristicTypeIdentifierDateOfBirth="1985-04-12" HKCharacteristicTypeIdentifierBiologicalSex="HKBiologicalSexNotSet"/>
+'''
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """What a synthetic export contains.
+
+    Attributes:
+        records: Record elements to write, duplicates included.
+        types: Record types as (identifier, unit, low, high).
+        sources: Sources as (name, version, device).
+        duplicate_rate: Fraction of records that repeat an earlier record,
+            as overlapping exports do.
+        timezones: UTC offsets the timestamps cycle through, e.g. after travel.
+        correlation_rate: Fraction of records wrapped in a Correlation.
+        workout_rate: Workout elements written per record.
+        start: Timestamp of the first record.
+        seed: Random seed.
+    """
+    records: int = 10000
+    types: Sequence[Tuple[str, str, Optional[float], Optional[float]]] = DEFAULT_TYPES
+    sources: Sequence[Tuple[str, str, str]] = DEFAULT_SOURCES
+    duplicate_rate: float = 0.02
+    timezones: Sequence[str] = ('-0500', '-0400', '+0100')
+    correlation_rate: float = 0.01
+    workout_rate: float = 0.002
+    start: datetime = datetime(2023, 1, 1)
+    seed: int = 0
+
+
+@dataclass
+class GeneratedExport:
+    """A written export and what importing it should produce.
+
+    Attributes:
+        path: File written.
+        records: Record rows written.
+        unique_records: Rows left after duplicates are ignored.
+        size_bytes: File size.
+        type_counts: Unique records per type identifier.
+    """
+    path: Path
+    records: int
+    unique_records: int
+    size_bytes: int
+    type_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def generate_records(spec: ExportSpec) -> Iterator[Dict[str, str]]:
+    """Yield the spec's records as export attribute dicts, in file order.
+
+    Timestamps advance by a few minutes per record and switch time zone
+    every few thousand records. Duplicates repeat a recent record exactly.
+    """
+    rng = random.Random(spec.seed)
+    moment = spec.start
+    recent = []
+    for index in range(spec.records):
+        if recent and rng.random() < spec.duplicate_rate:
+            yield rng.choice(recent)
+            continue
+
+        moment += timedelta(seconds=rng.randint(30, 600))
+        offset = spec.timezones[(index // 5000) % len(spec.timezones)]
+        type_id, unit, low, high = spec.types[rng.randrange(len(spec.types))]
+        name, version, device = spec.sources[rng.randrange(len(spec.sources))]
+        if low is None:
+            value = 'HKCategoryValueSleepAnalysisAsleepCore'
+            end = moment + timedelta(minutes=rng.randint(5, 90))
+        else:
+            value = f'{rng.uniform(low, high):.3f}'.rstrip('0').rstrip('.')
+            end = moment + timedelta(seconds=rng.randint(0, 300))
+
+        record = {
+            'type': type_id,
+            'sourceName': name,
+            'sourceVersion': version,
+            'device': device,
+            'unit': unit,
+            'creationDate': f'{end:%Y-%m-%d %H:%M:%S} {offset}',
+            'startDate': f'{moment:%Y-%m-%d %H:%M:%S} {offset}',
+            'endDate': f'{end:%Y-%m-%d %H:%M:%S} {offset}',
+            'value': value,
+        }
+        if not device:
+            del record['device']
+        if not unit:
+            del record['unit']
+        recent.append(record)
+        if len(recent) > 1000:
+            recent.pop(0)
+        yield record
+
+
+def _unique_key(record: Dict[str, str]) -> Tuple[str, ...]:
+    return (record['type'], record['sourceName'], record['startDate'],
+            record['endDate'], record['value'])
+
+
+def write_health_export(path, spec: ExportSpec = ExportSpec()) -> GeneratedExport:
+    """Write a synthetic ``export.xml``.
+
+    Args:
+        path: File to write.
+        spec: What the export contains.
+
+    Returns:
+        The written export and its expected import results.
+    """
+    path = Path(path)
+    rng = random.Random(spec.seed + 1)
+    seen = set()
+    type_counts: Dict[str, int] = {}
+    written = 0
+
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as out:
+        out.write(_HEADER.format(export_date=f'{spec.start:%Y-%m-%d %H:%M:%S} -0500'))
+        for record in generate_records(spec):
+            written += 1
+            key = _unique_key(record)
+            if key not in seen:
+                seen.add(key)
+                type_counts[record['type']] = type_counts.get(record['type'], 0) + 1
+
+            attributes = ' '.join(f'{name}={quoteattr(value)}' for name, value in record.items())
+            if rng.random() < spec.correlation_rate:
+                out.write(f' <Correlation type="HKCorrelationTypeIdentifierFood" '
+                          f'sourceName={quoteattr(record["sourceName"])} '
+                          f'startDate="{record["startDate"]}" endDate="{record["endDate"]}">\n'
+                          f'  <Record {attributes}/>\n </Correlation>\n')
+            elif rng.random() < 0.2:
+                out.write(f' <Record {attributes}>\n'
+                          f'  <MetadataEntry key="HKWasUserEntered" value="0"/>\n </Record>\n')
+            else:
+                out.write(f' <Record {attributes}/>\n')
+
+            if rng.random() < spec.workout_rate:
+                out.write(f' <Workout workoutActivityType="HKWorkoutActivityTypeWalking" '
+                          f'duration="31.5" durationUnit="min" '
+                          f'sourceName={quoteattr(record["sourceName"])} '
+                          f'startDate="{record["startDate"]}" endDate="{record["endDate"]}"/>\n')
+        out.write('</HealthData>\n')
+
+    return GeneratedExport(path, written, len(seen), path.stat().st_size, type_counts)
+
+
+def write_health_csv(path, spec: ExportSpec = ExportSpec()) -> GeneratedExport:
+    """Write the spec's records as a CSV export for migrate_csv_to_sqlite.
+
+    Type identifiers lose their HealthKit prefix and timestamps their UTC
+    offset, as in the database.
+
+    Args:
+        path: File to write.
+        spec: What the export contains.
+
+    Returns:
+        The written file and its expected import results.
+    """
+    path = Path(path)
+    seen = set()
+    type_counts: Dict[str, int] = {}
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        for record in generate_records(spec):
+            written += 1
+            key = _unique_key(record)
+            if key not in seen:
+                seen.add(key)
+                type_counts[record['type']] = type_counts.get(record['type'], 0) + 1
+            row = dict(record)
+            row['type'] = (row['type'].replace('HKQuantityTypeIdentifier', '')
+                           .replace('HKCategoryTypeIdentifier', ''))
+            for column in ('creationDate', 'startDate', 'endDate'):
+                row[column] = row[column].rsplit(' ', 1)[0]
+            writer.writerow([row.get(column, '') for column in CSV_COLUMNS])
+
+    return GeneratedExport(path, written, len(seen), path.stat().st_size, type_counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='File to write')
+    parser.add_argument('--records', type=int, default=ExportSpec.records)
+    parser.add_argument('--duplicate-rate', type=float, default=ExportSpec.duplicate_rate)
+    parser.add_argument('--seed', type=int, default=ExportSpec.seed)
+    parser.add_argument('--csv', action='store_true', help='Write CSV instead of XML')
+    args = parser.parse_args()
+
+    spec = ExportSpec(records=args.records, duplicate_rate=args.duplicate_rate, seed=args.seed)
+    export = (write_health_csv if args.csv else write_health_export)(args.path, spec)
+    print(f"Wrote {export.records:,} records ({export.unique_records:,} unique), "
+          f"{export.size_bytes / (1024 * 1024):.1f} MB to {export.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Serialization benchmarks: columnar payloads versus the previous formats.
+
+The previous formats are ``pickle`` (L2), gzip-compressed pickle (L3) and
+one JSON string per (metric, day) for import summaries.
+"""
+
+import gzip
+import json
+import logging
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cache_manager import AnalyticsCacheManager
+from src.analytics.cache_serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'pickle': (lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    'pickle+gzip': (lambda v: gzip.compress(pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL),
+                                            compresslevel=3),
+                    lambda b: pickle.loads(gzip.decompress(b))),
+    'columnar': (dumps, loads),
+    'columnar+gzip': (lambda v: gzip.compress(dumps(v), compresslevel=3),
+                      lambda b: loads(gzip.decompress(b))),
+}
+
+
+@pytest.fixture(scope='module')
+def health_records():
+    """Half a year of minute-level records shaped like health_records."""
+    rng = np.random.default_rng(0)
+    n = 250_000
+    return pd.DataFrame({
+        'type': np.array(['HKQuantityTypeIdentifierStepCount',
+                          'HKQuantityTypeIdentifierHeartRate',
+                          'HKQuantityTypeIdentifierActiveEnergyBurned'])[rng.integers(0, 3, n)],
+        'sourceName': np.array(['Apple Watch', 'iPhone'])[rng.integers(0, 2, n)],
+        'startDate': pd.date_range('2024-01-01', periods=n, freq='min'),
+        'value': rng.normal(100, 15, n),
+    })
+
+
+@pytest.fixture(scope='module')
+def daily_summaries():
+    """Three years of daily summaries for 30 metrics."""
+    days = pd.date_range('2022-01-01', periods=3 * 365).strftime('%Y-%m-%d')
+    rng = np.random.default_rng(1)
+    return {f"Metric{m}": {day: {'sum': float(v), 'avg': float(v) / 2, 'max': float(v),
+                                 'min': 0.0, 'count': 24, 'sources': 2}
+                           for day, v in zip(days, rng.random(len(days)) * 1000)}
+            for m in range(30)}
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('name', list(FORMATS))
+def test_frame_encode(benchmark, health_records, name):
+    """Measure encode time and payload size of a records frame."""
+    encode, _ = FORMATS[name]
+    blob = benchmark(encode, health_records)
+    logger.info(f"{name}: {len(blob) / 1e6:.2f} MB")
+    benchmark.extra_info['bytes'] = len(blob)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('name', list(FORMATS))
+def test_frame_decode(benchmark, health_records, name):
+    """Measure decode time of a records frame."""
+    encode, decode = FORMATS[name]
+    blob = encode(health_records)
+    result = benchmark(decode, blob)
+    assert len(result) == len(health_records)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('layout', ['json_rows', 'columnar_table'])
+def test_import_summary_encode(benchmark, daily_summaries, layout):
+    """Compare per-day JSON rows with one columnar table per metric."""
+    if layout == 'json_rows':
+        def encode():
+            return [json.dumps(stats) for days in daily_summaries.values()
+                    for stats in days.values()]
+    else:
+        def encode():
+            return [dumps(AnalyticsCacheManager._summary_table(days))
+                    for days in daily_summaries.values()]
+    payloads = benchmark(encode)
+    size = sum(len(p) for p in payloads)
+    logger.info(f"{layout}: {len(payloads)} rows, {size / 1e6:.2f} MB")
+    benchmark.extra_info.update({'rows': len(payloads), 'bytes': size})
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('layout', ['json_rows', 'columnar_table'])
+def test_import_summary_month_read(benchmark, daily_summaries, layout):
+    """Measure decoding one metric's daily summaries for a month view.
+
+    The columnar table is decoded whole here; the cache manager keeps the
+    decoded table in L1, so later periods of the same metric are lookups.
+    """
+    days = daily_summaries['Metric0']
+    month = [day for day in days if day.startswith('2023-06')]
+    if layout == 'json_rows':
+        rows = {day: json.dumps(stats) for day, stats in days.items()}
+
+        def read():
+            return [json.loads(rows[day]) for day in month]
+    else:
+        blob = dumps(AnalyticsCacheManager._summary_table(days))
+
+        def read():
+            table = loads(blob)
+            return table.loc[month[0]:month[-1]]
+    assert len(benchmark(read)) == len(month)
@@ -0,0 +1,59 @@
+"""Report chart rendering: serial versus the process pool render farm."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.chart_render_farm import ChartRenderFarm, metric_chart_spec
+
+CHARTS = 12
+
+
+@pytest.fixture(scope="module")
+def chart_specs():
+    """Twelve metric charts of a year of hourly records at print resolution."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2023-01-01', periods=24 * 365, freq='h')
+    return [
+        metric_chart_spec(f'metric_{i}',
+                          pd.DataFrame({'value': rng.normal(100, 20, len(index))}, index=index),
+                          ('2023-01-01', '2023-12-31'), dpi=150)
+        for i in range(CHARTS)
+    ]
+
+
+@pytest.mark.performance
+def test_serial_rendering(benchmark, chart_specs):
+    """Measure rendering every chart on the calling thread."""
+
+    def render():
+        ChartRenderFarm(max_workers=0).render_all(chart_specs)
+
+    benchmark.pedantic(render, rounds=2, iterations=1)
+
+
+@pytest.mark.performance
+def test_render_farm(benchmark, chart_specs):
+    """Measure rendering the charts in a warm worker pool."""
+    farm = ChartRenderFarm(max_workers=4)
+    # Start the workers outside the measurement
+    farm.render_all(chart_specs[:4])
+
+    def render():
+        farm.clear_cache()
+        farm.render_all(chart_specs)
+
+    try:
+        benchmark.pedantic(render, rounds=2, iterations=1)
+    finally:
+        farm.shutdown()
+
+
+@pytest.mark.performance
+def test_cached_charts(benchmark, chart_specs):
+    """Measure re-exporting charts whose data did not change."""
+    farm = ChartRenderFarm(max_workers=0)
+    farm.render_all(chart_specs)
+
+    benchmark(farm.render_all, chart_specs)
+    assert benchmark.stats['mean'] < 0.05
@@ -0,0 +1,43 @@
+"""Benchmarks for the chart downsampling kernels on 1M-point series."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ui.charts.downsampling import lttb_indices, m4_indices, mean_buckets
+
+POINTS = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def series():
+    """Timestamps and three random-walk series of POINTS samples."""
+    x = pd.date_range('2020-01-01', periods=POINTS, freq='min').asi8
+    y = np.random.default_rng(0).normal(size=(POINTS, 3)).cumsum(axis=0)
+    return x, y
+
+
+@pytest.mark.performance
+def test_lttb_1m_points(benchmark, series):
+    """Measure LTTB of three 1M-point series to 5,000 points each."""
+    _, y = series
+    selected = benchmark.pedantic(lttb_indices, args=(None, y, 5000), rounds=3, iterations=1)
+    assert selected.shape == (5000, 3)
+    assert benchmark.stats['mean'] < 2.0
+
+
+@pytest.mark.performance
+def test_m4_1m_points(benchmark, series):
+    """Measure M4 of three 1M-point series onto 1,920 pixel columns."""
+    x, y = series
+    rows = benchmark.pedantic(m4_indices, args=(x, y, 1920), rounds=3, iterations=1)
+    assert len(rows) <= 8 * 1920
+    assert benchmark.stats['mean'] < 1.0
+
+
+@pytest.mark.performance
+def test_mean_buckets_1m_points(benchmark, series):
+    """Measure bucket means of three 1M-point series to 1,000 buckets."""
+    x, y = series
+    starts, means = benchmark.pedantic(mean_buckets, args=(x, y, 1000), rounds=3, iterations=1)
+    assert means.shape == (1000, 3)
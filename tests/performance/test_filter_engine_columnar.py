@@ -0,0 +1,57 @@
+"""Benchmark for columnar result construction in the data filter engine."""
+
+import logging
+import sqlite3
+import tracemalloc
+
+import pytest
+
+from src.data_filter_engine import DataFilterEngine, FilterCriteria
+
+logger = logging.getLogger(__name__)
+
+RECORDS = 200_000
+
+
+@pytest.fixture(scope="module")
+def large_db(tmp_path_factory):
+    """Database with RECORDS health records across a few metrics and sources."""
+    db_path = tmp_path_factory.mktemp("filter") / "health.db"
+    types = ['StepCount', 'HeartRate', 'ActiveEnergyBurned', 'DistanceWalkingRunning']
+    sources = ['iPhone', 'Apple Watch', 'Scale']
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE health_records (
+                type TEXT, sourceName TEXT, sourceVersion TEXT, device TEXT,
+                unit TEXT, creationDate TEXT, startDate TEXT, endDate TEXT,
+                value REAL
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO health_records VALUES (?,?,?,?,?,?,?,?,?)",
+            ((types[i % 4], sources[i % 3], '17.0', None, 'count',
+              f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:00",
+              f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:00",
+              f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:30",
+              float(i % 500)) for i in range(RECORDS)))
+    return str(db_path)
+
+
+@pytest.mark.performance
+def test_filter_data_columnar(benchmark, large_db):
+    """Measure a full-table filter returning the columns the dashboards use."""
+    engine = DataFilterEngine(large_db)
+    columns = ['type', 'sourceName', 'startDate', 'endDate', 'value']
+
+    df = benchmark.pedantic(engine.filter_data, args=(FilterCriteria(),),
+                            kwargs={'columns': columns}, rounds=3, iterations=1)
+
+    tracemalloc.start()
+    engine.filter_data(FilterCriteria(), columns=columns)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    logger.info(f"{len(df)} rows, peak allocation {peak / 2**20:.1f} MiB, "
+                f"result {df.memory_usage(deep=True).sum() / 2**20:.1f} MiB")
+    benchmark.extra_info['peak_mib'] = peak / 2**20
+    assert len(df) == RECORDS
@@ -0,0 +1,130 @@
+"""Import throughput of each ingestion path on a synthetic Apple Health export.
+
+Each benchmark imports the same deterministic export into a fresh database
+and records records/sec, peak RSS and database size in the benchmark's
+extra_info. Save runs and compare them over time with pytest-benchmark's
+storage::
+
+    pytest tests/performance/test_import_throughput.py -m performance \\
+        --benchmark-autosave --benchmark-storage=.benchmarks/imports
+    pytest tests/performance/test_import_throughput.py -m performance \\
+        --benchmark-storage=.benchmarks/imports --benchmark-compare
+
+IMPORT_BENCHMARK_RECORDS sets the export size (default 20,000 records).
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+
+import psutil
+import pytest
+
+from src.data_loader import convert_xml_to_sqlite, migrate_csv_to_sqlite
+from src.xml_streaming_processor import XMLStreamingProcessor
+from tests.performance.apple_health_generator import (ExportSpec, write_health_csv,
+                                                      write_health_export)
+
+logger = logging.getLogger(__name__)
+
+RECORDS = int(os.environ.get('IMPORT_BENCHMARK_RECORDS', 20000))
+MB = 1024 * 1024
+
+
+class _PeakRSS:
+    """Sample this process's resident memory on a thread while an import runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+@pytest.fixture(scope="module")
+def exports(tmp_path_factory):
+    """One XML and one CSV export of the same records."""
+    directory = tmp_path_factory.mktemp('exports')
+    spec = ExportSpec(records=RECORDS)
+    return (write_health_export(directory / 'export.xml', spec),
+            write_health_csv(directory / 'export.csv', spec))
+
+
+def _benchmark_import(benchmark, tmp_path, source, run):
+    """Time run(source_path, db_path) on fresh databases and report its costs.
+
+    Returns:
+        Row count of the last database imported into.
+    """
+    databases = (str(tmp_path / f'health_{i}.db') for i in itertools.count())
+    last_db = []
+
+    def setup():
+        last_db.append(next(databases))
+        return (str(source.path), last_db[-1]), {}
+
+    with _PeakRSS() as rss:
+        benchmark.pedantic(run, setup=setup, rounds=3, iterations=1)
+
+    with sqlite3.connect(last_db[-1]) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM health_records").fetchone()[0]
+    records_per_second = source.records / benchmark.stats.stats.mean
+    benchmark.extra_info.update({
+        'records': source.records,
+        'file_mb': round(source.size_bytes / MB, 2),
+        'records_per_second': round(records_per_second),
+        'peak_rss_mb': round(rss.peak / MB, 1),
+        'rss_growth_mb': round((rss.peak - rss.baseline) / MB, 1),
+        'db_mb': round(os.path.getsize(last_db[-1]) / MB, 2),
+    })
+    logger.info(f"{benchmark.name}: {records_per_second:,.0f} records/sec, "
+                f"peak RSS {rss.peak / MB:.0f} MB (+{(rss.peak - rss.baseline) / MB:.0f}), "
+                f"DB {benchmark.extra_info['db_mb']} MB")
+    return rows
+
+
+@pytest.mark.performance
+def test_convert_xml_to_sqlite(benchmark, exports, tmp_path):
+    """Measure the in-memory XML import used for small exports."""
+    xml_export, _ = exports
+    rows = _benchmark_import(benchmark, tmp_path, xml_export, convert_xml_to_sqlite)
+    assert rows == xml_export.unique_records
+
+
+@pytest.mark.performance
+def test_streaming_xml_import(benchmark, exports, tmp_path):
+    """Measure the SAX streaming import used for large exports."""
+    xml_export, _ = exports
+    processor = XMLStreamingProcessor()
+    # Stream regardless of size; the benchmark export is far below the threshold
+    processor.should_use_streaming = lambda path: True
+
+    def run(xml_path, db_path):
+        return processor.process_xml_file(xml_path, db_path)
+
+    rows = _benchmark_import(benchmark, tmp_path, xml_export, run)
+    assert rows == xml_export.unique_records
+
+
+@pytest.mark.performance
+def test_migrate_csv_to_sqlite(benchmark, exports, tmp_path):
+    """Measure migrating a CSV export, which keeps every row."""
+    _, csv_export = exports
+    rows = _benchmark_import(benchmark, tmp_path, csv_export, migrate_csv_to_sqlite)
+    assert rows == csv_export.records
@@ -0,0 +1,94 @@
+"""L1 cache benchmarks: eviction policy hit rates and sizing cost.
+
+The access trace is synthetic, not recorded: a deterministic model of a
+dashboard session in which a working set of per-metric statistics is re-read
+as the user switches tabs and periods, interrupted by one-off scans (year
+heatmaps and exports touching every daily key once) that flush a plain LRU
+cache.
+"""
+
+import logging
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cache_manager import LRUCache
+from src.analytics.cache_sizing import estimate_size
+
+logger = logging.getLogger(__name__)
+
+METRICS = ['StepCount', 'HeartRate', 'ActiveEnergyBurned', 'DistanceWalkingRunning',
+           'SleepAnalysis', 'BodyMass', 'RestingHeartRate', 'FlightsClimbed']
+VIEWS = ['daily_stats', 'weekly_rolling', 'monthly_summary', 'weekly_trend',
+         'daily_percentiles', 'monthly_yoy', 'daily_outliers']
+
+
+def synthetic_dashboard_trace(requests: int = 20000, seed: int = 3):
+    """Generate the synthetic session trace as a list of cache keys."""
+    rng = np.random.default_rng(seed)
+    working_set = [f"{view}|{metric}|2024-06" for metric in METRICS for view in VIEWS]
+    # Tab popularity is skewed: a few views dominate
+    weights = 1.0 / np.arange(1, len(working_set) + 1) ** 0.8
+    weights /= weights.sum()
+
+    trace = []
+    scan = 0
+    while len(trace) < requests:
+        picks = rng.choice(len(working_set), size=200, p=weights)
+        trace.extend(working_set[i] for i in picks)
+        # Year heatmap or export for one metric: 365 keys read once
+        metric = METRICS[scan % len(METRICS)]
+        trace.extend(f"daily_single_stats|{metric}|{scan}|{day}" for day in range(365))
+        scan += 1
+    return trace[:requests]
+
+
+def replay(cache: LRUCache, trace) -> float:
+    """Replay ``trace`` through ``cache`` and return the hit rate."""
+    hits = 0
+    for key in trace:
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.set(key, {'mean': 1.0, 'key': key})
+    return hits / len(trace)
+
+
+@pytest.mark.performance
+def test_scan_resistant_policies_beat_lru():
+    """Compare hit rates of each eviction policy on the synthetic dashboard trace."""
+    trace = synthetic_dashboard_trace()
+    hit_rates = {policy: replay(LRUCache(maxsize=60, eviction_policy=policy), trace)
+                 for policy in LRUCache.EVICTION_POLICIES}
+    logger.info(", ".join(f"{p}: {r:.1%}" for p, r in hit_rates.items()))
+
+    assert hit_rates['slru'] > hit_rates['lru']
+    assert hit_rates['tinylfu'] > hit_rates['lru']
+
+
+@pytest.fixture
+def health_records():
+    """A year of hourly records for 20 metrics, shaped like health_records."""
+    rng = np.random.default_rng(0)
+    n = 365 * 24 * 20
+    metrics = np.array([f"HKQuantityTypeIdentifier{m}{i}" for i in range(3) for m in METRICS])[:20]
+    return pd.DataFrame({
+        'type': metrics[rng.integers(0, 20, n)],
+        'sourceName': np.array(['Apple Watch', 'iPhone', 'Withings'])[rng.integers(0, 3, n)],
+        'startDate': pd.date_range('2024-01-01', periods=n, freq='min').astype(str),
+        'value': rng.normal(size=n),
+    })
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('method', ['estimate', 'pickle'])
+def test_sizing_cost(benchmark, health_records, method):
+    """Measure the cost of sizing a large DataFrame for the L1 budget."""
+    if method == 'estimate':
+        size = benchmark(estimate_size, health_records)
+    else:
+        size = benchmark(lambda: len(pickle.dumps(health_records)))
+    logger.info(f"{method}: {size / 1e6:.1f} MB")
+    assert size > len(health_records) * 8
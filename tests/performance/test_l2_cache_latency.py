@@ -0,0 +1,38 @@
+"""Latency benchmark for L2 SQLite cache hits."""
+
+import logging
+
+import pytest
+
+from src.analytics.cache_manager import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+ENTRIES = 2000
+
+
+@pytest.fixture
+def populated_cache(tmp_path):
+    """L2 cache holding daily statistics for several metrics."""
+    cache = SQLiteCache(db_path=str(tmp_path / "l2.db"))
+    cache.set_many({f"daily_stats|metric_{i % 20}|{i}": {'mean': float(i), 'count': i}
+                    for i in range(ENTRIES)}, ttl=3600)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.performance
+def test_l2_hit_latency(benchmark, populated_cache):
+    """Measure single-key hit latency on the persistent connection."""
+    keys = [f"daily_stats|metric_{i % 20}|{i}" for i in range(0, ENTRIES, 7)]
+
+    def run():
+        for key in keys:
+            assert populated_cache.get(key) is not None
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
+    stats = populated_cache.get_latency_stats()['get']
+    logger.info(f"L2 get: mean {stats['mean_ms']:.3f} ms, p95 {stats['p95_ms']:.3f} ms")
+    benchmark.extra_info.update(stats)
+
+    assert stats['p95_ms'] < 1.0
@@ -0,0 +1,51 @@
+"""Viewport lookup latency for charts with thousands of chunks."""
+
+import numpy as np
+import pytest
+
+from src.ui.charts.range_index import BoundsIndex, TimeRangeIndex
+
+CHUNKS = 10_000
+
+
+@pytest.fixture(scope="module")
+def chunk_bounds():
+    """Bounds of sequential one-hour chunks with random value ranges."""
+    rng = np.random.default_rng(0)
+    starts = np.arange(CHUNKS) * 3600.0
+    lows = rng.uniform(0, 100, CHUNKS)
+    return [(start, low, start + 3599.0, low + rng.uniform(1, 50))
+            for start, low in zip(starts, lows)]
+
+
+@pytest.mark.performance
+def test_bounds_index_viewport_query(benchmark, chunk_bounds):
+    """Measure R-tree lookups for a one-week viewport."""
+    index = BoundsIndex()
+    for chunk_id, bounds in enumerate(chunk_bounds):
+        index.insert(chunk_id, bounds)
+    index.build()
+
+    def pan():
+        for offset in range(0, 100):
+            start = offset * 36_000.0
+            index.query(start, 0, start + 7 * 86_400, 200)
+
+    benchmark.pedantic(pan, rounds=5, iterations=1)
+    # 100 queries
+    assert benchmark.stats['mean'] < 0.1
+
+
+@pytest.mark.performance
+def test_time_range_index_query(benchmark, chunk_bounds):
+    """Measure bisect lookups for a one-week viewport."""
+    index = TimeRangeIndex()
+    index.build([b[0] for b in chunk_bounds], [b[2] for b in chunk_bounds])
+
+    def pan():
+        for offset in range(0, 100):
+            start = offset * 36_000.0
+            index.query_range(start, start + 7 * 86_400)
+
+    benchmark.pedantic(pan, rounds=5, iterations=1)
+    assert benchmark.stats['mean'] < 0.02
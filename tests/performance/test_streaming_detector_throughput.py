@@ -0,0 +1,32 @@
+"""Throughput benchmarks for online anomaly detectors (points/second)."""
+
+import logging
+
+import numpy as np
+import pytest
+
+from src.analytics.streaming_detectors import create_streaming_detectors
+
+logger = logging.getLogger(__name__)
+
+POINTS = 20000
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize('name', ['zscore', 'modified_zscore', 'iqr'])
+def test_streaming_detector_throughput(benchmark, name):
+    """Measure per-point update throughput of each online detector."""
+    values = np.random.default_rng(0).normal(60, 5, POINTS).tolist()
+
+    def run():
+        detector = create_streaming_detectors()[name]
+        for value in values:
+            detector.update(value, metric='heart_rate')
+
+    benchmark.pedantic(run, rounds=3, iterations=1)
+    points_per_second = POINTS / benchmark.stats.stats.mean
+    benchmark.extra_info['points_per_second'] = points_per_second
+    logger.info(f"{name}: {points_per_second:,.0f} points/sec")
+
+    # Online updates must stay far above real-time requirements
+    assert points_per_second > 10000
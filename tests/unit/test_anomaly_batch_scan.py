@@ -0,0 +1,154 @@
+"""Tests for batch multi-metric anomaly scanning."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomaly_detectors import (
+    IQRDetector, IsolationForestDetector, LocalOutlierFactorDetector,
+    ModifiedZScoreDetector, ZScoreDetector
+)
+from src.analytics.anomaly_detection_system import AnomalyDetectionSystem
+from src.analytics.anomaly_models import DetectionConfig, DetectionMethod
+from src.analytics.data_versions import DataVersionRegistry
+from src.analytics.ensemble_detector import EnsembleDetector
+
+
+@pytest.fixture
+def metrics_frame():
+    """Two years of daily values for several metrics with one spike."""
+    index = pd.date_range('2023-01-01', periods=730, freq='D')
+    rng = np.random.default_rng(11)
+    frame = pd.DataFrame(rng.normal(100, 10, (730, 6)), index=index,
+                         columns=[f'metric_{i}' for i in range(6)])
+    frame.iloc[200, 2] = 400
+    return frame
+
+
+def _keys(anomalies):
+    return sorted((a.timestamp, a.metric, round(float(a.score), 9)) for a in anomalies)
+
+
+class TestVectorizedDetectBatch:
+    """Test that vectorized batch detection matches per-series detection."""
+
+    @pytest.mark.parametrize('detector', [
+        ZScoreDetector(), ModifiedZScoreDetector(), IQRDetector()
+    ])
+    def test_matches_per_column_detection(self, metrics_frame, detector):
+        """Test that one vectorized pass finds the same anomalies."""
+        per_column = [a for column in metrics_frame
+                      for a in detector.detect(metrics_frame[column])]
+
+        assert _keys(detector.detect_batch(metrics_frame)) == _keys(per_column)
+
+
+class TestModelCache:
+    """Test reuse of fitted models across sweeps."""
+
+    @pytest.mark.parametrize('detector_cls', [
+        IsolationForestDetector, LocalOutlierFactorDetector
+    ])
+    def test_same_data_version_reuses_fit(self, metrics_frame, detector_cls):
+        """Test that a second sweep over identical data skips fitting."""
+        detector = detector_cls()
+        first = detector.detect_multivariate(metrics_frame)
+        second = detector.detect_multivariate(metrics_frame.copy())
+
+        assert detector.model_cache_misses == 1
+        assert detector.model_cache_hits == 1
+        assert _keys(first) == _keys(second)
+
+    def test_changed_data_refits(self, metrics_frame):
+        """Test that new data produces a new fit."""
+        detector = IsolationForestDetector()
+        detector.detect_multivariate(metrics_frame)
+        changed = metrics_frame.copy()
+        changed.iloc[0, 0] += 1
+
+        detector.detect_multivariate(changed)
+
+        assert detector.model_cache_misses == 2
+
+    def test_explicit_data_version_is_used_as_key(self, metrics_frame):
+        """Test that callers can supply a version token instead of hashing."""
+        detector = IsolationForestDetector()
+        detector.detect_multivariate(metrics_frame, data_version='v1')
+        detector.detect_multivariate(metrics_frame, data_version='v1')
+
+        assert detector.model_cache_hits == 1
+
+    def test_version_token_does_not_cover_other_data(self, metrics_frame):
+        """Test that a reused token with a different span of data refits."""
+        detector = IsolationForestDetector()
+        detector.detect_multivariate(metrics_frame, data_version='v1')
+        detector.detect_multivariate(metrics_frame.iloc[:-1], data_version='v1')
+
+        assert detector.model_cache_misses == 2
+
+    def test_history_scan_versions_come_from_the_registry(self, metrics_frame, tmp_path,
+                                                          monkeypatch):
+        """Test that a scan refits after the registry records a change."""
+        monkeypatch.chdir(tmp_path)
+        registry = DataVersionRegistry()
+        system = AnomalyDetectionSystem(
+            DetectionConfig(enabled_methods=[DetectionMethod.ISOLATION_FOREST]),
+            data_versions=registry)
+        detector = system.detectors['isolation_forest']
+        try:
+            system.scan_history(metrics_frame)
+            system.scan_history(metrics_frame)
+            assert detector.model_cache_misses == 1
+
+            registry.bump('metric_2', '2023-07-20', '2023-07-20')
+            system.scan_history(metrics_frame)
+            assert detector.model_cache_misses == 2
+        finally:
+            system.shutdown()
+
+    def test_models_fit_single_threaded_inside_the_ensemble(self, tmp_path, monkeypatch):
+        """Test that scikit-learn does not spawn its own workers by default."""
+        monkeypatch.chdir(tmp_path)
+        system = AnomalyDetectionSystem()
+        try:
+            assert system.detectors['isolation_forest'].n_jobs == 1
+            assert system.detectors['lof'].n_jobs == 1
+        finally:
+            system.shutdown()
+
+
+class TestConcurrentEnsemble:
+    """Test concurrent ensemble execution."""
+
+    def test_parallel_and_serial_results_match(self, metrics_frame):
+        """Test that running members concurrently does not change results."""
+        config = DetectionConfig(enabled_methods=[
+            DetectionMethod.ZSCORE, DetectionMethod.MODIFIED_ZSCORE,
+            DetectionMethod.IQR, DetectionMethod.ISOLATION_FOREST
+        ])
+
+        def build(max_workers):
+            detectors = {
+                'zscore': ZScoreDetector(),
+                'modified_zscore': ModifiedZScoreDetector(),
+                'iqr': IQRDetector(),
+                'isolation_forest': IsolationForestDetector(),
+            }
+            return EnsembleDetector(detectors, config, max_workers=max_workers)
+
+        parallel = build(4)
+        try:
+            assert (_keys(parallel.detect_multivariate(metrics_frame)) ==
+                    _keys(build(1).detect_multivariate(metrics_frame)))
+        finally:
+            parallel.shutdown()
+
+    def test_shutdown_releases_the_pool(self, metrics_frame):
+        """Test that leaving the ensemble's context stops its worker threads."""
+        config = DetectionConfig(enabled_methods=[DetectionMethod.ZSCORE, DetectionMethod.IQR])
+        with EnsembleDetector({'zscore': ZScoreDetector(), 'iqr': IQRDetector()},
+                              config) as ensemble:
+            ensemble.detect_multivariate(metrics_frame)
+            assert ensemble._executor is not None
+
+        assert ensemble._executor is None
@@ -0,0 +1,132 @@
+"""Tests for the batch multi-metric forecasting pipeline."""
+
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import batch_forecasting
+from src.analytics.batch_forecasting import (
+    BatchForecastPipeline, ForecastJob, ForecastResult
+)
+
+_run_forecast_job = batch_forecasting._run_forecast_job
+
+
+def _run_or_kill_worker(metric, *args):
+    """Forecast job that kills its worker for the 'hungry' metric."""
+    if metric == 'hungry':
+        os._exit(1)
+    return _run_forecast_job(metric, *args)
+
+
+@pytest.fixture
+def daily_series():
+    """Sixty days of synthetic step counts."""
+    index = pd.date_range('2024-01-01', periods=60, freq='D')
+    rng = np.random.default_rng(42)
+    return pd.Series(8000 + rng.normal(0, 500, len(index)), index=index)
+
+
+class TestForecastJob:
+    """Test forecast job validation."""
+
+    def test_rejects_unknown_method(self, daily_series):
+        """Test that unsupported methods are rejected."""
+        with pytest.raises(ValueError):
+            ForecastJob('steps', daily_series, method='magic')
+
+    def test_rejects_non_positive_horizon(self, daily_series):
+        """Test that horizons below one day are rejected."""
+        with pytest.raises(ValueError):
+            ForecastJob('steps', daily_series, horizon=0)
+
+
+class TestBatchForecastPipeline:
+    """Test batch forecasting execution and fit time tracking."""
+
+    def test_in_process_execution_streams_results(self, daily_series):
+        """Test that every job yields a result with a recorded fit time."""
+        pipeline = BatchForecastPipeline(max_workers=0)
+        jobs = [
+            ForecastJob('steps', daily_series, method='weekly'),
+            ForecastJob('heart_rate', daily_series / 100, horizon=14, method='prophet'),
+        ]
+
+        results = list(pipeline.forecast_iter(jobs))
+
+        assert [r.metric for r in results] == ['steps', 'heart_rate']
+        assert all(isinstance(r, ForecastResult) and r.succeeded for r in results)
+        assert len(results[0].forecast.daily_predictions) == 7
+        assert len(results[1].forecast['forecast']) == 14
+        assert set(pipeline.get_fit_times()) == {'steps', 'heart_rate'}
+
+    def test_failed_job_is_reported_not_raised(self):
+        """Test that a failing fit produces an error result."""
+        pipeline = BatchForecastPipeline(max_workers=0)
+        results = pipeline.forecast_all([
+            ForecastJob('empty', pd.Series(dtype=float), method='prophet')
+        ])
+
+        assert not results['empty'].succeeded
+        assert results['empty'].error
+
+    def test_weekly_method_honours_horizon(self, daily_series):
+        """Test that weekly forecasts cover the requested horizon."""
+        pipeline = BatchForecastPipeline(max_workers=0)
+        [result] = pipeline.forecast_iter([ForecastJob('steps', daily_series, horizon=14)])
+
+        assert result.succeeded
+        assert len(result.forecast.daily_predictions) == 14
+        assert len(result.forecast.scenarios['pessimistic']) == 14
+
+    def test_weekly_fit_failure_is_reported(self):
+        """Test that weekly fits report errors instead of a fallback forecast."""
+        pipeline = BatchForecastPipeline(max_workers=0)
+        [result] = pipeline.forecast_iter([ForecastJob('empty', pd.Series(dtype=float))])
+
+        assert not result.succeeded
+        assert result.forecast is None
+
+    def test_slowest_metrics_ordering(self):
+        """Test that metrics are ranked by mean fit time."""
+        pipeline = BatchForecastPipeline(max_workers=0)
+        for metric, seconds in [('fast', 0.1), ('slow', 2.0), ('medium', 0.5)]:
+            pipeline._record(ForecastResult(metric, 'arima', 7,
+                                            fit_time_seconds=seconds))
+
+        assert [m for m, _ in pipeline.get_slowest_metrics(2)] == ['slow', 'medium']
+
+    def test_process_pool_execution(self, daily_series):
+        """Test that jobs complete across worker processes."""
+        pipeline = BatchForecastPipeline(max_workers=2, memory_limit_mb=None)
+        callbacks = []
+        jobs = [ForecastJob(f'metric_{i}', daily_series, horizon=5, method='arima')
+                for i in range(3)]
+
+        results = pipeline.forecast_all(jobs, callback=callbacks.append)
+
+        assert len(results) == 3
+        assert len(callbacks) == 3
+        assert all(len(r.forecast) == 5 for r in results.values())
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                        reason="workers must inherit the patched job function")
+    def test_dead_worker_fails_only_its_job(self, daily_series, monkeypatch):
+        """Test that a killed worker fails its own job and the batch carries on."""
+        monkeypatch.setattr(batch_forecasting, '_run_forecast_job', _run_or_kill_worker)
+        monkeypatch.setattr(BatchForecastPipeline, '_create_executor',
+                            lambda self: batch_forecasting.ProcessPoolExecutor(
+                                max_workers=2, mp_context=multiprocessing.get_context('fork')))
+        pipeline = BatchForecastPipeline(max_workers=2)
+        jobs = [ForecastJob(metric, daily_series, horizon=5, method='arima')
+                for metric in ('first', 'hungry', 'second', 'third', 'fourth')]
+
+        results = pipeline.forecast_all(jobs)
+
+        assert set(results) == {'first', 'hungry', 'second', 'third', 'fourth'}
+        assert not results['hungry'].succeeded
+        assert 'died' in results['hungry'].error
+        assert all(results[m].succeeded for m in ('first', 'second', 'third', 'fourth'))
@@ -0,0 +1,153 @@
+"""Tests for data-version keys and range-based cache invalidation."""
+
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.analytics.cache_manager import AnalyticsCacheManager
+from src.analytics.data_versions import (
+    DataVersionRegistry, DependencyIndex, parse_dependencies, spans_overlap
+)
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    """Cache manager with all tiers under a temporary directory."""
+    manager = AnalyticsCacheManager(
+        l2_db_path=str(tmp_path / "cache.db"),
+        l3_cache_dir=str(tmp_path / "disk")
+    )
+    yield manager
+    manager.shutdown()
+
+
+class TestDependencyParsing:
+    """Test conversion of dependency strings into day spans."""
+
+    def test_month_and_week_spans(self):
+        """Test that month and ISO week dependencies cover their days."""
+        assert parse_dependencies(["metric:steps", "month:2024:2"]) == [
+            ("steps", "2024-02-01", "2024-02-29")
+        ]
+        assert parse_dependencies(["metric:steps", "week:2024:1"]) == [
+            ("steps", "2024-01-01", "2024-01-07")
+        ]
+
+    def test_open_date_range(self):
+        """Test that None bounds stay open."""
+        assert parse_dependencies(["metric:hr", "date_range:None:2024-03-31"]) == [
+            ("hr", None, "2024-03-31")
+        ]
+
+
+class TestDataVersionRegistry:
+    """Test per-metric version counters."""
+
+    def test_bump_only_affects_overlapping_ranges(self, tmp_path):
+        """Test that a new day does not change versions of earlier months."""
+        registry = DataVersionRegistry(tmp_path / "versions.db")
+        version = registry.bump("steps", "2024-06-01", "2024-06-01")
+
+        assert registry.version("steps", "2024-01-01", "2024-05-31") == 0
+        assert registry.version("steps", "2024-06-01", "2024-06-30") == version
+        assert registry.version("heart_rate", "2024-06-01", "2024-06-30") == 0
+
+    def test_versions_persist(self, tmp_path):
+        """Test that versions survive reloading the registry."""
+        DataVersionRegistry(tmp_path / "versions.db").bump("steps", "2024-06-01", "2024-06-02")
+
+        reloaded = DataVersionRegistry(tmp_path / "versions.db")
+
+        assert reloaded.version_for(["metric:steps", "date:2024-06-02"]) == 1
+        assert reloaded.bump(None) == 2
+
+    def test_overlapping_bumps_merge(self, tmp_path):
+        """Test that a bump overwrites the days it covers and trims older ranges."""
+        registry = DataVersionRegistry(tmp_path / "versions.db")
+        registry.bump("steps", "2024-06-01", "2024-06-30")
+        for day in range(10, 31):
+            registry.bump("steps", "2024-06-10", f"2024-06-{day:02d}")
+        latest = registry.bump("steps", "2024-06-15", "2024-07-05")
+
+        assert registry.version("steps", "2024-06-01", "2024-06-09") == 1
+        assert registry.version("steps", "2024-06-10", "2024-06-14") == latest - 1
+        assert registry.version("steps", "2024-07-01", "2024-07-31") == latest
+        assert registry.version("steps", "2024-07-06", "2024-07-31") == 0
+        with sqlite3.connect(tmp_path / "versions.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM data_versions").fetchone()[0] == 3
+
+        reloaded = DataVersionRegistry(tmp_path / "versions.db")
+        assert reloaded.version("steps", "2024-06-10", "2024-06-14") == latest - 1
+        assert reloaded.version("steps", None, "2024-06-09") == 1
+
+
+class TestDependencyIndex:
+    """Test the month-bucketed dependency index."""
+
+    def test_matches_a_full_scan(self):
+        """Test that bucketed lookups find exactly the overlapping keys."""
+        rng = random.Random(3)
+        first_day = date(2023, 1, 1)
+
+        def day():
+            return (first_day + timedelta(days=rng.randrange(730))).isoformat()
+
+        index, spans = DependencyIndex(), {}
+        for number in range(500):
+            start, end = sorted([day(), day()])
+            if number % 7 == 0:
+                start = None
+            elif number % 5 == 0:
+                end = start
+            metric = rng.choice(["steps", "heart_rate"])
+            key = f"key{number}"
+            index.add(key, [f"metric:{metric}", f"date_range:{start}:{end}"])
+            spans[key] = (metric, start, end)
+        for key in list(spans)[::3]:
+            index.remove(key)
+            del spans[key]
+
+        for _ in range(100):
+            start, end = sorted([day(), day()])
+            if rng.random() < 0.5:
+                end = start
+            expected = {key for key, (metric, s, e) in spans.items()
+                        if metric == "steps" and spans_overlap(s, e, start, end)}
+            assert set(index.matching("steps", start, end)) == expected
+        assert len(index) == len(spans)
+
+
+class TestRangeInvalidation:
+    """Test precise invalidation across cache tiers."""
+
+    def test_new_day_keeps_earlier_months_cached(self, cache_manager):
+        """Test that importing one day only evicts entries overlapping it."""
+        may = ["metric:steps", "month:2024:5"]
+        june = ["metric:steps", "month:2024:6"]
+        cache_manager.set("monthly|steps|2024-05", 1, dependencies=may)
+        cache_manager.set("monthly|steps|2024-06", 2, dependencies=june)
+        cache_manager.set("monthly|hr|2024-06", 3, dependencies=["metric:hr", "month:2024:6"])
+
+        cache_manager.record_data_change("steps", "2024-06-15", "2024-06-15")
+
+        for tier in ('l1', 'l2', 'l3'):
+            assert cache_manager.get("monthly|steps|2024-05", lambda: None, cache_tiers=[tier]) == 1
+            assert cache_manager.get("monthly|hr|2024-06", lambda: None, cache_tiers=[tier]) == 3
+            assert cache_manager.get("monthly|steps|2024-06", lambda: "recomputed",
+                                     cache_tiers=[tier]) == "recomputed"
+
+    def test_versioned_key_changes_after_data_change(self, cache_manager):
+        """Test that keys embed the version of the data they depend on."""
+        dependencies = ["metric:steps", "date_range:2024-06-01:2024-06-30"]
+        before = cache_manager.versioned_key("stats|steps", dependencies)
+
+        cache_manager.record_data_change("steps", "2024-06-10", "2024-06-10")
+        after = cache_manager.versioned_key("stats|steps", dependencies)
+
+        assert before == "stats|steps"
+        assert after != before
+        assert cache_manager.versioned_key(
+            "stats|steps", ["metric:steps", "date_range:2024-05-01:2024-05-31"]
+        ) == "stats|steps"
@@ -0,0 +1,155 @@
+"""Tests for concurrent access to AnalyticsCacheManager."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.analytics.cache_manager import AnalyticsCacheManager
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    """Cache manager with all tiers under a temporary directory."""
+    manager = AnalyticsCacheManager(
+        l2_db_path=str(tmp_path / "cache.db"),
+        l3_cache_dir=str(tmp_path / "disk")
+    )
+    yield manager
+    manager.shutdown()
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent misses."""
+
+    def test_concurrent_misses_share_one_computation(self, cache_manager):
+        """Test that simultaneous misses for one key compute it once."""
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(cache_manager.get, "slow", compute, ['l1'])
+                       for _ in range(8)]
+            time.sleep(0.2)
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert results == [42] * 8
+        assert len(calls) == 1
+        assert cache_manager.metrics.computations == 1
+
+    def test_different_keys_compute_in_parallel(self, cache_manager):
+        """Test that a slow computation does not block other keys or hits."""
+        cache_manager.set("hot", "cached", cache_tiers=['l1'])
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            slow_future = pool.submit(cache_manager.get, "slow", slow, ['l1'])
+            assert started.wait(5)
+
+            assert cache_manager.get("hot", lambda: None, ['l1']) == "cached"
+            assert cache_manager.get("other", lambda: "fast", ['l1']) == "fast"
+            assert not slow_future.done()
+
+            release.set()
+            assert slow_future.result(timeout=5) == "slow"
+
+    def test_failure_propagates_to_waiters(self, cache_manager):
+        """Test that a failed computation raises for every waiter and is not cached."""
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(cache_manager.get, "bad", failing, ['l1'])
+                       for _ in range(3)]
+            time.sleep(0.2)
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result(timeout=5)
+
+        assert cache_manager.get("bad", lambda: "ok", ['l1']) == "ok"
+
+    def test_result_overtaken_by_data_change_is_not_stored(self, cache_manager):
+        """Test that a computation started before a data change is not cached."""
+        started = threading.Event()
+        release = threading.Event()
+        deps = ["metric:steps", "date:2024-06-02"]
+
+        def stale():
+            started.set()
+            release.wait(5)
+            return "stale"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(cache_manager.get, "daily|steps", stale,
+                                 ['l1', 'l2'], None, deps)
+            assert started.wait(5)
+            cache_manager.record_data_change("steps", "2024-06-02", "2024-06-02")
+            release.set()
+            assert future.result(timeout=5) == "stale"
+
+        assert cache_manager.get("daily|steps", lambda: "fresh", ['l1', 'l2'],
+                                 dependencies=deps) == "fresh"
+
+    def test_invalidation_detaches_in_flight_computation(self, cache_manager):
+        """Test that callers arriving after an invalidation do not join a stale computation."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def stale():
+            started.set()
+            release.wait(5)
+            return "stale"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(cache_manager.get, "key", stale, ['l1'])
+            assert started.wait(5)
+            cache_manager.invalidate_pattern("key")
+            assert cache_manager.get("key", lambda: "fresh", ['l1']) == "fresh"
+            release.set()
+            assert future.result(timeout=5) == "stale"
+
+        assert cache_manager.get("key", lambda: "recomputed", ['l1']) == "fresh"
+
+
+class TestLockScope:
+    """Test that tier I/O does not run under the manager lock."""
+
+    def test_hits_do_not_wait_for_invalidation_io(self, cache_manager, monkeypatch):
+        """Test that L1 hits complete while an L2 invalidation is blocked."""
+        cache_manager.set("hot", "cached", cache_tiers=['l1'])
+        entered = threading.Event()
+        release = threading.Event()
+
+        def blocked_invalidation(*args):
+            entered.set()
+            release.wait(5)
+            return 0
+
+        monkeypatch.setattr(cache_manager.l2_cache, "invalidate_range", blocked_invalidation)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            future = pool.submit(cache_manager.invalidate_range, "steps")
+            assert entered.wait(5)
+            hit = pool.submit(cache_manager.get, "hot", lambda: None, ['l1'])
+            try:
+                assert hit.result(timeout=1) == "cached"
+            finally:
+                release.set()
+            future.result(timeout=5)
@@ -0,0 +1,168 @@
+"""Tests for the cache serializer registry and columnar summary storage."""
+
+import pickle
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cache_manager import AnalyticsCacheManager, DiskCache, SQLiteCache
+from src.analytics.cache_serialization import default_registry, dumps, loads
+
+
+@pytest.fixture
+def mixed_frame():
+    """Frame with numeric, string, categorical and datetime columns."""
+    n = 1000
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame({
+        'type': np.array(['StepCount', 'HeartRate', None], dtype=object)[rng.integers(0, 3, n)],
+        'value': rng.normal(size=n),
+        'count': np.arange(n),
+        'flag': rng.random(n) > 0.5,
+        'source': pd.Categorical(rng.choice(['iPhone', 'Apple Watch'], n)),
+        'startDate': pd.date_range('2024-01-01', periods=n, freq='h'),
+        'local': pd.date_range('2024-01-01', periods=n, freq='h', tz='US/Eastern'),
+    })
+    frame.index = pd.Index([f"row_{i}" for i in range(n)], name='row')
+    return frame
+
+
+class TestSerializerRegistry:
+    """Test format selection and round trips."""
+
+    def test_frame_round_trip_is_columnar(self, mixed_frame):
+        """Test that supported frames use the columnar format and round-trip."""
+        blob = dumps(mixed_frame)
+
+        assert default_registry.format_of(blob).columnar
+        decoded = loads(blob)
+        pd.testing.assert_frame_equal(decoded, mixed_frame)
+        writable = loads(blob, writable=True)
+        writable.loc['row_0', 'value'] = 0.0
+
+    def test_decode_is_zero_copy_and_read_only(self):
+        """Test that arrays decode as read-only views over the payload."""
+        array = np.arange(10_000, dtype=np.float64)
+        blob = dumps(array)
+
+        view = loads(blob)
+
+        np.testing.assert_array_equal(view, array)
+        assert np.shares_memory(view, np.frombuffer(blob, dtype=np.uint8))
+        with pytest.raises(ValueError):
+            view[0] = 1.0
+        assert not np.shares_memory(loads(blob, writable=True),
+                                    np.frombuffer(blob, dtype=np.uint8))
+
+    @pytest.mark.parametrize('missing', [None, np.nan])
+    def test_string_gaps_keep_their_missing_marker(self, missing):
+        """Test that None and NaN gaps in string columns decode unchanged."""
+        frame = pd.DataFrame({'source': np.array(['iPhone', missing, 'Watch'], dtype=object)})
+
+        decoded = loads(dumps(frame))
+
+        pd.testing.assert_frame_equal(decoded, frame)
+        assert (decoded['source'][1] is None) == (missing is None)
+
+    def test_arrow_round_trip(self, mixed_frame):
+        """Test that the Arrow format is preferred and round-trips when available."""
+        pytest.importorskip("pyarrow")
+        blob = dumps(mixed_frame)
+
+        assert default_registry.format_of(blob).name == 'arrow'
+        pd.testing.assert_frame_equal(loads(blob), mixed_frame)
+
+    def test_unsupported_values_fall_back_to_pickle(self, mixed_frame):
+        """Test that MultiIndex frames and plain objects use pickle."""
+        multi = mixed_frame.set_index(['type', 'source'])
+
+        assert default_registry.format_of(dumps(multi)).name == 'pickle'
+        pd.testing.assert_frame_equal(loads(dumps(multi)), multi)
+        assert loads(dumps({'mean': 1.0})) == {'mean': 1.0}
+
+    def test_legacy_payloads_are_readable(self):
+        """Test that bare pickles and JSON text from older entries decode."""
+        assert loads(pickle.dumps({'mean': 2.0})) == {'mean': 2.0}
+        assert loads('{"sum": 3}') == {'sum': 3}
+
+
+class TestCacheTiers:
+    """Test the registry inside the L2 and L3 tiers."""
+
+    def test_sqlite_cache_round_trips_frames(self, tmp_path, mixed_frame):
+        """Test that L2 stores frames in the columnar format."""
+        cache = SQLiteCache(db_path=str(tmp_path / "l2.db"))
+        cache.set("frame", mixed_frame)
+
+        pd.testing.assert_frame_equal(cache.get("frame"), mixed_frame)
+        cache.close()
+
+    def test_disk_cache_memory_maps_large_frames(self, tmp_path):
+        """Test that large columnar entries are stored uncompressed and mapped."""
+        cache = DiskCache(cache_dir=str(tmp_path), mmap_min_mb=0.5)
+        frame = pd.DataFrame({'value': np.arange(200_000, dtype=np.float64)})
+        cache.set("large", frame)
+        cache.set("small", {'mean': 1.0})
+
+        assert cache._metadata["large"]['codec'] == 'none'
+        assert cache._metadata["small"]['codec'] != 'none'
+        decoded = cache.get("large")
+        pd.testing.assert_frame_equal(decoded, frame)
+        decoded.loc[0, 'value'] = -1.0  # Copy-on-write mapping
+        assert cache.get("large").loc[0, 'value'] == 0.0
+
+
+class TestImportSummaries:
+    """Test columnar storage of import summaries."""
+
+    def test_one_table_per_metric_and_granularity(self, tmp_path):
+        """Test that summaries are stored per metric table and read per period."""
+        manager = AnalyticsCacheManager(l2_db_path=str(tmp_path / "cache.db"),
+                                        l3_cache_dir=str(tmp_path / "disk"))
+        summaries = {
+            'daily': {'StepCount': {
+                '2024-01-02': {'sum': 900.0, 'avg': 450.0, 'count': 2, 'sources': 1},
+                '2024-01-01': {'sum': 1200.0, 'avg': None, 'count': 3, 'sources': 2},
+            }},
+            'monthly': {'StepCount': {
+                '2024-01': {'sum': 2100.0, 'days_with_data': 2, 'trend': 'up'},
+                '2023-12': {'sum': 600.0, 'days_with_data': None, 'trend': None},
+            }},
+            'metadata': {'metrics_processed': 1},
+        }
+
+        manager.cache_import_summaries(summaries, "import-1")
+
+        assert manager.l2_cache.get_size() == 3
+        table = manager.get_import_summary_table('daily', 'StepCount')
+        assert list(table.index) == ['2024-01-01', '2024-01-02']
+        daily = manager.get_import_summary('daily', 'StepCount', '2024-01-01')
+        assert daily == {'sum': 1200.0, 'avg': None, 'count': 3, 'sources': 2}
+        assert type(daily['count']) is int and type(daily['sources']) is int
+        monthly = manager.get_import_summary('monthly', 'StepCount', '2024-01')
+        assert monthly == {'sum': 2100.0, 'days_with_data': 2, 'trend': 'up'}
+        assert type(monthly['days_with_data']) is int
+        assert manager.get_import_summary('monthly', 'StepCount', '2023-12') == {
+            'sum': 600.0, 'days_with_data': None, 'trend': None}
+        assert manager.get_import_summary('daily', 'StepCount', '2024-02-01') is None
+        manager.shutdown()
+
+    def test_reimport_reuses_the_cache_connection(self, tmp_path, monkeypatch):
+        """Test that a new import replaces old summaries without opening connections."""
+        manager = AnalyticsCacheManager(l2_db_path=str(tmp_path / "cache.db"),
+                                        l3_cache_dir=str(tmp_path / "disk"))
+        manager.l2_cache._get_connection()
+        monkeypatch.setattr(sqlite3, 'connect', None)
+        summaries = {'daily': {'StepCount': {'2024-01-01': {'sum': 1.0, 'count': 1}}}}
+
+        manager.cache_import_summaries(summaries, "import-1")
+        manager.cache_import_summaries({'daily': {'HeartRate': {
+            '2024-01-01': {'avg': 60.0, 'count': 1}}}}, "import-2")
+
+        assert manager.get_import_summary_table('daily', 'StepCount') is None
+        assert manager.get_import_summary('daily', 'HeartRate', '2024-01-01') == {
+            'avg': 60.0, 'count': 1}
+        monkeypatch.undo()
+        manager.shutdown()
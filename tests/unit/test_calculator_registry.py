@@ -0,0 +1,172 @@
+"""Tests for fingerprint-keyed calculator reuse."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.calculator_registry import CalculatorRegistry
+from src.analytics.daily_metrics_calculator import DailyMetricsCalculator
+from src.utils.data_fingerprint import fingerprint_frame
+
+
+@pytest.fixture
+def records():
+    """A few health records."""
+    return pd.DataFrame({
+        'type': ['HKQuantityTypeIdentifierStepCount'] * 3,
+        'startDate': ['2024-01-01 08:00:00', '2024-01-02 08:00:00', '2024-01-03 08:00:00'],
+        'value': [1000.0, 2000.0, 3000.0],
+    })
+
+
+@pytest.fixture
+def registry():
+    """Registry whose factory records what it built."""
+    built = []
+
+    def factory(data, timezone):
+        built.append((len(data), timezone))
+        return {'daily': object(), 'data': data}
+
+    registry = CalculatorRegistry(factory, max_entries=2)
+    registry.built = built
+    return registry
+
+
+class TestCalculatorRegistry:
+    """Test reuse and rebuild decisions."""
+
+    def test_identical_content_reuses_calculators(self, registry, records):
+        """Test that an equal copy of the data reuses the calculator set."""
+        first = registry.get(records)
+
+        assert registry.get(records.copy()) is first
+        assert registry.get_stats()['builds'] == 1
+
+    def test_same_shape_different_values_rebuilds(self, registry, records):
+        """Test that a filter change keeping the row count is not reused."""
+        first = registry.get(records)
+        changed = records.copy()
+        changed.loc[1, 'value'] = 2500.0
+
+        assert registry.get(changed) is not first
+        assert registry.get_stats()['builds'] == 2
+
+    def test_timezone_is_part_of_the_key(self, registry, records):
+        """Test that calculators are rebuilt for another timezone."""
+        registry.get(records, timezone='UTC')
+        registry.get(records, timezone='US/Eastern')
+
+        assert registry.built == [(3, 'UTC'), (3, 'US/Eastern')]
+
+    def test_recent_sets_are_kept(self, registry, records):
+        """Test that switching back to a previous filter is a hit."""
+        subset = records.iloc[:2]
+        registry.get(records)
+        registry.get(subset)
+        registry.get(records)
+        registry.get(records.iloc[1:])  # Evicts the subset's set
+
+        assert registry.get_stats()['builds'] == 3
+        registry.get(subset)
+        assert registry.get_stats()['builds'] == 4
+
+
+class TestDerivedCalculators:
+    """Test building calculators from rows a kept set already prepared."""
+
+    @pytest.fixture
+    def deriving(self):
+        """Registry whose derive callback records the rows it selected."""
+        derived = []
+
+        def derive(calculators, rows, timezone):
+            derived.append(rows.tolist())
+            return {'data': calculators['data'].iloc[rows].reset_index(drop=True)}
+
+        registry = CalculatorRegistry(lambda data, timezone: {'data': data}, derive=derive)
+        registry.derived_rows = derived
+        return registry
+
+    def test_subset_is_derived(self, deriving, records):
+        """Test that a narrower filter selects rows instead of rebuilding."""
+        deriving.get(records)
+        subset = deriving.get(records.iloc[[2, 0]].reset_index(drop=True))
+
+        assert deriving.derived_rows == [[2, 0]]
+        assert subset['data'].equals(records.iloc[[2, 0]].reset_index(drop=True))
+        assert deriving.get_stats()['builds'] == 1
+        assert deriving.get_stats()['derived'] == 1
+
+    def test_new_rows_or_timezone_rebuild(self, deriving, records):
+        """Test that data outside every kept set is built from scratch."""
+        deriving.get(records.iloc[:2])
+        deriving.get(records)
+        deriving.get(records.iloc[1:], timezone='US/Eastern')
+
+        assert deriving.derived_rows == []
+        assert deriving.get_stats()['builds'] == 3
+
+    def test_prepared_rows_match_a_fresh_calculator(self):
+        """Test that a calculator over prepared rows equals one built from scratch."""
+        rng = np.random.default_rng(1)
+        data = pd.DataFrame({
+            'type': rng.choice(['StepCount', 'HeartRate'], 200),
+            'startDate': pd.date_range('2024-01-01', periods=200, freq='7h').astype(str),
+            'value': rng.uniform(50, 150, 200),
+        })
+        full = DailyMetricsCalculator(data, timezone='US/Eastern')
+        subset = data[data['type'] == 'StepCount'].iloc[10:80]
+
+        derived = DailyMetricsCalculator.from_prepared(full.data.loc[subset.index], 'US/Eastern')
+        fresh = DailyMetricsCalculator(subset, timezone='US/Eastern')
+
+        assert derived.calculate_statistics('StepCount') == fresh.calculate_statistics('StepCount')
+
+
+class TestConcurrentBuilds:
+    """Test that builds run outside the registry lock."""
+
+    def test_same_key_builds_once_other_keys_proceed(self, records):
+        """Test that waiters share one build and other data is not blocked by it."""
+        started = threading.Event()
+        release = threading.Event()
+        built = []
+
+        def factory(data, timezone):
+            built.append(len(data))
+            if len(data) == 3:
+                started.set()
+                assert release.wait(5)
+            return {'rows': len(data)}
+
+        registry = CalculatorRegistry(factory)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            slow = [pool.submit(registry.get, records) for _ in range(2)]
+            assert started.wait(5)
+            other = pool.submit(registry.get, records.iloc[:1])
+            try:
+                assert other.result(timeout=2) == {'rows': 1}
+            finally:
+                release.set()
+            first, second = (future.result(timeout=5) for future in slow)
+
+        assert first is second
+        assert sorted(built) == [1, 3]
+        assert registry.get_stats()['hits'] == 1
+
+
+class TestFingerprintFrame:
+    """Test the column hashing used for calculator keys."""
+
+    def test_string_boundaries_and_missing_values(self):
+        """Test that shifted string boundaries and None change the digest."""
+        a = pd.DataFrame({'type': ['ab', 'c']})
+        b = pd.DataFrame({'type': ['a', 'bc']})
+        c = pd.DataFrame({'type': ['ab', None]})
+
+        assert len({fingerprint_frame(a), fingerprint_frame(b), fingerprint_frame(c)}) == 3
+        assert fingerprint_frame(a) == fingerprint_frame(a.copy())
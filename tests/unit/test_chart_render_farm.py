@@ -0,0 +1,98 @@
+"""Tests for parallel chart rendering and the rendered chart cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.chart_render_farm import (ChartRenderFarm, metric_chart_spec,
+                                             overview_chart_spec)
+
+PNG_MAGIC = b'\x89PNG'
+
+
+def _frame(seed, periods=200):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'value': rng.normal(100, 15, periods), 'unit': 'count'},
+                        index=pd.date_range('2024-01-01', periods=periods, freq='h'))
+
+
+DATE_RANGE = ('2024-01-01', '2024-01-31')
+
+
+class TestChartRenderFarm:
+    """Test rendering, caching and result ordering."""
+
+    def test_inline_render_and_cache(self):
+        """Test that repeated charts come from the cache until their data changes."""
+        farm = ChartRenderFarm(max_workers=0)
+        data = _frame(1)
+        spec = metric_chart_spec('step_count', data, DATE_RANGE, dpi=50)
+
+        first = farm.render_all([spec])[0]
+        assert first.startswith(PNG_MAGIC)
+        again = farm.render_all([metric_chart_spec('step_count', data, DATE_RANGE, dpi=50)])[0]
+        assert again == first
+        assert farm.get_stats()['hits'] == 1 and farm.get_stats()['renders'] == 1
+
+        changed = data.copy()
+        changed.iloc[0, 0] += 1
+        for key_change in (metric_chart_spec('step_count', changed, DATE_RANGE, dpi=50),
+                           metric_chart_spec('step_count', data, DATE_RANGE, dpi=72),
+                           metric_chart_spec('step_count', data, ('2024-01-01', '2024-02-29'),
+                                             dpi=50),
+                           metric_chart_spec('step_count', data, DATE_RANGE, dpi=50,
+                                             style={**spec.style, 'primary': '#000000'}),
+                           metric_chart_spec('step_count', data, DATE_RANGE, dpi=50,
+                                             style={**spec.style, 'title_size': 30}),
+                           metric_chart_spec('step_count', data, DATE_RANGE, dpi=50,
+                                             title='Steps')):
+            assert key_change.cache_key != spec.cache_key
+        svg = farm.render_all([metric_chart_spec('step_count', data, DATE_RANGE, format='svg')])[0]
+        assert b'<svg' in svg
+
+    def test_process_pool_keeps_submission_order(self):
+        """Test that pooled results map back to their specs."""
+        farm = ChartRenderFarm(max_workers=2)
+        try:
+            frames = {f'metric_{i}': _frame(i) for i in range(4)}
+            specs = [metric_chart_spec(name, frame, DATE_RANGE, dpi=40)
+                     for name, frame in frames.items()]
+            specs.append(overview_chart_spec(frames, DATE_RANGE, dpi=40))
+            batch = farm.submit(specs)
+            images = batch.results()
+        finally:
+            farm.shutdown()
+
+        assert all(image.startswith(PNG_MAGIC) for image in images)
+        inline = ChartRenderFarm(max_workers=0)
+        assert images[0] == inline.render_all([specs[0]])[0]
+        assert len(set(images)) == len(images)
+
+    def test_failed_chart_yields_none(self):
+        """Test that a chart that cannot render does not fail the batch."""
+        farm = ChartRenderFarm(max_workers=0)
+        good = metric_chart_spec('heart_rate', _frame(2), DATE_RANGE, dpi=40)
+        bad = metric_chart_spec('sleep', _frame(3), DATE_RANGE, dpi=40, format='nope')
+        images = farm.render_all([bad, good])
+        assert images[0] is None and images[1].startswith(PNG_MAGIC)
+
+    def test_cache_budget(self):
+        """Test that the cache evicts least recently used images past its budget."""
+        specs = [metric_chart_spec(f'm{i}', _frame(i, 50), DATE_RANGE, dpi=40, size=(3, 2))
+                 for i in range(6)]
+        image_size = len(ChartRenderFarm(max_workers=0).render_all(specs[:1])[0])
+        farm = ChartRenderFarm(max_workers=0, cache_mb=3.5 * image_size / (1024 * 1024))
+        farm.render_all(specs)
+        stats = farm.get_stats()
+        assert stats['cached_bytes'] <= farm.cache_bytes
+        assert 2 <= stats['cached_charts'] <= 4
+        assert farm.get_cached(specs[-1]) is not None
+        assert farm.get_cached(specs[0]) is None
+
+    def test_overview_requires_values(self):
+        """Test that an overview without numeric data is skipped."""
+        assert overview_chart_spec({'a': pd.DataFrame()}, DATE_RANGE) is None
+        spec = overview_chart_spec({f'm{i}': _frame(i) for i in range(6)}, DATE_RANGE)
+        assert len(spec.series) == 4
+        with pytest.raises(KeyError):
+            metric_chart_spec('m', pd.DataFrame({'x': [1.0]}))
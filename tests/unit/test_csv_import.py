@@ -0,0 +1,86 @@
+"""Tests for the chunked CSV import path."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src import data_loader
+from src.data_loader import DataLoader, migrate_csv_to_sqlite
+from src.utils.error_handler import DataImportError
+
+CSV = """type,sourceName,startDate,endDate,value,notes
+HKQuantityTypeIdentifierStepCount,iPhone,2024-01-01 08:00:00,2024-01-01 08:05:00,120,a
+StepCount,iPhone,2024-01-01 09:00:00 -0500,2024-01-01 09:05:00 -0500,80,b
+HKCategoryTypeIdentifierSleepAnalysis,Watch,2024-01-02T01:00:00,2024-01-02T02:00:00,HKCategoryValueSleepAnalysisAsleep,c
+HeartRate,,2024-01-02 10:00:00,not a date,61.5,d
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_text(CSV)
+    return str(path)
+
+
+class TestMigrateCsv:
+    """Test migrating CSV exports in typed chunks."""
+
+    def test_rows_are_cleaned_across_chunks(self, csv_path, tmp_path, monkeypatch):
+        """Test that every chunk is cleaned and written with the table's columns."""
+        monkeypatch.setattr(data_loader, 'CSV_CHUNK_ROWS', 2)
+        progress = []
+        db_path = str(tmp_path / 'health.db')
+
+        count = migrate_csv_to_sqlite(csv_path, db_path,
+                                      lambda pct, records: progress.append((pct, records)))
+
+        assert count == 4
+        assert [records for _, records in progress[:2]] == [2, 4]
+        assert progress[0][0] <= progress[1][0] <= 60
+        with sqlite3.connect(db_path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(health_records)")]
+            rows = conn.execute("SELECT type, sourceName, startDate, endDate, value "
+                                "FROM health_records ORDER BY rowid").fetchall()
+        assert columns == list(data_loader.CSV_COLUMNS)
+        assert rows == [
+            ('StepCount', 'iPhone', '2024-01-01 08:00:00', '2024-01-01 08:05:00', 120.0),
+            ('StepCount', 'iPhone', '2024-01-01 09:00:00', '2024-01-01 09:05:00', 80.0),
+            ('SleepAnalysis', 'Watch', '2024-01-02 01:00:00', '2024-01-02 02:00:00', 1.0),
+            ('HeartRate', None, '2024-01-02 10:00:00', None, 61.5),
+        ]
+
+    def test_cancel_keeps_previous_records(self, csv_path, tmp_path, monkeypatch):
+        """Test that a cancelled migration leaves the existing table in place."""
+        monkeypatch.setattr(data_loader, 'CSV_CHUNK_ROWS', 2)
+        db_path = str(tmp_path / 'health.db')
+        migrate_csv_to_sqlite(csv_path, db_path)
+
+        assert migrate_csv_to_sqlite(csv_path, db_path, lambda pct, records: records < 4) == 0
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM health_records").fetchone()[0] == 4
+
+
+class TestLoadCsv:
+    """Test loading CSV exports into a DataFrame."""
+
+    def test_typed_columns(self, csv_path, monkeypatch):
+        """Test that chunks combine into categoricals, timestamps and numbers."""
+        monkeypatch.setattr(data_loader, 'CSV_CHUNK_ROWS', 3)
+        df = DataLoader().load_csv(csv_path)
+
+        assert list(df.columns) == ['type', 'sourceName', 'startDate', 'endDate', 'value']
+        assert isinstance(df['type'].dtype, pd.CategoricalDtype)
+        assert list(df['type'].cat.categories) == ['HeartRate', 'SleepAnalysis', 'StepCount']
+        assert df['startDate'].tolist() == list(pd.to_datetime([
+            '2024-01-01 08:00', '2024-01-01 09:00', '2024-01-02 01:00', '2024-01-02 10:00']))
+        assert df['endDate'].isna().tolist() == [False, False, False, True]
+        assert df['value'].tolist() == [120.0, 80.0, 1.0, 61.5]
+
+    def test_requires_type_column(self, tmp_path):
+        """Test that a CSV without the type column is rejected."""
+        path = tmp_path / 'bad.csv'
+        path.write_text("startDate,value\n2024-01-01 08:00:00,1\n")
+        with pytest.raises(DataImportError, match='type'):
+            DataLoader().load_csv(str(path))
@@ -0,0 +1,98 @@
+"""Tests for the columnar fetch path of the data filter engine."""
+
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.data_filter_engine import DataFilterEngine, FilterCriteria
+from src.utils.error_handler import DataImportError
+
+
+@pytest.fixture
+def health_db(tmp_path):
+    """Database with a few hundred health records."""
+    db_path = tmp_path / "health.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE health_records (
+                type TEXT, sourceName TEXT, sourceVersion TEXT, device TEXT,
+                unit TEXT, creationDate TEXT, startDate TEXT, endDate TEXT,
+                value REAL
+            )
+        """)
+        rows = []
+        for i in range(300):
+            day = f"2024-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00"
+            rows.append((
+                ['StepCount', 'HeartRate', 'SleepAnalysis'][i % 3],
+                ['iPhone', 'Apple Watch'][i % 2],
+                None, None, 'count', day, day, day,
+                None if i % 3 == 2 else float(i),
+            ))
+        conn.executemany("INSERT INTO health_records VALUES (?,?,?,?,?,?,?,?,?)", rows)
+    return str(db_path)
+
+
+def _reference_frame(db_path, query):
+    """Build the frame the way the row-by-row path used to."""
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(query).fetchall()
+    df = pd.DataFrame([dict(row) for row in rows])
+    for col in ['creationDate', 'startDate', 'endDate']:
+        df[col] = pd.to_datetime(df[col])
+    df['value'] = pd.to_numeric(df['value'], errors='coerce').fillna(1.0)
+    return df
+
+
+class TestColumnarFilter:
+    """Test batched, typed result construction."""
+
+    def test_matches_row_by_row_result(self, health_db):
+        """Test that batched reads give the same values as the old path."""
+        engine = DataFilterEngine(health_db)
+        df = engine.filter_data(FilterCriteria(), batch_size=64)
+        expected = _reference_frame(
+            health_db, "SELECT * FROM health_records ORDER BY startDate DESC")
+
+        assert isinstance(df['type'].dtype, pd.CategoricalDtype)
+        assert isinstance(df['sourceName'].dtype, pd.CategoricalDtype)
+        assert df['sourceVersion'].isna().all()
+        populated = ['type', 'sourceName', 'unit', 'creationDate', 'startDate', 'endDate', 'value']
+        pd.testing.assert_frame_equal(
+            df[populated].astype({'type': object, 'sourceName': object, 'unit': object}),
+            expected[populated])
+
+    def test_selects_only_requested_columns(self, health_db):
+        """Test that column selection and filters are pushed into the query."""
+        engine = DataFilterEngine(health_db)
+        criteria = FilterCriteria(start_date=date(2024, 1, 10), end_date=date(2024, 1, 20),
+                                  health_types=['StepCount'])
+
+        df = engine.filter_data(criteria, columns=['startDate', 'value', 'type'],
+                                categorical=False)
+
+        assert list(df.columns) == ['startDate', 'value', 'type']
+        assert df['type'].dtype == object
+        assert set(df['type']) == {'StepCount'}
+        assert df['startDate'].between('2024-01-10', '2024-01-21').all()
+        assert df['value'].dtype == 'float64'
+
+    def test_rejects_unknown_columns(self, health_db):
+        """Test that column names are validated before building SQL."""
+        engine = DataFilterEngine(health_db)
+
+        with pytest.raises(DataImportError):
+            engine.filter_data(FilterCriteria(), columns=['value; DROP TABLE x'])
+
+    def test_empty_result(self, health_db):
+        """Test that no matches keep the expected empty shape."""
+        engine = DataFilterEngine(health_db)
+        criteria = FilterCriteria(health_types=['Missing'])
+
+        assert list(engine.filter_data(criteria).columns) == [
+            'startDate', 'type', 'value', 'sourceName']
+        assert list(engine.filter_data(criteria, columns=['type', 'value']).columns) == [
+            'type', 'value']
@@ -0,0 +1,116 @@
+"""Tests for page-level database backups."""
+
+import hashlib
+import io
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from src.database_backup import BackupCancelledError, DatabaseBackupEngine
+
+
+def _digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _dump(path):
+    conn = sqlite3.connect(path)
+    try:
+        return list(conn.iterdump())
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def live_db(tmp_path):
+    """WAL database with a few hundred pages of health records."""
+    path = tmp_path / 'health.db'
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE health_records (type TEXT, startDate TEXT, value REAL)")
+    conn.execute("CREATE TABLE journal_entries (id INTEGER PRIMARY KEY, content TEXT)")
+    conn.executemany("INSERT INTO health_records VALUES (?, ?, ?)",
+                     [('HKQuantityTypeIdentifierStepCount', f'2024-01-01 {i % 24:02d}:00:00',
+                       float(i)) for i in range(20000)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestDatabaseBackupEngine:
+    """Test full and incremental backups and their restore."""
+
+    def test_full_backup_round_trip(self, live_db, tmp_path):
+        """Test that a full backup restores the database byte for byte."""
+        progress = []
+        engine = DatabaseBackupEngine(live_db, pages_per_step=16, chunk_pages=32,
+                                      progress=lambda pct, msg: progress.append(pct))
+        manifest = engine.create_backup(tmp_path / 'full.zip', settings={'theme': 'light'})
+
+        assert manifest['kind'] == 'full'
+        assert manifest['tables'] == {'health_records': 20000, 'journal_entries': 0}
+        assert all(chunk['stored'] for chunk in manifest['chunks'])
+        assert progress == sorted(progress) and progress[-1] == 100
+        assert DatabaseBackupEngine.verify_backup(tmp_path / 'full.zip')
+
+        with zipfile.ZipFile(tmp_path / 'full.zip') as archive:
+            assert json.loads(archive.read('settings.json')) == {'theme': 'light'}
+        DatabaseBackupEngine.restore([tmp_path / 'full.zip'], tmp_path / 'restored.db')
+        assert _digest(tmp_path / 'restored.db') == manifest['database_sha256']
+        assert _dump(tmp_path / 'restored.db') == _dump(live_db)
+
+    def test_incremental_stores_changed_chunks(self, live_db, tmp_path):
+        """Test that incremental backups hold only changed chunks and restore as a chain."""
+        engine = DatabaseBackupEngine(live_db, chunk_pages=8)
+        full = engine.create_backup(tmp_path / 'full.zip')
+
+        conn = sqlite3.connect(live_db)
+        conn.execute("INSERT INTO journal_entries (content) VALUES ('Ran 5k')")
+        conn.commit()
+        first = engine.create_backup(tmp_path / 'inc1.zip', base=tmp_path / 'full.zip')
+        conn.executemany("INSERT INTO health_records VALUES (?, ?, ?)",
+                         [('HKQuantityTypeIdentifierHeartRate', '2024-02-01', 60.0)] * 3000)
+        conn.commit()
+        conn.close()
+        second = engine.create_backup(tmp_path / 'inc2.zip', base=first)
+
+        assert first['kind'] == second['kind'] == 'incremental'
+        assert second['base_id'] == first['backup_id']
+        stored = sum(chunk['stored'] for chunk in first['chunks'])
+        assert 0 < stored < len(full['chunks']) // 2
+        assert (tmp_path / 'inc1.zip').stat().st_size < (tmp_path / 'full.zip').stat().st_size
+
+        chain = [tmp_path / 'full.zip', tmp_path / 'inc1.zip', tmp_path / 'inc2.zip']
+        DatabaseBackupEngine.restore(chain, tmp_path / 'restored.db')
+        assert _dump(tmp_path / 'restored.db') == _dump(live_db)
+
+        with pytest.raises(ValueError):
+            DatabaseBackupEngine.restore([chain[0], chain[2]], tmp_path / 'broken.db')
+        assert not (tmp_path / 'broken.db').exists()
+
+    def test_verify_detects_corruption(self, live_db):
+        """Test that a tampered chunk fails verification."""
+        buffer = io.BytesIO()
+        DatabaseBackupEngine(live_db, chunk_pages=16).create_backup(buffer)
+
+        buffer.seek(0)
+        tampered = io.BytesIO()
+        with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(tampered, 'w') as target:
+            for item in source.infolist():
+                data = source.read(item)
+                if item.filename == 'database.sqlite':
+                    data = data[:5000] + b'\xff' + data[5001:]
+                target.writestr(item, data)
+        assert DatabaseBackupEngine.verify_backup(buffer)
+        assert not DatabaseBackupEngine.verify_backup(tampered)
+
+    def test_cancel_leaves_no_archive(self, live_db, tmp_path):
+        """Test that cancelling mid-copy removes the partial archive."""
+        steps = []
+        engine = DatabaseBackupEngine(live_db, pages_per_step=4,
+                                      is_cancelled=lambda: steps.append(1) or len(steps) > 3)
+        with pytest.raises(BackupCancelledError):
+            engine.create_backup(tmp_path / 'backup.zip', temp_dir=tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['health.db']
@@ -0,0 +1,83 @@
+"""Tests for the sharded, log-structured L3 disk cache."""
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+
+from src.analytics.cache_manager import DiskCache
+
+
+class TestDiskCache:
+    """Test persistence, compaction and eviction of the L3 tier."""
+
+    def test_entries_survive_restart_via_log_replay(self, tmp_path):
+        """Test that metadata appended to the log is replayed on start."""
+        cache = DiskCache(cache_dir=str(tmp_path))
+        cache.set("monthly|steps", {'mean': 1.0}, dependencies=["metric:steps"])
+        cache.set("monthly|hr", {'mean': 2.0})
+        cache.invalidate_pattern("monthly|hr")
+
+        reopened = DiskCache(cache_dir=str(tmp_path))
+
+        assert reopened.get("monthly|steps") == {'mean': 1.0}
+        assert reopened.get("monthly|hr") is None
+        assert reopened.invalidate_range("steps") == 1
+
+    def test_reads_do_not_write_metadata(self, tmp_path):
+        """Test that hits leave the metadata log untouched."""
+        cache = DiskCache(cache_dir=str(tmp_path))
+        cache.set("key", [1, 2, 3])
+        log_size = cache.log_file.stat().st_size
+
+        for _ in range(10):
+            assert cache.get("key") == [1, 2, 3]
+
+        assert cache.log_file.stat().st_size == log_size
+        assert not cache.metadata_file.exists()
+
+    def test_torn_log_record_is_ignored(self, tmp_path):
+        """Test that a partially written final record does not break loading."""
+        cache = DiskCache(cache_dir=str(tmp_path))
+        cache.set("key", "value")
+        cache.close()
+        with open(cache.log_file, 'a') as f:
+            f.write('{"op": "set", "key": "torn"')
+
+        assert DiskCache(cache_dir=str(tmp_path)).get("key") == "value"
+
+    def test_compaction_truncates_log(self, tmp_path, monkeypatch):
+        """Test that the log is folded into the snapshot once it grows."""
+        monkeypatch.setattr(DiskCache, 'MIN_COMPACTION_RECORDS', 10)
+        cache = DiskCache(cache_dir=str(tmp_path))
+        for i in range(30):
+            cache.set("same_key", i)
+
+        assert cache._log_records <= 10
+        assert DiskCache(cache_dir=str(tmp_path)).get("same_key") == 29
+
+    def test_size_bound_evicts_least_recently_used(self, tmp_path):
+        """Test that the total size stays within the configured bound."""
+        cache = DiskCache(cache_dir=str(tmp_path), max_size_mb=0.05, codec='gzip')
+        for i in range(4):
+            cache.set(f"key_{i}", os.urandom(10_000))
+        cache.get("key_0")
+        for i in range(4, 8):
+            cache.set(f"key_{i}", os.urandom(10_000))
+
+        assert cache.size_mb <= 0.05
+        assert cache.get("key_0") is not None
+        assert cache.get("key_1") is None
+
+    def test_reads_legacy_single_file_layout(self, tmp_path):
+        """Test that entries written by the previous layout remain readable."""
+        key = "legacy|steps"
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        with gzip.open(tmp_path / f"{key_hash}.cache.gz", 'wb') as f:
+            pickle.dump({'mean': 3.0}, f)
+        (tmp_path / "metadata.json").write_text(json.dumps({key: {
+            'created_at': '2099-01-01T00:00:00', 'ttl_seconds': None,
+            'size_bytes': 10, 'dependencies': []}}))
+
+        assert DiskCache(cache_dir=str(tmp_path)).get(key) == {'mean': 3.0}
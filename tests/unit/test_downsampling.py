@@ -0,0 +1,140 @@
+"""Tests for the shared chart downsampling kernels."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ui.charts.chart_performance_optimizer import ChartPerformanceOptimizer
+from src.ui.charts.downsampling import (downsample_frame, lttb_indices, m4_indices,
+                                        mean_buckets)
+
+
+def _reference_lttb(y, n_out):
+    """Bucket-by-bucket LTTB as the chart optimizers implemented it."""
+    n = len(y)
+    x = np.arange(n)
+    every = (n - 2) / (n_out - 2)
+    sampled = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = np.mean(x[avg_start:avg_end])
+        avg_y = np.mean(y[avg_start:avg_end])
+        start = int(i * every) + 1
+        end = min(int((i + 1) * every) + 1, n)
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                       (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        sampled.append(a)
+    sampled.append(n - 1)
+    return np.array(sampled)
+
+
+@pytest.fixture
+def walk():
+    """Three random-walk series of 20,000 points."""
+    return np.random.default_rng(7).normal(size=(20_000, 3)).cumsum(axis=0)
+
+
+class TestLTTB:
+    """Test the vectorized Largest Triangle Three Buckets kernel."""
+
+    @pytest.mark.parametrize("n_out", [3, 101, 2500])
+    def test_matches_reference(self, walk, n_out):
+        """Test that each series selects the same points as the loop version."""
+        selected = lttb_indices(None, walk, n_out)
+
+        assert selected.shape == (n_out, 3)
+        for column in range(3):
+            np.testing.assert_array_equal(selected[:, column],
+                                          _reference_lttb(walk[:, column], n_out))
+        np.testing.assert_array_equal(lttb_indices(None, walk[:, 0], n_out), selected[:, 0])
+
+    def test_missing_values_are_not_selected(self, walk):
+        """Test that NaN points lose to real points in their bucket."""
+        y = walk[:, 0].copy()
+        y[1:-1:2] = np.nan
+
+        selected = lttb_indices(None, y, 500)
+
+        assert not np.isnan(y[selected]).any()
+
+
+class TestM4:
+    """Test per-pixel first/last/min/max selection."""
+
+    def test_keeps_extremes_of_every_bucket(self, walk):
+        """Test that every bucket's min and max survive."""
+        y = walk[:, 0]
+        rows = m4_indices(None, y, 100)
+
+        assert len(rows) <= 400
+        for bucket in np.array_split(np.arange(len(y)), 100):
+            kept = np.intersect1d(rows, bucket)
+            assert y[kept].min() == y[bucket].min()
+            assert y[kept].max() == y[bucket].max()
+
+    def test_buckets_follow_time_axis(self):
+        """Test that buckets are equal width in time, not in points."""
+        index = pd.date_range('2024-01-01', periods=1000, freq='min').append(
+            pd.date_range('2024-01-02', periods=9000, freq='s'))
+        rows = m4_indices(index.asi8, np.sin(np.arange(10_000)), 10)
+
+        # The dense second day falls into the last bucket only
+        assert (rows < 1000).sum() > (rows >= 1000).sum()
+
+
+class TestFrameDownsampling:
+    """Test DataFrame reduction used by the chart optimizers."""
+
+    def test_mean_buckets(self):
+        """Test that bucket means ignore missing values."""
+        starts, means = mean_buckets(None, np.array([1.0, np.nan, 3.0, 5.0]), 2)
+
+        np.testing.assert_array_equal(starts, [0, 2])
+        np.testing.assert_array_equal(means, [1.0, 4.0])
+
+    def test_optimizer_keeps_real_rows_for_all_columns(self, walk):
+        """Test that multi-column LTTB returns original rows without gaps."""
+        index = pd.date_range('2024-01-01', periods=len(walk), freq='min')
+        data = pd.DataFrame(walk, index=index, columns=['steps', 'heart_rate', 'energy'])
+
+        result = ChartPerformanceOptimizer().optimize_data(data, target_points=1000,
+                                                           algorithm='lttb')
+
+        assert 1000 <= len(result) <= 3000
+        assert result.notna().all().all()
+        pd.testing.assert_frame_equal(result, data.loc[result.index])
+
+    def test_aggregation_uses_time_buckets(self):
+        """Test that aggregation returns bucket means of numeric columns."""
+        index = pd.date_range('2024-01-01', periods=10_000, freq='min')
+        data = pd.DataFrame({'value': np.arange(10_000, dtype=float), 'label': 'x'}, index=index)
+
+        result = downsample_frame(data, 100, method='mean')
+
+        assert list(result.columns) == ['value']
+        assert len(result) == 100
+        assert result['value'].iloc[0] == pytest.approx(49.5, abs=1)
+
+    @pytest.mark.parametrize('columns', [1, 3])
+    def test_viewport_downsampling_stays_within_budget(self, walk, columns):
+        """Test that M4 viewport reduction respects the renderable point budget."""
+        from src.ui.charts.visualization_performance_optimizer import (
+            ChartVirtualizationEngine, ViewportConfig)
+
+        index = pd.date_range('2024-01-01', periods=len(walk), freq='min')
+        data = pd.DataFrame(walk[:, :columns], index=index)
+        viewport = ViewportConfig(x_min=0, x_max=1, y_min=0, y_max=1,
+                                  width_pixels=200, height_pixels=100)
+        engine = ChartVirtualizationEngine()
+
+        result = engine._optimize_viewport_data(data, viewport)
+
+        assert len(result) <= viewport.max_renderable_points
+        assert len(result) > viewport.max_renderable_points // 2
+        for column in data.columns:
+            assert result[column].max() == data[column].max()
+            assert result[column].min() == data[column].min()
+        engine.prefetch_executor.shutdown(wait=True)
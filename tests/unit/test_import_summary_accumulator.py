@@ -0,0 +1,202 @@
+"""Tests for metric summaries accumulated during import."""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.analytics.import_summary_accumulator import (DAILY_TOTALS_TABLE,
+                                                      ImportSummaryAccumulator)
+from src.analytics.summary_calculator import SummaryCalculator
+from src.data_loader import convert_xml_to_sqlite, migrate_csv_to_sqlite
+from src.database import DatabaseManager
+from src.xml_streaming_processor import XMLStreamingProcessor
+
+
+def _day(days_ago):
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+def _record(metric, source, day, value, hour=9):
+    start = f"{day} {hour:02d}:00:00 +0000"
+    return (f'<Record type="HKQuantityTypeIdentifier{metric}" sourceName="{source}" '
+            f'unit="count" creationDate="{start}" startDate="{start}" '
+            f'endDate="{start}" value="{value}"/>')
+
+
+def _write_export(path, records):
+    path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<HealthData locale="en_US">\n'
+                    + '\n'.join(records) + '\n</HealthData>\n')
+    return str(path)
+
+
+RECORDS = [
+    _record('StepCount', 'iPhone', _day(1), 1000),
+    _record('StepCount', 'iPhone', _day(1), 500, hour=10),
+    _record('StepCount', 'Watch', _day(1), 1200),
+    _record('StepCount', 'iPhone', _day(9), 800),
+    _record('StepCount', 'Watch', _day(40), 300),
+    _record('HeartRate', 'Watch', _day(1), 60),
+    _record('HeartRate', 'Watch', _day(1), 80, hour=12),
+    _record('HeartRate', 'Watch', _day(500), 70),
+]
+
+
+def _calculator(db_path):
+    db = object.__new__(DatabaseManager)
+    db.db_path = db_path
+    calculator = object.__new__(SummaryCalculator)
+    calculator.data_access = None
+    calculator.db_manager = db
+    calculator.db_path = db_path
+    calculator._total_metrics = 0
+    calculator._processed_metrics = 0
+    return calculator
+
+
+class TestImportSummaryAccumulator:
+    """Test that imports produce summaries without scanning the records."""
+
+    def test_matches_summary_calculator(self, tmp_path):
+        """Test that accumulated summaries equal the post-import queries."""
+        db_path = tmp_path / 'health.db'
+        summary = ImportSummaryAccumulator()
+        convert_xml_to_sqlite(_write_export(tmp_path / 'export.xml', RECORDS),
+                              str(db_path), summary=summary)
+
+        expected = _calculator(db_path).calculate_all_summaries(months_back=12)
+        actual = summary.summaries()
+        for period in ('daily', 'weekly', 'monthly'):
+            assert actual[period].keys() == expected[period].keys()
+            for metric, stats in expected[period].items():
+                assert actual[period][metric].keys() == stats.keys()
+                for key, values in stats.items():
+                    assert actual[period][metric][key] == pytest.approx(values)
+        assert actual['metadata']['metrics_processed'] == 2
+
+        by_source = summary.summaries_by_source()['daily']
+        assert by_source['StepCount']['iPhone'][_day(1)] == {
+            'sum': 1500, 'avg': 750, 'max': 1000, 'min': 500, 'count': 2}
+        assert by_source['StepCount'][None][_day(1)]['sum'] == 1500
+        assert by_source['HeartRate'][None][_day(1)]['sum'] == 140
+
+    def test_reimport_merges_new_records_only(self, tmp_path):
+        """Test that duplicates are ignored and earlier imports still count."""
+        db_path = str(tmp_path / 'health.db')
+        first = _write_export(tmp_path / 'first.xml', RECORDS[:3])
+        convert_xml_to_sqlite(first, db_path, summary=ImportSummaryAccumulator())
+
+        summary = ImportSummaryAccumulator()
+        processor = XMLStreamingProcessor()
+        processor.process_xml_file(
+            _write_export(tmp_path / 'second.xml',
+                          RECORDS[:3] + [_record('StepCount', 'Watch', _day(1), 50, hour=20)]),
+            db_path, summary=summary)
+
+        assert len(summary) == 1
+        daily = summary.summaries()['daily']['StepCount'][_day(1)]
+        assert daily['sum'] == 2750 and daily['count'] == 4 and daily['sources'] == 2
+
+    def test_seeds_totals_for_existing_records(self, tmp_path):
+        """Test that records imported before totals were kept are included once."""
+        db_path = str(tmp_path / 'health.db')
+        convert_xml_to_sqlite(_write_export(tmp_path / 'old.xml', RECORDS[:2]), db_path)
+
+        summary = ImportSummaryAccumulator()
+        convert_xml_to_sqlite(_write_export(tmp_path / 'new.xml', RECORDS[2:3]), db_path,
+                              summary=summary)
+        assert summary.summaries()['daily']['StepCount'][_day(1)]['sum'] == 2700
+
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(f"SELECT COUNT(*) FROM {DAILY_TOTALS_TABLE}").fetchone()[0]
+        assert rows == 2
+
+    def test_csv_migration_replaces_totals(self, tmp_path):
+        """Test that a CSV migration starts the totals over."""
+        db_path = str(tmp_path / 'health.db')
+        convert_xml_to_sqlite(_write_export(tmp_path / 'export.xml', RECORDS), db_path,
+                              summary=ImportSummaryAccumulator())
+
+        csv_path = tmp_path / 'export.csv'
+        pd.DataFrame({
+            'type': ['StepCount', 'StepCount', 'StepCount'],
+            'sourceName': ['iPhone', 'iPhone', None],
+            'startDate': [f'{_day(2)} 08:00:00', f'{_day(2)} 09:00:00', f'{_day(3)} 08:00:00'],
+            'endDate': [f'{_day(2)} 08:05:00', f'{_day(2)} 09:05:00', f'{_day(3)} 08:05:00'],
+            'value': [10, 20, 'n/a'],
+        }).to_csv(csv_path, index=False)
+
+        summary = ImportSummaryAccumulator()
+        migrate_csv_to_sqlite(str(csv_path), db_path, summary=summary)
+
+        result = summary.summaries()
+        assert list(result['daily']) == ['StepCount']
+        assert result['daily']['StepCount'] == {
+            _day(3): {'sum': 1, 'avg': 1, 'max': 1, 'min': 1, 'count': 1, 'sources': 1},
+            _day(2): {'sum': 30, 'avg': 30, 'max': 30, 'min': 30, 'count': 2, 'sources': 1}}
+
+    def test_imports_without_accumulator_refresh_totals(self, tmp_path):
+        """Test that records written without an accumulator are not left out of the totals."""
+        db_path = str(tmp_path / 'health.db')
+
+        def totals_match_records():
+            with sqlite3.connect(db_path) as conn:
+                totals = conn.execute(f"""
+                    SELECT type, sourceName, day, total, count FROM {DAILY_TOTALS_TABLE}
+                    ORDER BY 1, 2, 3""").fetchall()
+                records = conn.execute("""
+                    SELECT type, COALESCE(sourceName, ''), substr(startDate, 1, 10),
+                           SUM(value), COUNT(value)
+                    FROM health_records WHERE value IS NOT NULL
+                    GROUP BY 1, 2, 3 ORDER BY 1, 2, 3""").fetchall()
+            return totals == records
+
+        convert_xml_to_sqlite(_write_export(tmp_path / 'a.xml', RECORDS[:3]), db_path,
+                              summary=ImportSummaryAccumulator())
+        convert_xml_to_sqlite(_write_export(tmp_path / 'b.xml', RECORDS[3:6]), db_path)
+        summary = ImportSummaryAccumulator()
+        convert_xml_to_sqlite(_write_export(tmp_path / 'c.xml', RECORDS[6:]), db_path,
+                              summary=summary)
+        assert totals_match_records()
+        assert summary.summaries()['daily']['HeartRate'][_day(1)]['sum'] == 140
+
+        csv_path = tmp_path / 'export.csv'
+        pd.DataFrame({
+            'type': ['StepCount'], 'sourceName': ['iPhone'],
+            'startDate': [f'{_day(2)} 08:00:00'], 'endDate': [f'{_day(2)} 08:05:00'],
+            'value': [5],
+        }).to_csv(csv_path, index=False)
+        migrate_csv_to_sqlite(str(csv_path), db_path)
+        summary = ImportSummaryAccumulator()
+        convert_xml_to_sqlite(_write_export(tmp_path / 'd.xml', RECORDS[5:6]), db_path,
+                              summary=summary)
+        assert totals_match_records()
+        assert set(summary.summaries()['daily']['StepCount']) == {_day(2)}
+
+    def test_deleted_or_updated_records_refresh_totals(self, tmp_path, caplog):
+        """Test that edits below the rowid watermark are not left in the totals."""
+        db_path = str(tmp_path / 'health.db')
+        convert_xml_to_sqlite(_write_export(tmp_path / 'a.xml', RECORDS), db_path,
+                              summary=ImportSummaryAccumulator())
+
+        with caplog.at_level('INFO', logger='src.analytics.import_summary_accumulator'):
+            convert_xml_to_sqlite(_write_export(tmp_path / 'b.xml', RECORDS[:1]), db_path,
+                                  summary=ImportSummaryAccumulator())
+        assert "deriving them again" not in caplog.text
+
+        with sqlite3.connect(db_path) as conn:
+            # The highest rowid stays, so the watermark alone misses the edits
+            conn.execute("DELETE FROM health_records WHERE type = 'HeartRate' AND value != 70")
+            conn.execute("UPDATE health_records SET value = value + 1 WHERE rowid = 1")
+        summary = ImportSummaryAccumulator()
+        convert_xml_to_sqlite(_write_export(tmp_path / 'c.xml', RECORDS[:1]), db_path,
+                              summary=summary)
+
+        assert 'HeartRate' not in summary.summaries()['daily']
+        with sqlite3.connect(db_path) as conn:
+            records = conn.execute("""
+                SELECT COUNT(value), SUM(value) FROM health_records""").fetchone()
+            totals = conn.execute(
+                f"SELECT SUM(count), SUM(total) FROM {DAILY_TOTALS_TABLE}").fetchone()
+        assert totals == records
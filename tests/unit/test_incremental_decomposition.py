@@ -0,0 +1,125 @@
+"""Tests for incremental STL decomposition and online CUSUM."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.incremental_decomposition import IncrementalSTL, OnlineCUSUM
+
+
+@pytest.fixture
+def weekly_series():
+    """Two years of daily data with a weekly cycle and a level shift."""
+    index = pd.date_range('2022-01-01', periods=730, freq='D')
+    rng = np.random.default_rng(7)
+    values = 1000 + 100 * np.sin(np.arange(730) * 2 * np.pi / 7) + rng.normal(0, 20, 730)
+    values[600:] += 300
+    return pd.Series(values, index=index, name='steps')
+
+
+class TestIncrementalSTL:
+    """Test windowed re-decomposition."""
+
+    def test_appending_points_refits_only_trailing_window(self, weekly_series):
+        """Test that a one-day refresh re-decomposes only the window tail."""
+        stl = IncrementalSTL()
+        stl.update(weekly_series.iloc[:-1])
+        state = stl.update(weekly_series)
+
+        assert stl.full_fits == 1
+        assert stl.incremental_fits == 1
+        assert len(state) == len(weekly_series)
+        assert state.refreshed_from == len(weekly_series) - stl.window + stl.overlap
+        np.testing.assert_allclose(state.trend + state.seasonal + state.resid,
+                                   weekly_series.values)
+
+    def test_changed_history_forces_full_fit(self, weekly_series):
+        """Test that edits inside the overlap trigger a full re-decomposition."""
+        stl = IncrementalSTL()
+        stl.update(weekly_series.iloc[:-1])
+
+        edited = weekly_series.copy()
+        edited.iloc[-5] += 50
+        state = stl.update(edited)
+
+        assert stl.full_fits == 2
+        assert state.refreshed_from == 0
+
+    def test_edits_before_the_window_force_full_fit(self, weekly_series):
+        """Test that edits to old history, announced by a new version, force a full fit."""
+        stl = IncrementalSTL()
+        stl.update(weekly_series.iloc[:-1], version=1)
+
+        edited = weekly_series.copy()
+        edited.iloc[10] += 50
+        state = stl.update(edited, version=2)
+
+        assert stl.full_fits == 2 and stl.incremental_fits == 0
+        np.testing.assert_allclose(state.trend + state.seasonal + state.resid, edited.values)
+
+    def test_repeated_appends_match_the_history(self, weekly_series):
+        """Test that in-place appends keep every component aligned with the data."""
+        stl = IncrementalSTL()
+        stl.update(weekly_series.iloc[:-40])
+        for end in range(len(weekly_series) - 39, len(weekly_series) + 1):
+            state = stl.update(weekly_series.iloc[:end])
+
+        assert stl.full_fits == 1 and stl.incremental_fits == 40
+        assert state.index.equals(weekly_series.index)
+        np.testing.assert_allclose(state.observed, weekly_series.values)
+        np.testing.assert_allclose(state.trend + state.seasonal + state.resid,
+                                   weekly_series.values)
+
+    def test_window_covers_the_seasonal_smoother(self):
+        """Test that long seasonal smoothers get a window spanning their cycles."""
+        assert IncrementalSTL(seasonal=7).window == 90
+        assert IncrementalSTL(seasonal=365).window == 365 * 7
+        assert not IncrementalSTL(period=30, window=45, overlap=10).windowed
+
+    def test_window_must_exceed_overlap(self):
+        """Test that degenerate window settings are rejected."""
+        with pytest.raises(ValueError):
+            IncrementalSTL(window=14, overlap=14)
+
+
+class TestOnlineCUSUM:
+    """Test online change point detection."""
+
+    def test_detects_level_shift(self, weekly_series):
+        """Test that the injected level shift is found near its true date."""
+        cusum = OnlineCUSUM()
+        changes = cusum.update_series(weekly_series)
+
+        shift_date = weekly_series.index[600]
+        assert any(abs((cp.timestamp - shift_date).days) <= 7 and cp.direction == 'increase'
+                   for cp in changes)
+
+    def test_only_new_points_are_processed(self, weekly_series):
+        """Test that re-submitting the history does not re-scan old points."""
+        cusum = OnlineCUSUM()
+        cusum.update_series(weekly_series.iloc[:-1])
+        seen = cusum.points_seen
+
+        cusum.update_series(weekly_series)
+
+        assert cusum.points_seen == seen + 1
+
+    def test_backfilled_history_is_rescanned(self, weekly_series):
+        """Test that points inserted before the last processed one reset the detector."""
+        cusum = OnlineCUSUM()
+        cusum.update_series(weekly_series.drop(weekly_series.index[100]))
+
+        changes = cusum.update_series(weekly_series)
+
+        assert cusum.points_seen == len(weekly_series)
+        assert changes == cusum.change_points
+
+    def test_new_version_rescans(self, weekly_series):
+        """Test that a changed data version replays the whole history."""
+        cusum = OnlineCUSUM()
+        first = cusum.update_series(weekly_series, version=1)
+
+        assert first
+        assert cusum.update_series(weekly_series, version=1) == []
+        assert cusum.update_series(weekly_series, version=2) == first
+        assert cusum.points_seen == len(weekly_series)
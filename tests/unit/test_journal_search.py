@@ -3,13 +3,18 @@
 Tests the journal search engine, query parser, and search UI components.
 """
 
+import tempfile
 import unittest
 from datetime import date, datetime
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 from src.analytics.journal_search_engine import (
     JournalSearchEngine, QueryParser, ParsedQuery, SearchResult
 )
+from src.analytics import journal_search_engine
+from src.data_access import JournalDAO
+from src.database import DatabaseManager
 from src.models import JournalEntry
 
 
@@ -226,5 +231,145 @@ class TestSearchIntegration(unittest.TestCase):
             self.assertEqual(len(results), 0)
 
 
+
+class TestSuggestionIndex(unittest.TestCase):
+    """Test suggestions served from the vocabulary and query indexes."""
+    
+    def setUp(self):
+        """Create a migrated database with a few journal entries."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = object.__new__(DatabaseManager)
+        self.db.db_path = Path(self.temp_dir.name) / 'journal.db'
+        self.db.initialized = True
+        self.db.initialize_database()
+        
+        entries = [
+            ('2024-01-01', 'Morning workout then work on the garden'),
+            ('2024-01-02', 'Working late, skipped the workout'),
+            ('2024-01-03', 'Café visit and a long walk'),
+        ]
+        with self.db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO journal_entries (entry_date, entry_type, content) VALUES (?, 'daily', ?)",
+                entries
+            )
+            for query in ['workout plan', 'Workout plan', 'walking']:
+                conn.execute("INSERT INTO search_history (query, result_count) VALUES (?, 1)", (query,))
+            conn.commit()
+        
+        self.engine = JournalSearchEngine(":memory:")
+        self.engine.db = self.db
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def test_history_then_vocabulary(self):
+        """Test that past searches rank first, then terms by document count."""
+        suggestions = self.engine.suggest_queries("Wor", limit=5)
+        self.assertEqual(suggestions[0], 'workout plan')
+        self.assertEqual(suggestions[1:], ['workout', 'work', 'working'])
+        
+    def test_completes_last_word(self):
+        """Test that multi-word input completes its last word."""
+        self.assertEqual(self.engine.suggest_queries("long caf"), ['long cafe'])
+        self.assertEqual(self.engine.suggest_queries("long "), [])
+        
+    def test_index_follows_writes(self):
+        """Test that updates and deletes keep the vocabulary current."""
+        with self.db.get_connection() as conn:
+            conn.execute("UPDATE journal_entries SET content = 'Rest day' WHERE entry_date = '2024-01-02'")
+            conn.execute("DELETE FROM journal_entries WHERE entry_date = '2024-01-01'")
+            conn.commit()
+            matches = conn.execute(
+                "SELECT COUNT(*) FROM journal_search WHERE journal_search MATCH 'rest'"
+            ).fetchone()[0]
+        
+        self.assertEqual(matches, 1)
+        self.assertEqual(self.engine.suggest_queries("wor", limit=5), ['workout plan'])
+        self.assertEqual(self.engine.suggest_queries("re"), ['rest'])
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the paged, write-invalidated search result cache."""
+    
+    def setUp(self):
+        """Create a migrated database with thirty matching entries."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = object.__new__(DatabaseManager)
+        self.db.db_path = Path(self.temp_dir.name) / 'journal.db'
+        self.db.initialized = True
+        self.db.initialize_database()
+        
+        with self.db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO journal_entries (entry_date, entry_type, content) VALUES (?, 'daily', ?)",
+                [(f'2024-01-{day:02d}', 'Evening walk ' + 'walk ' * (day % 5) + 'by the river')
+                 for day in range(1, 31)]
+            )
+            conn.commit()
+        
+        self.engine = JournalSearchEngine(":memory:")
+        self.engine.db = self.db
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def test_pages_share_one_ranking(self):
+        """Test that later pages are sliced from the cached ranking."""
+        with patch.object(self.engine, '_execute_search',
+                          wraps=self.engine._execute_search) as execute:
+            pages = [self.engine.search("walk", limit=10, offset=offset)
+                     for offset in (0, 10, 20, 30)]
+        
+        self.assertEqual(execute.call_count, 1)
+        ids = [result.entry_id for page in pages for result in page]
+        self.assertEqual(len(ids), 30)
+        self.assertEqual(len(set(ids)), 30)
+        text_scores = [result.metadata['text_score'] for page in pages for result in page]
+        self.assertEqual(text_scores, sorted(text_scores, reverse=True))
+        self.assertTrue(all('<mark>' in result.snippet for page in pages for result in page))
+        
+        stats = self.engine.get_search_stats()
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (3, 1))
+        self.assertAlmostEqual(stats['cache_hit_rate'], 0.75)
+        
+    def test_paging_past_window_widens_ranking(self):
+        """Test that a page beyond the ranked window re-ranks a wider one."""
+        with patch.object(journal_search_engine, 'RANKING_WINDOW', 8):
+            pages = [self.engine.search("river", limit=8, offset=offset)
+                     for offset in (0, 8, 16, 24)]
+        
+        self.assertEqual([len(page) for page in pages], [8, 8, 8, 6])
+        self.assertEqual(len({r.entry_id for page in pages for r in page}), 30)
+        # Windows of 8, 16 and 32 results; the last page is a hit
+        self.assertEqual(self.engine.get_search_stats()['cache_misses'], 3)
+        
+    def test_journal_writes_invalidate(self):
+        """Test that saving or deleting through JournalDAO drops cached results."""
+        self.assertEqual(self.engine.search("lake"), [])
+        with patch('src.data_access.DatabaseManager', return_value=self.db):
+            JournalDAO.save_journal_entry(date(2024, 2, 1), 'daily', 'Swam in the lake')
+            self.assertEqual(len(self.engine.search("lake")), 1)
+            
+            JournalDAO.delete_journal_entry(date(2024, 2, 1), 'daily')
+            self.assertEqual(self.engine.search("lake"), [])
+        
+        stats = self.engine.get_search_stats()
+        self.assertEqual(stats['cache_invalidations'], 2)
+        self.assertEqual(stats['cache_hits'], 0)
+        
+    def test_least_recently_used_evicted(self):
+        """Test that the cache keeps the most recently used queries."""
+        with patch.object(journal_search_engine, 'RESULT_CACHE_SIZE', 2):
+            for query in ("walk", "river", "walk", "evening"):
+                self.engine.search(query)
+            self.engine.search("walk")
+            self.engine.search("river")
+        
+        stats = self.engine.get_search_stats()
+        self.assertEqual(stats['cache_evictions'], 2)
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (2, 4))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
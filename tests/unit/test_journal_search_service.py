@@ -0,0 +1,124 @@
+"""Tests for the debounced background journal search service."""
+
+import sqlite3
+
+import pytest
+
+from src.analytics.journal_search_engine import JournalSearchEngine
+from src.analytics.journal_search_service import JournalSearchService
+from src.database import DatabaseManager
+
+
+@pytest.fixture
+def journal_db(tmp_path):
+    """Migrated database with forty entries mentioning a river walk."""
+    db = object.__new__(DatabaseManager)
+    db.db_path = tmp_path / 'journal.db'
+    db.initialized = True
+    db.initialize_database()
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO journal_entries (entry_date, entry_type, content) VALUES (?, 'daily', ?)",
+            [(f'2024-{1 + day // 28:02d}-{1 + day % 28:02d}', f'Walk number {day} along the river')
+             for day in range(40)]
+        )
+        conn.commit()
+    return db.db_path
+
+
+@pytest.fixture
+def service(journal_db):
+    service = JournalSearchService(str(journal_db), debounce_ms=50, first_page_size=10,
+                                   page_size=15)
+    yield service
+    service.shutdown()
+
+
+def _record(signal):
+    emitted = []
+    signal.connect(lambda *args: emitted.append(args))
+    return emitted
+
+
+class TestJournalSearchService:
+    """Test debouncing, superseding, paging and lazy snippets."""
+
+    def test_keystrokes_collapse_to_last_query(self, service, qtbot):
+        """Test that only the query typing settled on is searched."""
+        started = _record(service.searchStarted)
+        pages = _record(service.pageReady)
+        for text in ('r', 'ri', 'riv', 'rive', 'river'):
+            generation = service.search(text)
+
+        qtbot.waitUntil(lambda: bool(pages), timeout=5000)
+        qtbot.wait(100)
+        assert started == [(generation, 'river')]
+        assert len(pages) == 1
+        page_generation, offset, results = pages[0]
+        assert (page_generation, offset, len(results)) == (generation, 0, 10)
+        assert all(result.snippet == '' for result in results)
+
+    def test_only_explicit_searches_are_logged(self, service, qtbot, monkeypatch):
+        """Test that queries typed on the way never reach search history."""
+        logged = []
+        monkeypatch.setattr(JournalSearchEngine, '_log_search',
+                            lambda engine, query, count: logged.append((query, count)))
+        pages = _record(service.pageReady)
+        for text in ('riv', 'rive', 'river'):
+            service.search(text)
+            qtbot.wait(80)
+        qtbot.waitUntil(lambda: len(pages) == 3, timeout=5000)
+        service.load_more(10)
+        qtbot.waitUntil(lambda: len(pages) == 4, timeout=5000)
+        assert logged == []
+
+        service.search('river', immediate=True)
+        qtbot.waitUntil(lambda: len(pages) == 5, timeout=5000)
+        assert logged == [('river', 40)]
+
+    def test_next_page_and_visible_snippets(self, service, qtbot):
+        """Test that pages and snippets load on demand for the current search."""
+        pages = _record(service.pageReady)
+        snippets = _record(service.snippetsReady)
+        generation = service.search('walk', immediate=True)
+        qtbot.waitUntil(lambda: bool(pages), timeout=5000)
+        first = pages[0][2]
+
+        service.request_snippets(first[:3])
+        qtbot.waitUntil(lambda: bool(snippets), timeout=5000)
+        assert snippets[0][0] == generation
+        assert all('<mark>' in result.snippet for result in first[:3])
+        assert first[3].snippet == ''
+
+        service.load_more(len(first))
+        qtbot.waitUntil(lambda: len(pages) == 2, timeout=5000)
+        _, offset, second = pages[1]
+        assert offset == 10 and len(second) == 15
+        assert not {r.entry_id for r in first} & {r.entry_id for r in second}
+
+    def test_cancelled_search_emits_nothing(self, service, qtbot):
+        """Test that results of a cancelled or superseded search are dropped."""
+        pages = _record(service.pageReady)
+        service.search('river', immediate=True)
+        service.cancel()
+        qtbot.wait(300)
+        assert pages == []
+
+        service.search('walk')
+        generation = service.search('number', immediate=True)
+        qtbot.waitUntil(lambda: bool(pages), timeout=5000)
+        qtbot.wait(100)
+        assert [page[0] for page in pages] == [generation]
+
+    def test_failure_reported(self, tmp_path, qtbot):
+        """Test that a failing search is reported with its generation."""
+        sqlite3.connect(tmp_path / 'empty.db').close()
+        service = JournalSearchService(str(tmp_path / 'empty.db'), debounce_ms=0)
+        failures = _record(service.searchFailed)
+        try:
+            generation = service.search('river')
+            qtbot.waitUntil(lambda: bool(failures), timeout=5000)
+        finally:
+            service.shutdown()
+        assert failures[0][0] == generation
+        assert 'journal_search' in failures[0][1]
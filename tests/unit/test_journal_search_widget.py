@@ -17,7 +17,7 @@ from PyQt6.QtCore import Qt, QThread
 from PyQt6.QtTest import QTest
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
-from src.ui.journal_search_widget import JournalSearchWidget, SearchWorker
+from src.ui.journal_search_widget import JournalSearchWidget
 from src.analytics.journal_search_engine import SearchResult
 from src.models import JournalEntry
 
@@ -57,90 +57,6 @@ def search_widget(qtbot):
             return widget
 
 
-@pytest.mark.ui
-class TestSearchWorker:
-    """Test the SearchWorker thread."""
-    
-    def test_worker_initialization(self):
-        """Test worker initialization."""
-        mock_engine = Mock()
-        worker = SearchWorker(mock_engine)
-        
-        assert worker.search_engine == mock_engine
-        assert worker.query == ""
-        assert worker.filters is None
-        assert worker.limit == 50
-        assert worker._is_cancelled is False
-        
-    def test_set_search_params(self):
-        """Test setting search parameters."""
-        worker = SearchWorker(Mock())
-        
-        worker.set_search_params(
-            query="test query",
-            filters={'type': 'daily'},
-            limit=100
-        )
-        
-        assert worker.query == "test query"
-        assert worker.filters == {'type': 'daily'}
-        assert worker.limit == 100
-        assert worker._is_cancelled is False
-        
-    def test_cancel_operation(self):
-        """Test cancelling search operation."""
-        worker = SearchWorker(Mock())
-        worker.cancel()
-        
-        assert worker._is_cancelled is True
-        
-    @patch('src.ui.journal_search_widget.logger')
-    def test_run_success(self, mock_logger, qtbot):
-        """Test successful search execution."""
-        mock_engine = Mock()
-        mock_results = [Mock(), Mock()]
-        mock_engine.search.return_value = mock_results
-        
-        worker = SearchWorker(mock_engine)
-        worker.set_search_params("test", None, 50)
-        
-        # Connect signal spy
-        results_signal = []
-        progress_updates = []
-        worker.resultsReady.connect(results_signal.append)
-        worker.progressUpdate.connect(lambda p, m: progress_updates.append((p, m)))
-        
-        # Run worker
-        worker.run()
-        
-        # Check search was executed
-        mock_engine.search.assert_called_once_with("test", None, 50)
-        
-        # Check signals emitted
-        assert len(results_signal) == 1
-        assert results_signal[0] == mock_results
-        assert len(progress_updates) >= 3  # At least 3 progress updates
-        
-    def test_run_with_error(self, qtbot):
-        """Test search execution with error."""
-        mock_engine = Mock()
-        mock_engine.search.side_effect = Exception("Search failed")
-        
-        worker = SearchWorker(mock_engine)
-        worker.set_search_params("test", None, 50)
-        
-        # Connect signal spy
-        error_signal = []
-        worker.errorOccurred.connect(error_signal.append)
-        
-        # Run worker
-        worker.run()
-        
-        # Check error signal emitted
-        assert len(error_signal) == 1
-        assert "Search failed" in error_signal[0]
-
-
 @pytest.mark.ui
 class TestJournalSearchWidget:
     """Test the main search widget."""
@@ -150,7 +66,7 @@ class TestJournalSearchWidget:
         assert search_widget.search_bar is not None
         assert search_widget.results_widget is not None
         assert search_widget.progress_bar is not None
-        assert search_widget.search_worker is not None
+        assert search_widget.search_service is not None
         assert search_widget._current_query == ""
         assert search_widget._current_offset == 0
         assert search_widget._has_more_results is True
@@ -161,9 +77,9 @@ class TestJournalSearchWidget:
         
     def test_search_request_handling(self, search_widget, qtbot):
         """Test handling search requests."""
-        # Mock worker
-        search_widget.search_worker = Mock()
-        search_widget.search_worker.isRunning.return_value = False
+        # Mock service
+        search_widget.search_service = Mock(first_page_size=20)
+        search_widget.search_service.search.return_value = 7
         
         # Mock search bar filters
         search_widget.search_bar.get_filters = Mock(return_value={'type': 'daily'})
@@ -186,37 +102,53 @@ class TestJournalSearchWidget:
         # Note: Progress bar visibility is unreliable in headless Qt tests
         # so we skip that assertion
         
-        # Check worker started
-        search_widget.search_worker.set_search_params.assert_called_once_with(
+        # Check search handed to the service without debounce
+        search_widget.search_service.search.assert_called_once_with(
             "test query",
             {'type': 'daily'},
-            limit=50
+            immediate=True
         )
-        search_widget.search_worker.start.assert_called_once()
+        assert search_widget._search_generation == 7
         
         # Check signal emitted
         assert search_started == ["test query"]
         
+        # Pressing Enter on the query typing already searched is a no-op
+        search_widget._on_search_requested("test query")
+        search_widget.search_service.search.assert_called_once()
+        
     def test_empty_query_ignored(self, search_widget):
         """Test that empty queries are ignored."""
-        search_widget.search_worker = Mock()
+        search_widget.search_service = Mock()
         
         search_widget._on_search_requested("   ")
         
-        search_widget.search_worker.start.assert_not_called()
+        search_widget.search_service.search.assert_not_called()
         
-    def test_ongoing_search_cancelled(self, search_widget):
-        """Test cancelling ongoing search before new one."""
-        # Mock running worker
-        search_widget.search_worker = Mock()
-        search_widget.search_worker.isRunning.return_value = True
+    def test_typing_is_debounced_by_service(self, search_widget):
+        """Test that edits go to the service with its debounce."""
+        search_widget.search_service = Mock(first_page_size=20)
+        search_widget.search_bar.get_filters = Mock(return_value={})
         
-        # Trigger search
-        search_widget._on_search_requested("new query")
+        search_widget._on_query_edited("walk")
+        
+        search_widget.search_service.search.assert_called_once_with(
+            "walk", {}, immediate=False
+        )
+        
+    def test_stale_pages_ignored(self, search_widget, mock_search_results):
+        """Test that pages of a superseded search are not displayed."""
+        search_widget._search_generation = 3
+        search_widget.results_widget.display_results = Mock()
         
-        # Check cancel called
-        search_widget.search_worker.cancel.assert_called_once()
-        search_widget.search_worker.wait.assert_called_once()
+        search_widget._on_page_ready(2, 0, mock_search_results)
+        search_widget.results_widget.display_results.assert_not_called()
+        
+        search_widget._on_page_ready(3, 0, mock_search_results)
+        search_widget.results_widget.display_results.assert_called_once_with(
+            mock_search_results,
+            append=False
+        )
         
     def test_results_handling(self, search_widget, mock_search_results, qtbot):
         """Test handling search results."""
@@ -252,7 +184,7 @@ class TestJournalSearchWidget:
         
         # Check pagination state
         assert search_widget._current_offset == 2
-        assert search_widget._has_more_results is False  # Less than 50 results
+        assert search_widget._has_more_results is False  # Short page
         
     def test_pagination_handling(self, search_widget, mock_search_results):
         """Test pagination and infinite scrolling."""
@@ -330,35 +262,26 @@ class TestJournalSearchWidget:
         search_widget._current_offset = 50
         
         # Mock methods
-        search_widget.search_worker = Mock()
-        search_widget.search_worker.isRunning.return_value = False
-        search_widget.search_bar.get_filters = Mock(return_value={'type': 'daily'})
+        search_widget.search_service = Mock(page_size=50)
         
         # Load more
         search_widget._load_more_results()
         
-        # Check search triggered with same query
-        search_widget.search_worker.set_search_params.assert_called_once()
-        call_args = search_widget.search_worker.set_search_params.call_args
-        if call_args.args:  # If positional args exist
-            args = call_args.args
-            assert args[0] == "test"
-            assert args[1] == {'type': 'daily'}
-            # Check keyword args for limit
-            if call_args.kwargs:
-                assert call_args.kwargs.get('limit') == 50
-        else:  # If only keyword args
-            kwargs = call_args.kwargs
-            assert kwargs.get('query') == "test" or kwargs.get('search_text') == "test"
+        # Check the next page was requested after the shown results
+        search_widget.search_service.load_more.assert_called_once_with(50, 50)
+        
+        # A second request waits for the page in flight
+        search_widget._load_more_results()
+        search_widget.search_service.load_more.assert_called_once()
         
     def test_no_more_results_prevents_loading(self, search_widget):
         """Test that load more is prevented when no more results."""
         search_widget._has_more_results = False
-        search_widget.search_worker = Mock()
+        search_widget.search_service = Mock()
         
         search_widget._load_more_results()
         
-        search_widget.search_worker.start.assert_not_called()
+        search_widget.search_service.load_more.assert_not_called()
         
     def test_filter_change_triggers_search(self, search_widget):
         """Test that filter changes trigger new search."""
@@ -0,0 +1,91 @@
+"""Tests for L1 cache sizing, large objects and eviction policies."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cache_manager import LRUCache
+from src.analytics.cache_sizing import estimate_size
+from src.analytics.daily_metrics_calculator import MetricStatistics
+
+
+class TestEstimateSize:
+    """Test structural size estimates."""
+
+    def test_array_and_frame_sizes(self):
+        """Test that numeric buffers are counted without serialization."""
+        values = np.zeros(100_000)
+        frame = pd.DataFrame({'a': values, 'b': values})
+
+        assert estimate_size(values) >= values.nbytes
+        assert estimate_size(frame) >= 2 * values.nbytes
+
+    def test_dataclass_fields_are_included(self):
+        """Test that dataclass fields contribute to the estimate."""
+        stats = MetricStatistics(metric_name='steps', count=10, mean=1.0, median=1.0,
+                                 std=0.5, min=0.0, max=2.0, percentile_25=0.5,
+                                 percentile_75=1.5, percentile_95=1.9)
+        big = {'series': np.zeros(10_000), 'stats': stats}
+
+        assert estimate_size(big) > estimate_size(stats) + 80_000
+
+
+class TestLargeObjects:
+    """Test the large-object segment."""
+
+    def test_large_values_are_cached(self):
+        """Test that values over the large-object threshold still get L1 hits."""
+        cache = LRUCache(max_memory_mb=40, large_object_mb=1.0, large_memory_mb=20)
+        matrix = pd.DataFrame(np.zeros((365, 1000)))
+
+        cache.set('matrix', matrix)
+
+        assert cache.get('matrix') is matrix
+
+    def test_large_values_do_not_evict_small_entries(self):
+        """Test that large values compete only within their own budget."""
+        cache = LRUCache(max_memory_mb=10, large_object_mb=1.0, large_memory_mb=3)
+        for i in range(20):
+            cache.set(f'small_{i}', {'mean': float(i)})
+        for i in range(5):
+            cache.set(f'large_{i}', np.zeros(150_000))
+
+        assert all(cache.get(f'small_{i}') is not None for i in range(20))
+        assert cache.get('large_4') is not None
+        assert cache.get('large_0') is None
+
+
+class TestEvictionPolicies:
+    """Test scan resistance of the segmented policies."""
+
+    @pytest.mark.parametrize('policy', ['slru', 'tinylfu'])
+    def test_scan_does_not_flush_working_set(self, policy):
+        """Test that a one-off scan leaves frequently used entries cached."""
+        cache = LRUCache(maxsize=20, eviction_policy=policy)
+        hot = [f'hot_{i}' for i in range(5)]
+        for _ in range(3):
+            for key in hot:
+                if cache.get(key) is None:
+                    cache.set(key, key)
+
+        for i in range(100):
+            key = f'scan_{i}'
+            if cache.get(key) is None:
+                cache.set(key, key)
+
+        assert all(cache.get(key) == key for key in hot)
+
+    def test_lru_policy_is_flushed_by_scan(self):
+        """Test that plain LRU keeps the previous behaviour."""
+        cache = LRUCache(maxsize=20, eviction_policy='lru')
+        cache.set('hot', 'hot')
+        cache.get('hot')
+        for i in range(100):
+            cache.set(f'scan_{i}', i)
+
+        assert cache.get('hot') is None
+
+    def test_rejects_unknown_policy(self):
+        """Test that unsupported policies are rejected."""
+        with pytest.raises(ValueError):
+            LRUCache(eviction_policy='fifo')
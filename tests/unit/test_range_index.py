@@ -0,0 +1,108 @@
+"""Tests for the viewport range indexes."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ui.charts.optimized_data_structures import ChunkedDataStore
+from src.ui.charts.range_index import BoundsIndex, TimeRangeIndex
+
+
+def _overlapping(boxes, query):
+    x_min, y_min, x_max, y_max = query
+    return [item_id for item_id, (bx0, by0, bx1, by1) in boxes
+            if not (x_max < bx0 or x_min > bx1 or y_max < by0 or y_min > by1)]
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(3)
+
+
+class TestTimeRangeIndex:
+    """Test binary-search interval queries."""
+
+    def test_overlapping_intervals(self, rng):
+        """Test that queries return exactly the intersecting intervals."""
+        starts = rng.uniform(0, 1000, 500)
+        ends = starts + rng.uniform(0, 40, 500)
+        index = TimeRangeIndex()
+        index.build(starts, ends)
+
+        for _ in range(100):
+            lo = rng.uniform(-50, 1050)
+            hi = lo + rng.uniform(0, 120)
+            expected = np.nonzero((starts <= hi) & (ends >= lo))[0]
+            np.testing.assert_array_equal(index.query_range(lo, hi), expected)
+
+    def test_points_and_nearest(self):
+        """Test point lookups on a series' timestamps."""
+        timestamps = np.array([0, 10, 20, 30, 40, 50])
+        index = TimeRangeIndex()
+        index.build(timestamps)
+
+        np.testing.assert_array_equal(index.query_range(15, 40), [2, 3, 4])
+        assert len(index.query_range(60, 70)) == 0
+        np.testing.assert_array_equal(index.query_nearest(29, 2), [3, 2])
+        assert index.bounds == (0.0, 50.0)
+
+    def test_incremental_inserts(self):
+        """Test that items inserted one by one are indexed on query."""
+        index = TimeRangeIndex()
+        for chunk_id, start in enumerate([200, 0, 100]):
+            index.insert(chunk_id, start, start + 99)
+
+        np.testing.assert_array_equal(index.query_range(150, 250), [0, 2])
+
+    def test_chunked_store_uses_index(self):
+        """Test that chunked range queries still merge the right chunks."""
+        store = ChunkedDataStore(chunk_size=100)
+        timestamps = np.arange(0, 1000, dtype='int64')
+        store.add_data(timestamps, timestamps.astype(float))
+
+        result = store.query_range(250, 449)
+
+        np.testing.assert_array_equal(result.timestamps, np.arange(250, 450))
+
+
+class TestBoundsIndex:
+    """Test the packed R-tree over chunk bounds."""
+
+    def test_matches_linear_scan(self, rng):
+        """Test that tree queries equal a scan over all boxes."""
+        boxes = []
+        for item_id in range(2000):
+            x, y = rng.uniform(0, 10_000), rng.uniform(0, 100)
+            box = (x, y, x + rng.uniform(0, 30), y + rng.uniform(0, 10))
+            if item_id % 97 == 0:
+                box = (x, float('nan'), x + 5, float('nan'))
+            boxes.append((item_id * 2, box))
+        index = BoundsIndex(node_size=8)
+        for item_id, box in boxes:
+            index.insert(item_id, box)
+
+        for _ in range(100):
+            x, y = rng.uniform(-100, 10_000), rng.uniform(-10, 100)
+            query = (x, y, x + rng.uniform(0, 500), y + rng.uniform(0, 40))
+            assert index.query(*query) == _overlapping(boxes, query)
+
+    def test_virtualization_engine_viewport(self):
+        """Test chunk lookup through the virtualization engine."""
+        from src.ui.charts.visualization_performance_optimizer import (
+            ChartVirtualizationEngine, ViewportConfig)
+
+        engine = ChartVirtualizationEngine()
+        engine.chunk_size = 1000
+        index = pd.date_range('2024-01-01', periods=20_000, freq='min')
+        data = pd.DataFrame({'value': np.arange(20_000, dtype=float)}, index=index)
+        source = engine.setup_virtualization(data)
+
+        viewport = ViewportConfig(x_min=index[4500].timestamp(), x_max=index[6200].timestamp(),
+                                  y_min=0, y_max=1e6, width_pixels=2000, height_pixels=400)
+
+        assert source.spatial_index.query(viewport.x_min, viewport.y_min,
+                                          viewport.x_max, viewport.y_max) == [4, 5, 6]
+        visible = engine.get_viewport_data(source, viewport)
+        assert visible['value'].min() == 4500
+        assert visible['value'].max() == 6200
+        engine.prefetch_executor.shutdown(wait=True)
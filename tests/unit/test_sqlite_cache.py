@@ -0,0 +1,80 @@
+"""Tests for the persistent-connection L2 SQLite cache."""
+
+import gc
+import sqlite3
+import threading
+
+import pytest
+
+from src.analytics.cache_manager import SQLiteCache
+
+
+@pytest.fixture
+def l2_cache(tmp_path):
+    """SQLite cache in a temporary database."""
+    cache = SQLiteCache(db_path=str(tmp_path / "l2.db"), access_flush_size=4)
+    yield cache
+    cache.close()
+
+
+def _access_count(cache, key):
+    with sqlite3.connect(cache.db_path) as conn:
+        return conn.execute("SELECT access_count FROM cache_entries WHERE key = ?",
+                            (key,)).fetchone()[0]
+
+
+class TestSQLiteCache:
+    """Test bulk operations and deferred access statistics."""
+
+    def test_get_many_and_set_many(self, l2_cache):
+        """Test that bulk writes and reads round-trip in one call each."""
+        items = {f"key_{i}": {'value': i} for i in range(1500)}
+
+        assert l2_cache.set_many(items, ttl=3600) == 1500
+        found = l2_cache.get_many(list(items) + ['missing'])
+
+        assert found == items
+        stats = l2_cache.get_latency_stats()
+        assert stats['set_many']['count'] == 1
+        assert stats['get_many']['count'] == 1
+
+    def test_hits_defer_access_statistics(self, l2_cache):
+        """Test that hits are buffered and written in batches."""
+        l2_cache.set_many({f"stats_{i}": i for i in range(4)}, ttl=3600)
+
+        for _ in range(2):
+            for i in range(3):
+                assert l2_cache.get(f"stats_{i}") == i
+        assert _access_count(l2_cache, "stats_0") == 1
+
+        l2_cache.get("stats_3")  # Fourth pending key fills the batch
+        assert _access_count(l2_cache, "stats_0") == 3
+        assert _access_count(l2_cache, "stats_3") == 2
+
+    def test_connections_are_per_thread(self, l2_cache):
+        """Test that threads reuse their own connection and close it on exit."""
+        l2_cache.set("shared", "value")
+        results = []
+        used = {}
+        barrier = threading.Barrier(4)
+
+        def worker():
+            for _ in range(10):
+                results.append(l2_cache.get("shared"))
+                used.setdefault(threading.get_ident(), set()).add(l2_cache._get_connection())
+            barrier.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+
+        assert results == ["value"] * 40
+        assert all(len(conns) == 1 for conns in used.values())
+        worker_conns = [conn for conns in used.values() for conn in conns]
+        assert len(set(map(id, worker_conns))) == 4
+        assert len(l2_cache._connections) == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            worker_conns[0].execute("SELECT 1")
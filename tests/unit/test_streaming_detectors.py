@@ -0,0 +1,99 @@
+"""Tests for online streaming anomaly detectors."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomaly_detection_system import AnomalyDetectionSystem
+from src.analytics.anomaly_models import DetectionConfig, DetectionMethod
+from src.analytics.ensemble_detector import EnsembleDetector
+from src.analytics.streaming_detectors import (
+    EWMAZScoreDetector, OnlineZScoreDetector, P2Quantile,
+    StreamingIQRDetector, StreamingModifiedZScoreDetector,
+    create_streaming_detectors
+)
+
+
+@pytest.fixture
+def heart_rate():
+    """Resting heart rate with a single spike on the last day."""
+    index = pd.date_range('2024-01-01', periods=200, freq='D')
+    rng = np.random.default_rng(3)
+    values = 60 + rng.normal(0, 2, len(index))
+    values[-1] = 95
+    return pd.Series(values, index=index, name='heart_rate')
+
+
+class TestP2Quantile:
+    """Test streaming quantile sketch accuracy."""
+
+    @pytest.mark.parametrize('q', [0.25, 0.5, 0.75])
+    def test_estimate_close_to_exact_quantile(self, q):
+        """Test that the sketch tracks the exact quantile of a large stream."""
+        values = np.random.default_rng(0).normal(100, 15, 20000)
+        sketch = P2Quantile(q)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.value == pytest.approx(np.quantile(values, q), abs=1.0)
+
+
+class TestOnlineDetectors:
+    """Test per-point detection and stream cursors."""
+
+    @pytest.mark.parametrize('detector_cls', [
+        OnlineZScoreDetector, EWMAZScoreDetector,
+        StreamingModifiedZScoreDetector, StreamingIQRDetector
+    ])
+    def test_flags_spike(self, heart_rate, detector_cls):
+        """Test that each detector flags the final spike."""
+        anomalies = detector_cls().detect(heart_rate)
+
+        assert heart_rate.index[-1] in [a.timestamp for a in anomalies]
+
+    def test_points_are_processed_once(self, heart_rate):
+        """Test that re-submitting a growing series only scores new points."""
+        detector = OnlineZScoreDetector()
+        detector.detect(heart_rate.iloc[:-1])
+        detector.detect(heart_rate)
+
+        assert detector.points_processed == len(heart_rate)
+
+    def test_metrics_keep_separate_statistics(self, heart_rate):
+        """Test that statistics are tracked per metric."""
+        detector = OnlineZScoreDetector()
+        detector.detect(heart_rate)
+        steps = (heart_rate * 100).rename('steps')
+
+        assert detector.detect(steps)[-1].metric == 'steps'
+
+    def test_ensemble_combines_streaming_detectors(self, heart_rate):
+        """Test that streaming detectors vote through EnsembleDetector."""
+        detectors = create_streaming_detectors()
+        config = DetectionConfig(enabled_methods=[
+            DetectionMethod.ZSCORE, DetectionMethod.MODIFIED_ZSCORE, DetectionMethod.IQR
+        ])
+        ensemble = EnsembleDetector(detectors, config)
+
+        anomalies = ensemble.detect(heart_rate)
+
+        spike = [a for a in anomalies if a.timestamp == heart_rate.index[-1]]
+        assert spike and spike[0].method == DetectionMethod.ENSEMBLE
+
+
+class TestRealTimeStreaming:
+    """Test that real-time detection uses online detectors only when asked to."""
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_streaming_is_opt_in(self, heart_rate, streaming, tmp_path, monkeypatch):
+        """Test that the streaming ensemble runs only with real_time_streaming set."""
+        monkeypatch.chdir(tmp_path)
+        options = {'real_time_streaming': True} if streaming else {}
+        system = AnomalyDetectionSystem(DetectionConfig(real_time_enabled=True, **options))
+        calls = []
+        monkeypatch.setattr(system.streaming_ensemble, 'detect',
+                            lambda data: calls.append(data) or [])
+
+        system.detect_anomalies(heart_rate, real_time=True)
+
+        assert bool(calls) == streaming
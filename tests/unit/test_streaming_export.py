@@ -0,0 +1,180 @@
+"""Tests for the streaming CSV, JSON and Excel exporters."""
+
+import csv
+import io
+import json
+import sqlite3
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.analytics.streaming_export import (ExportCancelledError, HealthRecordChunkSource,
+                                            RunningStats, StreamingDataExporter)
+
+
+def _config(metrics, include_insights=True):
+    return SimpleNamespace(metrics=metrics, include_insights=include_insights,
+                           date_range=(date(2024, 1, 1), date(2024, 1, 31)))
+
+
+@pytest.fixture
+def record_db(tmp_path):
+    """Database with 500 step records and 30 heart rate records in January."""
+    path = tmp_path / 'health.db'
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE health_records (type TEXT, sourceName TEXT, unit TEXT,
+                    startDate TEXT, endDate TEXT, value REAL)""")
+    rng = np.random.default_rng(5)
+    start = pd.Timestamp('2024-01-01 06:00')
+    rows = []
+    for i in range(500):
+        when = (start + pd.Timedelta(minutes=85 * i)).strftime('%Y-%m-%d %H:%M:%S-05:00')
+        rows.append(('HKQuantityTypeIdentifierStepCount', 'Watch', 'count', when, when,
+                     float(rng.integers(10, 2000))))
+    for day in range(1, 31):
+        when = f'2024-01-{day:02d} 12:00:00-05:00'
+        rows.append(('HKQuantityTypeIdentifierHeartRate', 'Watch', 'count/min', when, when,
+                     60.0 + day))
+    # Outside the date range
+    rows.append(('HKQuantityTypeIdentifierHeartRate', 'Watch', 'count/min',
+                 '2024-02-05 12:00:00-05:00', '2024-02-05 12:00:00-05:00', 200.0))
+    conn.executemany("INSERT INTO health_records VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+class TestRunningStats:
+    """Test statistics merged across chunks."""
+
+    def test_matches_whole_series(self):
+        """Test that chunked statistics equal those of the full series."""
+        values = np.random.default_rng(1).normal(50, 10, 1000)
+        index = pd.date_range('2024-01-01', periods=1000, freq='h')
+        stats = RunningStats()
+        for lo in range(0, 1000, 137):
+            stats.update(index[lo:lo + 137], values[lo:lo + 137])
+
+        summary = stats.as_summary()
+        series = pd.Series(values)
+        assert summary['count'] == 1000
+        assert summary['mean'] == pytest.approx(series.mean())
+        assert summary['std'] == pytest.approx(series.std())
+        assert summary['min'] == series.min() and summary['max'] == series.max()
+        slope = np.polyfit(np.arange(1000), values, 1)[0]
+        assert summary['trend'] == ('Stable' if abs(slope) < 0.01 else
+                                    'Increasing' if slope > 0 else 'Decreasing')
+        daily = stats.daily_means()
+        pd.testing.assert_series_equal(
+            daily['value'], series.groupby(index.normalize()).mean().set_axis(daily.index),
+            check_names=False)
+
+
+class TestStreamingDataExporter:
+    """Test exports written chunk by chunk from the database."""
+
+    def test_csv_streams_all_records(self, record_db, tmp_path):
+        """Test that every record in range is written with summary statistics."""
+        progress = []
+        exporter = StreamingDataExporter(HealthRecordChunkSource(record_db), chunk_size=64,
+                                         progress=lambda pct, msg: progress.append(pct))
+        target = tmp_path / 'export.csv'
+        summary = exporter.write_csv(target, _config(['step_count', 'heart_rate']))
+
+        rows = list(csv.reader(target.open(newline='', encoding='utf-8')))
+        assert rows[4] == ['Metric: Step Count']
+        assert rows[5] == ['Date', 'Value', 'Unit']
+        assert rows[6][0] == '2024-01-01 06:00:00' and rows[6][2] == 'count'
+        assert float(rows[6][1]) >= 10
+        heart = rows.index(['Metric: Heart Rate'])
+        assert heart == 6 + 500 + 1
+        assert rows[heart + 2][0] == '2024-01-01 12:00:00'
+        assert rows[-1][0] == 'Heart Rate' and rows[-1][1] == '30'
+        assert summary['heart_rate']['mean'] == pytest.approx(75.5)
+        assert progress[-1] == 100 and len(progress) > 8
+        assert not (tmp_path / 'export.csv.part').exists()
+
+    def test_json_matches_records(self, record_db):
+        """Test that the JSON document parses and holds every record."""
+        exporter = StreamingDataExporter(HealthRecordChunkSource(record_db), chunk_size=100)
+        buffer = io.BytesIO()
+        exporter.write_json(buffer, _config(['step_count', 'heart_rate', 'sleep']),
+                            insights_factory=lambda metrics: [{'title': sorted(metrics)}])
+
+        document = json.loads(buffer.getvalue())
+        assert list(document['data']) == ['step_count', 'heart_rate', 'sleep']
+        assert document['data']['sleep'] == []
+        assert len(document['data']['step_count']) == 500
+        assert document['data']['heart_rate'][0] == {
+            'timestamp': '2024-01-01T12:00:00', 'value': 61.0, 'unit': 'count/min'}
+        assert document['summary_statistics']['heart_rate']['count'] == 30
+        assert document['insights'] == [{'title': ['heart_rate', 'step_count']}]
+
+    def test_excel_sheets(self, record_db, tmp_path):
+        """Test the write-only workbook layout."""
+        exporter = StreamingDataExporter(HealthRecordChunkSource(record_db), chunk_size=128)
+        target = tmp_path / 'export.xlsx'
+        exporter.write_excel(target, _config(['step_count', 'heart_rate']))
+
+        workbook = load_workbook(target)
+        assert workbook.sheetnames == ['Summary', 'Step Count', 'Heart Rate']
+        steps = workbook['Step Count']
+        assert [cell.value for cell in steps[1]] == ['Date', 'Time', 'Value', 'Unit']
+        assert steps.max_row == 501
+        assert workbook['Heart Rate']['C2'].value == 61.0
+        summary_rows = [[cell.value for cell in row] for row in workbook['Summary'].iter_rows()]
+        assert ['Heart Rate', 30, 75.5, 61, 90, pytest.approx(8.8, abs=0.01)] in summary_rows
+
+    def test_cancel_removes_partial_file(self, record_db, tmp_path):
+        """Test that a cancelled export leaves no output behind."""
+        calls = []
+
+        def cancelled():
+            calls.append(1)
+            return len(calls) > 2
+
+        exporter = StreamingDataExporter(HealthRecordChunkSource(record_db), chunk_size=50,
+                                         is_cancelled=cancelled)
+        target = tmp_path / 'export.csv'
+        with pytest.raises(ExportCancelledError):
+            exporter.write_csv(target, _config(['step_count']))
+        assert list(tmp_path.glob('export.csv*')) == []
+
+    def test_data_manager_source(self):
+        """Test exporting from a data manager without a chunked reader."""
+        frame = pd.DataFrame({'value': [1.0, 2.0, 3.0], 'unit': 'kg'},
+                             index=pd.date_range(datetime(2024, 1, 2), periods=3, freq='D'))
+        manager = SimpleNamespace(get_metric_data=lambda metric, start, end: frame)
+        buffer = io.BytesIO()
+        StreamingDataExporter(manager, chunk_size=2).write_json(buffer, _config(['body_mass']))
+
+        document = json.loads(buffer.getvalue())
+        assert [r['value'] for r in document['data']['body_mass']] == [1.0, 2.0, 3.0]
+        assert document['summary_statistics']['body_mass']['trend'] == 'Increasing'
+
+
+class TestHealthRecordChunkSource:
+    """Test which record types a metric name reads."""
+
+    @pytest.mark.parametrize('metric, stored_type', [
+        ('active_energy', 'ActiveEnergyBurned'),
+        ('heart_rate_variability', 'HKQuantityTypeIdentifierHeartRateVariabilitySDNN'),
+        ('walking_heart_rate', 'WalkingHeartRateAverage'),
+        ('vo2_max', 'VO2Max'),
+        ('heart_rate', 'HeartRate'),
+    ])
+    def test_metric_names_match_healthkit_types(self, tmp_path, metric, stored_type):
+        """Test that metric names find records whose type is not their CamelCase."""
+        path = tmp_path / 'health.db'
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE health_records (type TEXT, startDate TEXT, value REAL)")
+            conn.executemany("INSERT INTO health_records VALUES (?, ?, ?)",
+                             [(stored_type, '2024-01-05 08:00:00-05:00', 42.0),
+                              ('StepCount', '2024-01-05 08:00:00-05:00', 1.0)])
+
+        source = HealthRecordChunkSource(str(path))
+        assert source.count_metric_data(metric, date(2024, 1, 1), date(2024, 1, 31)) == 1
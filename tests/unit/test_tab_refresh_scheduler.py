@@ -0,0 +1,106 @@
+"""Tests for lazy dashboard tab refreshes."""
+
+import threading
+
+import pytest
+
+from src.ui.tab_refresh_scheduler import TabRefreshScheduler
+
+
+class FakeTabs:
+    """Stands in for the tab widget's current index."""
+
+    def __init__(self):
+        self.current = 1
+
+    def currentIndex(self):
+        return self.current
+
+
+@pytest.fixture
+def tabs():
+    return FakeTabs()
+
+
+@pytest.fixture
+def scheduler(qapp, tabs):
+    """Scheduler with two tabs that record their prepare and refresh calls."""
+    scheduler = TabRefreshScheduler(tabs.currentIndex, coalesce_ms=20)
+    scheduler.calls = []
+    scheduler.prepare_threads = []
+
+    def prepare(payload):
+        scheduler.prepare_threads.append(threading.current_thread())
+        return f"prepared:{payload}"
+
+    for index, name in ((1, 'daily'), (2, 'weekly')):
+        scheduler.register(
+            index,
+            refresh=lambda prepared, name=name: scheduler.calls.append((name, prepared)),
+            prepare=lambda payload: prepare(payload),
+            name=name
+        )
+    yield scheduler
+    scheduler.shutdown()
+
+
+class TestTabRefreshScheduler:
+    """Test dirty tracking, coalescing and background preparation."""
+
+    def test_only_visible_tab_refreshes(self, qtbot, scheduler):
+        """Test that an invalidation refreshes the visible tab only."""
+        scheduler.invalidate('v1')
+
+        qtbot.waitUntil(lambda: scheduler.calls == [('daily', 'prepared:v1')])
+        assert scheduler.is_dirty(2)
+        assert all(t is not threading.main_thread() for t in scheduler.prepare_threads)
+
+    def test_rapid_invalidations_coalesce(self, qtbot, scheduler):
+        """Test that a burst of filter changes refreshes once with the last data."""
+        for version in range(5):
+            scheduler.invalidate(f'v{version}')
+
+        qtbot.waitUntil(lambda: bool(scheduler.calls))
+        qtbot.wait(50)
+        assert scheduler.calls == [('daily', 'prepared:v4')]
+
+    def test_next_tab_is_prefetched_and_refreshed_on_show(self, qtbot, scheduler, tabs):
+        """Test that the likely next tab is prepared before it is shown."""
+        scheduler.invalidate('v1')
+        qtbot.waitUntil(lambda: scheduler.get_timings()['weekly']['prefetches'] == 1)
+
+        tabs.current = 2
+        scheduler.tab_shown(2)
+
+        assert scheduler.calls[-1] == ('weekly', 'prepared:v1')
+        assert not scheduler.is_dirty(2)
+        scheduler.tab_shown(2)
+        assert len(scheduler.calls) == 2
+        assert scheduler.get_timings()['weekly']['refreshes'] == 1
+
+    def test_shared_prepare_runs_once(self, qtbot, qapp, tabs):
+        """Test that tabs with the same prepare step reuse its result instead of prefetching."""
+        scheduler = TabRefreshScheduler(tabs.currentIndex, coalesce_ms=20)
+        prepared = []
+        calls = []
+
+        def prepare(payload):
+            prepared.append(payload)
+            return f"prepared:{payload}"
+
+        for index, name in ((1, 'daily'), (2, 'weekly')):
+            scheduler.register(index, refresh=lambda result, name=name: calls.append((name, result)),
+                               prepare=prepare, name=name)
+        try:
+            scheduler.invalidate('v1')
+            qtbot.waitUntil(lambda: bool(calls))
+            qtbot.wait(50)
+
+            tabs.current = 2
+            scheduler.tab_shown(2)
+
+            assert calls == [('daily', 'prepared:v1'), ('weekly', 'prepared:v1')]
+            assert prepared == ['v1']
+            assert scheduler.get_timings()['weekly']['prefetches'] == 0
+        finally:
+            scheduler.shutdown()
@@ -0,0 +1,152 @@
+"""Tests for checkpointed, resumable streaming imports."""
+
+import sqlite3
+import subprocess
+import sys
+import xml.sax
+from pathlib import Path
+
+import pytest
+
+from src.analytics.import_summary_accumulator import ImportSummaryAccumulator
+from src.import_history import IMPORT_CHECKPOINT_COLUMNS, ensure_import_history_table
+from src.utils.error_handler import DataImportError
+from src.xml_streaming_processor import AppleHealthHandler, XMLStreamingProcessor
+
+RECORDS = 1000
+
+
+def _write_export(path, records=RECORDS):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<!DOCTYPE HealthData [',
+             '<!ELEMENT HealthData (ExportDate,Record*,Correlation*)>',
+             ']>',
+             '<HealthData locale="en_US">',
+             ' <ExportDate value="2024-06-01 00:00:00 +0000"/>']
+    for i in range(records):
+        start = f"2024-01-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:00 +0000"
+        record = (f'<Record type="HKQuantityTypeIdentifierStepCount" sourceName="Phone" '
+                  f'unit="count" startDate="{start}" endDate="{start}" value="{i}"')
+        if i % 100 == 50:
+            # Records nested in a correlation are imported too
+            lines.append(f' <Correlation type="Food" startDate="{start}">{record}/></Correlation>')
+        else:
+            lines.append(f' {record}>\n  <MetadataEntry key="HKWasUserEntered" value="0"/>\n </Record>')
+    lines.append('</HealthData>')
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def _cancel_after(monkeypatch, records):
+    original = AppleHealthHandler._process_record
+
+    def process(handler, record):
+        if handler.records_seen == records:
+            raise xml.sax.SAXException("Import cancelled by user")
+        original(handler, record)
+
+    monkeypatch.setattr(AppleHealthHandler, '_process_record', process)
+
+
+def _history(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute("SELECT * FROM import_history ORDER BY id")]
+
+
+class TestCheckpointedImport:
+    """Test that interrupted imports keep their checkpoints and resume."""
+
+    def test_cancel_then_resume(self, tmp_path, monkeypatch):
+        """Test that a resumed import parses only what the checkpoint had not committed."""
+        xml_path = _write_export(tmp_path / 'export.xml')
+        db_path = str(tmp_path / 'health.db')
+        processor = XMLStreamingProcessor()
+
+        with monkeypatch.context() as patch:
+            _cancel_after(patch, 650)
+            with pytest.raises(DataImportError):
+                processor._stream_process(xml_path, db_path, checkpoint_interval=100,
+                                          summary=ImportSummaryAccumulator())
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM health_records").fetchone()[0] == 600
+            assert conn.execute("SELECT SUM(count) FROM import_daily_totals").fetchone()[0] == 600
+        [interrupted] = _history(db_path)
+        assert interrupted['status'] == 'interrupted'
+        assert interrupted['row_count'] == 600 and interrupted['records_processed'] == 600
+        assert 0 < interrupted['header_bytes'] < interrupted['byte_offset']
+
+        cleaned = []
+        original_clean = AppleHealthHandler._clean_record
+        monkeypatch.setattr(AppleHealthHandler, '_clean_record',
+                            lambda handler, record: cleaned.append(record) or
+                            original_clean(handler, record))
+        summary = ImportSummaryAccumulator()
+        count = processor._stream_process(xml_path, db_path, summary=summary,
+                                          checkpoint_interval=100)
+
+        assert count == RECORDS
+        assert len(cleaned) == RECORDS - 600
+        assert len(summary) > 0
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM health_records").fetchone()[0] == RECORDS
+            assert conn.execute("SELECT SUM(count) FROM import_daily_totals").fetchone()[0] == RECORDS
+        [completed] = _history(db_path)
+        assert completed['import_id'] == interrupted['import_id']
+        assert completed['status'] == 'completed' and completed['row_count'] == RECORDS
+
+    def test_completed_or_changed_files_start_over(self, tmp_path, monkeypatch):
+        """Test that only an interrupted import of the same file is resumed."""
+        xml_path = _write_export(tmp_path / 'export.xml', 300)
+        db_path = str(tmp_path / 'health.db')
+        processor = XMLStreamingProcessor()
+
+        with monkeypatch.context() as patch:
+            _cancel_after(patch, 250)
+            with pytest.raises(DataImportError):
+                processor._stream_process(xml_path, db_path, checkpoint_interval=100)
+
+        _write_export(tmp_path / 'export.xml', 320)
+        assert processor._stream_process(xml_path, db_path, checkpoint_interval=100) == 320
+        assert processor._stream_process(xml_path, db_path, checkpoint_interval=100) == 320
+
+        history = _history(db_path)
+        assert [row['status'] for row in history] == ['interrupted', 'completed', 'completed']
+        assert len({row['import_id'] for row in history}) == 3
+
+    def test_malformed_file_keeps_its_checkpoint(self, tmp_path):
+        """Test that a parse error reports the failure and leaves the import resumable."""
+        xml_path = _write_export(tmp_path / 'export.xml', 300)
+        text = Path(xml_path).read_text()
+        Path(xml_path).write_text(text.replace('</HealthData>', '<Record></HealthData>'))
+        db_path = str(tmp_path / 'health.db')
+
+        with pytest.raises(DataImportError, match="Failed to parse XML"):
+            XMLStreamingProcessor()._stream_process(xml_path, db_path, checkpoint_interval=100)
+
+        [interrupted] = _history(db_path)
+        assert interrupted['status'] == 'interrupted' and interrupted['row_count'] == 300
+        assert 0 < interrupted['header_bytes'] < interrupted['byte_offset']
+
+    def test_adds_columns_to_existing_history(self, tmp_path):
+        """Test that an import_history table from before checkpoints is upgraded."""
+        with sqlite3.connect(tmp_path / 'health.db') as conn:
+            conn.execute("CREATE TABLE import_history (id INTEGER PRIMARY KEY, file_path TEXT "
+                         "NOT NULL, file_hash VARCHAR(64), import_date TIMESTAMP, row_count INTEGER)")
+            conn.execute("INSERT INTO import_history (file_path, row_count) VALUES ('old.xml', 5)")
+            ensure_import_history_table(conn.cursor())
+            ensure_import_history_table(conn.cursor())
+
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(import_history)")}
+            status = conn.execute("SELECT status FROM import_history").fetchone()[0]
+        assert {name for name, _ in IMPORT_CHECKPOINT_COLUMNS} <= columns
+        assert status == 'completed'
+
+    def test_import_does_not_create_application_database(self, tmp_path):
+        """Test that importing the streaming importer leaves the application database alone."""
+        code = ("import sys, src.xml_streaming_processor; "
+                "sys.exit('src.database' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path,
+                                env={'PYTHONPATH': str(Path(__file__).parents[2])})
+        assert result.returncode == 0